@@ -0,0 +1,240 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+from x8.core import ArgParser
+from x8.messaging.queue import MessageBatch, Queue
+from x8.ql import QLParser
+from x8.ql._antlr_parser import AntlrParser
+from x8.ql._fast_parser import FastParser
+from x8.storage.document_store import DocumentStore
+from x8.storage.key_value_store import KeyValueStore
+
+
+def measure(name: str, func: Callable[[], Any], n: int = 20000) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    rate = n / (time.perf_counter() - start)
+    print(f"{name:<24} {rate:>12,.0f} calls/sec")
+    return rate
+
+
+async def ameasure(name: str, func: Callable[[], Any], n: int = 20000):
+    await func()
+    start = time.perf_counter()
+    for _ in range(n):
+        await func()
+    rate = n / (time.perf_counter() - start)
+    print(f"{name:<24} {rate:>12,.0f} calls/sec")
+    return rate
+
+
+def measure_threads(
+    name: str,
+    funcs: list[Callable[[], Any]],
+    threads: int,
+    n: int = 2000,
+) -> float:
+    def worker(i: int):
+        func = funcs[i % len(funcs)]
+        for _ in range(n):
+            func()
+
+    workers = [
+        threading.Thread(target=worker, args=(i,)) for i in range(threads)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    rate = threads * n / (time.perf_counter() - start)
+    print(f"{name:<24} {rate:>12,.0f} calls/sec")
+    return rate
+
+
+def run_mixed():
+    ds = DocumentStore(collection="mixed", __provider__="memory")
+    ds.create_collection()
+    for i in range(1000):
+        ds.put(value={"id": str(i), "pk": "pk", "value": i})
+    key = {"id": "1", "pk": "pk"}
+
+    def read():
+        ds.query(where="value < 10")
+
+    def write():
+        ds.update(key=key, set="value=increment(1)")
+
+    for threads in (1, 2, 4, 8):
+        measure_threads(
+            f"document.mixed x{threads}",
+            [read, read, read, write],
+            threads,
+            n=200,
+        )
+
+
+def run_parse():
+    where = "value < 10 and pk = @pk"
+    measure("ql.parse_where", lambda: QLParser.parse_where(where))
+    measure(
+        "ql.parse_where (params)",
+        lambda: ArgParser.get_parsed_arg("where", where, {"pk": "pk"}),
+    )
+    print(QLParser.cache_info())
+
+    # Cold parses, without the cache.
+    measure("ql.parse (fast)", lambda: FastParser.parse(where, "where"))
+    measure(
+        "ql.parse (antlr)",
+        lambda: AntlrParser.parse(where, "where"),
+        n=2000,
+    )
+
+
+async def measure_consumers(
+    name: str,
+    parameters: dict[str, Any],
+    consumers: int,
+    n: int = 2000,
+) -> float:
+    # Consumers share the event loop with a ticker that records
+    # how late the loop runs it.
+    consumer = Queue(
+        __provider__=dict(type="postgresql", parameters=parameters)
+    )
+    producer = Queue(
+        __provider__=dict(type="postgresql", parameters=parameters)
+    )
+    await producer.acreate_queue()
+    await producer.apurge()
+    received = 0
+    stalls: list[float] = [0.0]
+
+    async def tick():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - start - 0.01)
+
+    async def consume():
+        nonlocal received
+        while received < n:
+            res = await consumer.apull(
+                config=dict(max_count=10, max_wait_time=1)
+            )
+            if res.result:
+                received += len(res.result)
+                await consumer.amack(keys=[item.key for item in res.result])
+
+    async def produce():
+        for start in range(0, n, 100):
+            batch = MessageBatch()
+            for i in range(start, min(start + 100, n)):
+                batch.put(value=str(i))
+            await producer.abatch(batch=batch)
+
+    ticker = asyncio.create_task(tick())
+    start = time.perf_counter()
+    await asyncio.gather(produce(), *(consume() for _ in range(consumers)))
+    rate = n / (time.perf_counter() - start)
+    ticker.cancel()
+    print(
+        f"{name:<24} {rate:>12,.0f} messages/sec"
+        f" (max stall {max(stalls) * 1000:,.0f} ms)"
+    )
+    await consumer.aclose()
+    await producer.aclose()
+    return rate
+
+
+def run_postgresql():
+    # Runs against the server in POSTGRESQL_CONNECTION_STRING, if set.
+    connection_string = os.environ.get("POSTGRESQL_CONNECTION_STRING")
+    if not connection_string:
+        return
+    parameters = dict(connection_string=connection_string, queue="benchmark")
+    for consumers in (1, 8, 32):
+        asyncio.run(
+            measure_consumers(
+                f"queue.postgresql.apull x{consumers}",
+                parameters,
+                consumers,
+            )
+        )
+
+
+def run():
+    run_parse()
+
+    kv = KeyValueStore(__provider__="memory")
+    kv.put(key="key", value=b"value")
+    measure("kv.get", lambda: kv.get(key="key"))
+    measure("kv.get (positional)", lambda: kv.get("key"))
+    measure("kv.put", lambda: kv.put(key="key", value=b"value"))
+    asyncio.run(ameasure("kv.aget", lambda: kv.aget(key="key")))
+
+    ds = DocumentStore(collection="test", __provider__="memory")
+    ds.create_collection()
+    key = {"id": "id", "pk": "pk"}
+    ds.put(value={"id": "id", "pk": "pk", "value": 1})
+    measure("document.get", lambda: ds.get(key=key))
+    measure(
+        "document.put",
+        lambda: ds.put(value={"id": "id", "pk": "pk", "value": 1}),
+    )
+    asyncio.run(ameasure("document.aget", lambda: ds.aget(key=key)))
+
+    rds = DocumentStore(collection="test", __provider__="memory", __raw__=True)
+    rds.create_collection()
+    for i in range(100):
+        for store in (ds, rds):
+            store.put(value={"id": f"id{i}", "pk": "pk", "value": i})
+    measure("document.query", lambda: ds.query(), n=2000)
+    measure("document.query (raw)", lambda: rds.query(), n=2000)
+
+    with tempfile.TemporaryDirectory() as store_path:
+        pds = DocumentStore(
+            collection="test",
+            __provider__=dict(
+                type="memory", parameters=dict(store_path=store_path)
+            ),
+        )
+        pds.create_collection()
+        measure(
+            "document.put (persisted)",
+            lambda: pds.put(value={"id": "id", "pk": "pk", "value": 1}),
+            n=2000,
+        )
+        pds.close()
+
+    with tempfile.TemporaryDirectory() as folder:
+        sds = DocumentStore(
+            collection="test",
+            __provider__=dict(
+                type="sqlite",
+                parameters=dict(database=f"{folder}/test.db"),
+            ),
+        )
+        sds.create_collection()
+        sds.put(value={"id": "id", "pk": "pk", "value": 1})
+        measure("document.sqlite.get", lambda: sds.get(key=key), n=5000)
+        measure(
+            "document.sqlite.put",
+            lambda: sds.put(value={"id": "id", "pk": "pk", "value": 1}),
+            n=2000,
+        )
+        sds.close()
+
+    run_mixed()
+    run_postgresql()
+
+
+if __name__ == "__main__":
+    run()
@@ -11,6 +11,7 @@ from x8.messaging.pubsub import (
     MessageItem,
     MessagePullConfig,
     NotFoundError,
+    PubSub,
     SubscriptionConfig,
     SubscriptionInfo,
     TopicConfig,
@@ -627,6 +628,47 @@ def assert_message(result: MessageItem, message: dict):
     assert diff_time_seconds < 100
 
 
+def test_sqlite_shared_payload():
+    client = PubSub(
+        topic=topic_name,
+        __provider__=dict(
+            type=PubSubProvider.SQLITE,
+            parameters=dict(database=":memory:"),
+        ),
+    )
+    client.create_topic()
+    for subscription_name in subscription_names:
+        client.create_subscription(subscription=subscription_name)
+    client.create_subscription(
+        subscription="expiring", config=SubscriptionConfig(ttl=0.2)
+    )
+    connection = client.__provider__._client.connection
+
+    def get_payloads():
+        return connection.execute("SELECT refs FROM payload").fetchall()
+
+    # The payload is stored once for all the subscriptions.
+    client.put(value=b"x" * 100000)
+    assert get_payloads() == [(3,)]
+    assert connection.execute("SELECT COUNT(*) FROM message").fetchone() == (
+        3,
+    )
+
+    # Acks release the payload, the last one deletes it.
+    for subscription_name in subscription_names:
+        res = client.pull(subscription=subscription_name)
+        assert res.result[0].value == b"x" * 100000
+        client.ack(subscription=subscription_name, key=res.result[0].key)
+    assert get_payloads() == [(1,)]
+
+    # So do the expired messages.
+    time.sleep(0.3)
+    res = client.pull(subscription="expiring", config=dict(max_wait_time=0.1))
+    assert res.result == []
+    assert get_payloads() == []
+    client.close()
+
+
 async def create_topic_if_needed(
     provider_type: str,
     client: PubSubSyncAndAsyncClient,
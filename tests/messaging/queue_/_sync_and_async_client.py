@@ -42,6 +42,12 @@ class QueueSyncAndAsyncClient(SyncAndAsyncClient):
     async def nack(self, **kwargs):
         return await self._execute_method(**kwargs)
 
+    async def mack(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
+    async def mnack(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
     async def extend(self, **kwargs):
         return await self._execute_method(**kwargs)
 
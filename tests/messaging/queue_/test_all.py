@@ -1,5 +1,10 @@
 # type: ignore
 
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
 import time
 from datetime import datetime, timezone
 
@@ -11,12 +16,13 @@ from x8.messaging.queue import (
     MessageItem,
     MessagePullConfig,
     NotFoundError,
+    Queue,
     QueueConfig,
     QueueInfo,
 )
 
 from ._data import messages
-from ._providers import QueueProvider
+from ._providers import QueueProvider, provider_parameters
 from ._sync_and_async_client import QueueSyncAndAsyncClient
 
 except_config_providers = [
@@ -273,6 +279,60 @@ async def test_count(provider_type: str, async_call: bool):
     await client.close()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        QueueProvider.AMAZON_SQS,
+        QueueProvider.AZURE_SERVICE_BUS,
+        QueueProvider.AZURE_QUEUE_STORAGE,
+        QueueProvider.GOOGLE_PUBSUB,
+        QueueProvider.REDIS,
+        QueueProvider.POSTGRESQL,
+        QueueProvider.SQLITE,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_mack_mnack(provider_type: str, async_call: bool):
+    client = QueueSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+    await create_queue_if_needed(provider_type, client)
+
+    await client.purge(config=dict(max_count=10, max_wait_time=2))
+    batch = MessageBatch()
+    for message in messages:
+        batch.put(**message)
+    await client.batch(batch=batch)
+    result = []
+    while len(result) < len(messages):
+        res = await client.pull(
+            config=dict(max_count=len(messages), max_wait_time=5)
+        )
+        result.extend(res.result)
+    assert_batch(result, messages)
+
+    keys = [message.key for message in result]
+    res = await client.mnack(keys=keys[:1])
+    assert res.result == [True]
+    res = await client.mack(keys=keys)
+    assert res.result == [False] + [True] * (len(keys) - 1)
+    res = await client.mack(keys=keys[1:])
+    assert res.result == [False] * (len(keys) - 1)
+
+    res = await client.pull(config=dict(max_wait_time=5))
+    assert (
+        res.result[0].properties.message_id
+        == result[0].properties.message_id
+    )
+    res = await client.mack(keys=[res.result[0].key])
+    assert res.result == [True]
+    await client.close()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "provider_type",
@@ -377,6 +437,265 @@ def assert_queue_info(
     assert result.nref is not None
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("database", [":memory:", "file"])
+@pytest.mark.parametrize("async_call", [False, True])
+async def test_sqlite_wakeup(database: str, async_call: bool):
+    with tempfile.TemporaryDirectory() as folder:
+        if database == "file":
+            database = os.path.join(folder, "queue.db")
+        # Pulls must not wait for the poll interval to see new messages.
+        consumer = Queue(
+            __provider__=dict(
+                type=QueueProvider.SQLITE,
+                parameters=dict(
+                    database=database, queue=queue_name, poll_interval=30
+                ),
+            )
+        )
+        consumer.create_queue()
+        producer = consumer
+        if database != ":memory:":
+            producer = Queue(
+                __provider__=dict(
+                    type=QueueProvider.SQLITE,
+                    parameters=dict(database=database, queue=queue_name),
+                )
+            )
+        timer = threading.Timer(0.2, producer.put, kwargs=dict(value="a"))
+        timer.start()
+        start = time.time()
+        config = dict(max_wait_time=20)
+        if async_call:
+            res = await consumer.apull(config=config)
+        else:
+            res = consumer.pull(config=config)
+        assert time.time() - start < 5
+        assert res.result[0].value == "a"
+        consumer.ack(key=res.result[0].key)
+        timer.join()
+        consumer.close()
+        producer.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("async_call", [False, True])
+async def test_sqlite_idle_pull(async_call: bool):
+    with tempfile.TemporaryDirectory() as folder:
+        client = Queue(
+            __provider__=dict(
+                type=QueueProvider.SQLITE,
+                parameters=dict(
+                    database=os.path.join(folder, "queue.db"),
+                    queue=queue_name,
+                    poll_interval=0.5,
+                ),
+            )
+        )
+        client.create_queue()
+        helper = client.__provider__._client_helper
+        get_data_version = helper._get_data_version
+        checks = []
+
+        def count_data_version():
+            checks.append(1)
+            return get_data_version()
+
+        # Idle pulls back off checking for commits of other connections.
+        helper._get_data_version = count_data_version
+        config = dict(max_wait_time=1)
+        if async_call:
+            res = await client.apull(config=config)
+        else:
+            res = client.pull(config=config)
+        assert res.result == []
+        assert len(checks) < 30
+        client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("async_call", [False, True])
+async def test_sqlite_large_batch(async_call: bool):
+    queue = Queue(
+        __provider__=dict(
+            type=QueueProvider.SQLITE,
+            parameters=dict(database=":memory:", queue=queue_name),
+        )
+    )
+    queue.create_queue()
+    count = 2000
+    batch = MessageBatch()
+    for i in range(count):
+        batch.put(value=str(i), properties=dict(message_id=str(i)))
+    if async_call:
+        await queue.abatch(batch=batch)
+    else:
+        queue.batch(batch=batch)
+    assert queue.get_queue().result.active_message_count == count
+    res = queue.pull(config=dict(max_count=count))
+    assert [message.value for message in res.result] == [
+        str(i) for i in range(count)
+    ]
+    queue.close()
+
+
+def test_sqlite_migrate():
+    with tempfile.TemporaryDirectory() as folder:
+        database = os.path.join(folder, "queue.db")
+        # Messages stored with their payload before the payload table.
+        connection = sqlite3.connect(database)
+        connection.execute(
+            """
+                CREATE TABLE message (
+                    id TEXT,
+                    topic TEXT,
+                    subscription TEXT,
+                    value BLOB,
+                    metadata TEXT,
+                    message_id TEXT,
+                    group_id TEXT,
+                    content_type TEXT,
+                    enqueued_time REAL,
+                    delivery_count INTEGER,
+                    lock_until_time REAL,
+                    lock_token TEXT,
+                    PRIMARY KEY (id, topic, subscription)
+                )
+                """
+        )
+        connection.execute(
+            "INSERT INTO message VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                "1",
+                queue_name,
+                "default",
+                b"old",
+                None,
+                None,
+                None,
+                "text/plain",
+                time.time(),
+                0,
+                0,
+                "",
+            ),
+        )
+        connection.commit()
+        connection.close()
+
+        queue = Queue(
+            __provider__=dict(
+                type=QueueProvider.SQLITE,
+                parameters=dict(database=database, queue=queue_name),
+            )
+        )
+        queue.create_queue()
+        queue.put(value="new")
+        res = queue.pull(config=dict(max_count=2))
+        assert [message.value for message in res.result] == ["old", "new"]
+        queue.mack(keys=[message.key for message in res.result])
+        connection = queue.__provider__._client.connection
+        assert connection.execute("SELECT * FROM payload").fetchall() == []
+        queue.close()
+
+
+def open_postgresql_queue(queue: str, **kwargs) -> Queue:
+    psycopg = pytest.importorskip("psycopg")
+    parameters = dict(provider_parameters[QueueProvider.POSTGRESQL])
+    parameters.update(queue=queue, **kwargs)
+    try:
+        psycopg.connect(
+            parameters["connection_string"], connect_timeout=2
+        ).close()
+    except psycopg.Error:
+        pytest.skip("PostgreSQL server is not available")
+    return Queue(
+        __provider__=dict(type=QueueProvider.POSTGRESQL, parameters=parameters)
+    )
+
+
+async def open_postgresql_queues(queue: str) -> tuple[Queue, Queue]:
+    # Consumers only poll for new messages every 30 seconds.
+    consumer = open_postgresql_queue(queue, poll_interval=30)
+    producer = open_postgresql_queue(queue)
+    await producer.acreate_queue()
+    await producer.apurge()
+    return consumer, producer
+
+
+@pytest.mark.asyncio
+async def test_postgresql_pull():
+    consumer, producer = await open_postgresql_queues("pgpull")
+    for i in range(5):
+        await producer.aput(value=str(i))
+    res = await consumer.apull(config=dict(max_count=3, max_wait_time=5))
+    assert [message.value for message in res.result] == ["0", "1", "2"]
+    res = await consumer.apull(config=dict(max_count=3, max_wait_time=5))
+    assert [message.value for message in res.result] == ["3", "4"]
+    res = await consumer.apull(config=dict(max_wait_time=0.5))
+    assert res.result == []
+    await consumer.aclose()
+    await producer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_postgresql_wakeup():
+    consumer, producer = await open_postgresql_queues("pgwakeup")
+    await consumer.apull(config=dict(max_wait_time=0.1))
+    # Waiting pulls are woken up by the notification of the put.
+    pull = asyncio.create_task(consumer.apull(config=dict(max_wait_time=20)))
+    await asyncio.sleep(0.5)
+    start = time.time()
+    await producer.aput(value="a")
+    res = await pull
+    assert time.time() - start < 5
+    assert [message.value for message in res.result] == ["a"]
+    await consumer.aclose()
+    await producer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_postgresql_concurrent_pull():
+    consumer, producer = await open_postgresql_queues("pgclaims")
+    count = 60
+    lags: list[float] = []
+
+    async def tick():
+        # Measures how late the event loop runs a short sleep.
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    async def consume() -> list:
+        values = []
+        while len(values) < count:
+            res = await consumer.apull(
+                config=dict(max_count=4, max_wait_time=2)
+            )
+            if not res.result:
+                break
+            values.extend(message.value for message in res.result)
+            await consumer.amack(keys=[message.key for message in res.result])
+        return values
+
+    ticker = asyncio.create_task(tick())
+    consumers = [asyncio.create_task(consume()) for _ in range(8)]
+    await asyncio.sleep(0.5)
+    for i in range(count):
+        await producer.aput(value=str(i))
+    results = await asyncio.gather(*consumers)
+    ticker.cancel()
+    # Every message is claimed by exactly one consumer.
+    values = [value for result in results for value in result]
+    assert sorted(values, key=int) == [str(i) for i in range(count)]
+    assert sum(1 for result in results if result) > 1
+    # Idle consumers do not stall the event loop.
+    assert max(lags) < 0.5
+    await consumer.aclose()
+    await producer.aclose()
+
+
 def assert_batch(result: list[MessageItem], messages: list[dict]):
     for message in messages:
         found = False
@@ -0,0 +1,432 @@
+# type: ignore
+import pytest
+from x8.core import ArgParser
+from x8.ql import (
+    Comparison,
+    Field,
+    OrderByDirection,
+    QLParser,
+    QueryCompiler,
+    QueryProcessor,
+    Undefined,
+)
+from x8.ql._antlr_parser import AntlrParser
+from x8.ql._fast_parser import UNSUPPORTED, FastParser
+from x8.ql._ql_parser import ParseCache
+from x8.ql._query_compiler import AscFieldComparer, DescFieldComparer
+from x8.ql.exceptions import ParserError
+
+complex_condition = """
+    length(arrstr[0]) > 7
+    and contains(arrstr[1], 'und')
+    and not contains(const, '$')
+    and starts_with(arrobj[0].ostr, 'nine')
+    and 8 = array_length(obj.narr)
+    and array_contains_any(arrstr, ['xyz', 'hundred nine', 'abc'])
+    and is_type(obj.nobj, 'object')
+    and obj.nstr = "9"
+    and arrobj[1].oint = 9000000000
+    and 9.1 != float
+    and int >= 8 and (bool = true or obj.nobj.nnfloat <= -900.1)
+    and not (pk = "pk00" or length(obj.nobj.nnstr) != 2)
+    and obj.nint between -10 and 10
+    and str in ('one', 'two', 'eight', 'nine')
+    and obj.nint not in (-1, -2, -8)
+    """
+
+
+@pytest.mark.parametrize(
+    "str",
+    [
+        "a = 1",
+        "a.b[0].c[-].d['x'] = 'y'",
+        "$id = @id and $pk = @pk",
+        "a != 1.5 or b < -2 or c <= +3 or d > .5 or e >= 1e-3",
+        "a = 1. or b = -.5e2",
+        "a = null or b = TRUE or c = false",
+        '"abc" = a',
+        "NOT a = 1 AND b = 2",
+        "not not a = 1",
+        "not (a = 1 and b = 2)",
+        "a = 1 or b = 2 and c = 3",
+        "a = 1 and b = 2 and c = 3 or d = 4 or e = 5",
+        "x between 1 and 2 and y = 1",
+        "x not in (1, 2) or not x in ('a')",
+        "exists()",
+        "is_defined(a) and not is_type(b, 'null')",
+        "vector_search(field=vector, vector=@v, Top_K=10)",
+        "ns.func(a, 'b', 1)",
+        "Order = 1 and desc.select = 2",
+        "a-b = 1",
+        'a = [1, 2.5, "x", [true, null], []]',
+        "a = ['x', 1]",
+        "@p",
+        complex_condition,
+    ],
+)
+def test_where(str: str):
+    obj = FastParser.parse(str, "where")
+    assert obj is not UNSUPPORTED
+    assert obj == AntlrParser.parse(str, "where")
+
+
+@pytest.mark.parametrize(
+    "str",
+    [
+        "*",
+        "@p",
+        "a",
+        "a, b as c, d.e AS f",
+        "a[0] as b, select",
+    ],
+)
+def test_select(str: str):
+    obj = FastParser.parse(str, "select")
+    assert obj is not UNSUPPORTED
+    assert obj == AntlrParser.parse(str, "select")
+
+
+@pytest.mark.parametrize(
+    "str",
+    [
+        "@p",
+        "a",
+        "a, b desc, c ASC",
+        "desc desc, asc",
+    ],
+)
+def test_order_by(str: str):
+    obj = FastParser.parse(str, "order_by")
+    assert obj is not UNSUPPORTED
+    assert obj == AntlrParser.parse(str, "order_by")
+
+
+@pytest.mark.parametrize(
+    "str",
+    [
+        "a = 1 -- comment",
+        "a = 1 /* comment */",
+        "a = 'it''s'",
+        "a = {{ref://collection.field}}",
+        'a = {"b": 1}',
+        "a = [+1]",
+        "a <> 1",
+        "ns.func()",
+        "a.b.c(1)",
+        "a = ",
+        "",
+    ],
+)
+def test_fallback(str: str):
+    assert FastParser.parse(str, "where") is UNSUPPORTED
+    try:
+        obj = AntlrParser.parse(str, "where")
+    except Exception:
+        with pytest.raises(Exception):
+            QLParser.parse_where(str)
+    else:
+        assert QLParser.parse_where(str) == obj
+
+
+def test_parser_error():
+    QLParser.clear_cache()
+    with pytest.raises(ParserError):
+        QLParser.parse_where("a = 1 and")
+    with pytest.raises(ParserError):
+        QLParser.parse_order_by("a desc desc")
+
+
+def test_parameters():
+    where = ArgParser.get_parsed_arg("where", "a = @p", {"p": 1})
+    assert where == Comparison(lexpr=Field(path="a"), op="=", rexpr=1)
+
+
+compile_items = [
+    {"a": 1, "b": "x", "c": [1, "x"], "d": {"e": 2}},
+    {"a": 2.5, "b": "xyz", "c": [], "d": {"e": "2"}},
+    {"a": "1", "b": 3, "c": ["y"], "d": None},
+    {"a": True, "b": None, "c": "x"},
+    {"a": None, "b": "abc", "d": {"e": [1, 2]}},
+    {"a": [1], "c": [[1], "x"]},
+    {"a": {"b": 1}, "b": "a.c"},
+    {},
+]
+
+
+@pytest.mark.parametrize(
+    "where",
+    [
+        "a = 1",
+        "a = '1'",
+        "1 = a",
+        "a != 1",
+        "a < 2",
+        "a >= '1'",
+        "2 > a",
+        "b <= 'xy'",
+        "a between 1 and 3",
+        "b between 'a' and 'y'",
+        "a between 1 and 'z'",
+        "a in (1, '1', null)",
+        "a not in (1, 2.5)",
+        Comparison(lexpr=Field(path="b"), op="like", rexpr="x.*"),
+        Comparison(lexpr=Field(path="b"), op="like", rexpr="a.c"),
+        Comparison(lexpr=Field(path="a"), op="like", rexpr="1"),
+        "a = b",
+        "a < b",
+        "d.e = 2",
+        "d.e[0] = 1",
+        "c[0] = 1",
+        "c[1][0] = 1",
+        "a = null",
+        "a = true",
+        "a = [1]",
+        'a = {"b": 1}',
+        "is_defined(b) and not is_defined(d)",
+        "is_not_defined(a)",
+        "is_type(a, 'number')",
+        "is_type(a, 'string') or is_type(a, 'boolean')",
+        "is_type(a, 'null') or is_type(a, 'array')",
+        "is_type(d, 'object')",
+        "length(b) = 3",
+        "length(a) = 0",
+        "contains(b, 'y')",
+        "contains(a, '1')",
+        "starts_with(b, 'x')",
+        "starts_with(c, 'x')",
+        "array_length(c) = 2",
+        "array_length(b) = 0",
+        "array_contains(c, 'x')",
+        "array_contains(c, [1])",
+        "array_contains_any(c, [1, 'y'])",
+        "array_contains_any(c, 1)",
+        "exists()",
+        "not a = 1 and (b = 'x' or c = 'x')",
+        "not (a > 1 or a < 1)",
+        "a = 1 or b = 3 or is_not_defined(c)",
+    ],
+)
+def test_compile_where(where: str | Comparison):
+    expr = QLParser.parse_where(where) if isinstance(where, str) else where
+    predicate = QueryCompiler.compile_where(expr)
+    for item in compile_items:
+        expected = bool(QueryProcessor.eval_expr(item, expr))
+        assert predicate(item) is expected, item
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        Comparison(lexpr=Field(path="a"), op="between", rexpr=1),
+        Comparison(lexpr=Field(path="a"), op="in", rexpr=1),
+        Comparison(lexpr=Field(path="a"), op="not in", rexpr="x"),
+        QLParser.parse_where("ns.func(a)"),
+    ],
+)
+def test_compile_where_error(expr: Comparison):
+    for item in compile_items:
+        with pytest.raises(Exception) as expected:
+            QueryProcessor.eval_expr(item, expr)
+        with pytest.raises(expected.type):
+            QueryCompiler.compile_where(expr)(item)
+
+
+@pytest.mark.parametrize(
+    "order_by",
+    [
+        "a",
+        "a desc",
+        "b",
+        "b desc, a",
+        "d.e",
+        "a, b",
+        "c[0] desc",
+    ],
+)
+def test_compile_order_by(order_by: str):
+    ob = QLParser.parse_order_by(order_by)
+
+    def key(item):
+        values = []
+        for term in ob.terms:
+            value = QueryProcessor.eval_expr(item, Field(path=term.field))
+            # Null values sort before any other value.
+            value = (value is not None, value)
+            if term.direction == OrderByDirection.DESC:
+                values.append(DescFieldComparer(value))
+            else:
+                values.append(AscFieldComparer(value))
+        return tuple(values)
+
+    is_defined, compiled_key = QueryCompiler.compile_order_by(ob)
+    for start in range(len(compile_items)):
+        items = compile_items[start:]
+        defined = [
+            item
+            for item in items
+            if not any(
+                isinstance(
+                    QueryProcessor.eval_expr(item, Field(path=term.field)),
+                    Undefined,
+                )
+                for term in ob.terms
+            )
+        ]
+        assert list(filter(is_defined, items)) == defined
+        # Values of different types can not be ordered.
+        try:
+            expected = sorted(defined, key=key)
+        except TypeError:
+            with pytest.raises(TypeError):
+                sorted(defined, key=compiled_key)
+        else:
+            assert sorted(defined, key=compiled_key) == expected
+
+
+@pytest.mark.parametrize(
+    "select",
+    [
+        "a",
+        "a, b as c",
+        "d.e as f, c[0]",
+        "d.e as x.y, b as x.z",
+        "missing, a as missing2",
+        "*",
+    ],
+)
+def test_compile_select(select: str):
+    sel = QLParser.parse_select(select)
+    project = QueryCompiler.compile_select(sel)
+    for item in compile_items:
+        assert project(item) == QueryProcessor.project_item(item, sel), item
+
+
+def test_query_items_top_k():
+    items = [{"id": i, "v": i % 3, "w": -i} for i in range(10)]
+    items.append({"id": 10})
+    expected = sorted(
+        [item for item in items if "v" in item], key=lambda item: item["v"]
+    )
+    for limit, offset in [(1, None), (4, 2), (3, 8), (5, 20), (None, 3)]:
+        start = offset or 0
+        end = start + limit if limit is not None else None
+        # Ties keep the order of the input items, as with a full sort.
+        result = QueryProcessor.query_items(
+            items, order_by="v", limit=limit, offset=offset
+        )
+        assert result == expected[start:end]
+        result = QueryProcessor.query_items(
+            items, order_by="v desc", limit=limit, offset=offset
+        )
+        descending = sorted(expected, key=lambda item: -item["v"])
+        assert result == descending[start:end]
+        result = QueryProcessor.query_items(
+            items, order_by="v desc, w", limit=limit, offset=offset
+        )
+        ids = [8, 5, 2, 7, 4, 1, 9, 6, 3, 0]
+        assert [item["id"] for item in result] == ids[start:end]
+    assert QueryProcessor.query_items(items, order_by="v", limit=0) == []
+
+
+def test_query_items_early_exit():
+    consumed = []
+
+    def iter_items():
+        for i in range(100):
+            consumed.append(i)
+            yield {"id": i, "v": i % 2}
+
+    result = QueryProcessor.query_items(
+        iter_items(), select="id", where="v = 1", limit=3, offset=2
+    )
+    assert result == [{"id": 5}, {"id": 7}, {"id": 9}]
+    assert consumed == list(range(10))
+
+    # Offsets past the end return nothing, after reading every item.
+    consumed.clear()
+    result = QueryProcessor.query_items(iter_items(), limit=5, offset=200)
+    assert result == []
+    assert len(consumed) == 100
+
+
+def test_parse_cache():
+    cache = ParseCache(maxsize=2)
+    assert cache.get(("where", "a = 1")) == (False, None)
+    cache.put(("where", "a = 1"), 1)
+    cache.put(("where", "a = 2"), 2)
+    assert cache.get(("where", "a = 1")) == (True, 1)
+    # The least recently used entry is evicted.
+    cache.put(("where", "a = 3"), 3)
+    assert cache.get(("where", "a = 2")) == (False, None)
+    assert cache.get(("where", "a = 1")) == (True, 1)
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (2, 2, 1)
+    assert (info.size, info.maxsize) == (2, 2)
+
+    cache.resize(1)
+    assert cache.get(("where", "a = 3")) == (False, None)
+    assert cache.get(("where", "a = 1")) == (True, 1)
+    info = cache.info()
+    assert (info.evictions, info.size, info.maxsize) == (2, 1, 1)
+
+    cache.resize(0)
+    cache.put(("where", "a = 1"), 1)
+    assert cache.get(("where", "a = 1")) == (False, None)
+    info = cache.info()
+    assert (info.evictions, info.size, info.maxsize) == (3, 0, 0)
+
+    cache.clear()
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (0,) * 4
+
+
+def test_parser_cache(monkeypatch):
+    monkeypatch.setattr(QLParser, "cache", ParseCache())
+    QLParser.configure_cache(2)
+    where = QLParser.parse_where("a = 1")
+    assert QLParser.parse_where("a = 1") is where
+    QLParser.parse_where("a = 2")
+    QLParser.parse_where("a = 3")
+    info = QLParser.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (1, 3, 1)
+    assert (info.size, info.maxsize) == (2, 2)
+
+    # A disabled cache parses every string.
+    QLParser.configure_cache(0)
+    assert QLParser.parse_where("a = 1") == where
+    assert QLParser.parse_where("a = 1") is not where
+    info = QLParser.cache_info()
+    assert (info.hits, info.misses, info.size) == (1, 5, 0)
+
+    QLParser.clear_cache()
+    info = QLParser.cache_info()
+    assert (info.hits, info.misses, info.maxsize) == (0, 0, 0)
+
+
+def test_parser_cache_copies(monkeypatch):
+    monkeypatch.setattr(QLParser, "cache", ParseCache())
+    # Changes made by one caller are not seen by the next.
+    select = QLParser.parse_select("a, b")
+    select.add_field("c")
+    assert str(QLParser.parse_select("a, b")) == "a, b"
+    order_by = QLParser.parse_order_by("a desc")
+    order_by.add_field("b")
+    assert len(QLParser.parse_order_by("a desc").terms) == 1
+    update = QLParser.parse_update("a=put(1)")
+    update.put("b", 2)
+    assert len(QLParser.parse_update("a=put(1)").operations) == 1
+    statement = "QUERY SELECT a WHERE x = 1 ORDER BY a"
+    operation = QLParser.parse_statement(statement)
+    operation.args["select"].add_field("b")
+    operation.args["order_by"].add_field("b")
+    operation.args["limit"] = 1
+    operation = QLParser.parse_statement(statement)
+    assert str(operation.args["select"]) == "a"
+    assert len(operation.args["order_by"].terms) == 1
+    assert "limit" not in operation.args
+    # Expressions are frozen, so they are shared.
+    assert (
+        operation.args["where"]
+        is QLParser.parse_statement(statement).args["where"]
+    )
+    assert QLParser.cache_info().hits == 5
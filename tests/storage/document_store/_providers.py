@@ -64,9 +64,12 @@ provider_parameters: dict[str, dict[str, Any]] = {
 }
 
 
-def get_component(provider_type: str, collection: str = "test"):
+def get_component(
+    provider_type: str, collection: str = "test", raw: bool = False
+):
     component = DocumentStore(
         collection=collection,
+        __raw__=raw,
         __provider__=dict(
             type=provider_type,
             parameters=provider_parameters[provider_type],
@@ -4,8 +4,10 @@ from ._providers import get_component
 
 
 class DocumentStoreSyncAndAsyncClient(SyncAndAsyncClient):
-    def __init__(self, provider_type: str, async_call: bool):
-        self.client = get_component(provider_type)
+    def __init__(
+        self, provider_type: str, async_call: bool, raw: bool = False
+    ):
+        self.client = get_component(provider_type, raw=raw)
         self.async_call = async_call
         self.provider_type = provider_type
 
@@ -51,6 +53,9 @@ class DocumentStoreSyncAndAsyncClient(SyncAndAsyncClient):
     async def query(self, **kwargs):
         return await self._execute_method(**kwargs)
 
+    async def iter_query(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
     async def count(self, **kwargs):
         return await self._execute_method(**kwargs)
 
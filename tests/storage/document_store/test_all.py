@@ -3,11 +3,17 @@ import asyncio
 import copy
 import json
 import os
+import pickle
+import struct
+import zlib
 
 import pytest
-from x8.core import DataModel
+from x8.core import DataModel, Record
+from x8.core.exceptions import InternalError
 from x8.storage._common import Comparator, StoreOperation
 from x8.storage.document_store import (
+    BadRequestError,
+    DocumentStore,
     CollectionStatus,
     ConflictError,
     DocumentItem,
@@ -16,9 +22,13 @@ from x8.storage.document_store import (
     NotFoundError,
     PreconditionFailedError,
 )
+from x8.storage.document_store.providers._memory_index import (
+    SortedFieldIndex,
+)
+from x8.storage.document_store.providers._memory_log import MemoryLog
 
 from ._data import bson, documents
-from ._providers import DocumentStoreProvider
+from ._providers import DocumentStoreProvider, get_component
 from ._sync_and_async_client import DocumentStoreSyncAndAsyncClient
 
 if os.name == "nt":
@@ -1618,6 +1628,228 @@ async def test_query_count(provider_type: str, async_call: bool):
     await client.close()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        DocumentStoreProvider.AMAZON_DYNAMODB,
+        DocumentStoreProvider.AZURE_COSMOS_DB,
+        DocumentStoreProvider.GOOGLE_FIRESTORE,
+        DocumentStoreProvider.MONGODB,
+        DocumentStoreProvider.POSTGRESQL,
+        DocumentStoreProvider.REDIS,
+        DocumentStoreProvider.SQLITE,
+        DocumentStoreProvider.MEMORY,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_iter_query(provider_type: str, async_call: bool):
+    client = DocumentStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+
+    async def collect(result):
+        if async_call:
+            return [item async for item in result]
+        return list(result)
+
+    await create_collection_if_needed(provider_type, client)
+    for document in documents:
+        await cleanup_document(document, client)
+
+    for document in documents:
+        response = await client.put(value=document)
+        result = response.result
+        assert_put_result(result, document)
+
+    response = await client.iter_query(batch_size=2)
+    items = await collect(response.result)
+    assert_select_result(items, documents, False)
+
+    for query in queries:
+        if "except_providers" in query:
+            if provider_type in query["except_providers"]:
+                continue
+        args = query["args"]
+        filtered_documents = filter_documents(documents, query["result_index"])
+
+        projected = None
+        if "select" in query["args"]:
+            projected = query["args"]["select"]
+
+        response = await client.iter_query(**args, batch_size=2)
+        items = await collect(response.result)
+        ordered = True if "ordered" not in query else query["ordered"]
+
+        assert_select_result(items, filtered_documents, ordered, projected)
+
+    for document in documents:
+        key = get_key(document)
+        response = await client.delete(key=key)
+        result = response.result
+        assert_delete_result(result)
+
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        DocumentStoreProvider.MONGODB,
+        DocumentStoreProvider.POSTGRESQL,
+        DocumentStoreProvider.SQLITE,
+        DocumentStoreProvider.MEMORY,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_query_continuation(provider_type: str, async_call: bool):
+    client = DocumentStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+    await create_collection_if_needed(provider_type, client)
+    for document in documents:
+        await cleanup_document(document, client)
+
+    for document in documents:
+        response = await client.put(value=document)
+        result = response.result
+        assert_put_result(result, document)
+
+    for args, result_index in [
+        ({"order_by": "id"}, list(range(len(documents)))),
+        ({"where": "pk = 'pk01'", "order_by": "id DESC"}, [9, 8, 7, 6, 5]),
+        ({"order_by": "pk DESC"}, [5, 6, 7, 8, 9, 0, 1, 2, 3, 4]),
+    ]:
+        items: list = []
+        continuation = None
+        while True:
+            response = await client.query(
+                **args, limit=3, continuation=continuation
+            )
+            result = response.result
+            assert len(result.items) <= 3
+            items.extend(result.items)
+            continuation = result.continuation
+            if continuation is None:
+                break
+        assert_select_result(items, filter_documents(documents, result_index))
+
+    # A limit alone keeps the order of the query without a limit.
+    response = await client.query()
+    expected = [item.key for item in response.result.items[:3]]
+    response = await client.query(limit=3)
+    assert [item.key for item in response.result.items] == expected
+    assert response.result.continuation is None
+
+    # Full pages can not be continued without the order by values.
+    with pytest.raises(BadRequestError):
+        await client.query(select="id, pk", order_by="int", limit=2)
+
+    with pytest.raises(BadRequestError):
+        await client.query(limit=3, continuation="bad continuation")
+
+    for document in documents:
+        key = get_key(document)
+        response = await client.delete(key=key)
+        result = response.result
+        assert_delete_result(result)
+
+    await client.close()
+
+
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        DocumentStoreProvider.POSTGRESQL,
+        DocumentStoreProvider.SQLITE,
+        DocumentStoreProvider.MEMORY,
+    ],
+)
+def test_query_continuation_nulls(provider_type: str):
+    client = get_component(provider_type, collection="nulls")
+    client.create_collection()
+    # Memory stores leave out documents without the order by field.
+    values: list = [None, 4, {}, 5, None, 6, {}, 7, None, 4, {}, None]
+    for i, value in enumerate(values):
+        document = {"id": f"d{i:02}", "pk": "pk"}
+        if value != {}:
+            document["n"] = value
+        client.put(value=document)
+
+    for order_by in ["n", "n desc", "n, id desc", "n desc, id"]:
+        response = client.query(order_by=f"{order_by}, $id")
+        expected = [item.key.id for item in response.result.items]
+        if provider_type != DocumentStoreProvider.MEMORY:
+            assert len(expected) == len(values)
+        for limit in [1, 3, 4]:
+            ids: list = []
+            continuation = None
+            while True:
+                response = client.query(
+                    order_by=order_by, limit=limit, continuation=continuation
+                )
+                ids.extend(item.key.id for item in response.result.items)
+                continuation = response.result.continuation
+                if continuation is None:
+                    break
+            assert ids == expected, (order_by, limit)
+    client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        DocumentStoreProvider.POSTGRESQL,
+        DocumentStoreProvider.REDIS,
+        DocumentStoreProvider.SQLITE,
+        DocumentStoreProvider.MEMORY,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_raw(provider_type: str, async_call: bool):
+    client = DocumentStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call, raw=True
+    )
+    await create_collection_if_needed(provider_type, client)
+    for document in documents:
+        await cleanup_document(document, client)
+
+    for document in documents:
+        await client.put(value=document)
+
+    document = documents[0]
+    response = await client.get(key=get_key(document))
+    result = response.result
+    assert isinstance(result, Record)
+    assert_get_result(result, document)
+    item = result.to_model()
+    assert isinstance(item, DocumentItem)
+    assert result == item
+
+    response = await client.query(where="pk = 'pk01'", order_by="id")
+    result = response.result
+    assert isinstance(result, Record)
+    assert all(isinstance(item, Record) for item in result.items)
+    assert_select_result(
+        result.items, filter_documents(documents, [5, 6, 7, 8, 9])
+    )
+
+    for document in documents:
+        await cleanup_document(document, client)
+    await client.close()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "provider_type",
@@ -2317,3 +2549,321 @@ async def create_collection_if_needed(
         indexes.append(index)
 
     await client.create_collection(config={"indexes": indexes})
+
+
+def open_memory_store(store_path: str, **kwargs) -> DocumentStore:
+    return DocumentStore(
+        collection="docs",
+        __provider__=dict(
+            type="memory",
+            parameters=dict(store_path=store_path, **kwargs),
+        ),
+    )
+
+
+def get_memory_values(client: DocumentStore) -> dict:
+    response = client.query(order_by="id")
+    return {item.value["id"]: item.value for item in response.result.items}
+
+
+def test_memory_store_path(tmp_path):
+    store_path = str(tmp_path / "store")
+    client = open_memory_store(store_path)
+    client.create_index(index={"type": "field", "field": "v"})
+    for i in range(5):
+        client.put(value={"id": f"id{i}", "pk": "pk", "v": i})
+    client.update(key={"id": "id1", "pk": "pk"}, set="v=increment(10)")
+    client.delete(key={"id": "id2", "pk": "pk"})
+    client.put(value={"id": "id3", "pk": "pk", "v": "three"})
+    expected = get_memory_values(client)
+    client.close()
+
+    # Deletes and updates are replayed in order.
+    client = open_memory_store(store_path)
+    assert get_memory_values(client) == expected
+    assert sorted(expected) == ["id0", "id1", "id3", "id4"]
+    assert expected["id1"]["v"] == 11
+    assert expected["id3"]["v"] == "three"
+    with pytest.raises(NotFoundError):
+        client.get(key={"id": "id2", "pk": "pk"})
+    indexes = client.list_indexes().result
+    assert [index.field for index in indexes if index.type == "field"] == ["v"]
+    client.close()
+
+
+def test_memory_store_path_torn_tail(tmp_path):
+    store_path = str(tmp_path / "store")
+    client = open_memory_store(store_path)
+    client.put(value={"id": "id0", "pk": "pk", "v": 0})
+    client.put(value={"id": "id1", "pk": "pk", "v": 1})
+    client.close()
+    log_path = tmp_path / "store" / "log.0"
+    size = log_path.stat().st_size
+
+    # A partial write at the end of the log is dropped on load, and
+    # later writes are appended after the last complete entry.
+    with open(log_path, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x00\x00\x00\x00partial")
+    client = open_memory_store(store_path)
+    assert sorted(get_memory_values(client)) == ["id0", "id1"]
+    assert log_path.stat().st_size == size
+    client.put(value={"id": "id2", "pk": "pk", "v": 2})
+    client.close()
+
+    # A corrupted entry ends the replay.
+    client = open_memory_store(store_path)
+    assert sorted(get_memory_values(client)) == ["id0", "id1", "id2"]
+    client.close()
+    with open(log_path, "r+b") as file:
+        file.seek(size + 8)
+        file.write(b"\xff")
+    client = open_memory_store(store_path)
+    assert sorted(get_memory_values(client)) == ["id0", "id1"]
+    client.close()
+
+
+def test_memory_store_path_snapshot(tmp_path):
+    store_path = str(tmp_path / "store")
+    client = open_memory_store(store_path, snapshot_log_size=1)
+    client.create_index(index={"type": "range", "field": "v"})
+    for i in range(4):
+        client.put(value={"id": f"id{i}", "pk": "pk", "v": i})
+    client.update(key={"id": "id0", "pk": "pk"}, set="v=increment(10)")
+    client.delete(key={"id": "id1", "pk": "pk"})
+    expected = get_memory_values(client)
+    client.close()
+
+    # Every write rotated the log, and the older generations were
+    # removed once their snapshot was written.
+    assert sorted(os.listdir(store_path)) == ["snapshot.7"]
+    client = open_memory_store(store_path, snapshot_log_size=1)
+    assert get_memory_values(client) == expected
+    assert sorted(expected) == ["id0", "id2", "id3"]
+    assert expected["id0"]["v"] == 10
+    client.put(value={"id": "id4", "pk": "pk", "v": 4})
+    expected = get_memory_values(client)
+    client.close()
+    assert sorted(os.listdir(store_path)) == ["snapshot.8"]
+
+    # An incomplete snapshot falls back to the previous one.
+    snapshot_path = os.path.join(store_path, "snapshot.8")
+    with open(snapshot_path, "rb") as file:
+        data = file.read()
+    with open(os.path.join(store_path, "snapshot.9"), "wb") as file:
+        file.write(data[:-1])
+    client = open_memory_store(store_path)
+    assert get_memory_values(client) == expected
+    indexes = client.list_indexes().result
+    assert [index.field for index in indexes if index.type == "range"] == [
+        "v"
+    ]
+    client.close()
+
+
+def test_memory_store_path_corrupted(tmp_path, monkeypatch):
+    store_path = str(tmp_path / "store")
+    # Logs are left behind when snapshots are not written.
+    with monkeypatch.context() as context:
+        context.setattr(MemoryLog, "write_snapshot", lambda *args: None)
+        client = open_memory_store(store_path, snapshot_log_size=1)
+        for i in range(3):
+            client.put(value={"id": f"id{i}", "pk": "pk", "v": i})
+        client.close()
+    assert sorted(os.listdir(store_path)) == ["log.0", "log.1", "log.2"]
+
+    # Entries can only hold data.
+    class Remove:
+        def __reduce__(self):
+            return os.remove, (os.path.join(store_path, "log.0"),)
+
+    client = open_memory_store(store_path)
+    with pytest.raises(BadRequestError):
+        client.put(value={"id": "id3", "pk": "pk", "v": Remove()})
+    assert sorted(get_memory_values(client)) == ["id0", "id1", "id2"]
+    client.close()
+    data = pickle.dumps([Remove()])
+    with open(os.path.join(store_path, "log.2"), "ab") as file:
+        file.write(struct.pack("<II", len(data), zlib.crc32(data)))
+        file.write(data)
+    client = open_memory_store(store_path)
+    with pytest.raises(InternalError):
+        get_memory_values(client)
+    assert os.path.exists(os.path.join(store_path, "log.0"))
+
+    # Only the last log can end with a torn write.
+    with open(os.path.join(store_path, "log.0"), "ab") as file:
+        file.write(b"partial")
+    client = open_memory_store(store_path)
+    with pytest.raises(InternalError):
+        get_memory_values(client)
+
+
+def test_memory_index_plan(monkeypatch):
+    ordered = []
+    for name in ("iter_ordered", "iter_ordered_groups"):
+        method = getattr(SortedFieldIndex, name)
+
+        def wrapper(self, *args, method=method, **kwargs):
+            ordered.append(self.field)
+            return method(self, *args, **kwargs)
+
+        monkeypatch.setattr(SortedFieldIndex, name, wrapper)
+
+    values = [1, 2, 2.5, "2", "a", "b", True, None, 10, "10"]
+    items = []
+    for i in range(60):
+        item = {
+            "id": f"id{i:02}",
+            "pk": "pk",
+            "h": values[i % len(values)],
+            "r": values[(i * 7) % len(values)],
+            "n": i % 7,
+            "tags": [values[i % 4], values[(i + 5) % len(values)]],
+        }
+        if i % 11 == 0:
+            del item["r"]
+            del item["n"]
+        items.append(item)
+    clients = [
+        DocumentStore(collection="docs", __provider__="memory")
+        for _ in range(2)
+    ]
+    for index in (
+        {"type": "hash", "field": "h"},
+        {"type": "range", "field": "r"},
+        {"type": "range", "field": "n"},
+        {"type": "array", "field": "tags"},
+    ):
+        clients[1].create_index(index=index)
+    for client in clients:
+        for item in items:
+            client.put(value=item)
+    # Changes after the index was built are indexed too.
+    for client in clients:
+        client.delete(key={"id": "id03", "pk": "pk"})
+        client.update(
+            key={"id": "id04", "pk": "pk"}, set="r=put(20), n=put(-1)"
+        )
+
+    wheres = [
+        None,
+        "h = 2",
+        "h = '2'",
+        "h = 2.5",
+        "h = true",
+        "h in (1, 'a', 10, '10')",
+        "2 = h",
+        "r > 2",
+        "r >= 'a'",
+        "r < '2'",
+        "r <= 2.5",
+        "r between 2 and 10",
+        "r = 20",
+        "n = 3",
+        "n in (2, 5)",
+        "n >= 5",
+        "h = 1 and r > 1",
+        "h = 'a' or r = 10",
+        "array_contains(tags, 2)",
+        "array_contains(tags, 'b')",
+        "array_contains_any(tags, [1, 'a', 10])",
+        "starts_with(r, '1')",
+    ]
+    orders: list = [
+        dict(),
+        dict(order_by="n"),
+        dict(order_by="n DESC"),
+        dict(order_by="n", limit=5),
+        dict(order_by="n DESC", limit=5, offset=3),
+        dict(order_by="n, $id DESC", limit=7),
+        dict(order_by="n DESC, $id", limit=7, offset=6),
+        dict(order_by="n", limit=100),
+        dict(limit=3, offset=2),
+    ]
+    for where in wheres:
+        for args in orders:
+            results = [
+                [
+                    {k: v for k, v in item.value.items() if k != "_etag"}
+                    for item in client.query(where=where, **args).result.items
+                ]
+                for client in clients
+            ]
+            assert results[0] == results[1], (where, args)
+    # Ordered limits without a selective condition walk the index.
+    assert "r" not in ordered
+    ordered.clear()
+    clients[1].query(order_by="n, $id", limit=5)
+    clients[1].query(where="h != 'a'", order_by="n DESC", limit=5)
+    assert ordered == ["n", "n"]
+    ordered.clear()
+    clients[1].query(where="h = 'a'", order_by="n", limit=5)
+    assert ordered == []
+
+
+def open_sqlite_store() -> DocumentStore:
+    client = DocumentStore(collection="docs", __provider__="sqlite")
+    client.create_collection()
+    return client
+
+
+def test_sqlite_quoted_values():
+    client = open_sqlite_store()
+    values = [
+        "it's",
+        'say "hi"',
+        "'); DROP TABLE docs; --",
+        "back\\slash ? and @p",
+        "$.path",
+    ]
+    for i, value in enumerate(values):
+        client.put(value={"id": value, "pk": f"p'{i}", "s": value})
+    for i, value in enumerate(values):
+        key = {"id": value, "pk": f"p'{i}"}
+        assert client.get(key=key).result.value["s"] == value
+        response = client.query(where="s = @s", params={"s": value})
+        assert [item.value["id"] for item in response.result.items] == [value]
+        if "'" not in value and "\\" not in value:
+            response = client.query(where=f"s = '{value}'")
+            assert len(response.result.items) == 1
+    response = client.query(
+        where="s in (@a, @b)", params={"a": values[0], "b": values[2]}
+    )
+    assert sorted(item.value["s"] for item in response.result.items) == sorted(
+        [values[0], values[2]]
+    )
+    key = {"id": values[0], "pk": "p'0"}
+    client.update(key=key, set="s=put(@s)", params={"s": values[2]})
+    assert client.get(key=key).result.value["s"] == values[2]
+    assert client.count().result == len(values)
+    client.close()
+
+
+def test_sqlite_sql_cache():
+    client = open_sqlite_store()
+    provider = client.__provider__
+    for i in range(6):
+        client.put(value={"id": f"id{i}", "pk": "pk", "v": i, "s": f"s{i}"})
+    op_converter = provider._collection_cache["docs"].op_converter
+
+    # Statements of the same shape are built once and bound to
+    # different parameters.
+    sql_cache = None
+    for i in range(6):
+        response = client.query(
+            where="v >= @v and s != @s", params={"v": i, "s": "s5"}
+        )
+        assert [item.value["v"] for item in response.result.items] == list(
+            range(i, 5)
+        )
+        key = {"id": f"id{i}", "pk": "pk"}
+        assert client.get(key=key).result.value["s"] == f"s{i}"
+        client.update(key=key, set="v=increment(@n)", params={"n": 10})
+        client.delete(key=key, where="v = @v", params={"v": i + 10})
+        if sql_cache is None:
+            sql_cache = dict(op_converter._sql_cache)
+        assert op_converter._sql_cache == sql_cache
+        for shape, sql in sql_cache.items():
+            assert op_converter._sql_cache[shape] is sql
+    assert client.count().result == 0
+    client.close()
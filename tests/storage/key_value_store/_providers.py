@@ -55,7 +55,12 @@ provider_parameters: dict[str, dict[str, Any]] = {
 }
 
 
-def get_component(provider_type: str, type="binary", collection: str = "test"):
+def get_component(
+    provider_type: str,
+    type="binary",
+    collection: str = "test",
+    raw: bool = False,
+):
     base_provider_type = provider_type
     if provider_type.startswith("ds"):
         splits = provider_type.split("_")
@@ -73,6 +78,7 @@ def get_component(provider_type: str, type="binary", collection: str = "test"):
     component = KeyValueStore(
         type=type,
         collection=collection,
+        __raw__=raw,
         __provider__=dict(
             type=base_provider_type,
             parameters=parameters,
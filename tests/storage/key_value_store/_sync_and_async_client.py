@@ -4,8 +4,14 @@ from ._providers import get_component
 
 
 class KeyValueStoreSyncAndAsyncClient(SyncAndAsyncClient):
-    def __init__(self, provider_type: str, async_call: bool, type: str):
-        self.client = get_component(provider_type, type)
+    def __init__(
+        self,
+        provider_type: str,
+        async_call: bool,
+        type: str,
+        raw: bool = False,
+    ):
+        self.client = get_component(provider_type, type, raw=raw)
         self.async_call = async_call
         self.provider_type = provider_type
 
@@ -24,6 +30,15 @@ class KeyValueStoreSyncAndAsyncClient(SyncAndAsyncClient):
     async def delete(self, **kwargs):
         return await self._execute_method(**kwargs)
 
+    async def mget(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
+    async def mput(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
+    async def mdelete(self, **kwargs):
+        return await self._execute_method(**kwargs)
+
     async def query(self, **kwargs):
         return await self._execute_method(**kwargs)
 
@@ -1,13 +1,21 @@
 # type: ignore
 import asyncio
 import os
+import sqlite3
 import time
+from functools import partial
+from threading import Thread
 
 import pytest
 
+from x8._common.sqlite_client import SQLiteClient
+from x8.core import Record
+from x8.core.exceptions import NotSupportedError
+from x8.messaging.pubsub import PubSub
 from x8.storage.key_value_store import (
     KeyValueBatch,
     KeyValueItem,
+    KeyValueStore,
     NotFoundError,
     PreconditionFailedError,
 )
@@ -451,6 +459,63 @@ async def test_query(provider_type: str, async_call: bool):
     await client.close()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        KeyValueStoreProvider.REDIS,
+        KeyValueStoreProvider.MEMORY,
+        KeyValueStoreProvider.SQLITE,
+        KeyValueStoreProvider.POSTGRESQL,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_raw(provider_type: str, async_call: bool):
+    client = KeyValueStoreSyncAndAsyncClient(
+        provider_type=provider_type,
+        async_call=async_call,
+        type="binary",
+        raw=True,
+    )
+    for kv in query_kvs:
+        try:
+            await client.delete(key=get_key(kv), collection=kv["collection"])
+        except NotFoundError:
+            pass
+
+    for kv in query_kvs:
+        response = await client.put(
+            key=get_key(kv),
+            value=get_value(kv),
+            collection=kv["collection"],
+        )
+        result = response.result
+        assert isinstance(result, Record)
+        assert_put_result(result, kv, provider_type)
+
+    kv = query_kvs[0]
+    response = await client.get(key=get_key(kv), collection=kv["collection"])
+    result = response.result
+    assert isinstance(result, Record)
+    assert_get_result(result, kv, "binary", provider_type)
+    item = result.to_model()
+    assert isinstance(item, KeyValueItem)
+    assert result == item
+
+    response = await client.query(collection=kv["collection"])
+    result = response.result
+    assert isinstance(result, Record)
+    assert all(isinstance(item, Record) for item in result.items)
+    assert len(result.items) == len(
+        [q for q in query_kvs if q["collection"] == kv["collection"]]
+    )
+
+    await client.close()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "provider_type",
@@ -522,6 +587,97 @@ async def test_batch(provider_type: str, async_call: bool, type: str):
     await client.close()
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    providers,
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+@pytest.mark.parametrize(
+    "type",
+    ["binary", "string"],
+)
+async def test_mget_mput_mdelete(
+    provider_type: str, async_call: bool, type: str
+):
+    client = KeyValueStoreSyncAndAsyncClient(
+        provider_type=provider_type,
+        async_call=async_call,
+        type=type,
+    )
+    collection = "col1"
+    keys = [get_key(kv) for kv in batch_kvs]
+    await client.mdelete(keys=keys, collection=collection)
+
+    response = await client.mput(
+        values={get_key(kv): get_value(kv) for kv in batch_kvs},
+        collection=collection,
+    )
+    result = response.result
+    assert len(result) == len(batch_kvs)
+    for item_result, kv in zip(result, batch_kvs):
+        assert_put_result(item_result, kv, provider_type)
+
+    response = await client.mget(keys=keys + ["id99"], collection=collection)
+    result = response.result
+    assert len(result) == len(batch_kvs) + 1
+    for item_result, kv in zip(result, batch_kvs):
+        assert_get_result(item_result, kv, type, provider_type, batch=True)
+    assert result[-1] is None
+
+    response = await client.mdelete(
+        keys=keys[:2] + ["id99"], collection=collection
+    )
+    assert response.result == [True, True, False]
+    response = await client.mget(keys=keys, collection=collection)
+    assert [item is None for item in response.result] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+
+    await client.mdelete(keys=keys, collection=collection)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_mget_mput_mdelete_fallback(monkeypatch):
+    client = KeyValueStore(__provider__="memory", __unpack__=True)
+    provider = client.__provider__
+    run = provider.__run__
+
+    # The provider has no batch operations.
+    def not_supported(operation, *args, run=run, **kwargs):
+        if operation.name in ("mget", "mput", "mdelete"):
+            raise NotSupportedError
+        return run(operation, *args, **kwargs)
+
+    monkeypatch.setattr(provider, "__run__", not_supported)
+    monkeypatch.setattr(
+        provider, "__arun__", partial(asyncio.to_thread, not_supported)
+    )
+
+    result = client.mput(values={"k0": b"v0", "k1": b"v1"})
+    assert [item.key.id for item in result] == ["k0", "k1"]
+    result = client.mget(keys=["k0", "k1", "k2"])
+    assert [item and item.value for item in result] == [b"v0", b"v1", None]
+    assert client.mdelete(keys=["k0", "k2"]) == [True, False]
+
+    result = await client.amput(values={"k2": b"v2"})
+    assert [item.key.id for item in result] == ["k2"]
+    result = await client.amget(keys=["k0", "k1", "k2"])
+    assert [item and item.value for item in result] == [None, b"v1", b"v2"]
+    assert await client.amdelete(keys=["k1", "k2", "k3"]) == [
+        True,
+        True,
+        False,
+    ]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "provider_type",
@@ -566,6 +722,425 @@ async def test_expire(provider_type: str, async_call: bool):
     await client.close()
 
 
+@pytest.mark.parametrize(
+    "eviction, evicted",
+    [
+        ("lru", ["k0", "k1"]),
+        ("lfu", ["k1", "k3"]),
+    ],
+)
+def test_memory_eviction(eviction: str, evicted: list):
+    client = KeyValueStore(
+        __provider__=dict(
+            type="memory",
+            parameters=dict(max_items=3, eviction=eviction),
+        )
+    )
+    for key in ["k0", "k1", "k2"]:
+        client.put(key=key, value=b"value")
+    client.get(key="k0")
+    client.get(key="k0")
+    client.get(key="k2")
+    client.put(key="k3", value=b"value")
+    client.put(key="k2", value=b"value2")
+    client.put(key="k4", value=b"value")
+    keys = ["k0", "k1", "k2", "k3", "k4"]
+    assert [
+        key for key in keys if not client.exists(key=key).result
+    ] == evicted
+    info = client.__provider__.cache_info()
+    assert info.items == 3
+    assert info.evictions == 2
+    assert info.hits == 3 + 3
+    assert info.misses == 2
+
+
+@pytest.mark.parametrize("eviction", ["lru", "tinylfu"])
+def test_memory_eviction_tinylfu(eviction: str):
+    client = KeyValueStore(
+        __provider__=dict(
+            type="memory",
+            parameters=dict(max_items=100, eviction=eviction),
+        )
+    )
+    hot_keys = [f"hot{i}" for i in range(90)]
+    for key in hot_keys:
+        client.put(key=key, value=b"value")
+    for _ in range(3):
+        for key in hot_keys:
+            client.get(key=key)
+    # A scan of keys used once flushes the frequently used keys from
+    # an LRU cache, but not from a TinyLFU cache. The frequency sketch
+    # hashes keys with the per process string hash seed, so a few hot
+    # keys can collide with cold keys and be evicted.
+    for i in range(1000):
+        client.put(key=f"cold{i}", value=b"value")
+    hot = sum(client.exists(key=key).result for key in hot_keys)
+    if eviction == "lru":
+        assert hot == 0
+    else:
+        assert hot >= 70
+    assert client.__provider__.cache_info().items == 100
+
+
+def test_memory_max_bytes():
+    client = KeyValueStore(
+        __provider__=dict(type="memory", parameters=dict(max_bytes=100))
+    )
+    for i in range(10):
+        client.put(key=f"k{i}", value=b"0123456789" * 2)
+    info = client.__provider__.cache_info()
+    assert info.bytes <= 100
+    assert info.items == 4
+    exists = [client.exists(key=f"k{i}").result for i in range(10)]
+    assert exists == [False] * 6 + [True] * 4
+
+
+def test_memory_active_expiry():
+    client = KeyValueStore(__provider__="memory")
+    for i in range(10):
+        client.put(key=f"k{i}", value=b"value", expiry=100)
+    client.put(key="k", value=b"value")
+    time.sleep(0.2)
+    # Expired items are removed by writes, without being read.
+    client.put(key="k", value=b"value")
+    info = client.__provider__.cache_info()
+    assert info.expirations == 10
+    assert info.items == 1
+
+
+def test_sqlite_sweep():
+    client = KeyValueStore(
+        collection="col1",
+        __provider__=dict(
+            type="sqlite",
+            parameters=dict(sweep_interval=None, sweep_batch_size=3),
+        ),
+    )
+    for i in range(10):
+        client.put(key=f"k{i}", value=b"value", expiry=100)
+    client.put(key="k", value=b"value")
+    time.sleep(0.2)
+    # Expired items are not returned before they are deleted.
+    assert [item.key.id for item in client.query().result.items] == ["k"]
+    assert client.count().result == 1
+    assert client.__provider__.sweep() == 10
+    assert client.__provider__.sweep() == 0
+    assert client.get(key="k").result.value == b"value"
+    client.close()
+
+
+def test_sqlite_background_sweep(tmp_path):
+    client = KeyValueStore(
+        collection="col1",
+        __provider__=dict(
+            type="sqlite",
+            parameters=dict(
+                database=str(tmp_path / "kv.db"),
+                sweep_interval=0.1,
+                incremental_vacuum=True,
+            ),
+        ),
+    )
+    for i in range(100):
+        client.put(key=f"k{i}", value=b"x" * 10000, expiry=100)
+    provider = client.__provider__
+    connection = provider._client.connection
+    pages = connection.execute("PRAGMA page_count").fetchone()[0]
+    time.sleep(0.5)
+    assert provider.sweep() == 0
+    assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert connection.execute("PRAGMA page_count").fetchone()[0] < pages
+    client.close()
+
+
+def test_sqlite_group_commit(tmp_path):
+    database = str(tmp_path / "kv.db")
+    client = SQLiteClient(database, group_commit=True)
+    with client.cursor() as cursor:
+        cursor.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    commit = client._commit
+    commits = []
+
+    def count_commit():
+        commits.append(1)
+        commit()
+
+    client._commit = count_commit
+    errors = []
+
+    # Every write is visible to other connections once it returns.
+    def write(start: int):
+        reader = sqlite3.connect(database)
+        try:
+            for id in range(start, start + 50):
+                with client.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO t (id, v) VALUES (?, ?)", (id, "v")
+                    )
+                row = reader.execute(
+                    "SELECT COUNT(*) FROM t WHERE id = ?", (id,)
+                ).fetchone()
+                if row[0] != 1:
+                    errors.append(id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            reader.close()
+
+    threads = [Thread(target=write, args=(i * 50,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert 0 < len(commits) <= 400
+    assert not client.connection.in_transaction
+
+    # Reads do not commit.
+    count = len(commits)
+    with client.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM t")
+        assert cursor.fetchone()[0] == 400
+    assert len(commits) == count
+    client.close()
+
+
+def test_sqlite_transaction_rollback(tmp_path):
+    database = str(tmp_path / "kv.db")
+    client = SQLiteClient(database, group_commit=True)
+    with client.transaction() as cursor:
+        cursor.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+        cursor.execute("INSERT INTO t (id, v) VALUES (1, 'a')")
+
+    def read() -> list:
+        reader = sqlite3.connect(database)
+        try:
+            return reader.execute("SELECT id, v FROM t ORDER BY id").fetchall()
+        finally:
+            reader.close()
+
+    with pytest.raises(RuntimeError):
+        with client.transaction() as cursor:
+            cursor.execute("INSERT INTO t (id, v) VALUES (2, 'b')")
+            cursor.execute("UPDATE t SET v = 'x' WHERE id = 1")
+            raise RuntimeError
+    assert not client.connection.in_transaction
+    assert read() == [(1, "a")]
+
+    # A failed statement rolls back the statements before it.
+    with pytest.raises(sqlite3.IntegrityError):
+        with client.transaction() as cursor:
+            cursor.execute("UPDATE t SET v = 'x' WHERE id = 1")
+            cursor.execute("INSERT INTO t (id, v) VALUES (1, 'c')")
+    assert read() == [(1, "a")]
+
+    # Pending changes of other calls are kept.
+    client.connection.execute("INSERT INTO t (id, v) VALUES (3, 'c')")
+    with pytest.raises(RuntimeError):
+        with client.transaction() as cursor:
+            cursor.execute("DELETE FROM t")
+            raise RuntimeError
+    assert read() == [(1, "a"), (3, "c")]
+    with client.transaction() as cursor:
+        cursor.execute("INSERT INTO t (id, v) VALUES (2, 'b')")
+    assert read() == [(1, "a"), (2, "b"), (3, "c")]
+    client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_near_cache(async_call: bool):
+    store = KeyValueStore(__provider__="memory")
+    client = KeyValueStoreSyncAndAsyncClient(
+        provider_type=KeyValueStoreProvider.MEMORY,
+        async_call=async_call,
+        type="binary",
+    )
+    client.client = KeyValueStore(
+        __provider__=dict(
+            type="near_cache",
+            parameters=dict(store=store, ttl=0.2),
+        )
+    )
+    provider = client.client.__provider__
+
+    # Written through, read from the near cache.
+    response = await client.put(key="k0", value=b"value0")
+    etag = response.result.properties.etag
+    response = await client.get(key="k0")
+    assert response.result.value == b"value0"
+    assert response.result.properties.etag == etag
+    response = await client.get(key="k0", start=1, end=2)
+    assert response.result.value == b"al"
+    assert (await client.exists(key="k0")).result is True
+
+    # Missing keys are cached as not found.
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            await client.get(key="k1")
+    assert (await client.exists(key="k1")).result is False
+
+    # Stale items are revalidated by ETag.
+    time.sleep(0.3)
+    response = await client.get(key="k0")
+    assert response.result.value == b"value0"
+    store.put(key="k0", value=b"value1")
+    time.sleep(0.3)
+    response = await client.get(key="k0")
+    assert response.result.value == b"value1"
+
+    await client.put(key="k2", value=1)
+    await client.update(key="k2", set="$value=increment(1)")
+    response = await client.get(key="k2")
+    assert response.result.value == b"2"
+    await client.delete(key="k0")
+    with pytest.raises(NotFoundError):
+        await client.get(key="k0")
+
+    info = provider.cache_info()
+    assert info.near.hits == 5
+    assert info.store_hits == 3
+    assert info.store_misses == 2
+    assert info.revalidations == 1
+    await client.close()
+
+
+def test_near_cache_write_around():
+    store = KeyValueStore(__provider__="memory")
+    client = KeyValueStore(
+        __provider__=dict(
+            type="near_cache",
+            parameters=dict(store=store, write_policy="write_around"),
+        )
+    )
+    client.put(key="k0", value=b"value0")
+    assert client.__provider__.cache_info().near.items == 0
+    assert client.get(key="k0").result.value == b"value0"
+    assert client.get(key="k0").result.value == b"value0"
+    info = client.__provider__.cache_info()
+    assert info.near.hits == 1
+    assert info.store_hits == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_near_cache_mget(async_call: bool):
+    store = KeyValueStore(__provider__="memory")
+    client = KeyValueStoreSyncAndAsyncClient(
+        provider_type=KeyValueStoreProvider.MEMORY,
+        async_call=async_call,
+        type="binary",
+    )
+    client.client = KeyValueStore(
+        __provider__=dict(type="near_cache", parameters=dict(store=store))
+    )
+    provider = client.client.__provider__
+
+    await client.mput(values={"k0": b"value0", "k1": b"value1"})
+    store.put(key="k2", value=b"value2")
+    response = await client.mget(keys=["k0", "k1", "k2", "k3"])
+    assert [item and item.value for item in response.result] == [
+        b"value0",
+        b"value1",
+        b"value2",
+        None,
+    ]
+    response = await client.mget(keys=["k2", "k3"])
+    assert [item and item.value for item in response.result] == [
+        b"value2",
+        None,
+    ]
+    info = provider.cache_info()
+    assert info.near.hits == 4
+    assert info.store_hits == 1
+    assert info.store_misses == 1
+
+    response = await client.mdelete(keys=["k0", "k2"])
+    assert response.result == [True, True]
+    response = await client.mget(keys=["k0", "k1", "k2"])
+    assert [item and item.value for item in response.result] == [
+        None,
+        b"value1",
+        None,
+    ]
+    await client.close()
+
+
+def test_near_cache_concurrent_write():
+    store = KeyValueStore(__provider__="memory")
+    client = KeyValueStore(
+        __provider__=dict(type="near_cache", parameters=dict(store=store))
+    )
+    run = store.__run__
+    writes: list = []
+
+    # A write between the store read and the fill keeps the stale
+    # read out of the cache.
+    def run_and_write(*args, **kwargs):
+        response = run(*args, **kwargs)
+        if writes:
+            writes.pop()()
+        return response
+
+    store.__run__ = run_and_write
+    store.put(key="k0", value=b"value0")
+    writes.append(lambda: client.put(key="k0", value=b"value1"))
+    assert client.get(key="k0").result.value == b"value0"
+    assert client.get(key="k0").result.value == b"value1"
+    store.put(key="k1", value=b"value0")
+    writes.append(lambda: client.delete(key="k1"))
+    assert client.get(key="k1").result.value == b"value0"
+    with pytest.raises(NotFoundError):
+        client.get(key="k1")
+    client.close()
+
+
+def test_near_cache_invalidation(tmp_path):
+    database = str(tmp_path / "pubsub.db")
+    store = KeyValueStore(__provider__="memory")
+    clients = []
+    for subscription in ["sub1", "sub2"]:
+        pubsub = PubSub(
+            topic="invalidation",
+            subscription=subscription,
+            __provider__=dict(
+                type="sqlite",
+                parameters=dict(database=database, poll_interval=0.05),
+            ),
+        )
+        if not pubsub.has_topic().result:
+            pubsub.create_topic()
+        pubsub.create_subscription()
+        clients.append(
+            KeyValueStore(
+                __provider__=dict(
+                    type="near_cache",
+                    parameters=dict(store=store, pubsub=pubsub),
+                )
+            )
+        )
+
+    clients[0].put(key="k0", value=b"value0")
+    assert clients[1].get(key="k0").result.value == b"value0"
+    clients[0].put(key="k0", value=b"value1")
+    provider = clients[1].__provider__
+    for _ in range(100):
+        if provider.cache_info().invalidations:
+            break
+        time.sleep(0.05)
+    assert provider.cache_info().invalidations == 1
+    assert clients[1].get(key="k0").result.value == b"value1"
+    for client in clients:
+        client.close()
+
+
 def get_value(item):
     return item["value"]
 
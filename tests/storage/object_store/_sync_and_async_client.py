@@ -121,6 +121,36 @@ class ObjectStoreSyncAndAsyncClient:
             **kwargs,
         )
 
+    async def iter_get(
+        self,
+        key,
+        where=None,
+        start=None,
+        end=None,
+        config=None,
+        collection=None,
+        **kwargs,
+    ) -> Response:
+        if self.async_call:
+            return await self.client.aiter_get(
+                key=key,
+                where=where,
+                start=start,
+                end=end,
+                config=config,
+                collection=collection,
+                **kwargs,
+            )
+        return self.client.iter_get(
+            key=key,
+            where=where,
+            start=start,
+            end=end,
+            config=config,
+            collection=collection,
+            **kwargs,
+        )
+
     async def get_metadata(
         self,
         key,
@@ -290,6 +320,66 @@ class ObjectStoreSyncAndAsyncClient:
             return await self.client.abatch(batch=batch, **kwargs)
         return self.client.batch(batch=batch, **kwargs)
 
+    async def upload_dir(
+        self,
+        path,
+        prefix=None,
+        delete=False,
+        config=None,
+        progress=None,
+        collection=None,
+        **kwargs,
+    ) -> Response:
+        if self.async_call:
+            return await self.client.aupload_dir(
+                path=path,
+                prefix=prefix,
+                delete=delete,
+                config=config,
+                progress=progress,
+                collection=collection,
+                **kwargs,
+            )
+        return self.client.upload_dir(
+            path=path,
+            prefix=prefix,
+            delete=delete,
+            config=config,
+            progress=progress,
+            collection=collection,
+            **kwargs,
+        )
+
+    async def download_dir(
+        self,
+        path,
+        prefix=None,
+        delete=False,
+        config=None,
+        progress=None,
+        collection=None,
+        **kwargs,
+    ) -> Response:
+        if self.async_call:
+            return await self.client.adownload_dir(
+                path=path,
+                prefix=prefix,
+                delete=delete,
+                config=config,
+                progress=progress,
+                collection=collection,
+                **kwargs,
+            )
+        return self.client.download_dir(
+            path=path,
+            prefix=prefix,
+            delete=delete,
+            config=config,
+            progress=progress,
+            collection=collection,
+            **kwargs,
+        )
+
     async def close(self) -> Response[None]:
         if self.async_call:
             return await self.client.aclose()
@@ -1,4 +1,5 @@
 # type: ignore
+import asyncio
 import copy
 import filecmp
 import os
@@ -6,12 +7,14 @@ import tempfile
 import time
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from io import BytesIO
 from typing import Any
 
 import httpx
 import pytest
 
+from x8.core.exceptions import NotSupportedError
 from x8.storage.object_store import (
     CollectionStatus,
     ConflictError,
@@ -19,6 +22,7 @@ from x8.storage.object_store import (
     NotModified,
     ObjectBatch,
     ObjectItem,
+    ObjectStore,
     PreconditionFailedError,
 )
 
@@ -339,6 +343,306 @@ async def test_range(provider_type: str, async_call: bool):
     return
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        ObjectStoreProvider.AMAZON_S3,
+        ObjectStoreProvider.AZURE_BLOB_STORAGE,
+        ObjectStoreProvider.GOOGLE_CLOUD_STORAGE,
+        ObjectStoreProvider.FILE_SYSTEM,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_iter_get(provider_type: str, async_call: bool):
+    client = ObjectStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+
+    async def collect(result):
+        if async_call:
+            return [chunk async for chunk in result]
+        return list(result)
+
+    await create_collection_if_needed(provider_type, client)
+    object = objects[0]
+    key = get_key(object)
+    value = object["value"]
+    await cleanup_object(provider_type, key, client)
+
+    await client.put(key=key, value=value)
+    response = await client.iter_get(key=key, config={"chunksize": 4})
+    chunks = await collect(response.result)
+    assert b"".join(chunks) == value
+    assert max(len(chunk) for chunk in chunks) <= 4
+    response = await client.iter_get(
+        key=key, start=3, end=7, config={"chunksize": 4}
+    )
+    chunks = await collect(response.result)
+    assert b"".join(chunks) == value[3:8]
+    with pytest.raises(NotFoundError):
+        response = await client.iter_get(key={"id": "missing.txt"})
+        await collect(response.result)
+
+    await client.delete(key=key)
+    await client.close()
+    return
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_file_system_get_zero_copy(async_call: bool):
+    provider_type = ObjectStoreProvider.FILE_SYSTEM
+    client = ObjectStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+    await create_collection_if_needed(provider_type, client)
+    object = objects[0]
+    key = get_key(object)
+    value = object["value"]
+    await cleanup_object(provider_type, key, client)
+
+    await client.put(key=key, value=value)
+    response = await client.get(key=key, config={"zero_copy": True})
+    result = response.result
+    assert isinstance(result.value, memoryview)
+    assert result.value.readonly
+    assert result.value == value
+    response = await client.get(
+        key=key, start=3, end=7, config={"zero_copy": True}
+    )
+    assert response.result.value == value[3:8]
+
+    # Views keep the content they were mapped with after a put.
+    await client.put(key=key, value=b"new")
+    assert result.value == value
+    await client.put(key=key, value=value)
+
+    with tempfile.TemporaryDirectory() as folder:
+        file = os.path.join(folder, "out", "range.txt")
+        await client.get(key=key, file=file, start=3, config={"chunksize": 4})
+        with open(file, "rb") as f:
+            assert f.read() == value[3:]
+        stream = BytesIO()
+        await client.get(key=key, stream=stream, config={"chunksize": 4})
+        assert stream.read() == value
+
+        # Whole object downloads are linked to the object file, and
+        # keep their content after a put.
+        file = os.path.join(folder, "out", "linked.txt")
+        await client.get(key=key, file=file, config={"zero_copy": True})
+        assert os.stat(file).st_nlink == 2
+        await client.put(key=key, value=b"new")
+        with open(file, "rb") as f:
+            assert f.read() == value
+
+    await client.delete(key=key)
+    await client.close()
+    return
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "provider_type",
+    [
+        ObjectStoreProvider.AMAZON_S3,
+        ObjectStoreProvider.AZURE_BLOB_STORAGE,
+        ObjectStoreProvider.GOOGLE_CLOUD_STORAGE,
+        ObjectStoreProvider.FILE_SYSTEM,
+    ],
+)
+@pytest.mark.parametrize(
+    "async_call",
+    [False, True],
+)
+async def test_upload_download_dir(provider_type: str, async_call: bool):
+    client = ObjectStoreSyncAndAsyncClient(
+        provider_type=provider_type, async_call=async_call
+    )
+    await create_collection_if_needed(provider_type, client)
+    prefix = f"sync-{uuid.uuid4().hex}/"
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "source")
+        target = os.path.join(folder, "target")
+        files = {
+            "a.txt": b"a" * 10,
+            "b/c.txt": b"c" * 100,
+            "b/d/e.txt": bytes(range(256)) * 4,
+        }
+        for name, value in files.items():
+            file = os.path.join(source, name)
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(file, "wb") as f:
+                f.write(value)
+
+        events = []
+        response = await client.upload_dir(
+            path=source, prefix=prefix, progress=events.append
+        )
+        result = response.result
+        assert sorted(result.transferred) == [
+            f"{prefix}{name}" for name in sorted(files)
+        ]
+        assert result.transferred_bytes == sum(map(len, files.values()))
+        assert len(events) == len(files)
+        assert events[-1].completed == events[-1].total == len(files)
+
+        response = await client.upload_dir(path=source, prefix=prefix)
+        assert response.result.transferred == []
+        assert len(response.result.skipped) == len(files)
+
+        with open(os.path.join(source, "a.txt"), "wb") as f:
+            f.write(b"changed")
+        response = await client.upload_dir(path=source, prefix=prefix)
+        assert response.result.transferred == [f"{prefix}a.txt"]
+
+        response = await client.download_dir(
+            path=target,
+            prefix=prefix,
+            config={"multipart": True, "chunksize": 64},
+        )
+        assert len(response.result.transferred) == len(files)
+        assert not filecmp.dircmp(source, target).diff_files
+        for name in files:
+            assert filecmp.cmp(
+                os.path.join(source, name),
+                os.path.join(target, name),
+                shallow=False,
+            )
+        response = await client.download_dir(path=target, prefix=prefix)
+        assert response.result.transferred == []
+
+        os.remove(os.path.join(source, "b", "c.txt"))
+        response = await client.upload_dir(
+            path=source, prefix=prefix, delete=True
+        )
+        assert response.result.deleted == [f"{prefix}b/c.txt"]
+        response = await client.download_dir(
+            path=target, prefix=prefix, delete=True
+        )
+        assert response.result.deleted == [f"{prefix}b/c.txt"]
+        assert not os.path.exists(os.path.join(target, "b", "c.txt"))
+
+    for name in files:
+        if name != "b/c.txt":
+            await cleanup_object(provider_type, f"{prefix}{name}", client)
+    await client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("versioned", [False, True])
+async def test_iter_get_fallback(versioned: bool, monkeypatch):
+    with tempfile.TemporaryDirectory() as store_path:
+        client = ObjectStore(
+            collection="test",
+            __provider__=dict(
+                type=ObjectStoreProvider.FILE_SYSTEM,
+                parameters=dict(store_path=store_path),
+            ),
+        )
+        client.create_collection(config={"versioned": versioned})
+        provider = client.__provider__
+        run = provider.__run__
+        ranges = []
+
+        # The provider reads objects only with get.
+        def not_supported(operation, *args, run=run, **kwargs):
+            if operation.name == "iter_get":
+                raise NotSupportedError
+            if operation.name == "get":
+                ranges.append(
+                    (operation.args.get("start"), operation.args.get("end"))
+                )
+            return run(operation, *args, **kwargs)
+
+        monkeypatch.setattr(provider, "__run__", not_supported)
+        monkeypatch.setattr(
+            provider, "__arun__", partial(asyncio.to_thread, not_supported)
+        )
+
+        value = bytes(range(10))
+        client.put(key="a", value=value)
+        chunks = list(client.iter_get(key="a", config={"chunksize": 4}).result)
+        assert chunks == [value[0:4], value[4:8], value[8:10]]
+        assert ranges == [(0, 3), (4, 7), (8, 9)]
+        ranges.clear()
+        result = (await client.aiter_get(key="a", start=3, end=20)).result
+        assert [chunk async for chunk in result] == [value[3:]]
+        assert ranges == [(3, 9)]
+        with pytest.raises(NotFoundError):
+            client.iter_get(key="missing")
+
+        # Pages are read from the object found by the first lookup.
+        result = client.iter_get(key="a", config={"chunksize": 4}).result
+        assert next(result) == value[0:4]
+        client.put(key="a", value=b"new value")
+        if versioned:
+            assert b"".join(result) == value[4:]
+        else:
+            with pytest.raises(PreconditionFailedError):
+                next(result)
+        client.close()
+
+
+@pytest.mark.parametrize("versioned", [False, True])
+def test_file_system_metadata_cache(versioned: bool):
+    with tempfile.TemporaryDirectory() as store_path:
+        stores = [
+            ObjectStore(
+                collection="test",
+                __provider__=dict(
+                    type=ObjectStoreProvider.FILE_SYSTEM,
+                    parameters=dict(store_path=store_path),
+                ),
+            )
+            for _ in range(2)
+        ]
+        stores[0].create_collection(config={"versioned": versioned})
+        etag = stores[0].put(key="a", value=b"1").result.properties.etag
+        assert stores[0].get(key="a").result.properties.etag == etag
+        with pytest.raises(PreconditionFailedError):
+            stores[0].put(key="a", value=b"2", where="not_exists()")
+        etag = (
+            stores[0]
+            .put(key="a", value=b"2", where=f"$etag='{etag}'")
+            .result.properties.etag
+        )
+        item = stores[0].get(key="a").result
+        assert item.value == b"2"
+        assert item.properties.etag == etag
+
+        # Writes from another provider are checked against the stored
+        # metadata even though the first provider cached the old one.
+        new_etag = stores[1].put(key="a", value=b"3").result.properties.etag
+        with pytest.raises(PreconditionFailedError):
+            stores[0].put(key="a", value=b"4", where=f"$etag='{etag}'")
+        stores[0].put(key="a", value=b"4", where=f"$etag='{new_etag}'")
+        assert stores[1].get(key="a").result.value == b"4"
+
+        # Reads see the metadata written by another provider.
+        stores[0].get(key="a")
+        stores[1].put(key="a", value=b"brand-new", metadata={"k": "v"})
+        item = stores[0].get(key="a").result
+        assert item.value == b"brand-new"
+        assert item.metadata == {"k": "v"}
+        assert item.properties.content_length == 9
+        stores[1].update(key="a", metadata={"k": "w"})
+        assert stores[0].get(key="a").result.metadata == {"k": "w"}
+
+        stores[0].delete(key="a")
+        with pytest.raises(NotFoundError):
+            stores[0].get(key="a")
+        stores[0].put(key="a", value=b"5", where="not_exists()")
+        for store in stores:
+            store.close()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "provider_type",
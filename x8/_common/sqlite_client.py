@@ -0,0 +1,201 @@
+"""
+SQLite connection shared by the SQLite backed providers.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Any, Iterator
+
+DEFAULT_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "cache_size": -16384,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "memory",
+}
+
+
+class SQLiteClient:
+    """SQLite connection used from many threads.
+
+    The connection runs in WAL mode with synchronous=NORMAL, so readers
+    do not block the writer and commits do not fsync. Statements run
+    under one lock, so the statements of one call are never interleaved
+    with the statements of another.
+
+    With group_commit, a call that changed the database waits until
+    its changes are committed, and one waiting call commits for every
+    call that ran before it. Concurrent writes are coalesced into one
+    transaction instead of one transaction each.
+
+    Attributes:
+        database: SQLite database.
+        busy_timeout: Seconds to wait for a lock held by another
+            connection before failing with "database is locked".
+        group_commit: Coalesce the commits of concurrent calls.
+        pragmas: Pragmas set on the connection.
+        connection: Native SQLite connection.
+    """
+
+    database: str
+    busy_timeout: float
+    group_commit: bool
+    pragmas: dict[str, Any]
+    connection: sqlite3.Connection
+
+    _lock: Lock
+    _cond: Condition
+    _written: int
+    _committed: int
+    _committing: bool
+    _closed: bool
+
+    def __init__(
+        self,
+        database: str,
+        busy_timeout: float = 5.0,
+        group_commit: bool = False,
+        pragmas: dict[str, Any] | None = None,
+        nparams: dict[str, Any] | None = None,
+    ):
+        self.database = database
+        self.busy_timeout = busy_timeout
+        self.group_commit = group_commit
+        self.pragmas = {**DEFAULT_PRAGMAS, **(pragmas or {})}
+        if database == ":memory:":
+            # In memory databases have their own journal.
+            self.pragmas.pop("journal_mode", None)
+            self.pragmas.pop("mmap_size", None)
+        self.connection = sqlite3.connect(
+            database,
+            **{
+                "timeout": busy_timeout,
+                "check_same_thread": False,
+                **(nparams or {}),
+            },
+        )
+        self.connection.execute(
+            f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}"
+        )
+        for name, value in self.pragmas.items():
+            self.connection.execute(f"PRAGMA {name} = {value}")
+
+        self._lock = Lock()
+        self._cond = Condition()
+        self._written = 0
+        self._committed = 0
+        self._committing = False
+        self._closed = False
+
+    @contextmanager
+    def cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Run statements and commit the changes they made.
+
+        The changes are committed even if a later statement fails,
+        as each statement is atomic on its own.
+        """
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+                position = self._written
+                if self.connection.in_transaction:
+                    self._written += 1
+                    position = self._written
+                    if not self.group_commit:
+                        self._commit()
+        if position > self._committed:
+            self._wait_commit(position)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run statements in a transaction of their own.
+
+        The transaction is committed if the block completes and rolled
+        back if it raises.
+        """
+        with self._lock:
+            if self.connection.in_transaction:
+                # Commit the pending changes of other calls first,
+                # so that a rollback only discards this transaction.
+                self._commit()
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                yield cursor
+            except BaseException:
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+                raise
+            else:
+                self._commit()
+            finally:
+                cursor.close()
+
+    def iterate(
+        self, query: str, params: tuple, batch_size: int
+    ) -> Iterator[list[Any]]:
+        """Run a query and fetch its rows in batches.
+
+        The lock is only held while a batch is fetched, so other calls,
+        including writes made while iterating, run between batches.
+        Rows changed by them may or may not be returned.
+        """
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query, params)
+            except BaseException:
+                cursor.close()
+                raise
+
+        def fetch() -> Iterator[list[Any]]:
+            try:
+                while True:
+                    with self._lock:
+                        rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                with self._lock:
+                    cursor.close()
+
+        return fetch()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            if self.connection.in_transaction:
+                self._commit()
+            self.connection.close()
+            self._closed = True
+
+    def _commit(self) -> None:
+        # Must be called with the lock held.
+        self.connection.commit()
+        with self._cond:
+            self._committed = self._written
+            self._cond.notify_all()
+
+    def _wait_commit(self, position: int) -> None:
+        with self._cond:
+            while self._committed < position and self._committing:
+                self._cond.wait()
+            if self._committed >= position:
+                return
+            self._committing = True
+        try:
+            with self._lock:
+                if self._committed < position:
+                    self._commit()
+        finally:
+            with self._cond:
+                self._committing = False
+                self._cond.notify_all()
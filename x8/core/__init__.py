@@ -11,7 +11,7 @@ from ._operation_parser import OperationParser
 from ._provider import Provider
 from ._response import Response
 from ._type_converter import TypeConverter
-from .data_model import DataModel
+from .data_model import DataModel, Record
 
 __all__ = [
     "ArgParser",
@@ -26,6 +26,7 @@ __all__ = [
     "OperationParser",
     "Provider",
     "ProviderContext",
+    "Record",
     "RunContext",
     "Response",
     "TypeConverter",
@@ -3,6 +3,7 @@ from typing import Any
 from x8.ql._models import (
     And,
     Comparison,
+    Field,
     Function,
     Not,
     Or,
@@ -104,49 +105,62 @@ class ArgParser:
     def replace_expr_params(expr, params: dict[str, Any] | None) -> Any:
         if params is None or len(params) == 0:
             return expr
-        if isinstance(expr, list):
-            return [ArgParser.replace_expr_params(i, params) for i in expr]
+        return ArgParser._bind_params(expr, params)
+
+    @staticmethod
+    def _bind_params(expr, params: dict[str, Any]) -> Any:
+        # Parsed expressions are shared through the parse cache, so only
+        # the nodes above a parameter are rebuilt, from already valid
+        # parts. Subtrees without parameters are returned as they are.
+        if expr is None or isinstance(expr, (str, int, float, Field)):
+            return expr
+        bind = ArgParser._bind_params
         if isinstance(expr, Parameter):
             if expr.name in params:
                 return params[expr.name]
             else:
                 raise BadRequestError(f"Parameter {expr.name} not found")
+        if isinstance(expr, list):
+            items = [bind(i, params) for i in expr]
+            if all(a is b for a, b in zip(items, expr)):
+                return expr
+            return items
         if isinstance(expr, Comparison):
-            return Comparison(
-                lexpr=ArgParser.replace_expr_params(expr.lexpr, params),
-                op=expr.op,
-                rexpr=ArgParser.replace_expr_params(expr.rexpr, params),
+            lexpr = bind(expr.lexpr, params)
+            rexpr = bind(expr.rexpr, params)
+            if lexpr is expr.lexpr and rexpr is expr.rexpr:
+                return expr
+            return Comparison.model_construct(
+                lexpr=lexpr, op=expr.op, rexpr=rexpr
             )
-
         if isinstance(expr, Function):
-            args = None
-            named_args = None
+            args = expr.args
+            named_args = expr.named_args
             if expr.args is not None:
-                args = [
-                    ArgParser.replace_expr_params(arg, params)
-                    for arg in expr.args
-                ]
+                args = bind(expr.args, params)
             if expr.named_args is not None:
-                named_args = dict()
-                for k, v in expr.named_args.items():
-                    named_args[k] = ArgParser.replace_expr_params(v, params)
-
-            return Function(
+                named_args = {
+                    k: bind(v, params) for k, v in expr.named_args.items()
+                }
+                if all(named_args[k] is v for k, v in expr.named_args.items()):
+                    named_args = expr.named_args
+            if args is expr.args and named_args is expr.named_args:
+                return expr
+            return Function.model_construct(
                 namespace=expr.namespace,
                 name=expr.name,
                 args=args,
                 named_args=named_args,
             )
-        if isinstance(expr, And):
-            return And(
-                lexpr=ArgParser.replace_expr_params(expr.lexpr, params),
-                rexpr=ArgParser.replace_expr_params(expr.rexpr, params),
-            )
-        if isinstance(expr, Or):
-            return Or(
-                lexpr=ArgParser.replace_expr_params(expr.lexpr, params),
-                rexpr=ArgParser.replace_expr_params(expr.rexpr, params),
-            )
+        if isinstance(expr, (And, Or)):
+            lexpr = bind(expr.lexpr, params)
+            rexpr = bind(expr.rexpr, params)
+            if lexpr is expr.lexpr and rexpr is expr.rexpr:
+                return expr
+            return type(expr).model_construct(lexpr=lexpr, rexpr=rexpr)
         if isinstance(expr, Not):
-            return Not(expr=ArgParser.replace_expr_params(expr.expr, params))
+            nexpr = bind(expr.expr, params)
+            if nexpr is expr.expr:
+                return expr
+            return Not.model_construct(expr=nexpr)
         return expr
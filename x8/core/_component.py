@@ -5,10 +5,10 @@ from typing import Any
 
 from ._async_helper import run_async, run_sync
 from ._context import Context
+from ._dispatcher import Dispatcher
 from ._operation import Operation
 from ._provider import Provider
 from ._response import Response
-from ._type_converter import TypeConverter
 from .exceptions import NotSupportedError
 
 
@@ -18,6 +18,7 @@ class Component:
     __type__: str
     __unpack__: bool
     __native__: bool
+    __raw__: bool
 
     def __init__(
         self,
@@ -25,6 +26,7 @@ class Component:
     ):
         self.__native__ = kwargs.pop("__native__", False)
         self.__unpack__ = kwargs.pop("__unpack__", False)
+        self.__raw__ = kwargs.pop("__raw__", False)
         self.__handle__ = kwargs.pop("__handle__", None)
         self.__type__ = kwargs.pop("__type__", self.__class__.__module__)
         if "__provider__" in kwargs:
@@ -78,19 +80,17 @@ class Component:
                 **kwargs,
             )
         elif operation and operation_name:
-            func_name = operation_name
-            func = getattr(self, func_name, None)
-            if func and callable(func):
-                args = TypeConverter.convert_args(func, operation_args or {})
-                response = func(**args)
+            handler = Dispatcher.resolve(type(self), operation_name)
+            if handler is not None:
+                args = handler.convert_args(operation_args or {})
+                response = getattr(self, handler.name)(**args)
             else:
-                afunc_name = f"a{operation_name}"
-                afunc = getattr(self, afunc_name, None)
-                if callable(afunc):
-                    args = TypeConverter.convert_args(
-                        afunc, operation_args or {}
-                    )
-                    response = run_sync(afunc, **args)
+                ahandler = Dispatcher.resolve(
+                    type(self), f"a{operation_name}"
+                )
+                if ahandler is not None:
+                    args = ahandler.convert_args(operation_args or {})
+                    response = run_sync(getattr(self, ahandler.name), **args)
                 else:
                     raise NotSupportedError(
                         operation if operation is not None else None
@@ -128,11 +128,10 @@ class Component:
                 **kwargs,
             )
         else:
-            afunc_name = f"a{operation_name}"
-            afunc = getattr(self, afunc_name, None)
-            if afunc and callable(afunc):
-                args = TypeConverter.convert_args(afunc, operation_args or {})
-                response = await afunc(**args)
+            ahandler = Dispatcher.resolve(type(self), f"a{operation_name}")
+            if ahandler is not None:
+                args = ahandler.convert_args(operation_args or {})
+                response = await getattr(self, ahandler.name)(**args)
             else:
                 response = await run_async(
                     func=self.__run__,
@@ -203,7 +202,7 @@ class Component:
             id = context.id
         else:
             id = str(uuid.uuid4())
-        ctx = Context(
+        ctx = Context.model_construct(
             id=id,
             data=context.data if context else None,
         )
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Callable
 
 from x8.ql._models import Field, Undefined, UpdateOp, Value
 
@@ -7,6 +7,78 @@ from .exceptions import BadRequestError
 
 
 class DataAccessor:
+    @staticmethod
+    def split_field(field: str) -> list[str]:
+        npath = (
+            field.replace("[", "/")
+            .replace("]", "")
+            .replace(".", "/")
+            .rstrip("/")
+        )
+        return npath.split("/")
+
+    @staticmethod
+    def compile_get_field(
+        field: str,
+    ) -> Callable[[dict | DataModel | None], Value | Undefined]:
+        """Compile a getter for the field path.
+
+        The path is split once and the returned callable behaves like
+        ``get_field`` for every item it is applied to.
+        """
+        splits = DataAccessor.split_field(field)
+        undefined = Undefined()
+        if len(splits) == 1 and not splits[0].isnumeric() and splits[0] != "-":
+            key = splits[0]
+
+            def get_key(item: dict | DataModel | None) -> Value | Undefined:
+                if isinstance(item, dict):
+                    return item[key] if key in item else undefined
+                if item is None:
+                    return undefined
+                if isinstance(item, DataModel):
+                    if hasattr(item, key):
+                        return getattr(item, key)
+                return undefined
+
+            return get_key
+
+        steps = [
+            (split, int(split) if split.isnumeric() else None)
+            for split in splits
+        ]
+
+        def get_path(item: dict | DataModel | None) -> Value | Undefined:
+            if item is None:
+                return undefined
+            current_item: Any = item
+            for split, index in steps:
+                if index is not None and isinstance(current_item, list):
+                    if index < len(current_item):
+                        current_item = current_item[index]
+                    else:
+                        return undefined
+                elif split == "-":
+                    if isinstance(current_item, list) and current_item:
+                        current_item = current_item[-1]
+                    else:
+                        return undefined
+                elif isinstance(current_item, dict):
+                    if split in current_item:
+                        current_item = current_item[split]
+                    else:
+                        return undefined
+                elif isinstance(current_item, DataModel):
+                    if hasattr(current_item, split):
+                        current_item = getattr(current_item, split)
+                    else:
+                        return undefined
+                else:
+                    return undefined
+            return current_item
+
+        return get_path
+
     @staticmethod
     def get_field(
         item: dict | DataModel | None, field: str
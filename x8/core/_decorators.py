@@ -20,21 +20,18 @@ def operation(**config: Any) -> Callable[[T], T]:
     def decorator(func: T) -> T:
         setattr(func, "__operation__", True)
         setattr(func, "__config__", config)
+        bind_args = _compile_binder(func)
         if not inspect.iscoroutinefunction(func):
+            name = func.__name__
 
             @wraps(func)
             def wrapper(*args, **kwargs) -> Any:
                 self = args[0]
                 context = kwargs.pop("__context__", None)
                 if hasattr(self, "__provider__"):
-                    sig = inspect.signature(func)
-                    bound_args = sig.bind(*args, **kwargs)
-                    bound_args.apply_defaults()
-                    locals = dict(bound_args.arguments)
-                    locals.pop("self", None)
                     operation = Operation.normalize(
-                        name=func.__name__,
-                        args=locals,
+                        name=name,
+                        args=bind_args(args, kwargs),
                     )
                     try:
                         response = self.__run__(operation, context, **kwargs)
@@ -46,20 +43,16 @@ def operation(**config: Any) -> Callable[[T], T]:
 
             return cast(T, wrapper)
         else:
+            name = func.__name__[1:]
 
             @wraps(func)
             async def wrapper(*args, **kwargs) -> Any:
                 self = args[0]
                 context = kwargs.pop("__context__", None)
                 if hasattr(self, "__provider__"):
-                    sig = inspect.signature(func)
-                    bound_args = sig.bind(*args, **kwargs)
-                    bound_args.apply_defaults()
-                    locals = dict(bound_args.arguments)
-                    locals.pop("self", None)
                     operation = Operation.normalize(
-                        name=func.__name__[1:],
-                        args=locals,
+                        name=name,
+                        args=bind_args(args, kwargs),
                     )
                     try:
                         response = await self.__arun__(
@@ -74,3 +67,77 @@ def operation(**config: Any) -> Callable[[T], T]:
             return cast(T, wrapper)
 
     return decorator
+
+
+def _compile_binder(
+    func: Callable[..., Any],
+) -> Callable[[tuple, dict], dict[str, Any]]:
+    """Compile a function that binds call arguments to parameter names.
+
+    The result matches ``inspect.Signature.bind`` followed by
+    ``apply_defaults`` (without ``self``), but the signature is only
+    inspected once at decoration time. Any call the fast path does not
+    recognize is handed to ``Signature.bind`` so errors stay the same.
+    """
+    sig = inspect.signature(func)
+    names: list[str] = []
+    positional: list[str] = []
+    defaults: dict[str, Any] = {}
+    required: set[str] = set()
+    var_keyword: str | None = None
+    simple = True
+    for param in sig.parameters.values():
+        if param.kind is inspect.Parameter.VAR_POSITIONAL:
+            simple = False
+        elif param.kind is inspect.Parameter.VAR_KEYWORD:
+            var_keyword = param.name
+        else:
+            if param.kind is not inspect.Parameter.KEYWORD_ONLY:
+                positional.append(param.name)
+            if param.kind is inspect.Parameter.POSITIONAL_ONLY:
+                simple = False
+            if param.default is inspect.Parameter.empty:
+                required.add(param.name)
+            else:
+                defaults[param.name] = param.default
+        names.append(param.name)
+    known = set(names) - {var_keyword}
+
+    def bind_slow(args: tuple, kwargs: dict) -> dict[str, Any]:
+        bound_args = sig.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        locals = dict(bound_args.arguments)
+        locals.pop("self", None)
+        return locals
+
+    if not simple:
+        return bind_slow
+
+    def bind(args: tuple, kwargs: dict) -> dict[str, Any]:
+        if len(args) > len(positional):
+            return bind_slow(args, kwargs)
+        values = dict(zip(positional, args))
+        extra: dict[str, Any] = {}
+        for key, value in kwargs.items():
+            if key in known:
+                if key in values:
+                    return bind_slow(args, kwargs)
+                values[key] = value
+            elif var_keyword is not None:
+                extra[key] = value
+            else:
+                return bind_slow(args, kwargs)
+        if not required.issubset(values):
+            return bind_slow(args, kwargs)
+        locals: dict[str, Any] = {}
+        for name in names:
+            if name in values:
+                locals[name] = values[name]
+            elif name == var_keyword:
+                locals[name] = extra
+            else:
+                locals[name] = defaults[name]
+        locals.pop("self", None)
+        return locals
+
+    return bind
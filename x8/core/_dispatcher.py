@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from ._type_converter import TypeConverter
+
+
+class Handler:
+    """Resolved operation handler.
+
+    Attributes:
+        name: Attribute name of the method on the class.
+        convert_args: Compiled argument converter for the method.
+    """
+
+    __slots__ = ("name", "convert_args")
+
+    name: str
+    convert_args: Callable[[dict], dict]
+
+    def __init__(
+        self,
+        name: str,
+        convert_args: Callable[[dict], dict],
+    ):
+        self.name = name
+        self.convert_args = convert_args
+
+
+class Dispatcher:
+    """Per-class dispatch table for operations.
+
+    Method resolution and argument converters are computed the first
+    time a method name is dispatched on a class and reused afterwards,
+    so a steady-state call costs a dictionary lookup.
+    """
+
+    _tables: dict[type, dict[str, Handler | None]] = dict()
+
+    @staticmethod
+    def resolve(cls: type, name: str) -> Handler | None:
+        table = Dispatcher._tables.get(cls)
+        if table is None:
+            table = Dispatcher._tables.setdefault(cls, dict())
+        try:
+            return table[name]
+        except KeyError:
+            pass
+        handler: Handler | None = None
+        func: Any = getattr(cls, name, None)
+        if func is not None and callable(func):
+            handler = Handler(
+                name=name,
+                convert_args=TypeConverter.compile_args(func),
+            )
+        table[name] = handler
+        return handler
@@ -3,8 +3,8 @@ from typing import Any
 from ._arg_parser import ArgParser
 from ._async_helper import run_async, run_sync
 from ._context import Context
+from ._dispatcher import Dispatcher
 from ._operation import Operation
-from ._type_converter import TypeConverter
 from .exceptions import NotSupportedError
 
 
@@ -19,6 +19,17 @@ class Provider:
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    @property
+    def __raw__(self) -> bool:
+        """Whether results are built as records instead of models.
+
+        Set with the __raw__ flag of the component. Providers that
+        support it build result items with DataModel.record, skipping
+        validation.
+        """
+        component = getattr(self, "__component__", None)
+        return bool(getattr(component, "__raw__", False))
+
     def __setup__(self, context: Context | None = None) -> None:
         pass
 
@@ -32,24 +43,20 @@ class Provider:
         **kwargs,
     ) -> Any:
         if operation and operation.name:
-            func_name = operation.name
-            func = getattr(self, func_name, None)
-            if func and callable(func):
+            handler = Dispatcher.resolve(type(self), operation.name)
+            if handler is not None:
                 self.__setup__(context=context)
-                args = TypeConverter.convert_args(func, operation.args or {})
-                response = func(**args)
+                args = handler.convert_args(operation.args or {})
+                response = getattr(self, handler.name)(**args)
                 return response
 
-            afunc_name = f"a{operation.name}"
-            afunc = getattr(self, afunc_name, None)
-            if callable(afunc):
+            ahandler = Dispatcher.resolve(type(self), f"a{operation.name}")
+            if ahandler is not None:
                 run_sync(self.__asetup__, context=context)
-                args = TypeConverter.convert_args(afunc, operation.args or {})
-                response = run_sync(afunc, **args)
+                args = ahandler.convert_args(operation.args or {})
+                response = run_sync(getattr(self, ahandler.name), **args)
                 return response
-        raise NotSupportedError(
-            operation.to_json() if operation is not None else None
-        )
+        raise NotSupportedError(_describe_operation(operation))
 
     async def __arun__(
         self,
@@ -58,12 +65,11 @@ class Provider:
         **kwargs,
     ) -> Any:
         if operation and operation.name:
-            afunc_name = f"a{operation.name}"
-            afunc = getattr(self, afunc_name, None)
-            if afunc and callable(afunc):
+            ahandler = Dispatcher.resolve(type(self), f"a{operation.name}")
+            if ahandler is not None:
                 await self.__asetup__(context=context)
-                args = TypeConverter.convert_args(afunc, operation.args or {})
-                response = await afunc(**args)
+                args = ahandler.convert_args(operation.args or {})
+                response = await getattr(self, ahandler.name)(**args)
                 return response
 
         return await run_async(
@@ -95,3 +101,14 @@ class Provider:
     ) -> Any:
         operation = ArgParser.convert_execute_operation(statement, params)
         return await self.__arun__(operation, context)
+
+
+def _describe_operation(operation: Operation | None) -> str | None:
+    if operation is None:
+        return None
+    try:
+        return operation.to_json()
+    except ValueError:
+        # Arguments like callbacks are not JSON serializable.
+        args = {k: repr(v) for k, v in (operation.args or {}).items()}
+        return Operation(name=operation.name, args=args).to_json()
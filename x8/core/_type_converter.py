@@ -1,9 +1,15 @@
 import inspect
 import json
-from typing import Any, get_args, get_origin, get_type_hints
+import weakref
+from typing import Any, Callable, get_args, get_origin, get_type_hints
+
+ValueConverter = Callable[[Any], Any]
+ArgsConverter = Callable[[dict], dict]
 
 
 class TypeConverter:
+    _args_converters: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
     @staticmethod
     def convert_value(value, expected_type):
         origin = get_origin(expected_type)
@@ -79,16 +85,168 @@ class TypeConverter:
         return value
 
     @staticmethod
-    def convert_args(method, args: dict) -> dict:
-        sig = inspect.signature(method)
-        converted_args: dict = {}
+    def compile_value(expected_type) -> ValueConverter | None:
+        """Compile a converter for the expected type.
+
+        The returned callable behaves like ``convert_value`` with the
+        type analysis done once up front. None is returned when no
+        conversion can ever apply, so callers can skip the value.
+        """
+        origin = get_origin(expected_type)
+        if origin is not None and type(None) in get_args(expected_type):
+            expected_type = next(
+                t for t in get_args(expected_type) if t is not type(None)
+            )
+            origin = get_origin(expected_type)
+
+        if origin in (list, tuple):
+            type_args = get_args(expected_type)
+            elem_converter = TypeConverter.compile_value(
+                type_args[0] if type_args else Any
+            )
+
+            def convert_list(value):
+                if not isinstance(value, list):
+                    return value
+                if elem_converter is None:
+                    return list(value)
+                return [elem_converter(v) for v in value]
+
+            return convert_list
+
+        if origin is dict:
+            type_args = get_args(expected_type)
+            key_type, val_type = type_args if type_args else (Any, Any)
+            key_converter = TypeConverter.compile_value(key_type)
+            val_converter = TypeConverter.compile_value(val_type)
+
+            def convert_dict(value):
+                if not isinstance(value, dict):
+                    return value
+                return {
+                    (key_converter(k) if key_converter else k): (
+                        val_converter(v) if val_converter else v
+                    )
+                    for k, v in value.items()
+                }
+
+            return convert_dict
+
+        if hasattr(expected_type, "from_dict") and callable(
+            getattr(expected_type, "from_dict")
+        ):
+            from_dict = expected_type.from_dict
+
+            def convert_model(value):
+                if isinstance(value, dict):
+                    return from_dict(value)
+                if isinstance(value, str):
+                    return from_dict(json.loads(value))
+                return value
+
+            return convert_model
+
+        try:
+            return _PRIMITIVE_CONVERTERS.get(expected_type)
+        except TypeError:
+            return None
+
+    @staticmethod
+    def compile_args(method) -> ArgsConverter:
+        """Get the compiled argument converter for a method.
+
+        Signature and type hints are resolved once per function and
+        cached, so repeated calls only pay for conversions that apply.
+        """
+        func = getattr(method, "__func__", method)
+        try:
+            converter = TypeConverter._args_converters.get(func)
+        except TypeError:
+            converter = None
+            func = None
+        if converter is not None:
+            return converter
 
+        sig = inspect.signature(method)
         hints = get_type_hints(method)
-        for param_name, _ in sig.parameters.items():
-            param_type = hints.get(param_name, None)
-            if param_name in args:
-                converted_args[param_name] = TypeConverter.convert_value(
-                    args[param_name], param_type
-                )
+        converters: list[tuple[str, ValueConverter]] = []
+        for param_name in sig.parameters:
+            value_converter = TypeConverter.compile_value(
+                hints.get(param_name, None)
+            )
+            if value_converter is not None:
+                converters.append((param_name, value_converter))
+
+        def convert(args: dict) -> dict:
+            converted_args = dict(args)
+            for param_name, value_converter in converters:
+                if param_name in args:
+                    converted_args[param_name] = value_converter(
+                        args[param_name]
+                    )
+            return converted_args
+
+        if func is not None:
+            TypeConverter._args_converters[func] = convert
+        return convert
+
+    @staticmethod
+    def convert_args(method, args: dict) -> dict:
+        return TypeConverter.compile_args(method)(args)
+
+
+def _safe(convert: ValueConverter) -> ValueConverter:
+    def safe_convert(value):
+        try:
+            return convert(value)
+        except (ValueError, TypeError):
+            return value
+
+    return safe_convert
+
+
+def _to_int(value):
+    return int(value) if isinstance(value, (str, float)) else value
+
+
+def _to_float(value):
+    return float(value) if isinstance(value, (str, int)) else value
+
+
+def _to_str(value):
+    return str(value) if isinstance(value, (int, float, bytes)) else value
+
+
+def _to_bytes(value):
+    return value.encode() if isinstance(value, str) else value
+
+
+def _to_bool(value):
+    if isinstance(value, str) and value.isdigit():
+        return bool(int(value))
+    if isinstance(value, (str, int)):
+        return bool(value)
+    return value
+
+
+def _to_list(value):
+    return value if isinstance(value, list) else list(value)
+
+
+def _to_dict(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    if isinstance(value, bytes):
+        return json.loads(value.decode())
+    return value
+
 
-        return args | converted_args
+_PRIMITIVE_CONVERTERS: dict[Any, ValueConverter] = {
+    int: _safe(_to_int),
+    float: _safe(_to_float),
+    str: _safe(_to_str),
+    bytes: _safe(_to_bytes),
+    bool: _safe(_to_bool),
+    list: _safe(_to_list),
+    dict: _safe(_to_dict),
+}
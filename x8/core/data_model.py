@@ -1,4 +1,11 @@
-__all__ = ["DataModel", "DataModelField", "Empty", "get_origin", "get_args"]
+__all__ = [
+    "DataModel",
+    "DataModelField",
+    "Empty",
+    "Record",
+    "get_origin",
+    "get_args",
+]
 
 from typing import Any, Self
 
@@ -47,6 +54,23 @@ class DataModel(BaseModel):
             return field.default
         raise ValueError(f"Attribute {name} not found in model")
 
+    @classmethod
+    def record(cls, **kwargs: Any) -> Any:
+        """Build a lightweight record of this model without validation.
+
+        Args:
+            kwargs: Field values. Missing fields get their defaults.
+
+        Returns:
+            Record with the fields of this model.
+        """
+        record_type = _record_types.get(cls)
+        if record_type is None:
+            record_type = _record_types.setdefault(
+                cls, _create_record_type(cls)
+            )
+        return record_type(**kwargs)
+
 
 class Empty(DataModel):
     """Empty value."""
@@ -54,6 +78,85 @@ class Empty(DataModel):
     pass
 
 
+class Record:
+    """Lightweight record with the fields of a data model.
+
+    Records are built without validation and keep their fields in
+    slots, so they are much cheaper to create than the model. They are
+    returned for results read in bulk, where validating every item
+    costs more than reading it.
+    """
+
+    __slots__: tuple[str, ...] = ()
+    __model__: type[DataModel]
+    __defaults__: tuple[tuple[str, Any, Any], ...]
+
+    def __init__(self, **kwargs: Any):
+        for name, default, default_factory in self.__defaults__:
+            if name in kwargs:
+                value = kwargs[name]
+            elif default_factory is not None:
+                value = default_factory()
+            else:
+                value = default
+            setattr(self, name, value)
+
+    def to_dict(self) -> dict:
+        return {name: _dump(getattr(self, name)) for name in self.__slots__}
+
+    def to_model(self) -> Any:
+        return self.__model__.model_validate(self.to_dict())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Record):
+            return (
+                self.__model__ is other.__model__
+                and self.to_dict() == other.to_dict()
+            )
+        if isinstance(other, DataModel):
+            return self.to_model() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__
+        )
+        return f"{self.__model__.__name__}.record({fields})"
+
+
+_record_types: dict[type[DataModel], type[Record]] = dict()
+
+
+def _create_record_type(model: type[DataModel]) -> type[Record]:
+    defaults = []
+    for name, field in model.model_fields.items():
+        default = field.default
+        if default is PydanticUndefined:
+            default = None
+        defaults.append((name, default, field.default_factory))
+    return type(
+        f"{model.__name__}Record",
+        (Record,),
+        {
+            "__slots__": tuple(model.model_fields),
+            "__model__": model,
+            "__defaults__": tuple(defaults),
+        },
+    )
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _dump(item) for key, item in value.items()}
+    return value
+
+
 def DataModelField(
     alias: str | None = None,
     exclude: bool | None = None,
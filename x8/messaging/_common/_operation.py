@@ -25,6 +25,8 @@ class MessagingOperation:
     PULL = "pull"
     ACK = "ack"
     NACK = "nack"
+    MACK = "mack"
+    MNACK = "mnack"
     EXTEND = "extend"
     PURGE = "purge"
     CLOSE = "close"
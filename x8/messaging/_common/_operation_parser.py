@@ -51,6 +51,13 @@ class MessagingOperationParser(OperationParser):
             return MessageKey.from_dict(key)
         return key
 
+    def get_keys(self) -> list[MessageKey]:
+        keys = self.get_arg("keys")
+        return [
+            MessageKey.from_dict(key) if isinstance(key, dict) else key
+            for key in keys
+        ]
+
     def get_timeout(self) -> int | None:
         return self.get_arg("timeout")
 
@@ -115,6 +122,8 @@ class MessagingOperationParser(OperationParser):
             MessagingOperation.PULL,
             MessagingOperation.ACK,
             MessagingOperation.NACK,
+            MessagingOperation.MACK,
+            MessagingOperation.MNACK,
             MessagingOperation.EXTEND,
             MessagingOperation.PURGE,
         ]
@@ -5,11 +5,8 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
-from azure.servicebus import (
-    ServiceBusMessage,
-    ServiceBusMessageBatch,
-    ServiceBusReceivedMessage,
-)
+from azure.servicebus import ServiceBusMessage, ServiceBusReceivedMessage
+from azure.servicebus.exceptions import MessageSizeExceededError
 from azure.servicebus.management import (
     QueueProperties,
     QueueRuntimeProperties,
@@ -242,6 +239,7 @@ class AzureServiceBusBase(AzureProvider):
                 topic.sender = self._client.get_topic_sender(
                     topic_name=topic_name
                 )
+            topic.sender_helper = SenderHelper(topic.sender)
 
     def _ainit_sender(self, topic: AzureServiceBusTopic, topic_name: str):
         if topic.sender is None:
@@ -253,6 +251,7 @@ class AzureServiceBusBase(AzureProvider):
                 topic.sender = self._aclient.get_topic_sender(
                     topic_name=topic_name
                 )
+            topic.sender_helper = AsyncSenderHelper(topic.sender)
 
     def _init_receiver(
         self,
@@ -433,6 +432,7 @@ class AzureServiceBusBase(AzureProvider):
     ) -> NCall | None:
         if topic is not None:
             sender = topic.sender
+            sender_helper = topic.sender_helper
             subscription_name = self._get_subscription_name(op_parser)
             if subscription_name in topic.receivers:
                 receiver = topic.receivers[subscription_name]
@@ -689,11 +689,8 @@ class AzureServiceBusBase(AzureProvider):
             args = op_converter.convert_batch(
                 op_parser.get_batch(),
             )
-            call = NCall(
-                sender.send_messages,
-                args,
-                nargs,
-            )
+            args["nargs"] = nargs
+            call = NCall(sender_helper.batch, args)
         # PULL
         elif op_parser.op_equals(MessagingOperation.PULL):
             args = op_converter.convert_pull(
@@ -1217,6 +1214,74 @@ class AsyncResourceHelper:
             ).ainvoke()
 
 
+class SenderHelper:
+    sender: Any
+
+    def __init__(self, sender: Any):
+        self.sender = sender
+
+    def batch(
+        self,
+        messages: list[ServiceBusMessage],
+        nargs: Any,
+    ) -> None:
+        # Fill batches up to the size allowed by the link and send
+        # each one in a single call.
+        sb_batch = self.sender.create_message_batch()
+        for message in messages:
+            try:
+                sb_batch.add_message(message)
+            except MessageSizeExceededError:
+                if len(sb_batch) == 0:
+                    raise
+                NCall(
+                    self.sender.send_messages,
+                    {"message": sb_batch},
+                    nargs,
+                ).invoke()
+                sb_batch = self.sender.create_message_batch()
+                sb_batch.add_message(message)
+        if len(sb_batch) > 0:
+            NCall(
+                self.sender.send_messages,
+                {"message": sb_batch},
+                nargs,
+            ).invoke()
+
+
+class AsyncSenderHelper:
+    sender: Any
+
+    def __init__(self, sender: Any):
+        self.sender = sender
+
+    async def batch(
+        self,
+        messages: list[ServiceBusMessage],
+        nargs: Any,
+    ) -> None:
+        sb_batch = await self.sender.create_message_batch()
+        for message in messages:
+            try:
+                sb_batch.add_message(message)
+            except MessageSizeExceededError:
+                if len(sb_batch) == 0:
+                    raise
+                await NCall(
+                    self.sender.send_messages,
+                    {"message": sb_batch},
+                    nargs,
+                ).ainvoke()
+                sb_batch = await self.sender.create_message_batch()
+                sb_batch.add_message(message)
+        if len(sb_batch) > 0:
+            await NCall(
+                self.sender.send_messages,
+                {"message": sb_batch},
+                nargs,
+            ).ainvoke()
+
+
 class ReceiverHelper:
     receiver: Any
 
@@ -1512,18 +1577,18 @@ class OperationConverter:
         }
 
     def convert_batch(self, batch: MessageBatch) -> dict:
-        sb_batch = ServiceBusMessageBatch()
+        messages = []
         for operation in batch.operations:
             op_parser = MessagingOperationParser(operation)
-            sb_batch.add_message(
-                message=self.convert_put(
+            messages.append(
+                self.convert_put(
                     op_parser.get_value(),
                     op_parser.get_metadata(),
                     op_parser.get_properties(),
                     op_parser.get_put_config(),
                 )["message"]
             )
-        return {"message": sb_batch}
+        return {"messages": messages}
 
     def convert_pull(self, config: MessagePullConfig | None) -> dict:
         max_message_count = 1
@@ -1717,11 +1782,13 @@ class ResultConverter:
 
 class AzureServiceBusTopic:
     sender: Any
+    sender_helper: Any
     receivers: dict[str, Any]
     receiver_helpers: dict[str, Any]
 
     def __init__(self):
         self.sender = None
+        self.sender_helper = None
         self.receivers = {}
         self.receiver_helpers = {}
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 import uuid
@@ -50,6 +51,7 @@ class PostgreSQLBase(Provider):
 
     _client: Any
     _aclient: Any
+    _asetup_lock: asyncio.Lock
     _client_helper: Any
     _aclient_helper: Any
     _op_converter: OperationConverter
@@ -90,7 +92,10 @@ class PostgreSQLBase(Provider):
             metadata_table:
                 PostgreSQL table name for metadata.
             poll_interval:
-                Poll interval in seconds. Defaults to 0.5.
+                Seconds between pulls while waiting for messages.
+                Async pulls are woken up by producers with
+                LISTEN/NOTIFY and only poll for delayed messages and
+                expired locks. Defaults to 0.5.
             nparams:
                 Native parameters to PostgreSQL client.
         """
@@ -106,6 +111,7 @@ class PostgreSQLBase(Provider):
 
         self._client = None
         self._aclient = None
+        self._asetup_lock = asyncio.Lock()
         self._op_converter = OperationConverter(
             self.message_table,
             self.metadata_table,
@@ -122,6 +128,7 @@ class PostgreSQLBase(Provider):
         self,
         context: Context | None = None,
     ) -> None:
+        self._result_converter.raw = self.__raw__
         if self._client is not None:
             return
 
@@ -137,20 +144,32 @@ class PostgreSQLBase(Provider):
         self._create_tables_if_needed()
 
     async def __asetup__(self, context: Context | None = None) -> None:
+        self._result_converter.raw = self.__raw__
         if self._aclient is not None:
             return
-        self._aclient = await psycopg.AsyncConnection.connect(
-            self.connection_string, **self.nparams
-        )
-        self._aclient_helper = AsyncClientHelper(
-            self._aclient,
-            self._op_converter,
-            self._result_converter,
-            self.mode,
-            self.poll_interval,
-            self._subscription_config_cache,
-        )
-        await self._acreate_tables_if_needed()
+        # Concurrent first calls wait for the tables of the first one
+        # instead of opening a client each.
+        async with self._asetup_lock:
+            if self._aclient is not None:
+                return
+            aclient = await psycopg.AsyncConnection.connect(
+                self.connection_string, **self.nparams
+            )
+            await self._acreate_tables_if_needed(aclient)
+            self._aclient_helper = AsyncClientHelper(
+                aclient,
+                self._op_converter,
+                self._result_converter,
+                self.mode,
+                self.poll_interval,
+                self._subscription_config_cache,
+                AsyncListener(
+                    self.connection_string,
+                    self._op_converter.channel,
+                    self.nparams,
+                ),
+            )
+            self._aclient = aclient
 
     def _create_tables_if_needed(self, **kwargs: Any) -> None:
         cursor = self._client.cursor()
@@ -179,6 +198,13 @@ class PostgreSQLBase(Provider):
                 )
                 """
             )
+        cursor.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {self.message_table}_dequeue
+            ON {self.message_table}
+            (topic, subscription, enqueued_time, lock_until_time)
+            """
+        )
         rows = cursor.execute(
             """SELECT tablename FROM pg_catalog.pg_tables
             WHERE schemaname = 'public' AND tablename = %s""",
@@ -198,8 +224,10 @@ class PostgreSQLBase(Provider):
         self._client.commit()
         cursor.close()
 
-    async def _acreate_tables_if_needed(self, **kwargs: Any) -> None:
-        cursor = self._aclient.cursor()
+    async def _acreate_tables_if_needed(
+        self, aclient: Any, **kwargs: Any
+    ) -> None:
+        cursor = aclient.cursor()
         await cursor.execute(
             """SELECT tablename FROM pg_catalog.pg_tables
             WHERE schemaname = 'public' AND tablename = %s""",
@@ -207,7 +235,7 @@ class PostgreSQLBase(Provider):
         )
         rows = await cursor.fetchall()
         if len(rows) == 0:
-            cursor.execute(
+            await cursor.execute(
                 f"""
                 CREATE TABLE {self.message_table} (
                     id TEXT,
@@ -226,6 +254,13 @@ class PostgreSQLBase(Provider):
                 )
                 """
             )
+        await cursor.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {self.message_table}_dequeue
+            ON {self.message_table}
+            (topic, subscription, enqueued_time, lock_until_time)
+            """
+        )
         await cursor.execute(
             """SELECT tablename FROM pg_catalog.pg_tables
             WHERE schemaname = 'public' AND tablename = %s""",
@@ -233,7 +268,7 @@ class PostgreSQLBase(Provider):
         )
         rows = await cursor.fetchall()
         if len(rows) == 0:
-            cursor.execute(
+            await cursor.execute(
                 f"""
                 CREATE TABLE {self.metadata_table} (
                     topic TEXT,
@@ -243,7 +278,7 @@ class PostgreSQLBase(Provider):
                 )
                 """
             )
-        await self._aclient.commit()
+        await aclient.commit()
         await cursor.close()
 
     def _get_topic_name(self, op_parser: MessagingOperationParser) -> str:
@@ -317,7 +352,7 @@ class PostgreSQLBase(Provider):
             self._aclient_helper,
         )
         if ncall is None:
-            return super().__arun__(
+            return await super().__arun__(
                 operation,
                 context,
                 **kwargs,
@@ -880,6 +915,40 @@ class ClientHelper:
         properties: MessageProperties | None = None,
         config: MessagePutConfig | None = None,
     ) -> None:
+        self._put(topic, [(value, metadata, properties, config)])
+
+    def batch(
+        self,
+        topic: str,
+        batch: MessageBatch,
+    ) -> None:
+        messages = []
+        for operation in batch.operations:
+            op_parser = MessagingOperationParser(operation)
+            messages.append(
+                (
+                    op_parser.get_value(),
+                    op_parser.get_metadata(),
+                    op_parser.get_properties(),
+                    op_parser.get_put_config(),
+                )
+            )
+        self._put(topic, messages)
+
+    def _put(
+        self,
+        topic: str,
+        messages: list[
+            tuple[
+                MessageValueType,
+                dict | None,
+                MessageProperties | None,
+                MessagePutConfig | None,
+            ]
+        ],
+    ) -> None:
+        if len(messages) == 0:
+            return
         args = self.op_converter.convert_list_subscriptions(topic)
         nresult = self.execute(
             query=args["query"], params=args["params"], fetchall=True
@@ -892,42 +961,18 @@ class ClientHelper:
                 raise BadRequestError(
                     f"Queue {topic} not found.",
                 )
-        if properties and properties.message_id:
-            id = properties.message_id
-        else:
-            id = str(uuid.uuid4())
-        enqueue_time = Time.now()
-        if config and config.delay:
-            enqueue_time += config.delay
-        ops: list = []
-        for subscription in subscriptions:
-            args = self.op_converter.convert_put(
-                id,
+            return
+        ops = [
+            self.op_converter.convert_put(
                 topic,
-                subscription,
-                enqueue_time,
-                value,
-                metadata,
-                properties,
-            )
-            ops.append(args)
+                subscriptions,
+                messages,
+                Time.now(),
+            ),
+            self.op_converter.convert_notify(topic),
+        ]
         self.transact(ops=ops)
 
-    def batch(
-        self,
-        topic: str,
-        batch: MessageBatch,
-    ) -> None:
-        for operation in batch.operations:
-            op_parser = MessagingOperationParser(operation)
-            self.put(
-                topic=topic,
-                value=op_parser.get_value(),
-                metadata=op_parser.get_metadata(),
-                properties=op_parser.get_properties(),
-                config=op_parser.get_put_config(),
-            )
-
     def pull(
         self,
         topic: str,
@@ -942,58 +987,25 @@ class ClientHelper:
         start_time = Time.now()
         while True:
             now = Time.now()
-            found = False
-            with self.client.transaction():
-                args = self.op_converter.convert_pull(
-                    topic,
-                    subscription,
-                )
-                nresult = self.client.execute(
-                    args["query"], args["params"]
-                ).fetchone()
-                if nresult is not None:
-                    lock_token = str(uuid.uuid4())
-                    message = self.result_converter.convert_pull(nresult)
-                    if message.key is None or message.key.id is None:
-                        raise BadRequestError(
-                            "Message key is missing.",
-                        )
-                    lock_duration = (
-                        config.visibility_timeout if config else None
-                    )
-                    lock_duration = lock_duration or (
-                        subscription_config.visibility_timeout
-                        if subscription_config
-                        and subscription_config.visibility_timeout
-                        else DEFAULT_VISIBILITY_TIMEOUT
-                    )
-                    lock_until_time = now + lock_duration
-                    args = self.op_converter.convert_lock(
-                        message.key.id,
-                        topic,
-                        subscription,
-                        lock_until_time,
-                        lock_token,
-                        message.key.nref,
-                    )
-                    updated = self.client.execute(
-                        args["query"], args["params"]
-                    ).rowcount
-                    if updated == 1:
-                        message.key.nref = lock_token
-                        result.append(message)
-                        found = True
-            if config and config.max_wait_time:
-                if now - start_time > config.max_wait_time:
-                    break
-            if config and config.max_count:
-                if len(result) >= config.max_count:
-                    break
-            if not config or not config.max_count:
-                if len(result) > 0:
-                    break
-            if not found:
-                time.sleep(self.poll_interval)
+            count = _get_pull_count(config, result)
+            args = self.op_converter.convert_pull(
+                topic,
+                subscription,
+                now + _get_lock_duration(config, subscription_config),
+                str(uuid.uuid4()),
+                count,
+            )
+            nresult = self.execute(
+                args["query"], args["params"], fetchall=True
+            )
+            result.extend(self.result_converter.convert_claim(nresult))
+            wait_time = _get_wait_time(
+                config, result, start_time, self.poll_interval
+            )
+            if wait_time is None:
+                break
+            if len(nresult) < count:
+                time.sleep(wait_time)
         return result
 
     def extend(
@@ -1040,7 +1052,9 @@ class ClientHelper:
         cursor = self.client.cursor()
         try:
             for op in ops:
-                if "params" in op:
+                if "params_list" in op:
+                    cursor.executemany(op["query"], op["params_list"])
+                elif "params" in op:
                     cursor.execute(op["query"], op["params"])
                 else:
                     cursor.execute(op["query"])
@@ -1071,6 +1085,7 @@ class AsyncClientHelper:
     mode: MessagingMode
     poll_interval: float
     subscription_config_cache: dict[str, dict[str, SubscriptionConfig | None]]
+    listener: AsyncListener
 
     def __init__(
         self,
@@ -1082,6 +1097,7 @@ class AsyncClientHelper:
         subscription_config_cache: dict[
             str, dict[str, SubscriptionConfig | None]
         ],
+        listener: AsyncListener,
     ):
         self.client = client
         self.op_converter = op_converter
@@ -1089,6 +1105,7 @@ class AsyncClientHelper:
         self.mode = mode
         self.poll_interval = poll_interval
         self.subscription_config_cache = subscription_config_cache
+        self.listener = listener
 
     async def _get_subscription_config(
         self,
@@ -1210,6 +1227,40 @@ class AsyncClientHelper:
         properties: MessageProperties | None = None,
         config: MessagePutConfig | None = None,
     ) -> None:
+        await self._put(topic, [(value, metadata, properties, config)])
+
+    async def batch(
+        self,
+        topic: str,
+        batch: MessageBatch,
+    ) -> None:
+        messages = []
+        for operation in batch.operations:
+            op_parser = MessagingOperationParser(operation)
+            messages.append(
+                (
+                    op_parser.get_value(),
+                    op_parser.get_metadata(),
+                    op_parser.get_properties(),
+                    op_parser.get_put_config(),
+                )
+            )
+        await self._put(topic, messages)
+
+    async def _put(
+        self,
+        topic: str,
+        messages: list[
+            tuple[
+                MessageValueType,
+                dict | None,
+                MessageProperties | None,
+                MessagePutConfig | None,
+            ]
+        ],
+    ) -> None:
+        if len(messages) == 0:
+            return
         args = self.op_converter.convert_list_subscriptions(topic)
         nresult = await self.execute(
             query=args["query"], params=args["params"], fetchall=True
@@ -1222,42 +1273,18 @@ class AsyncClientHelper:
                 raise BadRequestError(
                     f"Queue {topic} not found.",
                 )
-        if properties and properties.message_id:
-            id = properties.message_id
-        else:
-            id = str(uuid.uuid4())
-        enqueue_time = Time.now()
-        if config and config.delay:
-            enqueue_time += config.delay
-        ops: list = []
-        for subscription in subscriptions:
-            args = self.op_converter.convert_put(
-                id,
+            return
+        ops = [
+            self.op_converter.convert_put(
                 topic,
-                subscription,
-                enqueue_time,
-                value,
-                metadata,
-                properties,
-            )
-            ops.append(args)
+                subscriptions,
+                messages,
+                Time.now(),
+            ),
+            self.op_converter.convert_notify(topic),
+        ]
         await self.transact(ops=ops)
 
-    async def batch(
-        self,
-        topic: str,
-        batch: MessageBatch,
-    ) -> None:
-        for operation in batch.operations:
-            op_parser = MessagingOperationParser(operation)
-            await self.put(
-                topic=topic,
-                value=op_parser.get_value(),
-                metadata=op_parser.get_metadata(),
-                properties=op_parser.get_properties(),
-                config=op_parser.get_put_config(),
-            )
-
     async def pull(
         self,
         topic: str,
@@ -1268,61 +1295,31 @@ class AsyncClientHelper:
             topic,
             subscription,
         )
+        await self.listener.start()
         result: list[MessageItem] = []
         start_time = Time.now()
         while True:
             now = Time.now()
-            found = False
-            async with self.client.transaction():
-                async with self.client.cursor() as cursor:
-                    args = self.op_converter.convert_pull(
-                        topic,
-                        subscription,
-                    )
-                    await cursor.execute(args["query"], args["params"])
-                    nresult = await cursor.fetchone()
-                    if nresult is not None:
-                        lock_token = str(uuid.uuid4())
-                        message = self.result_converter.convert_pull(nresult)
-                        if message.key is None or message.key.id is None:
-                            raise BadRequestError(
-                                "Message key is missing.",
-                            )
-                        lock_duration = (
-                            config.visibility_timeout if config else None
-                        )
-                        lock_duration = lock_duration or (
-                            subscription_config.visibility_timeout
-                            if subscription_config
-                            and subscription_config.visibility_timeout
-                            else DEFAULT_VISIBILITY_TIMEOUT
-                        )
-                        lock_until_time = now + lock_duration
-                        args = self.op_converter.convert_lock(
-                            message.key.id,
-                            topic,
-                            subscription,
-                            lock_until_time,
-                            lock_token,
-                            message.key.nref,
-                        )
-                        await cursor.execute(args["query"], args["params"])
-                        updated = cursor.rowcount
-                        if updated == 1:
-                            message.key.nref = lock_token
-                            result.append(message)
-                            found = True
-            if config and config.max_wait_time:
-                if now - start_time > config.max_wait_time:
-                    break
-            if config and config.max_count:
-                if len(result) >= config.max_count:
-                    break
-            if not config or not config.max_count:
-                if len(result) > 0:
-                    break
-            if not found:
-                time.sleep(self.poll_interval)
+            version = self.listener.get_version(topic)
+            count = _get_pull_count(config, result)
+            args = self.op_converter.convert_pull(
+                topic,
+                subscription,
+                now + _get_lock_duration(config, subscription_config),
+                str(uuid.uuid4()),
+                count,
+            )
+            nresult = await self.execute(
+                args["query"], args["params"], fetchall=True
+            )
+            result.extend(self.result_converter.convert_claim(nresult))
+            wait_time = _get_wait_time(
+                config, result, start_time, self.poll_interval
+            )
+            if wait_time is None:
+                break
+            if len(nresult) < count:
+                await self.listener.wait(topic, version, wait_time)
         return result
 
     async def extend(
@@ -1369,7 +1366,9 @@ class AsyncClientHelper:
         cursor = self.client.cursor()
         try:
             for op in ops:
-                if "params" in op:
+                if "params_list" in op:
+                    await cursor.executemany(op["query"], op["params_list"])
+                elif "params" in op:
                     await cursor.execute(op["query"], op["params"])
                 else:
                     await cursor.execute(op["query"])
@@ -1390,12 +1389,139 @@ class AsyncClientHelper:
     async def close(self, topic: str | None) -> Any:
         if topic is not None:
             return
+        await self.listener.close()
         await self.client.close()
 
 
+def _get_pull_count(
+    config: MessagePullConfig | None,
+    result: list[MessageItem],
+) -> int:
+    if config and config.max_count:
+        return config.max_count - len(result)
+    return 1
+
+
+def _get_lock_duration(
+    config: MessagePullConfig | None,
+    subscription_config: SubscriptionConfig | None,
+) -> float:
+    lock_duration = config.visibility_timeout if config else None
+    return lock_duration or (
+        subscription_config.visibility_timeout
+        if subscription_config and subscription_config.visibility_timeout
+        else DEFAULT_VISIBILITY_TIMEOUT
+    )
+
+
+def _get_wait_time(
+    config: MessagePullConfig | None,
+    result: list[MessageItem],
+    start_time: float,
+    poll_interval: float,
+) -> float | None:
+    # None when the pull is done.
+    now = Time.now()
+    max_wait_time = config.max_wait_time if config else None
+    if max_wait_time and now - start_time > max_wait_time:
+        return None
+    if config and config.max_count:
+        if len(result) >= config.max_count:
+            return None
+    elif len(result) > 0:
+        return None
+    wait_time = poll_interval
+    if max_wait_time:
+        wait_time = min(wait_time, start_time + max_wait_time - now)
+    return max(wait_time, 0)
+
+
+class AsyncListener:
+    """Wakes up the async pulls waiting for the messages of a topic.
+
+    Producers notify the channel with the topic when they commit
+    messages. The listener receives the notifications on a connection
+    of its own, which is opened by the first pull.
+    """
+
+    connection_string: str
+    channel: str
+    nparams: dict[str, Any]
+
+    _connection: Any
+    _task: asyncio.Task | None
+    _lock: asyncio.Lock
+    _versions: dict[str, int]
+    _events: dict[str, asyncio.Event]
+
+    def __init__(
+        self,
+        connection_string: str,
+        channel: str,
+        nparams: dict[str, Any],
+    ):
+        self.connection_string = connection_string
+        self.channel = channel
+        self.nparams = nparams
+        self._connection = None
+        self._task = None
+        self._lock = asyncio.Lock()
+        self._versions = {}
+        self._events = {}
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        # Concurrent first pulls share the connection of the first one.
+        async with self._lock:
+            if self._task is not None and not self._task.done():
+                return
+            if self._connection is not None:
+                await self._connection.close()
+            self._connection = await psycopg.AsyncConnection.connect(
+                self.connection_string,
+                **{**self.nparams, "autocommit": True},
+            )
+            await self._connection.execute(f'LISTEN "{self.channel}"')
+            self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        try:
+            async for notify in self._connection.notifies():
+                topic = notify.payload
+                self._versions[topic] = self._versions.get(topic, 0) + 1
+                event = self._events.pop(topic, None)
+                if event is not None:
+                    event.set()
+        except psycopg.Error:
+            # Pulls fall back to polling until the next pull reconnects.
+            pass
+
+    def get_version(self, topic: str) -> int:
+        return self._versions.get(topic, 0)
+
+    async def wait(self, topic: str, version: int, timeout: float) -> None:
+        if self.get_version(topic) != version:
+            return
+        event = self._events.setdefault(topic, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
 class OperationConverter:
     message_table: str
     metadata_table: str
+    channel: str
 
     META_SUBSCRIPTION_NAME = "#"
 
@@ -1406,6 +1532,7 @@ class OperationConverter:
     ):
         self.message_table = message_table
         self.metadata_table = metadata_table
+        self.channel = f"{message_table}_enqueued"
 
     def convert_get_active_message_count(
         self,
@@ -1764,36 +1891,50 @@ class OperationConverter:
 
     def convert_put(
         self,
-        id: str,
         topic: str,
-        subscription: str,
-        enqueue_time: float,
-        value: MessageValueType,
-        metadata: dict | None,
-        properties: MessageProperties | None,
+        subscriptions: list[str],
+        messages: list[
+            tuple[
+                MessageValueType,
+                dict | None,
+                MessageProperties | None,
+                MessagePutConfig | None,
+            ]
+        ],
+        now: float,
     ) -> dict:
-        message_id = None
-        content_type = None
-        group_id = None
-        body: bytes | None = None
-        if properties is not None:
-            message_id = properties.message_id
-            content_type = properties.content_type
-            group_id = properties.group_id
-        if isinstance(value, str):
-            body = value.encode("utf-8")
-            content_type = "text/plain"
-        elif isinstance(value, bytes):
-            body = value
-            content_type = "application/octet-stream"
-        elif isinstance(value, dict):
-            body = json.dumps(value).encode("utf-8")
-            content_type = "application/json"
-        elif isinstance(value, DataModel):
-            body = value.to_json().encode("utf-8")
-            content_type = "application/json"
-        else:
-            raise BadRequestError("Message type not supported")
+        params_list = []
+        for value, metadata, properties, config in messages:
+            if properties and properties.message_id:
+                id = properties.message_id
+            else:
+                id = str(uuid.uuid4())
+            enqueue_time = now
+            if config and config.delay:
+                enqueue_time += config.delay
+            body, content_type = self._convert_value(value)
+            message_id = None
+            group_id = None
+            if properties is not None:
+                message_id = properties.message_id
+                group_id = properties.group_id
+            for subscription in subscriptions:
+                params_list.append(
+                    (
+                        id,
+                        topic,
+                        subscription,
+                        body,
+                        json.dumps(metadata) if metadata else None,
+                        message_id,
+                        group_id,
+                        content_type,
+                        enqueue_time,
+                        0,
+                        0,
+                        "",
+                    )
+                )
         query = f"""
             INSERT INTO {self.message_table}
             (id, topic, subscription, value, metadata,
@@ -1803,82 +1944,84 @@ class OperationConverter:
             VALUES (%s, %s, %s, %s, %s,
             %s, %s, %s, %s, %s, %s, %s)
             """
-        params = (
-            id,
-            topic,
-            subscription,
-            body,
-            json.dumps(metadata) if metadata else None,
-            message_id,
-            group_id,
-            content_type,
-            enqueue_time,
-            0,
-            0,
-            "",
-        )
         return {
             "query": query,
-            "params": params,
+            "params_list": params_list,
             "rowcount": True,
         }
 
+    def _convert_value(self, value: MessageValueType) -> tuple[bytes, str]:
+        if isinstance(value, str):
+            return value.encode("utf-8"), "text/plain"
+        elif isinstance(value, bytes):
+            return value, "application/octet-stream"
+        elif isinstance(value, dict):
+            return json.dumps(value).encode("utf-8"), "application/json"
+        elif isinstance(value, DataModel):
+            return value.to_json().encode("utf-8"), "application/json"
+        raise BadRequestError("Message type not supported")
+
     def convert_pull(
         self,
         topic: str,
         subscription: str,
+        lock_until_time: float,
+        lock_token: str,
+        count: int,
     ) -> dict:
         current_time = Time.now()
+        # Claim up to count messages in one statement. Messages locked
+        # by the claims of other consumers are skipped instead of
+        # waited for. Each message gets its own lock token, derived
+        # from the token of the claim.
         query = f"""
-            SELECT id, topic, subscription, value, metadata,
-            message_id, group_id, content_type,
-            enqueued_time, delivery_count,
-            lock_until_time, lock_token
-            FROM {self.message_table}
-            WHERE topic = %s AND subscription = %s
-            AND lock_until_time <= %s
-            AND enqueued_time <= %s
-            ORDER BY enqueued_time
-            LIMIT 1
+            WITH claimed AS (
+                SELECT id
+                FROM {self.message_table}
+                WHERE topic = %s AND subscription = %s
+                AND lock_until_time <= %s
+                AND enqueued_time <= %s
+                ORDER BY enqueued_time
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE {self.message_table} AS m
+            SET lock_until_time = %s,
+            lock_token = %s || '-' || m.id,
+            delivery_count = m.delivery_count + 1
+            FROM claimed
+            WHERE m.topic = %s AND m.subscription = %s
+            AND m.id = claimed.id
+            RETURNING m.id, m.topic, m.subscription, m.value, m.metadata,
+            m.message_id, m.group_id, m.content_type,
+            m.enqueued_time, m.delivery_count,
+            m.lock_until_time, m.lock_token
             """
         params = (
             topic,
             subscription,
             current_time,
             current_time,
+            count,
+            lock_until_time,
+            lock_token,
+            topic,
+            subscription,
         )
         return {
             "query": query,
             "params": params,
+            "fetchall": True,
         }
 
-    def convert_lock(
-        self,
-        id: str,
-        topic: str,
-        subscription: str,
-        lock_until_time: float,
-        lock_token: str,
-        previous_lock_token: str | None,
-    ) -> dict:
-        query = f"""
-            UPDATE {self.message_table}
-            SET lock_until_time = %s, lock_token = %s,
-            delivery_count = delivery_count + 1
-            WHERE topic = %s AND subscription = %s
-            AND id = %s AND lock_token = %s
-            """
-        params = (
-            lock_until_time,
-            lock_token,
-            topic,
-            subscription,
-            id,
-            previous_lock_token,
-        )
+    def convert_notify(self, topic: str) -> dict:
+        # Notifications are delivered when the transaction commits.
+        query = "SELECT pg_notify(%s, %s)"
+        params = (self.channel, topic)
         return {
             "query": query,
             "params": params,
+            "rowcount": True,
         }
 
     def convert_ack(
@@ -1964,8 +2107,20 @@ class OperationConverter:
 
 
 class ResultConverter:
-    def __init__(self):
-        pass
+    raw: bool
+
+    def __init__(self, raw: bool = False):
+        self.raw = raw
+
+    def _get_types(self) -> tuple[Any, Any, Any]:
+        # Records skip validation when raw results are requested.
+        if self.raw:
+            return (
+                MessageItem.record,
+                MessageKey.record,
+                MessageProperties.record,
+            )
+        return (MessageItem, MessageKey, MessageProperties)
 
     def _convert_value(
         self,
@@ -2006,19 +2161,25 @@ class ResultConverter:
         delivery_count = nresult[9]
         lock_token = nresult[11]
 
-        message = MessageItem(
-            key=MessageKey(id=id, nref=lock_token),
+        item, key, properties = self._get_types()
+        message = item(
+            key=key(id=id, nref=lock_token),
             value=self._convert_value(
                 value,
                 content_type,
             ),
             metadata=json.loads(metadata) if metadata else None,
-            properties=MessageProperties(
+            properties=properties(
                 message_id=message_id,
                 group_id=group_id,
                 content_type=content_type,
                 enqueued_time=enqueued_time,
-                delivery_count=delivery_count + 1,
+                delivery_count=delivery_count,
             ),
         )
         return message
+
+    def convert_claim(self, nresult: Any) -> list[MessageItem]:
+        # RETURNING does not follow the order of the claim.
+        rows = sorted(nresult, key=lambda row: row[8])
+        return [self.convert_pull(row) for row in rows]
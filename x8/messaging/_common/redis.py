@@ -133,12 +133,14 @@ class RedisBase(RedisProvider):
         )
 
     def __setup__(self, context: Context | None = None) -> None:
+        self._result_converter.raw = self.__raw__
         if self._client is not None:
             return
 
         self._client, _ = self._get_client_and_lib(decode_responses=False)
 
     async def __asetup__(self, context: Context | None = None) -> None:
+        self._result_converter.raw = self.__raw__
         if self._aclient is not None:
             return
 
@@ -907,16 +909,24 @@ class ClientHelper:
         batch: MessageBatch,
         nargs: Any,
     ):
+        ops = []
         for operation in batch.operations:
             op_parser = MessagingOperationParser(operation)
-            args = self.op_converter.convert_put(
-                topic,
-                op_parser.get_value(),
-                op_parser.get_metadata(),
-                op_parser.get_properties(),
-                op_parser.get_put_config(),
+            ops.append(
+                self.op_converter.convert_put(
+                    topic,
+                    op_parser.get_value(),
+                    op_parser.get_metadata(),
+                    op_parser.get_properties(),
+                    op_parser.get_put_config(),
+                )
             )
-            self.client.xadd(**args)
+        if len(ops) == 0:
+            return
+        with self.client.pipeline(transaction=False) as pipe:
+            for args in ops:
+                pipe.xadd(**args)
+            pipe.execute()
 
     def check_pending_messages(
         self,
@@ -1297,16 +1307,24 @@ class AsyncClientHelper:
         batch: MessageBatch,
         nargs: Any,
     ):
+        ops = []
         for operation in batch.operations:
             op_parser = MessagingOperationParser(operation)
-            args = self.op_converter.convert_put(
-                topic,
-                op_parser.get_value(),
-                op_parser.get_metadata(),
-                op_parser.get_properties(),
-                op_parser.get_put_config(),
+            ops.append(
+                self.op_converter.convert_put(
+                    topic,
+                    op_parser.get_value(),
+                    op_parser.get_metadata(),
+                    op_parser.get_properties(),
+                    op_parser.get_put_config(),
+                )
             )
-            await self.client.xadd(**args)
+        if len(ops) == 0:
+            return
+        async with self.client.pipeline(transaction=False) as pipe:
+            for args in ops:
+                pipe.xadd(**args)
+            await pipe.execute()
 
     async def check_pending_messages(
         self,
@@ -1518,13 +1536,29 @@ class OperationConverter:
 
 
 class ResultConverter:
+    raw: bool
+
+    def __init__(self, raw: bool = False):
+        self.raw = raw
+
+    def _get_types(self) -> tuple[Any, Any, Any]:
+        # Records skip validation when raw results are requested.
+        if self.raw:
+            return (
+                MessageItem.record,
+                MessageKey.record,
+                MessageProperties.record,
+            )
+        return (MessageItem, MessageKey, MessageProperties)
+
     def _convert_key(
         self,
         id: bytes,
         fields: dict[bytes, bytes],
         origin_id: bytes | None,
     ) -> MessageKey:
-        return MessageKey(
+        _, key, _ = self._get_types()
+        return key(
             nref={
                 "id": id,
                 "fields": fields,
@@ -1552,14 +1586,15 @@ class ResultConverter:
 
         origin_id = fields.get(b"origin_id", None)
         metadata = json.loads(metadata_raw) if metadata_raw else None
-        props = MessageProperties(
+        item, _, properties = self._get_types()
+        props = properties(
             message_id=_b2s(fields.get(b"message_id", b"")) or None,
             content_type=content_type,
             group_id=_b2s(fields.get(b"group_id", b"")) or None,
             enqueued_time=float(_b2s(origin_id or id).split("-")[0]) / 1000.0,
             delivery_count=None,
         )
-        return MessageItem(
+        return item(
             key=self._convert_key(id, fields, origin_id),
             value=value,
             metadata=metadata,
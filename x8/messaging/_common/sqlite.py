@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import os
 import sqlite3
+import threading
 import time
 import uuid
 from typing import Any
 
+from x8._common.sqlite_client import SQLiteClient
 from x8.core import Context, DataModel, NCall, Operation, Provider, Response
 from x8.core.exceptions import BadRequestError, ConflictError, NotFoundError
 from x8.core.time import Time
@@ -32,6 +36,9 @@ from ._operation_parser import MessagingOperationParser
 
 DEFAULT_TTL = 7 * 24 * 60 * 60
 DEFAULT_VISIBILITY_TIMEOUT = 30
+# Seconds before the first data version check of a wait. The interval
+# doubles after every check, up to the poll interval.
+DATA_VERSION_INTERVAL = 0.01
 
 
 class SQLiteBase(Provider):
@@ -43,12 +50,17 @@ class SQLiteBase(Provider):
 
     database: str
     message_table: str
+    payload_table: str
     metadata_table: str
     poll_interval: float
+    busy_timeout: float
+    group_commit: bool
+    pragmas: dict[str, Any] | None
     nparams: dict[str, Any]
 
     _client: Any
     _client_helper: Any
+    _notifier: Notifier
     _op_converter: OperationConverter
     _result_converter: ResultConverter
     _topic_config_cache: dict[str, TopicConfig] = {}
@@ -64,8 +76,12 @@ class SQLiteBase(Provider):
         topic: str | None = None,
         subscription: str | None = None,
         message_table: str = "message",
+        payload_table: str = "payload",
         metadata_table: str = "metadata",
         poll_interval: float = 0.5,
+        busy_timeout: float = 5.0,
+        group_commit: bool = False,
+        pragmas: dict[str, Any] | None = None,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -83,11 +99,28 @@ class SQLiteBase(Provider):
             subscription:
                 Subscription name.
             message_table:
-                SQLite table name for messages.
+                SQLite table name for the deliveries of messages
+                to subscriptions.
+            payload_table:
+                SQLite table name for message payloads, stored once
+                for all the subscriptions of a topic.
             metadata_table:
                 SQLite table name for metadata.
             poll_interval:
-                Poll interval in seconds. Defaults to 0.5.
+                Seconds between pulls while waiting for delayed
+                messages and expired locks. New messages put in this
+                process wake up waiting pulls right away, and messages
+                put by other processes are seen within the interval.
+                Defaults to 0.5.
+            busy_timeout:
+                Seconds to wait for a lock held by another connection.
+                Defaults to 5.
+            group_commit:
+                Commit concurrent writes in one transaction.
+                Defaults to False.
+            pragmas:
+                SQLite pragmas that override the defaults
+                (WAL journal, synchronous NORMAL, larger cache and mmap).
             nparams:
                 Native parameters to SQLite client.
         """
@@ -97,14 +130,19 @@ class SQLiteBase(Provider):
         self.topic = topic
         self.subscription = subscription
         self.message_table = message_table
+        self.payload_table = payload_table
         self.metadata_table = metadata_table
         self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self.group_commit = group_commit
+        self.pragmas = pragmas
         self.nparams = nparams
 
         self._client = None
         self._client_helper = None
         self._op_converter = OperationConverter(
             self.message_table,
+            self.payload_table,
             self.metadata_table,
         )
         self._result_converter = ResultConverter()
@@ -119,14 +157,18 @@ class SQLiteBase(Provider):
         self,
         context: Context | None = None,
     ) -> None:
+        self._result_converter.raw = self.__raw__
         if self._client is not None:
             return
 
-        self._client = sqlite3.connect(
-            database=self.database,
-            check_same_thread=False,
-            **self.nparams,
+        self._client = SQLiteClient(
+            self.database,
+            busy_timeout=self.busy_timeout,
+            group_commit=self.group_commit,
+            pragmas=self.pragmas,
+            nparams=self.nparams,
         )
+        self._notifier = Notifier.get(self.database)
         self._client_helper = ClientHelper(
             self._client,
             self._op_converter,
@@ -134,54 +176,135 @@ class SQLiteBase(Provider):
             self.mode,
             self.poll_interval,
             self._subscription_config_cache,
+            self._notifier,
+            self.database != ":memory:",
         )
         self._create_tables_if_needed()
 
     def _create_tables_if_needed(self, **kwargs: Any) -> None:
-        cursor = self._client.cursor()
-        rows = cursor.execute(
-            """SELECT name FROM sqlite_master WHERE type='table'
-                AND name=?""",
-            (self.message_table,),
-        ).fetchall()
-        if len(rows) == 0:
+        with self._client.transaction() as cursor:
+            # Payloads are written once for all the subscriptions and
+            # count the deliveries that refer to them. The last
+            # delivery to be deleted, on ack, purge or expiry, deletes
+            # the payload.
             cursor.execute(
                 f"""
-                CREATE TABLE {self.message_table} (
-                    id TEXT,
-                    topic TEXT,
-                    subscription TEXT,
+                CREATE TABLE IF NOT EXISTS {self.payload_table} (
+                    id TEXT PRIMARY KEY,
                     value BLOB,
                     metadata TEXT,
                     message_id TEXT,
                     group_id TEXT,
                     content_type TEXT,
-                    enqueued_time REAL,
-                    delivery_count INTEGER,
-                    lock_until_time REAL,
-                    lock_token TEXT,
-                    PRIMARY KEY (id, topic, subscription)
+                    refs INTEGER
                 )
                 """
             )
-        rows = cursor.execute(
-            """SELECT name FROM sqlite_master WHERE type='table'
-                AND name=?""",
-            (self.metadata_table,),
-        ).fetchall()
-        if len(rows) == 0:
+            columns = [
+                row[1]
+                for row in cursor.execute(
+                    f"PRAGMA table_info({self.message_table})"
+                ).fetchall()
+            ]
+            if len(columns) == 0:
+                self._create_message_table(cursor, self.message_table)
+            elif "payload_id" not in columns:
+                self._migrate_message_table(cursor)
             cursor.execute(
                 f"""
-                CREATE TABLE {self.metadata_table} (
-                    topic TEXT,
-                    subscription TEXT,
-                    config TEXT,
-                    PRIMARY KEY (topic, subscription)
-                )
+                CREATE TRIGGER IF NOT EXISTS {self.message_table}_release
+                AFTER DELETE ON {self.message_table}
+                BEGIN
+                    UPDATE {self.payload_table}
+                    SET refs = refs - 1
+                    WHERE id = OLD.payload_id;
+                    DELETE FROM {self.payload_table}
+                    WHERE id = OLD.payload_id AND refs <= 0;
+                END
+                """
+            )
+            # Pulls scan the messages of one subscription in enqueue
+            # order and skip the locked ones without a sort, acks look
+            # messages up by lock token.
+            cursor.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {self.message_table}_dequeue
+                ON {self.message_table}
+                (topic, subscription, enqueued_time, lock_until_time)
+                """
+            )
+            cursor.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS {self.message_table}_lock
+                ON {self.message_table}
+                (topic, subscription, lock_token)
                 """
             )
-        self._client.commit()
-        cursor.close()
+            rows = cursor.execute(
+                """SELECT name FROM sqlite_master WHERE type='table'
+                    AND name=?""",
+                (self.metadata_table,),
+            ).fetchall()
+            if len(rows) == 0:
+                cursor.execute(
+                    f"""
+                    CREATE TABLE {self.metadata_table} (
+                        topic TEXT,
+                        subscription TEXT,
+                        config TEXT,
+                        PRIMARY KEY (topic, subscription)
+                    )
+                    """
+                )
+
+    def _create_message_table(self, cursor: Any, name: str) -> None:
+        cursor.execute(
+            f"""
+            CREATE TABLE {name} (
+                id TEXT,
+                topic TEXT,
+                subscription TEXT,
+                payload_id TEXT,
+                enqueued_time REAL,
+                delivery_count INTEGER,
+                lock_until_time REAL,
+                lock_token TEXT,
+                PRIMARY KEY (id, topic, subscription)
+            )
+            """
+        )
+
+    def _migrate_message_table(self, cursor: Any) -> None:
+        # Messages stored with their payload get a payload each.
+        # Dropping the old table also drops its indexes.
+        migrated_table = f"{self.message_table}_migrated"
+        cursor.execute(f"DROP TABLE IF EXISTS {migrated_table}")
+        self._create_message_table(cursor, migrated_table)
+        cursor.execute(
+            f"""
+            INSERT INTO {self.payload_table}
+            (id, value, metadata, message_id, group_id, content_type, refs)
+            SELECT 'migrated-' || rowid, value, metadata,
+            message_id, group_id, content_type, 1
+            FROM {self.message_table}
+            """
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {migrated_table}
+            (id, topic, subscription, payload_id,
+            enqueued_time, delivery_count,
+            lock_until_time, lock_token)
+            SELECT id, topic, subscription, 'migrated-' || rowid,
+            enqueued_time, delivery_count,
+            lock_until_time, lock_token
+            FROM {self.message_table}
+            """
+        )
+        cursor.execute(f"DROP TABLE {self.message_table}")
+        cursor.execute(
+            f"ALTER TABLE {migrated_table} RENAME TO {self.message_table}"
+        )
 
     def _get_topic_name(self, op_parser: MessagingOperationParser) -> str:
         if self.mode == MessagingMode.PUBSUB:
@@ -241,6 +364,38 @@ class SQLiteBase(Provider):
         )
         return Response(result=result, native=dict(result=nresult, call=ncall))
 
+    async def __arun__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        op_parser = MessagingOperationParser(operation)
+        if not op_parser.op_equals(MessagingOperation.PULL):
+            return await super().__arun__(
+                operation,
+                context,
+                **kwargs,
+            )
+        # Pulls wait for messages on the event loop instead of a thread.
+        self.__setup__(context=context)
+        args = {
+            "topic": self._get_topic_name(op_parser),
+            "subscription": self._get_subscription_name(op_parser),
+            "config": op_parser.get_pull_config(),
+        }
+        ncall = NCall(
+            self._client_helper.apull,
+            args,
+        )
+        nresult = await ncall.ainvoke()
+        result = self._convert_nresult(
+            nresult,
+            {},
+            op_parser,
+        )
+        return Response(result=result, native=dict(result=nresult, call=ncall))
+
     def _get_ncall(
         self,
         op_parser: MessagingOperationParser,
@@ -483,13 +638,36 @@ class SQLiteBase(Provider):
             )
         # NACK
         elif op_parser.op_equals(MessagingOperation.NACK):
+            topic = self._get_topic_name(op_parser)
             args = op_converter.convert_nack(
-                self._get_topic_name(op_parser),
+                topic,
                 self._get_subscription_name(op_parser),
                 op_parser.get_key(),
             )
             call = NCall(
-                helper.execute,
+                helper.nack,
+                {"topic": topic, "args": args},
+            )
+        # MACK
+        elif op_parser.op_equals(MessagingOperation.MACK):
+            args = {
+                "topic": self._get_topic_name(op_parser),
+                "subscription": self._get_subscription_name(op_parser),
+                "keys": op_parser.get_keys(),
+            }
+            call = NCall(
+                helper.mack,
+                args,
+            )
+        # MNACK
+        elif op_parser.op_equals(MessagingOperation.MNACK):
+            args = {
+                "topic": self._get_topic_name(op_parser),
+                "subscription": self._get_subscription_name(op_parser),
+                "keys": op_parser.get_keys(),
+            }
+            call = NCall(
+                helper.mnack,
                 args,
             )
         # EXTEND
@@ -628,6 +806,12 @@ class SQLiteBase(Provider):
                     "Message not found or already acknowledged.",
                 )
             result = None
+        # MACK
+        elif op_parser.op_equals(MessagingOperation.MACK):
+            result = nresult
+        # MNACK
+        elif op_parser.op_equals(MessagingOperation.MNACK):
+            result = nresult
         # EXTEND
         elif op_parser.op_equals(MessagingOperation.EXTEND):
             if nresult == 0:
@@ -645,12 +829,16 @@ class SQLiteBase(Provider):
 
 
 class ClientHelper:
+    EXPIRE_BATCH_SIZE = 1000
+
     client: Any
     op_converter: OperationConverter
     result_converter: ResultConverter
     mode: MessagingMode
     poll_interval: float
     subscription_config_cache: dict[str, dict[str, SubscriptionConfig | None]]
+    notifier: Notifier
+    watch: bool
 
     def __init__(
         self,
@@ -662,6 +850,8 @@ class ClientHelper:
         subscription_config_cache: dict[
             str, dict[str, SubscriptionConfig | None]
         ],
+        notifier: Notifier,
+        watch: bool,
     ):
         self.client = client
         self.op_converter = op_converter
@@ -669,6 +859,8 @@ class ClientHelper:
         self.mode = mode
         self.poll_interval = poll_interval
         self.subscription_config_cache = subscription_config_cache
+        self.notifier = notifier
+        self.watch = watch
 
     def _get_subscription_config(
         self,
@@ -790,8 +982,42 @@ class ClientHelper:
         properties: MessageProperties | None = None,
         config: MessagePutConfig | None = None,
     ) -> None:
+        self._put(topic, [(value, metadata, properties, config)])
+
+    def batch(
+        self,
+        topic: str,
+        batch: MessageBatch,
+    ) -> None:
+        messages = []
+        for operation in batch.operations:
+            op_parser = MessagingOperationParser(operation)
+            messages.append(
+                (
+                    op_parser.get_value(),
+                    op_parser.get_metadata(),
+                    op_parser.get_properties(),
+                    op_parser.get_put_config(),
+                )
+            )
+        self._put(topic, messages)
+
+    def _put(
+        self,
+        topic: str,
+        messages: list[
+            tuple[
+                MessageValueType,
+                dict | None,
+                MessageProperties | None,
+                MessagePutConfig | None,
+            ]
+        ],
+    ) -> None:
+        if len(messages) == 0:
+            return
         args = self.op_converter.convert_list_subscriptions(topic)
-        nresult = self.client.execute(args["query"], args["params"]).fetchall()
+        nresult = self.execute(args["query"], args["params"], fetchall=True)
         subscriptions = self.result_converter.convert_list_subscriptions(
             nresult
         )
@@ -800,49 +1026,58 @@ class ClientHelper:
                 raise BadRequestError(
                     f"Queue {topic} not found.",
                 )
-        if properties and properties.message_id:
-            id = properties.message_id
-        else:
-            id = str(uuid.uuid4())
-        enqueue_time = Time.now()
-        if config and config.delay:
-            enqueue_time += config.delay
-        ops: list = []
-        for subscription in subscriptions:
-            args = self.op_converter.convert_put(
-                id,
-                topic,
-                subscription,
-                enqueue_time,
-                value,
-                metadata,
-                properties,
-            )
-            ops.append(args)
+            return
+        ops = self.op_converter.convert_put(
+            topic,
+            subscriptions,
+            messages,
+            Time.now(),
+        )
         self.transact(ops=ops)
+        self.notifier.notify(topic)
 
-    def batch(
+    def pull(
         self,
         topic: str,
-        batch: MessageBatch,
-    ) -> None:
-        for operation in batch.operations:
-            op_parser = MessagingOperationParser(operation)
-            self.put(
-                topic=topic,
-                value=op_parser.get_value(),
-                metadata=op_parser.get_metadata(),
-                properties=op_parser.get_properties(),
-                config=op_parser.get_put_config(),
+        subscription: str,
+        config: MessagePullConfig | None = None,
+    ) -> list[MessageItem]:
+        subscription_config = self._get_subscription_config(
+            topic,
+            subscription,
+        )
+        result: list[MessageItem] = []
+        start_time = Time.now()
+        while True:
+            now = Time.now()
+            version = self.notifier.get_version(topic)
+            data_version = self._get_data_version()
+            count = self._get_pull_count(config, result)
+            result.extend(
+                self._claim(
+                    topic,
+                    subscription,
+                    now,
+                    count,
+                    config,
+                    subscription_config,
+                )
             )
+            wait_time = self._get_wait_time(config, result, start_time)
+            if wait_time is None:
+                break
+            if wait_time > 0:
+                self._wait(topic, version, data_version, wait_time)
+        return result
 
-    def pull(
+    async def apull(
         self,
         topic: str,
         subscription: str,
         config: MessagePullConfig | None = None,
     ) -> list[MessageItem]:
-        subscription_config = self._get_subscription_config(
+        subscription_config = await asyncio.to_thread(
+            self._get_subscription_config,
             topic,
             subscription,
         )
@@ -850,61 +1085,192 @@ class ClientHelper:
         start_time = Time.now()
         while True:
             now = Time.now()
-            found = False
-            with self.client:
-                args = self.op_converter.convert_pull(
+            version = self.notifier.get_version(topic)
+            data_version = None
+            if self.watch:
+                data_version = await asyncio.to_thread(self._get_data_version)
+            count = self._get_pull_count(config, result)
+            result.extend(
+                await asyncio.to_thread(
+                    self._claim,
                     topic,
                     subscription,
-                    subscription_config=subscription_config,
+                    now,
+                    count,
+                    config,
+                    subscription_config,
                 )
-                nresult = self.client.execute(
-                    args["query"], args["params"]
-                ).fetchone()
-                if nresult is not None:
-                    lock_token = str(uuid.uuid4())
-                    message = self.result_converter.convert_pull(nresult)
-                    if message.key is None or message.key.id is None:
-                        raise BadRequestError(
-                            "Message key is missing.",
-                        )
-                    lock_duration = (
-                        config.visibility_timeout if config else None
-                    )
-                    lock_duration = lock_duration or (
-                        subscription_config.visibility_timeout
-                        if subscription_config
-                        and subscription_config.visibility_timeout
-                        else DEFAULT_VISIBILITY_TIMEOUT
-                    )
-                    lock_until_time = now + lock_duration
-                    args = self.op_converter.convert_lock(
-                        message.key.id,
-                        topic,
-                        subscription,
-                        lock_until_time,
-                        lock_token,
-                        message.key.nref,
-                    )
-                    updated = self.client.execute(
-                        args["query"], args["params"]
-                    ).rowcount
-                    if updated == 1:
-                        message.key.nref = lock_token
-                        result.append(message)
-                        found = True
-            if config and config.max_wait_time:
-                if now - start_time > config.max_wait_time:
-                    break
-            if config and config.max_count:
-                if len(result) >= config.max_count:
-                    break
-            if not config or not config.max_count:
-                if len(result) > 0:
-                    break
-            if not found:
-                time.sleep(self.poll_interval)
+            )
+            wait_time = self._get_wait_time(config, result, start_time)
+            if wait_time is None:
+                break
+            if wait_time > 0:
+                await self._await(topic, version, data_version, wait_time)
         return result
 
+    def _claim(
+        self,
+        topic: str,
+        subscription: str,
+        now: float,
+        count: int,
+        config: MessagePullConfig | None,
+        subscription_config: SubscriptionConfig | None,
+    ) -> list[MessageItem]:
+        lock_duration = config.visibility_timeout if config else None
+        lock_duration = lock_duration or (
+            subscription_config.visibility_timeout
+            if subscription_config and subscription_config.visibility_timeout
+            else DEFAULT_VISIBILITY_TIMEOUT
+        )
+        with self.client.cursor() as cursor:
+            args = self.op_converter.convert_expire(
+                topic,
+                subscription,
+                ClientHelper.EXPIRE_BATCH_SIZE,
+                subscription_config=subscription_config,
+            )
+            cursor.execute(args["query"], args["params"])
+            args = self.op_converter.convert_pull(
+                topic,
+                subscription,
+                now + lock_duration,
+                str(uuid.uuid4()),
+                count,
+                subscription_config=subscription_config,
+            )
+            nresult = cursor.execute(args["query"], args["params"]).fetchall()
+            if len(nresult) == 0:
+                return []
+            args = self.op_converter.convert_get_payloads(
+                [row[3] for row in nresult]
+            )
+            payloads = {
+                row[0]: row
+                for row in cursor.execute(
+                    args["query"], args["params"]
+                ).fetchall()
+            }
+        # RETURNING does not follow the order of the claim.
+        nresult.sort(key=lambda row: row[4])
+        return [
+            self.result_converter.convert_pull(row, payloads[row[3]])
+            for row in nresult
+            if row[3] in payloads
+        ]
+
+    def _get_pull_count(
+        self,
+        config: MessagePullConfig | None,
+        result: list[MessageItem],
+    ) -> int:
+        if config and config.max_count:
+            return config.max_count - len(result)
+        return 1
+
+    def _get_wait_time(
+        self,
+        config: MessagePullConfig | None,
+        result: list[MessageItem],
+        start_time: float,
+    ) -> float | None:
+        # None when the pull is done.
+        now = Time.now()
+        max_wait_time = config.max_wait_time if config else None
+        if max_wait_time and now - start_time > max_wait_time:
+            return None
+        if config and config.max_count:
+            if len(result) >= config.max_count:
+                return None
+        elif len(result) > 0:
+            return None
+        wait_time = self.poll_interval
+        if max_wait_time:
+            wait_time = min(wait_time, start_time + max_wait_time - now)
+        return max(wait_time, 0)
+
+    def _get_data_version(self) -> int | None:
+        # The data version changes when another connection commits.
+        if not self.watch:
+            return None
+        return self.execute("PRAGMA data_version")[0]
+
+    def _wait(
+        self,
+        topic: str,
+        version: int,
+        data_version: int | None,
+        timeout: float,
+    ) -> None:
+        deadline = time.monotonic() + timeout
+        interval = DATA_VERSION_INTERVAL
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.watch:
+                remaining = min(remaining, interval)
+                interval *= 2
+            if self.notifier.wait(topic, version, remaining):
+                return
+            if self._get_data_version() != data_version:
+                return
+
+    async def _await(
+        self,
+        topic: str,
+        version: int,
+        data_version: int | None,
+        timeout: float,
+    ) -> None:
+        deadline = time.monotonic() + timeout
+        interval = DATA_VERSION_INTERVAL
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.watch:
+                remaining = min(remaining, interval)
+                interval *= 2
+            if await self.notifier.await_(topic, version, remaining):
+                return
+            if self.watch and (
+                await asyncio.to_thread(self._get_data_version) != data_version
+            ):
+                return
+
+    def mack(
+        self,
+        topic: str,
+        subscription: str,
+        keys: list[MessageKey],
+    ) -> list[bool]:
+        args = self.op_converter.convert_mack(topic, subscription, keys)
+        nresult = self.execute(args["query"], args["params"], fetchall=True)
+        return self.result_converter.convert_mack(keys, nresult)
+
+    def mnack(
+        self,
+        topic: str,
+        subscription: str,
+        keys: list[MessageKey],
+    ) -> list[bool]:
+        # The lock tokens are reset, so read the locked messages first.
+        with self.client.transaction() as cursor:
+            args = self.op_converter.convert_get_locks(
+                topic, subscription, keys
+            )
+            nresult = cursor.execute(args["query"], args["params"]).fetchall()
+            args = self.op_converter.convert_mnack(topic, subscription, keys)
+            cursor.execute(args["query"], args["params"])
+        self.notifier.notify(topic)
+        return self.result_converter.convert_mack(keys, nresult)
+
+    def nack(self, topic: str, args: dict) -> Any:
+        nresult = self.execute(**args)
+        self.notifier.notify(topic)
+        return nresult
+
     def extend(
         self,
         topic: str,
@@ -922,7 +1288,7 @@ class ClientHelper:
             timeout,
             subscription_config,
         )
-        self.client.execute(args["query"], args["params"])
+        self.execute(args["query"], args["params"], rowcount=True)
 
     def execute(
         self,
@@ -931,8 +1297,7 @@ class ClientHelper:
         rowcount: bool = False,
         fetchall: bool = False,
     ) -> Any:
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             if params:
                 cursor.execute(query, params)
             else:
@@ -942,33 +1307,26 @@ class ClientHelper:
             if fetchall:
                 return cursor.fetchall()
             return cursor.fetchone()
-        finally:
-            self.client.commit()
-            cursor.close()
 
     def transact(self, ops: list) -> Any:
         result = []
-        cursor = self.client.cursor()
-        try:
+        with self.client.transaction() as cursor:
             for op in ops:
-                if "params" in op:
+                if "params_list" in op:
+                    cursor.executemany(op["query"], op["params_list"])
+                elif "params" in op:
                     cursor.execute(op["query"], op["params"])
                 else:
                     cursor.execute(op["query"])
                 if "rowcount" in op and op["rowcount"]:
                     if cursor.rowcount == 0:
-                        self.client.rollback()
                         raise ConflictError
                     result.append(cursor.rowcount)
                 else:
                     res = cursor.fetchone()
                     if res is None or len(res) == 0:
-                        self.client.rollback()
                         raise ConflictError
                     result.append(res)
-            self.client.commit()
-        finally:
-            cursor.close()
         return result
 
     def close(self, topic: str | None) -> Any:
@@ -977,8 +1335,79 @@ class ClientHelper:
         self.client.close()
 
 
+class Notifier:
+    """Wakes up the pulls waiting for the messages of a topic.
+
+    Producers notify after their messages are committed. The providers
+    of a database file in this process share a notifier, while in
+    memory databases have one each. Commits of other processes are
+    not notified and are watched for by the pulls.
+    """
+
+    _notifiers: dict[str, Notifier] = {}
+    _notifiers_lock = threading.Lock()
+
+    _cond: threading.Condition
+    _versions: dict[str, int]
+    _waiters: list[tuple[str, asyncio.AbstractEventLoop, asyncio.Event]]
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._versions = {}
+        self._waiters = []
+
+    @classmethod
+    def get(cls, database: str) -> Notifier:
+        if database == ":memory:":
+            return cls()
+        path = os.path.abspath(database)
+        with cls._notifiers_lock:
+            if path not in cls._notifiers:
+                cls._notifiers[path] = cls()
+            return cls._notifiers[path]
+
+    def get_version(self, topic: str) -> int:
+        with self._cond:
+            return self._versions.get(topic, 0)
+
+    def notify(self, topic: str) -> None:
+        with self._cond:
+            self._versions[topic] = self._versions.get(topic, 0) + 1
+            self._cond.notify_all()
+            waiters = [w for w in self._waiters if w[0] == topic]
+        for _, loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The event loop of the waiter is closed.
+                pass
+
+    def wait(self, topic: str, version: int, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._versions.get(topic, 0) != version,
+                timeout,
+            )
+
+    async def await_(self, topic: str, version: int, timeout: float) -> bool:
+        waiter = (topic, asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            if self._versions.get(topic, 0) != version:
+                return True
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[2].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._waiters.remove(waiter)
+        return self.get_version(topic) != version
+
+
 class OperationConverter:
     message_table: str
+    payload_table: str
     metadata_table: str
 
     META_SUBSCRIPTION_NAME = "#"
@@ -986,9 +1415,11 @@ class OperationConverter:
     def __init__(
         self,
         message_table: str,
+        payload_table: str,
         metadata_table: str,
     ):
         self.message_table = message_table
+        self.payload_table = payload_table
         self.metadata_table = metadata_table
 
     def convert_get_active_message_count(
@@ -1348,69 +1779,102 @@ class OperationConverter:
 
     def convert_put(
         self,
-        id: str,
         topic: str,
-        subscription: str,
-        enqueue_time: float,
-        value: MessageValueType,
-        metadata: dict | None,
-        properties: MessageProperties | None,
-    ) -> dict:
-        message_id = None
-        content_type = None
-        group_id = None
-        body: bytes | None = None
-        if properties is not None:
-            message_id = properties.message_id
-            content_type = properties.content_type
-            group_id = properties.group_id
-        if isinstance(value, str):
-            body = value.encode("utf-8")
-            content_type = "text/plain"
-        elif isinstance(value, bytes):
-            body = value
-            content_type = "application/octet-stream"
-        elif isinstance(value, dict):
-            body = json.dumps(value).encode("utf-8")
-            content_type = "application/json"
-        elif isinstance(value, DataModel):
-            body = value.to_json().encode("utf-8")
-            content_type = "application/json"
-        else:
-            raise BadRequestError("Message type not supported")
+        subscriptions: list[str],
+        messages: list[
+            tuple[
+                MessageValueType,
+                dict | None,
+                MessageProperties | None,
+                MessagePutConfig | None,
+            ]
+        ],
+        now: float,
+    ) -> list[dict]:
+        payload_params_list = []
+        params_list = []
+        for value, metadata, properties, config in messages:
+            if properties and properties.message_id:
+                id = properties.message_id
+            else:
+                id = str(uuid.uuid4())
+            payload_id = str(uuid.uuid4())
+            enqueue_time = now
+            if config and config.delay:
+                enqueue_time += config.delay
+            body, content_type = self._convert_value(value)
+            message_id = None
+            group_id = None
+            if properties is not None:
+                message_id = properties.message_id
+                group_id = properties.group_id
+            payload_params_list.append(
+                (
+                    payload_id,
+                    body,
+                    json.dumps(metadata) if metadata else None,
+                    message_id,
+                    group_id,
+                    content_type,
+                    len(subscriptions),
+                )
+            )
+            for subscription in subscriptions:
+                params_list.append(
+                    (
+                        id,
+                        topic,
+                        subscription,
+                        payload_id,
+                        enqueue_time,
+                        0,
+                        0,
+                        "",
+                    )
+                )
+        payload_query = f"""
+            INSERT INTO {self.payload_table}
+            (id, value, metadata, message_id, group_id, content_type, refs)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """
         query = f"""
             INSERT INTO {self.message_table}
-            (id, topic, subscription, value, metadata,
-            message_id, group_id, content_type,
+            (id, topic, subscription, payload_id,
             enqueued_time, delivery_count,
             lock_until_time, lock_token)
-            VALUES (?, ?, ?, ?, ?,
-            ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """
-        params = (
-            id,
-            topic,
-            subscription,
-            body,
-            json.dumps(metadata) if metadata else None,
-            message_id,
-            group_id,
-            content_type,
-            enqueue_time,
-            0,
-            0,
-            "",
-        )
-        return {
-            "query": query,
-            "params": params,
-            "rowcount": True,
-        }
+        return [
+            {
+                "query": payload_query,
+                "params_list": payload_params_list,
+                "rowcount": True,
+            },
+            {
+                "query": query,
+                "params_list": params_list,
+                "rowcount": True,
+            },
+        ]
+
+    def _convert_value(self, value: MessageValueType) -> tuple[bytes, str]:
+        if isinstance(value, str):
+            return value.encode("utf-8"), "text/plain"
+        elif isinstance(value, bytes):
+            return value, "application/octet-stream"
+        elif isinstance(value, dict):
+            return json.dumps(value).encode("utf-8"), "application/json"
+        elif isinstance(value, DataModel):
+            return value.to_json().encode("utf-8"), "application/json"
+        raise BadRequestError("Message type not supported")
 
     def convert_pull(
         self,
         topic: str,
         subscription: str,
+        lock_until_time: float,
+        lock_token: str,
+        count: int,
         subscription_config: SubscriptionConfig | None = None,
     ) -> dict:
         ttl = (
@@ -1419,58 +1883,91 @@ class OperationConverter:
             else DEFAULT_TTL
         )
         current_time = Time.now()
+        # Claim up to count messages in one statement. Each message
+        # gets its own lock token, derived from the token of the claim.
         query = f"""
-            SELECT id, topic, subscription, value, metadata,
-            message_id, group_id, content_type,
+            UPDATE {self.message_table}
+            SET lock_until_time = ?,
+            lock_token = ? || '-' || rowid,
+            delivery_count = delivery_count + 1
+            WHERE rowid IN (
+                SELECT rowid
+                FROM {self.message_table}
+                WHERE topic = ? AND subscription = ?
+                AND lock_until_time <= ?
+                AND enqueued_time <= ?
+                AND enqueued_time >= ?
+                ORDER BY enqueued_time
+                LIMIT ?
+            )
+            RETURNING id, topic, subscription, payload_id,
             enqueued_time, delivery_count,
             lock_until_time, lock_token
-            FROM {self.message_table}
-            WHERE topic = ? AND subscription = ?
-            AND lock_until_time <= ?
-            AND enqueued_time <= ?
-            AND enqueued_time >= ?
-            ORDER BY enqueued_time
-            LIMIT 1
             """
         params = (
+            lock_until_time,
+            lock_token,
             topic,
             subscription,
             current_time,
             current_time,
             current_time - ttl,
+            count,
         )
         return {
             "query": query,
             "params": params,
+            "fetchall": True,
         }
 
-    def convert_lock(
+    def convert_get_payloads(self, payload_ids: list[str]) -> dict:
+        query = f"""
+            SELECT id, value, metadata, message_id, group_id, content_type
+            FROM {self.payload_table}
+            WHERE id IN (SELECT value FROM json_each(?))
+            """
+        params = (json.dumps(payload_ids),)
+        return {
+            "query": query,
+            "params": params,
+            "fetchall": True,
+        }
+
+    def convert_expire(
         self,
-        id: str,
         topic: str,
         subscription: str,
-        lock_until_time: float,
-        lock_token: str,
-        previous_lock_token: str | None,
+        count: int,
+        subscription_config: SubscriptionConfig | None = None,
     ) -> dict:
+        ttl = (
+            subscription_config.ttl
+            if subscription_config and subscription_config.ttl
+            else DEFAULT_TTL
+        )
+        current_time = Time.now()
         query = f"""
-            UPDATE {self.message_table}
-            SET lock_until_time = ?, lock_token = ?,
-            delivery_count = delivery_count + 1
-            WHERE topic = ? AND subscription = ?
-            AND id = ? AND lock_token = ?
+            DELETE FROM {self.message_table}
+            WHERE rowid IN (
+                SELECT rowid
+                FROM {self.message_table}
+                WHERE topic = ? AND subscription = ?
+                AND enqueued_time < ?
+                AND lock_until_time <= ?
+                LIMIT ?
+            )
             """
         params = (
-            lock_until_time,
-            lock_token,
             topic,
             subscription,
-            id,
-            previous_lock_token,
+            current_time - ttl,
+            current_time,
+            count,
         )
         return {
             "query": query,
             "params": params,
+            "rowcount": True,
         }
 
     def convert_ack(
@@ -1510,6 +2007,79 @@ class OperationConverter:
             "rowcount": True,
         }
 
+    def convert_mack(
+        self,
+        topic: str,
+        subscription: str,
+        keys: list[MessageKey],
+    ) -> dict:
+        # The lock tokens are passed as one JSON parameter, which avoids
+        # the limit on the number of query parameters.
+        query = f"""
+            DELETE FROM {self.message_table}
+            WHERE topic = ? AND subscription = ?
+            AND lock_token IN (SELECT value FROM json_each(?))
+            RETURNING lock_token
+            """
+        params = (
+            topic,
+            subscription,
+            json.dumps([key.nref for key in keys]),
+        )
+        return {
+            "query": query,
+            "params": params,
+            "fetchall": True,
+        }
+
+    def convert_get_locks(
+        self,
+        topic: str,
+        subscription: str,
+        keys: list[MessageKey],
+    ) -> dict:
+        query = f"""
+            SELECT lock_token
+            FROM {self.message_table}
+            WHERE topic = ? AND subscription = ?
+            AND lock_token IN (SELECT value FROM json_each(?))
+            """
+        params = (
+            topic,
+            subscription,
+            json.dumps([key.nref for key in keys]),
+        )
+        return {
+            "query": query,
+            "params": params,
+            "fetchall": True,
+        }
+
+    def convert_mnack(
+        self,
+        topic: str,
+        subscription: str,
+        keys: list[MessageKey],
+    ) -> dict:
+        query = f"""
+            UPDATE {self.message_table}
+            SET lock_until_time = ?, lock_token = ?
+            WHERE topic = ? AND subscription = ?
+            AND lock_token IN (SELECT value FROM json_each(?))
+            """
+        params = (
+            0,
+            "",
+            topic,
+            subscription,
+            json.dumps([key.nref for key in keys]),
+        )
+        return {
+            "query": query,
+            "params": params,
+            "rowcount": True,
+        }
+
     def convert_extend(
         self,
         topic: str,
@@ -1556,8 +2126,20 @@ class OperationConverter:
 
 
 class ResultConverter:
-    def __init__(self):
-        pass
+    raw: bool
+
+    def __init__(self, raw: bool = False):
+        self.raw = raw
+
+    def _get_types(self) -> tuple[Any, Any, Any]:
+        # Records skip validation when raw results are requested.
+        if self.raw:
+            return (
+                MessageItem.record,
+                MessageKey.record,
+                MessageProperties.record,
+            )
+        return (MessageItem, MessageKey, MessageProperties)
 
     def _convert_value(
         self,
@@ -1587,30 +2169,40 @@ class ResultConverter:
     def convert_pull(
         self,
         nresult: Any,
+        payload: Any,
     ) -> MessageItem:
         id = nresult[0]
-        value = nresult[3]
-        metadata = nresult[4]
-        message_id = nresult[5]
-        group_id = nresult[6]
-        content_type = nresult[7]
-        enqueued_time = nresult[8]
-        delivery_count = nresult[9]
-        lock_token = nresult[11]
-
-        message = MessageItem(
-            key=MessageKey(id=id, nref=lock_token),
+        enqueued_time = nresult[4]
+        delivery_count = nresult[5]
+        lock_token = nresult[7]
+        value = payload[1]
+        metadata = payload[2]
+        message_id = payload[3]
+        group_id = payload[4]
+        content_type = payload[5]
+
+        item, key, properties = self._get_types()
+        message = item(
+            key=key(id=id, nref=lock_token),
             value=self._convert_value(
                 value,
                 content_type,
             ),
             metadata=json.loads(metadata) if metadata else None,
-            properties=MessageProperties(
+            properties=properties(
                 message_id=message_id,
                 group_id=group_id,
                 content_type=content_type,
                 enqueued_time=enqueued_time,
-                delivery_count=delivery_count + 1,
+                delivery_count=delivery_count,
             ),
         )
         return message
+
+    def convert_mack(
+        self,
+        keys: list[MessageKey],
+        nresult: Any,
+    ) -> list[bool]:
+        lock_tokens = {row[0] for row in nresult}
+        return [key.nref in lock_tokens for key in keys]
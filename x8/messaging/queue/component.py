@@ -1,6 +1,7 @@
 from typing import Any
 
 from x8.core import Component, Response, operation
+from x8.core.exceptions import BadRequestError, NotFoundError
 from x8.messaging._common import (
     MessageBatch,
     MessageItem,
@@ -221,6 +222,62 @@ class Queue(Component):
         """
         raise NotImplementedError
 
+    @operation()
+    def mack(
+        self,
+        keys: list[dict | MessageKey],
+        queue: str | None = None,
+    ) -> Response[list[bool]]:
+        """Acknowledge many messages in one call.
+
+        Args:
+            keys:
+                Message keys.
+            queue:
+                Queue name.
+
+        Returns:
+            A value for each key indicating whether the message was
+            acknowledged. False for the messages that were not found
+            or are no longer locked.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                self.ack(key=key, queue=queue)
+                result.append(True)
+            except (BadRequestError, NotFoundError):
+                result.append(False)
+        return Response(result=result)
+
+    @operation()
+    def mnack(
+        self,
+        keys: list[dict | MessageKey],
+        queue: str | None = None,
+    ) -> Response[list[bool]]:
+        """Abandon many messages in one call.
+
+        Args:
+            keys:
+                Message keys.
+            queue:
+                Queue name.
+
+        Returns:
+            A value for each key indicating whether the message was
+            abandoned. False for the messages that were not found
+            or are no longer locked.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                self.nack(key=key, queue=queue)
+                result.append(True)
+            except (BadRequestError, NotFoundError):
+                result.append(False)
+        return Response(result=result)
+
     @operation()
     def extend(
         self,
@@ -453,6 +510,62 @@ class Queue(Component):
         """
         raise NotImplementedError
 
+    @operation()
+    async def amack(
+        self,
+        keys: list[dict | MessageKey],
+        queue: str | None = None,
+    ) -> Response[list[bool]]:
+        """Acknowledge many messages in one call.
+
+        Args:
+            keys:
+                Message keys.
+            queue:
+                Queue name.
+
+        Returns:
+            A value for each key indicating whether the message was
+            acknowledged. False for the messages that were not found
+            or are no longer locked.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                await self.aack(key=key, queue=queue)
+                result.append(True)
+            except (BadRequestError, NotFoundError):
+                result.append(False)
+        return Response(result=result)
+
+    @operation()
+    async def amnack(
+        self,
+        keys: list[dict | MessageKey],
+        queue: str | None = None,
+    ) -> Response[list[bool]]:
+        """Abandon many messages in one call.
+
+        Args:
+            keys:
+                Message keys.
+            queue:
+                Queue name.
+
+        Returns:
+            A value for each key indicating whether the message was
+            abandoned. False for the messages that were not found
+            or are no longer locked.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                await self.anack(key=key, queue=queue)
+                result.append(True)
+            except (BadRequestError, NotFoundError):
+                result.append(False)
+        return Response(result=result)
+
     @operation()
     async def aextend(
         self,
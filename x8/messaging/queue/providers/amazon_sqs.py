@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import base64
 import json
-from typing import Any
+from typing import Any, Iterator
 
 import boto3
 from botocore.exceptions import ClientError
@@ -375,6 +375,9 @@ class AmazonSQS(Provider):
 
 
 class ClientHelper:
+    MAX_BATCH_SIZE = 10
+    MAX_BATCH_BYTES = 256 * 1024
+
     sqs_client: Any
     op_converter: OperationConverter
 
@@ -593,24 +596,38 @@ class ClientHelper:
 
             entries.append(entry)
 
-        response = NCall(
-            self.sqs_client.send_message_batch,
-            {"QueueUrl": queue_url, "Entries": entries},
-        ).invoke()
-
-        message_ids = []
-        for msg in response.get("Successful", []):
-            message_ids.append(msg.get("MessageId"))
-
-        if "Failed" in response and response["Failed"]:
-            for failed in response["Failed"]:
+        message_ids: dict[int, str] = {}
+        for chunk in self._chunk_entries(entries):
+            response = NCall(
+                self.sqs_client.send_message_batch,
+                {"QueueUrl": queue_url, "Entries": chunk},
+            ).invoke()
+            for msg in response.get("Successful", []):
+                message_ids[int(msg["Id"])] = msg.get("MessageId")
+            if response.get("Failed"):
                 raise BadRequestError(
-                    (
-                        f"Failed to send message {failed['Id']}: "
-                        f"{failed['Message']}"
-                    )
+                    _get_failed_message(response["Failed"], message_ids)
                 )
-        return message_ids
+        return [message_ids[i] for i in sorted(message_ids)]
+
+    def _chunk_entries(self, entries: list[dict]) -> Iterator[list[dict]]:
+        # Batches are limited both in number of entries and in total
+        # payload size.
+        chunk: list[dict] = []
+        size = 0
+        for entry in entries:
+            entry_size = _get_entry_size(entry, "MessageBody")
+            if chunk and (
+                len(chunk) == self.MAX_BATCH_SIZE
+                or size + entry_size > self.MAX_BATCH_BYTES
+            ):
+                yield chunk
+                chunk = []
+                size = 0
+            chunk.append(entry)
+            size += entry_size
+        if chunk:
+            yield chunk
 
     def purge(
         self,
@@ -880,3 +897,27 @@ class ResultConverter:
         for message in nresult["Messages"]:
             result.append(self._convert_message(message))
         return result
+
+
+def _get_entry_size(entry: dict, body: str) -> int:
+    # Counts the body and the attribute names, types and values, as
+    # the batch size limit does.
+    size = len(entry[body].encode("utf-8"))
+    for name, attribute in entry.get("MessageAttributes", {}).items():
+        size += len(name.encode("utf-8"))
+        size += len(attribute["DataType"].encode("utf-8"))
+        if "BinaryValue" in attribute:
+            size += len(attribute["BinaryValue"])
+        else:
+            size += len(attribute.get("StringValue", "").encode("utf-8"))
+    return size
+
+
+def _get_failed_message(failed: list[dict], sent: dict[int, str]) -> str:
+    # Entry ids are the positions of the messages in the batch.
+    errors = ", ".join(f"{item['Id']} ({item['Message']})" for item in failed)
+    sent_ids = ", ".join(str(i) for i in sorted(sent)) or "none"
+    return (
+        f"Failed to send messages {errors}. "
+        f"Messages sent: {sent_ids}. The others were not sent."
+    )
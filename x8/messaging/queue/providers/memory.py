@@ -23,7 +23,9 @@ class Memory(SQLiteBase):
             lock_duration:
                 Lock duration in seconds. Defaults to 30.
             poll_interval:
-                Poll interval in seconds. Defaults to 0.5.
+                Seconds between pulls while waiting for delayed
+                messages and expired locks. New messages wake up
+                waiting pulls right away. Defaults to 0.5.
             nparams:
                 Native parameters to SQLite client.
         """
@@ -14,9 +14,13 @@ class SQLite(SQLiteBase):
         database: str = ":memory:",
         queue: str | None = None,
         message_table: str = "message",
+        payload_table: str = "payload",
         metadata_table: str = "metadata",
         lock_duration: float = 30,
         poll_interval: float = 0.5,
+        busy_timeout: float = 5.0,
+        group_commit: bool = False,
+        pragmas: dict[str, Any] | None = None,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -29,12 +33,27 @@ class SQLite(SQLiteBase):
                 Queue name.
             message_table:
                 SQLite table name for messages.
+            payload_table:
+                SQLite table name for message payloads.
             metadata_table:
                 SQLite table name for metadata.
             lock_duration:
                 Lock duration in seconds. Defaults to 30.
             poll_interval:
-                Poll interval in seconds. Defaults to 0.5.
+                Seconds between pulls while waiting for delayed
+                messages and expired locks. New messages put in this
+                process wake up waiting pulls right away, and messages
+                put by other processes are seen within the interval.
+                Defaults to 0.5.
+            busy_timeout:
+                Seconds to wait for a lock held by another connection.
+                Defaults to 5.
+            group_commit:
+                Commit concurrent writes in one transaction.
+                Defaults to False.
+            pragmas:
+                SQLite pragmas that override the defaults
+                (WAL journal, synchronous NORMAL, larger cache and mmap).
             nparams:
                 Native parameters to SQLite client.
         """
@@ -43,9 +62,13 @@ class SQLite(SQLiteBase):
             database=database,
             queue=queue,
             message_table=message_table,
+            payload_table=payload_table,
             metadata_table=metadata_table,
             lock_duration=lock_duration,
             poll_interval=poll_interval,
+            busy_timeout=busy_timeout,
+            group_commit=group_commit,
+            pragmas=pragmas,
             nparams=nparams,
             **kwargs,
         )
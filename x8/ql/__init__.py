@@ -29,7 +29,8 @@ from ._models import (
     UpdateOperation,
     Value,
 )
-from ._ql_parser import QLParser
+from ._ql_parser import ParseCacheInfo, QLParser
+from ._query_compiler import QueryCompiler
 from ._query_processor import QueryProcessor
 
 __all__ = [
@@ -48,6 +49,7 @@ __all__ = [
     "OrderByDirection",
     "OrderByTerm",
     "Parameter",
+    "ParseCacheInfo",
     "Ref",
     "Select",
     "SelectTerm",
@@ -59,6 +61,7 @@ __all__ = [
     "QLParser",
     "QueryFunction",
     "QueryFunctionName",
+    "QueryCompiler",
     "QueryProcessor",
     "TextSearchMatchMode",
     "TextSearchQueryType",
@@ -0,0 +1,366 @@
+import re
+from decimal import Decimal
+from typing import Any
+
+from ._models import (
+    And,
+    Comparison,
+    ComparisonOp,
+    Field,
+    Function,
+    Not,
+    Or,
+    OrderBy,
+    OrderByDirection,
+    OrderByTerm,
+    Parameter,
+    Select,
+    SelectTerm,
+)
+
+UNSUPPORTED = object()
+
+_TOKEN = re.compile(
+    r"(?P<ws>[ \t\r\n\x0b]+)"
+    r"|(?P<comment>--|/)"
+    r"|(?P<num>[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<id>[A-Za-z$_][A-Za-z0-9_-]*)"
+    r"|(?P<str>'[^'\\\x00-\x1f\x7f]*'|\"[^\"\\\x00-\x1f\x7f]*\")"
+    r"|(?P<punct><=|>=|<>|!=|[<>=,.()\[\]@*-])"
+)
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+_KEYWORDS = {
+    "AND",
+    "AS",
+    "ASC",
+    "BETWEEN",
+    "BY",
+    "COLLECTION",
+    "DESC",
+    "END",
+    "FALSE",
+    "FROM",
+    "IN",
+    "INTO",
+    "NOT",
+    "NULL",
+    "OR",
+    "ORDER",
+    "RANK",
+    "SEARCH",
+    "SELECT",
+    "SET",
+    "TRUE",
+    "WHERE",
+}
+# Keywords that the grammar also accepts as identifiers.
+_IDENTIFIERS = {
+    "id",
+    "SELECT",
+    "FROM",
+    "INTO",
+    "COLLECTION",
+    "ORDER",
+    "BY",
+    "WHERE",
+    "SEARCH",
+    "SET",
+    "ASC",
+    "DESC",
+    "RANK",
+}
+_COMPARISON_OPS = {"=", "!=", "<>", "<", "<=", ">", ">="}
+_EXPRESSION_TYPES = {"where", "search", "rank_by"}
+
+
+class FastParser:
+    """Recursive descent parser for the common X8QL fragments.
+
+    Handles where, search and rank_by expressions made of comparisons,
+    AND/OR/NOT, BETWEEN, IN and function calls, and select and order_by
+    lists, producing the same tree as the ANTLR parser. Anything else,
+    including any syntax error, returns UNSUPPORTED so that the ANTLR
+    parser handles it and reports the error.
+    """
+
+    @staticmethod
+    def parse(str: str, type: str) -> Any:
+        if type not in _EXPRESSION_TYPES and type not in (
+            "select",
+            "order_by",
+        ):
+            return UNSUPPORTED
+        try:
+            parser = _Parser(_tokenize(str))
+            if type == "select":
+                obj = parser.select()
+            elif type == "order_by":
+                obj = parser.order_by()
+            else:
+                obj = parser.expression()
+            parser.expect("eof")
+            return obj
+        except (_Unsupported, ValueError, TypeError, RecursionError):
+            return UNSUPPORTED
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _tokenize(source: str) -> list[tuple[str, str]]:
+    tokens = []
+    pos = 0
+    end = len(source)
+    while pos < end:
+        match = _TOKEN.match(source, pos)
+        if match is None:
+            raise _Unsupported
+        kind = str(match.lastgroup)
+        text = match.group()
+        pos = match.end()
+        if kind == "ws":
+            continue
+        if kind == "comment":
+            raise _Unsupported
+        if kind == "id":
+            keyword = text.upper()
+            if keyword in _KEYWORDS:
+                kind = keyword
+        elif kind == "punct":
+            kind = text
+        tokens.append((kind, text))
+    tokens.append(("eof", ""))
+    return tokens
+
+
+class _Parser:
+    tokens: list[tuple[str, str]]
+    pos: int
+
+    def __init__(self, tokens: list[tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> str:
+        index = min(self.pos + offset, len(self.tokens) - 1)
+        return self.tokens[index][0]
+
+    def next(self) -> tuple[str, str]:
+        token = self.tokens[self.pos]
+        if token[0] != "eof":
+            self.pos += 1
+        return token
+
+    def expect(self, kind: str) -> str:
+        token = self.next()
+        if token[0] != kind:
+            raise _Unsupported
+        return token[1]
+
+    def expression(self) -> Any:
+        lexpr = self.and_expression()
+        while self.peek() == "OR":
+            self.next()
+            lexpr = Or(lexpr=lexpr, rexpr=self.and_expression())
+        return lexpr
+
+    def and_expression(self) -> Any:
+        lexpr = self.not_expression()
+        while self.peek() == "AND":
+            self.next()
+            lexpr = And(lexpr=lexpr, rexpr=self.not_expression())
+        return lexpr
+
+    def not_expression(self) -> Any:
+        if self.peek() == "NOT":
+            self.next()
+            return Not(expr=self.not_expression())
+        return self.primary()
+
+    def primary(self) -> Any:
+        if self.peek() == "(":
+            self.next()
+            expr = self.expression()
+            self.expect(")")
+            return expr
+        lhs = self.operand()
+        kind = self.peek()
+        if kind in _COMPARISON_OPS:
+            op = self.next()[1]
+            return Comparison(
+                lexpr=lhs, op=ComparisonOp(op), rexpr=self.operand()
+            )
+        if kind == "BETWEEN":
+            self.next()
+            low = self.operand()
+            self.expect("AND")
+            high = self.operand()
+            return Comparison(
+                lexpr=lhs, op=ComparisonOp.BETWEEN, rexpr=[low, high]
+            )
+        if kind == "IN" or (kind == "NOT" and self.peek(1) == "IN"):
+            op = ComparisonOp.IN
+            if kind == "NOT":
+                self.next()
+                op = ComparisonOp.NIN
+            self.next()
+            self.expect("(")
+            args = [self.operand()]
+            while self.peek() == ",":
+                self.next()
+                args.append(self.operand())
+            self.expect(")")
+            return Comparison(lexpr=lhs, op=op, rexpr=args)
+        return lhs
+
+    def operand(self) -> Any:
+        kind = self.peek()
+        if kind == "@":
+            return self.parameter()
+        if kind in _IDENTIFIERS:
+            if self.peek(1) == "(":
+                return self.function(None)
+            if (
+                self.peek(1) == "."
+                and self.peek(2) in _IDENTIFIERS
+                and self.peek(3) == "("
+            ):
+                namespace = self.next()[1]
+                self.next()
+                return self.function(namespace)
+            return Field(path=self.field())
+        return self.value()
+
+    def value(self) -> Any:
+        kind, text = self.next()
+        if kind == "num":
+            return _number(text)
+        if kind == "str":
+            return text[1:-1]
+        if kind == "NULL":
+            return None
+        if kind == "TRUE":
+            return True
+        if kind == "FALSE":
+            return False
+        if kind == "[":
+            return self.array()
+        raise _Unsupported
+
+    def array(self) -> list:
+        # The grammar reads arrays that are valid JSON as JSON,
+        # which only gives the same values for JSON numbers.
+        items: list = []
+        if self.peek() == "]":
+            self.next()
+            return items
+        while True:
+            kind, text = self.tokens[self.pos]
+            if kind == "num" and not _JSON_NUMBER.fullmatch(text):
+                raise _Unsupported
+            items.append(self.value())
+            if self.peek() != ",":
+                break
+            self.next()
+        self.expect("]")
+        return items
+
+    def function(self, namespace: str | None) -> Function:
+        name = self.next()[1].lower()
+        self.expect("(")
+        if self.peek() == ")":
+            if namespace is not None:
+                raise _Unsupported
+            self.next()
+            return Function(name=name)
+        if self.peek() in _IDENTIFIERS and self.peek(1) == "=":
+            if namespace is not None:
+                raise _Unsupported
+            named_args = dict()
+            while True:
+                arg = self.identifier()
+                self.expect("=")
+                named_args[arg] = self.operand()
+                if self.peek() != ",":
+                    break
+                self.next()
+            self.expect(")")
+            return Function(name=name, named_args=named_args)
+        args = [self.operand()]
+        while self.peek() == ",":
+            self.next()
+            args.append(self.operand())
+        self.expect(")")
+        if namespace is None:
+            return Function(name=name, args=args)
+        return Function(name=name, args=args, namespace=namespace.lower())
+
+    def parameter(self) -> Parameter:
+        self.expect("@")
+        return Parameter(name=self.identifier())
+
+    def identifier(self) -> str:
+        kind, text = self.next()
+        if kind not in _IDENTIFIERS:
+            raise _Unsupported
+        return text
+
+    def field(self) -> str:
+        parts = [self.identifier()]
+        while True:
+            kind = self.peek()
+            if kind == ".":
+                self.next()
+                parts.append(".")
+                parts.append(self.identifier())
+            elif kind == "[":
+                self.next()
+                kind, text = self.next()
+                if kind not in ("num", "str", "-"):
+                    raise _Unsupported
+                self.expect("]")
+                parts.append(f"[{text}]")
+            else:
+                return "".join(parts)
+
+    def select(self) -> Any:
+        if self.peek() == "*":
+            self.next()
+            return Select()
+        if self.peek() == "@":
+            return self.parameter()
+        terms = []
+        while True:
+            field = self.field()
+            alias = None
+            if self.peek() == "AS":
+                self.next()
+                alias = self.field()
+            terms.append(SelectTerm(field=field, alias=alias))
+            if self.peek() != ",":
+                break
+            self.next()
+        return Select(terms=terms)
+
+    def order_by(self) -> Any:
+        if self.peek() == "@":
+            return self.parameter()
+        terms = []
+        while True:
+            field = self.field()
+            direction = None
+            if self.peek() in ("ASC", "DESC"):
+                direction = OrderByDirection(self.next()[1].lower())
+            terms.append(OrderByTerm(field=field, direction=direction))
+            if self.peek() != ",":
+                break
+            self.next()
+        return OrderBy(terms=terms)
+
+
+def _number(text: str) -> int | float:
+    if "." in text or "e" in text or "E" in text:
+        return float(Decimal(text))
+    return int(text)
@@ -4,6 +4,8 @@ import json
 from enum import Enum
 from typing import Any, Union
 
+from pydantic import ConfigDict
+
 from x8.core.data_model import DataModel
 
 
@@ -20,6 +22,8 @@ class Parameter(DataModel):
         name: Parameter name.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
 
     def __str__(self) -> str:
@@ -33,6 +37,8 @@ class Ref(DataModel):
         path: Ref path.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     path: str
 
     def __str__(self) -> str:
@@ -65,6 +71,8 @@ class Function(DataModel):
         namespace: Function namespace.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     namespace: str = FunctionNamespace.BUILTIN
     name: str
     args: list = []
@@ -103,6 +111,8 @@ class Field(DataModel):
         path: Field path.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     path: str
 
     def __str__(self) -> str:
@@ -116,6 +126,8 @@ class Collection(DataModel):
         name: Collection name.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
 
     def __str__(self) -> str:
@@ -131,6 +143,8 @@ class Comparison(DataModel):
         rexpr: Right expression.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     lexpr: Expression
     op: ComparisonOp
     rexpr: Expression
@@ -197,6 +211,8 @@ class And(DataModel):
         rexpr: Right expression.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     lexpr: Expression
     rexpr: Expression
 
@@ -212,6 +228,8 @@ class Or(DataModel):
         rexpr: Right expression.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     lexpr: Expression
     rexpr: Expression
 
@@ -226,6 +244,8 @@ class Not(DataModel):
         expr: Expression.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     expr: Expression
 
     def __str__(self) -> str:
@@ -343,6 +363,8 @@ class UpdateOperation(DataModel):
         args: Update args.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     field: str
     op: UpdateOp
     args: list = []
@@ -426,6 +448,8 @@ class SelectTerm(DataModel):
         alias: Field alias.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     field: str
     alias: str | None
 
@@ -465,6 +489,8 @@ class OrderByTerm(DataModel):
         direction: Order by direction.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     field: str
     direction: OrderByDirection | None = None
 
@@ -1,128 +1,194 @@
-import copy
-from functools import lru_cache
+from collections import OrderedDict
+from threading import Lock
 from typing import Any
 
-from antlr4 import CommonTokenStream  # type: ignore
-from antlr4 import InputStream  # type: ignore
-from antlr4 import ParseTreeWalker  # type: ignore
-from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
-
 from x8.core._operation import Operation
+from x8.core.data_model import DataModel
 
+from ._fast_parser import UNSUPPORTED, FastParser
 from ._models import Collection, Expression, OrderBy, Select, Update
-from ._parser_listener import X8QLParserListener  # type: ignore
-from .exceptions import ParserError
-from .generated.X8QLLexer import X8QLLexer  # type: ignore
-from .generated.X8QLParser import X8QLParser  # type: ignore
+
+
+class ParseCacheInfo(DataModel):
+    """Parse cache statistics.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to be parsed.
+        evictions: Entries dropped to stay within maxsize.
+        size: Current number of entries.
+        maxsize: Maximum number of entries.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class ParseCache:
+    """Least recently used cache of parse results.
+
+    Expression nodes are frozen, so the cached trees are shared by all
+    callers instead of being copied.
+    """
+
+    maxsize: int
+
+    _data: OrderedDict[tuple[str, str], Any]
+    _lock: Lock
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple[str, str]) -> tuple[bool, Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def put(self, key: tuple[str, str], value: Any) -> None:
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def info(self) -> ParseCacheInfo:
+        with self._lock:
+            return ParseCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+    def _evict(self) -> None:
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self._evictions += 1
 
 
 class QLParser:
-    @lru_cache
+    cache: ParseCache = ParseCache()
+
     @staticmethod
     def parse(str: str, type: str) -> Any:
-        obj = None
         if str is None:
             return None
-        parser = QLParser._get_parser(str=str)
-        if type == "statement":
-            tree = parser.parse_statement()
-            listener = QLParser._get_listener(tree)
-            obj = listener.operation
-        elif type == "where":
-            tree = parser.parse_where()
-            listener = QLParser._get_listener(tree)
-            obj = listener.where
-        elif type == "select":
-            tree = parser.parse_select()
-            listener = QLParser._get_listener(tree)
-            obj = listener.select
-        elif type == "collection":
-            tree = parser.parse_collection()
-            listener = QLParser._get_listener(tree)
-            obj = listener.collection
-        elif type == "order_by":
-            tree = parser.parse_order_by()
-            listener = QLParser._get_listener(tree)
-            obj = listener.order_by
-        elif type == "rank_by":
-            tree = parser.parse_rank_by()
-            listener = QLParser._get_listener(tree)
-            obj = listener.rank_by
-        elif type == "search":
-            tree = parser.parse_search()
-            listener = QLParser._get_listener(tree)
-            obj = listener.search
-        elif type == "update":
-            tree = parser.parse_update()
-            listener = QLParser._get_listener(tree)
-            obj = listener.update
-        return obj
+        key = (type, str)
+        found, obj = QLParser.cache.get(key)
+        if not found:
+            obj = QLParser._parse(str, type)
+            QLParser.cache.put(key, obj)
+        return QLParser._share(obj)
+
+    @staticmethod
+    def configure_cache(maxsize: int) -> None:
+        """Set the number of parse results kept in the cache.
+
+        Args:
+            maxsize:
+                Maximum number of entries. 0 disables the cache.
+        """
+        QLParser.cache.resize(maxsize)
+
+    @staticmethod
+    def cache_info() -> ParseCacheInfo:
+        return QLParser.cache.info()
+
+    @staticmethod
+    def clear_cache() -> None:
+        QLParser.cache.clear()
 
     @staticmethod
     def parse_statement(str: str) -> Operation | None:
-        return copy.deepcopy(QLParser.parse(str, "statement"))
+        return QLParser.parse(str, "statement")
 
     @staticmethod
     def parse_where(str: str) -> Expression:
-        return copy.deepcopy(QLParser.parse(str, "where"))
+        return QLParser.parse(str, "where")
 
     @staticmethod
     def parse_select(str: str) -> Select | None:
-        return copy.deepcopy(QLParser.parse(str, "select"))
+        return QLParser.parse(str, "select")
 
     @staticmethod
     def parse_collection(str: str) -> Collection | None:
-        return copy.deepcopy(QLParser.parse(str, "collection"))
+        return QLParser.parse(str, "collection")
 
     @staticmethod
     def parse_order_by(str: str) -> OrderBy | None:
-        return copy.deepcopy(QLParser.parse(str, "order_by"))
+        return QLParser.parse(str, "order_by")
 
     @staticmethod
     def parse_rank_by(str: str) -> Expression | None:
-        return copy.deepcopy(QLParser.parse(str, "rank_by"))
+        return QLParser.parse(str, "rank_by")
 
     @staticmethod
     def parse_search(str: str) -> Expression:
-        return copy.deepcopy(QLParser.parse(str, "search"))
+        return QLParser.parse(str, "search")
 
     @staticmethod
     def parse_update(str: str) -> Update | None:
-        return copy.deepcopy(QLParser.parse(str, "update"))
+        return QLParser.parse(str, "update")
 
     @staticmethod
-    def _get_listener(tree) -> X8QLParserListener:
-        listener = X8QLParserListener()
-        walker = ParseTreeWalker()
-        walker.walk(listener, tree)
-        return listener
+    def _parse(str: str, type: str) -> Any:
+        obj = FastParser.parse(str, type)
+        if obj is not UNSUPPORTED:
+            return obj
+        # The generated parser is large, so it is only imported
+        # once a string needs it.
+        from ._antlr_parser import AntlrParser
+
+        return AntlrParser.parse(str, type)
 
     @staticmethod
-    def _get_parser(str: str) -> X8QLParser:
-        input_stream = InputStream(str)
-        lexer = X8QLLexer(input_stream)
-        stream = CommonTokenStream(lexer)
-        parser = X8QLParser(stream)
-        parser.removeErrorListener(ConsoleErrorListener.INSTANCE)
-        parser.addErrorListener(ParserErrorListener())
-        return parser
-
-
-class ParserErrorListener(ErrorListener):
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
-        raise ParserError("line " + str(line) + ":" + str(column) + " " + msg)
-
-    def reportAmbiguity(
-        self, recognizer, dfa, startIndex, stopIndex, exact, ambigAlts, configs
-    ):
-        pass
-
-    def reportAttemptingFullContext(
-        self, recognizer, dfa, startIndex, stopIndex, conflictingAlts, configs
-    ):
-        pass
-
-    def reportContextSensitivity(
-        self, recognizer, dfa, startIndex, stopIndex, prediction, configs
-    ):
-        pass
+    def _share(obj: Any) -> Any:
+        # Expression nodes are frozen and returned as they are.
+        # Select, OrderBy, Update and Operation can be changed by
+        # their owner, so each caller gets its own shallow copy.
+        if isinstance(obj, Select):
+            return obj.model_copy(update={"terms": list(obj.terms)})
+        if isinstance(obj, OrderBy):
+            return obj.model_copy(update={"terms": list(obj.terms)})
+        if isinstance(obj, Update):
+            return obj.model_copy(update={"operations": list(obj.operations)})
+        if isinstance(obj, Operation):
+            if obj.args is None:
+                return obj.model_copy()
+            return obj.model_copy(update={"args": QLParser._share(obj.args)})
+        if isinstance(obj, dict):
+            return {k: QLParser._share(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [QLParser._share(v) for v in obj]
+        return obj
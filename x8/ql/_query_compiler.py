@@ -0,0 +1,473 @@
+import operator
+import re
+from typing import Any, Callable
+
+from x8.core._data_accessor import DataAccessor
+from x8.core.exceptions import BadRequestError
+
+from ._functions import QueryFunctionName
+from ._models import (
+    And,
+    Comparison,
+    ComparisonOp,
+    Expression,
+    Field,
+    Function,
+    FunctionNamespace,
+    Not,
+    Or,
+    OrderBy,
+    OrderByDirection,
+    Select,
+    Undefined,
+    UpdateOp,
+)
+
+Evaluator = Callable[[Any], Any]
+
+
+class QueryCompiler:
+    """Compiles query ASTs into plain Python callables.
+
+    Field paths are split and resolved once, constant operands are
+    hoisted out of the per-item closures and LIKE patterns are
+    compiled up front. The compiled callables evaluate exactly like
+    ``QueryProcessor.eval_expr`` and friends.
+    """
+
+    @staticmethod
+    def compile_where(
+        where: Expression,
+        field_resolver: Callable | None = None,
+    ) -> Callable[[Any], bool]:
+        evaluator = QueryCompiler.compile_expr(where, field_resolver)
+
+        def predicate(item: Any) -> bool:
+            return bool(evaluator(item))
+
+        return predicate
+
+    @staticmethod
+    def compile_order_by(
+        order_by: OrderBy,
+        field_resolver: Callable | None = None,
+    ) -> tuple[Callable[[Any], bool], Callable[[Any], Any]]:
+        """Compile order by terms.
+
+        Null values sort before any other value, as they do in
+        the stores.
+
+        Returns:
+            A predicate that is true when every order by field
+            is defined on the item, and the sort key function.
+        """
+        fields = [
+            QueryCompiler.compile_field(term.field, field_resolver)
+            for term in order_by.terms
+        ]
+        getters = [_null_first(field) for field in fields]
+        directions = [term.direction for term in order_by.terms]
+
+        def is_defined(item: Any) -> bool:
+            for field in fields:
+                if isinstance(field(item), Undefined):
+                    return False
+            return True
+
+        key: Callable[[Any], Any]
+        if OrderByDirection.DESC not in directions:
+            if len(getters) == 1:
+                key = getters[0]
+            else:
+
+                def key(item: Any) -> Any:
+                    return tuple(getter(item) for getter in getters)
+
+        else:
+            wrapped = [
+                (
+                    (getter, DescFieldComparer)
+                    if direction == OrderByDirection.DESC
+                    else (getter, AscFieldComparer)
+                )
+                for getter, direction in zip(getters, directions)
+            ]
+
+            def key(item: Any) -> Any:
+                return tuple(
+                    comparer(getter(item)) for getter, comparer in wrapped
+                )
+
+        return is_defined, key
+
+    @staticmethod
+    def compile_select(
+        select: Select,
+        field_resolver: Callable | None = None,
+    ) -> Callable[[Any], Any]:
+        if select.terms is None or len(select.terms) == 0:
+            return _identity
+        terms: list[tuple[Evaluator, str, bool]] = []
+        for term in select.terms:
+            alias = term.alias if term.alias is not None else term.field
+            if field_resolver is not None:
+                alias = field_resolver(alias)
+            simple = len(DataAccessor.split_field(alias)) == 1
+            terms.append(
+                (
+                    QueryCompiler.compile_field(term.field, field_resolver),
+                    alias,
+                    simple,
+                )
+            )
+
+        def project(item: Any) -> Any:
+            result: dict = dict()
+            for getter, alias, simple in terms:
+                val = getter(item)
+                if isinstance(val, Undefined):
+                    continue
+                if simple:
+                    result[alias] = val
+                else:
+                    DataAccessor.update_field(result, alias, UpdateOp.PUT, val)
+            return result
+
+        return project
+
+    @staticmethod
+    def compile_field(
+        path: str,
+        field_resolver: Callable | None = None,
+    ) -> Evaluator:
+        if field_resolver is not None:
+            path = field_resolver(path)
+        return DataAccessor.compile_get_field(path)
+
+    @staticmethod
+    def compile_expr(
+        expr: Expression,
+        field_resolver: Callable | None = None,
+    ) -> Evaluator:
+        if expr is None:
+            return _true
+        if isinstance(expr, (bool, int, float, str, list, dict)):
+            return _constant(expr)
+        if isinstance(expr, Field):
+            return QueryCompiler.compile_field(expr.path, field_resolver)
+        if isinstance(expr, Function):
+            return QueryCompiler._compile_function(expr, field_resolver)
+        if isinstance(expr, Comparison):
+            return QueryCompiler._compile_comparison(expr, field_resolver)
+        if isinstance(expr, And):
+            land = QueryCompiler.compile_expr(expr.lexpr, field_resolver)
+            rand = QueryCompiler.compile_expr(expr.rexpr, field_resolver)
+            return lambda item: bool(land(item)) and bool(rand(item))
+        if isinstance(expr, Or):
+            lor = QueryCompiler.compile_expr(expr.lexpr, field_resolver)
+            ror = QueryCompiler.compile_expr(expr.rexpr, field_resolver)
+            return lambda item: bool(lor(item)) or bool(ror(item))
+        if isinstance(expr, Not):
+            nexpr = QueryCompiler.compile_expr(expr.expr, field_resolver)
+            return lambda item: not bool(nexpr(item))
+        return _error(f"Expression {str(expr)} not supported")
+
+    @staticmethod
+    def _compile_comparison(
+        expr: Comparison,
+        field_resolver: Callable | None = None,
+    ) -> Evaluator:
+        lexpr = QueryCompiler.compile_expr(expr.lexpr, field_resolver)
+        rexpr = QueryCompiler.compile_expr(expr.rexpr, field_resolver)
+        op = expr.op
+        if op in _ORDERING_OPS:
+            compare = _ORDERING_OPS[op]
+
+            def ordering(item: Any) -> bool:
+                lval = lexpr(item)
+                rval = rexpr(item)
+                if isinstance(lval, str) and isinstance(rval, str):
+                    return compare(lval, rval)
+                if isinstance(lval, (int, float)) and isinstance(
+                    rval, (int, float)
+                ):
+                    return compare(lval, rval)
+                return False
+
+            return ordering
+        if op == ComparisonOp.EQ:
+            if _is_constant(expr.rexpr):
+                rconst = expr.rexpr
+                return lambda item: lexpr(item) == rconst
+            return lambda item: lexpr(item) == rexpr(item)
+        if op == ComparisonOp.NEQ:
+            if _is_constant(expr.rexpr):
+                rconst = expr.rexpr
+                return lambda item: lexpr(item) != rconst
+            return lambda item: lexpr(item) != rexpr(item)
+        if op == ComparisonOp.BETWEEN:
+
+            def between(item: Any) -> bool:
+                lval = lexpr(item)
+                rval = rexpr(item)
+                if isinstance(rval, list):
+                    rval1 = rval[0]
+                    rval2 = rval[1]
+                    if (
+                        isinstance(lval, str)
+                        and isinstance(rval1, str)
+                        and isinstance(rval2, str)
+                    ):
+                        return lval >= rval1 and lval <= rval2
+                    if (
+                        isinstance(lval, (int, float))
+                        and isinstance(rval1, (int, float))
+                        and isinstance(rval2, (int, float))
+                    ):
+                        return lval >= rval1 and lval <= rval2
+                    return False
+                raise BadRequestError(
+                    "Right operand for BETWEEN must be a list with two values"
+                )
+
+            return between
+        if op == ComparisonOp.IN or op == ComparisonOp.NIN:
+            negate = op == ComparisonOp.NIN
+            message = (
+                "Right operand for NOT IN comparison must be a list"
+                if negate
+                else "Right operand for IN comparison must be a list"
+            )
+            if (
+                isinstance(expr.rexpr, list)
+                and len(expr.rexpr) > 0
+                and all(isinstance(v, str) for v in expr.rexpr)
+            ):
+                lookup = frozenset(expr.rexpr)
+
+                def str_membership(item: Any) -> bool:
+                    lval = lexpr(item)
+                    found = isinstance(lval, str) and lval in lookup
+                    return not found if negate else found
+
+                return str_membership
+
+            def membership(item: Any) -> bool:
+                lval = lexpr(item)
+                rval = rexpr(item)
+                if isinstance(rval, list):
+                    return (lval not in rval) if negate else (lval in rval)
+                raise BadRequestError(message)
+
+            return membership
+        if op == ComparisonOp.LIKE:
+            if isinstance(expr.rexpr, str):
+                pattern = re.compile(expr.rexpr)
+
+                def like_compiled(item: Any) -> bool:
+                    lval = lexpr(item)
+                    if isinstance(lval, str):
+                        return bool(pattern.match(lval))
+                    return False
+
+                return like_compiled
+
+            def like(item: Any) -> bool:
+                lval = lexpr(item)
+                rval = rexpr(item)
+                if isinstance(lval, str) and isinstance(rval, str):
+                    return bool(re.match(rval, lval))
+                return False
+
+            return like
+        return _error("Comparison not supported")
+
+    @staticmethod
+    def _compile_function(
+        expr: Function,
+        field_resolver: Callable | None = None,
+    ) -> Evaluator:
+        if expr.namespace != FunctionNamespace.BUILTIN:
+            return _error("Function not supported")
+        name = expr.name
+        if name == QueryFunctionName.EXISTS:
+            return lambda item: item is not None
+        if name == QueryFunctionName.NOT_EXISTS:
+            return lambda item: item is None
+        if name == QueryFunctionName.RANDOM:
+            import random
+
+            return lambda item: random.random()
+        if name == QueryFunctionName.NOW:
+            from datetime import datetime, timezone
+
+            return lambda item: datetime.now(timezone.utc).strftime(
+                "%Y-%m-%d %H:%M:%S.%f%z"
+            )
+        if name not in _ARG_FUNCTIONS:
+            return _error(f"Function {expr.name} not supported")
+
+        args = [
+            QueryCompiler.compile_expr(arg, field_resolver)
+            for arg in expr.args[: _ARG_FUNCTIONS[name]]
+        ]
+        if len(args) < _ARG_FUNCTIONS[name]:
+            return _error(f"Function {expr.name} not supported")
+        arg0 = args[0]
+        if name == QueryFunctionName.IS_TYPE:
+            type = expr.args[1]
+            if not isinstance(type, str):
+                return _error(
+                    "type in IS_TYPE function must be specified as a string"
+                )
+            if type not in _TYPE_CHECKS:
+                return _error("Unknown type passed to IS_TYPE function")
+            check = _TYPE_CHECKS[type]
+            return lambda item: check(arg0(item))
+        if name == QueryFunctionName.IS_DEFINED:
+            return lambda item: not isinstance(arg0(item), Undefined)
+        if name == QueryFunctionName.IS_NOT_DEFINED:
+            return lambda item: isinstance(arg0(item), Undefined)
+        if name == QueryFunctionName.LENGTH:
+
+            def length(item: Any) -> int:
+                val = arg0(item)
+                return len(val) if isinstance(val, str) else 0
+
+            return length
+        if name == QueryFunctionName.ARRAY_LENGTH:
+
+            def array_length(item: Any) -> int:
+                val = arg0(item)
+                return len(val) if isinstance(val, list) else 0
+
+            return array_length
+
+        arg1 = args[1]
+        if name == QueryFunctionName.CONTAINS:
+
+            def contains(item: Any) -> bool:
+                val1 = arg0(item)
+                val2 = arg1(item)
+                if isinstance(val1, str) and isinstance(val2, str):
+                    return val2 in val1
+                return False
+
+            return contains
+        if name == QueryFunctionName.STARTS_WITH:
+
+            def starts_with(item: Any) -> bool:
+                val1 = arg0(item)
+                val2 = arg1(item)
+                if isinstance(val1, str) and isinstance(val2, str):
+                    return val1.startswith(val2)
+                return False
+
+            return starts_with
+        if name == QueryFunctionName.ARRAY_CONTAINS:
+
+            def array_contains(item: Any) -> bool:
+                val1 = arg0(item)
+                if isinstance(val1, list):
+                    return arg1(item) in val1
+                return False
+
+            return array_contains
+
+        def array_contains_any(item: Any) -> bool:
+            val1 = arg0(item)
+            val2 = arg1(item)
+            if isinstance(val1, list) and isinstance(val2, list):
+                for value in val2:
+                    if value in val1:
+                        return True
+            return False
+
+        return array_contains_any
+
+
+class AscFieldComparer:
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __eq__(self, other):
+        return self.obj == other.obj
+
+    def __lt__(self, other):
+        return self.obj < other.obj
+
+
+class DescFieldComparer:
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __eq__(self, other):
+        return self.obj == other.obj
+
+    def __lt__(self, other):
+        return self.obj > other.obj
+
+
+_ORDERING_OPS: dict[ComparisonOp, Callable[[Any, Any], bool]] = {
+    ComparisonOp.LT: operator.lt,
+    ComparisonOp.LTE: operator.le,
+    ComparisonOp.GT: operator.gt,
+    ComparisonOp.GTE: operator.ge,
+}
+
+# Number of positional args evaluated for builtin functions.
+_ARG_FUNCTIONS: dict[str, int] = {
+    QueryFunctionName.IS_TYPE: 2,
+    QueryFunctionName.IS_DEFINED: 1,
+    QueryFunctionName.IS_NOT_DEFINED: 1,
+    QueryFunctionName.LENGTH: 1,
+    QueryFunctionName.ARRAY_LENGTH: 1,
+    QueryFunctionName.CONTAINS: 2,
+    QueryFunctionName.STARTS_WITH: 2,
+    QueryFunctionName.ARRAY_CONTAINS: 2,
+    QueryFunctionName.ARRAY_CONTAINS_ANY: 2,
+}
+
+_TYPE_CHECKS: dict[str, Callable[[Any], bool]] = {
+    "string": lambda val: isinstance(val, str),
+    "number": lambda val: isinstance(val, (int, float)),
+    "boolean": lambda val: isinstance(val, bool),
+    "array": lambda val: isinstance(val, list),
+    "object": lambda val: isinstance(val, dict),
+    "null": lambda val: val is None,
+}
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _true(item: Any) -> bool:
+    return True
+
+
+def _constant(value: Any) -> Evaluator:
+    return lambda item: value
+
+
+def _error(message: str) -> Evaluator:
+    def raise_error(item: Any) -> Any:
+        raise BadRequestError(message)
+
+    return raise_error
+
+
+def _null_first(getter: Evaluator) -> Evaluator:
+    def key(item: Any) -> Any:
+        value = getter(item)
+        return value is not None, value
+
+    return key
+
+
+def _is_constant(expr: Expression) -> bool:
+    return isinstance(expr, (bool, int, float, str, list, dict))
@@ -1,6 +1,8 @@
 import copy
+import heapq
+import itertools
 import re
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Iterator
 
 from x8.core._data_accessor import DataAccessor
 from x8.core.exceptions import BadRequestError
@@ -17,7 +19,6 @@ from ._models import (
     Not,
     Or,
     OrderBy,
-    OrderByDirection,
     Select,
     Undefined,
     Update,
@@ -26,24 +27,23 @@ from ._models import (
     Value,
 )
 from ._ql_parser import QLParser
+from ._query_compiler import QueryCompiler
 
 
 class QueryProcessor:
     @staticmethod
     def count_items(
-        items: list[Any],
+        items: Iterable[Any],
         where: str | Expression | None = None,
         field_resolver: Callable | None = None,
     ) -> int:
-        current_items = items
-        current_items = QueryProcessor.filter_items(
-            current_items, where, field_resolver
+        return sum(
+            1 for _ in QueryProcessor.iter_items(items, where, field_resolver)
         )
-        return len(current_items)
 
     @staticmethod
     def query_items(
-        items: list[Any],
+        items: Iterable[Any],
         select: str | Select | None = None,
         where: str | Expression | None = None,
         order_by: str | OrderBy | None = None,
@@ -51,32 +51,68 @@ class QueryProcessor:
         offset: int | None = None,
         field_resolver: Callable | None = None,
     ) -> list[Any]:
-        current_items = items
-        current_items = QueryProcessor.filter_items(
-            current_items, where, field_resolver
-        )
-        current_items = QueryProcessor.order_items(
-            current_items, order_by, field_resolver
+        start = offset if offset is not None else 0
+        end = start + limit if limit is not None else None
+        if start < 0 or (end is not None and end < start):
+            current_items = QueryProcessor.filter_items(
+                items, where, field_resolver
+            )
+            current_items = QueryProcessor.order_items(
+                current_items, order_by, field_resolver
+            )
+            current_items = QueryProcessor.limit_items(
+                current_items, limit, offset
+            )
+            return QueryProcessor.project_items(
+                current_items, select, field_resolver
+            )
+
+        filtered_items = QueryProcessor.iter_items(
+            items, where, field_resolver
         )
-        current_items = QueryProcessor.project_items(
+        ob = QueryProcessor._parse_order_by(order_by)
+        if ob is not None:
+            # Only the first offset + limit items in order can survive,
+            # so keep a bounded heap instead of sorting everything.
+            is_defined, key = QueryCompiler.compile_order_by(
+                ob, field_resolver
+            )
+            ordered_items = filter(is_defined, filtered_items)
+            if end is not None:
+                current_items = heapq.nsmallest(end, ordered_items, key=key)
+            else:
+                current_items = sorted(ordered_items, key=key)
+            current_items = current_items[start:]
+        else:
+            current_items = list(
+                itertools.islice(filtered_items, start, end)
+            )
+        return QueryProcessor.project_items(
             current_items, select, field_resolver
         )
-        current_items = QueryProcessor.limit_items(
-            current_items, limit, offset
-        )
-        return current_items
+
+    @staticmethod
+    def iter_items(
+        items: Iterable[Any],
+        where: str | Expression | None = None,
+        field_resolver: Callable | None = None,
+    ) -> Iterator[Any]:
+        if where is None:
+            return (item for item in items if item)
+        if not isinstance(where, str):
+            expr: Expression = where
+        else:
+            expr = QLParser.parse_where(where)
+        predicate = QueryCompiler.compile_where(expr, field_resolver)
+        return (item for item in items if predicate(item) and item)
 
     @staticmethod
     def filter_items(
-        items: list[Any],
+        items: Iterable[Any],
         where: str | Expression | None = None,
         field_resolver: Callable | None = None,
     ) -> list[Any]:
-        result = []
-        for item in items:
-            if QueryProcessor.filter_item(item, where, field_resolver):
-                result.append(item)
-        return result
+        return list(QueryProcessor.iter_items(items, where, field_resolver))
 
     @staticmethod
     def filter_item(
@@ -100,37 +136,19 @@ class QueryProcessor:
         order_by: str | OrderBy | None = None,
         field_resolver: Callable | None = None,
     ) -> list[Any]:
-        if order_by is None:
-            return items
-        if isinstance(order_by, OrderBy):
-            ob: OrderBy | None = order_by
-        else:
-            ob = QLParser.parse_order_by(order_by)
+        ob = QueryProcessor._parse_order_by(order_by)
         if ob is None:
             return items
-        filtered_items = items
-        for term in ob.terms:
-            if isinstance(term.field, str):
-                filtered_items = QueryProcessor.filter_items(
-                    filtered_items,
-                    f"is_defined({term.field})",
-                    field_resolver,
-                )
+        is_defined, key = QueryCompiler.compile_order_by(ob, field_resolver)
+        return sorted(filter(is_defined, items), key=key)
 
-        def comparer(item):
-            values = []
-            for term in order_by.terms:
-                value = QueryProcessor.eval_expr(
-                    item, Field(path=term.field), field_resolver
-                )
-                if term.direction == OrderByDirection.DESC:
-                    values.append(DescFieldComparer(value))
-                else:
-                    values.append(AscFieldComparer(value))
-            return tuple(values)
-
-        sorted_items = sorted(filtered_items, key=comparer)
-        return sorted_items
+    @staticmethod
+    def _parse_order_by(order_by: str | OrderBy | None) -> OrderBy | None:
+        if order_by is None:
+            return None
+        if isinstance(order_by, OrderBy):
+            return order_by
+        return QLParser.parse_order_by(order_by)
 
     @staticmethod
     def limit_items(
@@ -152,12 +170,16 @@ class QueryProcessor:
         select: str | Select | None,
         field_resolver: Callable | None = None,
     ) -> list[Any]:
-        result = []
-        for item in items:
-            result.append(
-                QueryProcessor.project_item(item, select, field_resolver)
-            )
-        return result
+        if select is None:
+            return list(items)
+        if isinstance(select, Select):
+            sel: Select | None = select
+        else:
+            sel = QLParser.parse_select(select)
+        if sel is None:
+            return list(items)
+        project = QueryCompiler.compile_select(sel, field_resolver)
+        return [project(item) for item in items]
 
     @staticmethod
     def project_item(
@@ -425,11 +447,66 @@ class QueryProcessor:
             up = QLParser.parse_update(update)
         if up is None:
             return item
-        item_copy = copy.deepcopy(item)
+        if not isinstance(item, dict):
+            item_copy = copy.deepcopy(item)
+            for operation in up.operations:
+                QueryProcessor.update_field(
+                    item_copy, operation, field_resolver
+                )
+            return item_copy
+        # Structural sharing: only the containers on the updated paths
+        # are copied, everything else is shared with the original item.
+        item_copy = item.copy()
+        copies = {id(item_copy): item_copy}
         for operation in up.operations:
+            path = operation.field
+            if field_resolver is not None:
+                path = field_resolver(path)
+            QueryProcessor._copy_path(item_copy, path, copies)
+            if (
+                operation.op == UpdateOp.MOVE
+                and operation.args
+                and operation.args[0] is not None
+            ):
+                target = operation.args[0]
+                QueryProcessor._copy_path(
+                    item_copy,
+                    target.path if isinstance(target, Field) else target,
+                    copies,
+                )
             QueryProcessor.update_field(item_copy, operation, field_resolver)
         return item_copy
 
+    @staticmethod
+    def _copy_path(item: dict, path: str, copies: dict[int, Any]) -> None:
+        current: Any = item
+        index: int | str
+        for split in DataAccessor.split_field(path):
+            if isinstance(current, list):
+                if split.isnumeric():
+                    index = int(split)
+                elif split == "-" and current:
+                    index = -1
+                else:
+                    return
+                if index >= len(current):
+                    return
+            elif isinstance(current, dict):
+                if split not in current:
+                    return
+                index = split
+            else:
+                return
+            child = current[index]
+            if isinstance(child, (dict, list)):
+                if id(child) not in copies:
+                    child = child.copy()
+                    copies[id(child)] = child
+                    current[index] = child
+            else:
+                return
+            current = child
+
     @staticmethod
     def update_field(
         value: Any,
@@ -488,27 +565,5 @@ class QueryProcessor:
         return fields
 
 
-class AscFieldComparer:
-    def __init__(self, obj):
-        self.obj = obj
-
-    def __eq__(self, other):
-        return self.obj == other.obj
-
-    def __lt__(self, other):
-        return self.obj < other.obj
-
-
-class DescFieldComparer:
-    def __init__(self, obj):
-        self.obj = obj
-
-    def __eq__(self, other):
-        return self.obj == other.obj
-
-    def __lt__(self, other):
-        return self.obj > other.obj
-
-
 def default_field_resolver(field: str) -> str:
     return field
@@ -27,6 +27,7 @@ class ItemProcessor:
     local_etag: bool | None
     suppress_fields: list[str] | None
     field_types: dict | None
+    raw: bool
 
     def __init__(
         self,
@@ -39,6 +40,7 @@ class ItemProcessor:
         local_etag: bool | None = False,
         suppress_fields: list[str] | None = None,
         field_types: dict | None = None,
+        raw: bool = False,
         **kwargs,
     ):
         self.id_embed_field = id_embed_field
@@ -50,6 +52,7 @@ class ItemProcessor:
         self.local_etag = local_etag
         self.suppress_fields = suppress_fields
         self.field_types = field_types
+        self.raw = raw
 
     def suppress_fields_if_needed(self, value: dict) -> dict:
         if self.suppress_fields is not None:
@@ -9,10 +9,15 @@ from x8.ql import Collection, Expression, OrderBy, Select, Update, Value
 class StoreOperation:
     EXISTS = "exists"
     GET = "get"
+    ITER_GET = "iter_get"
     PUT = "put"
     UPDATE = "update"
     DELETE = "delete"
+    MGET = "mget"
+    MPUT = "mput"
+    MDELETE = "mdelete"
     QUERY = "query"
+    ITER_QUERY = "iter_query"
     COUNT = "count"
     BATCH = "batch"
     TRANSACT = "transact"
@@ -81,6 +86,15 @@ class StoreOperation:
     ) -> Operation:
         return Operation.normalize(StoreOperation.GET, locals())
 
+    @staticmethod
+    def iter_get(
+        key: Any = None,
+        where: str | Expression | None = None,
+        collection: str | Collection | None = None,
+        **kwargs,
+    ) -> Operation:
+        return Operation.normalize(StoreOperation.ITER_GET, locals())
+
     @staticmethod
     def get_properties(
         key: Any = None,
@@ -129,6 +143,31 @@ class StoreOperation:
     ) -> Operation:
         return Operation.normalize(StoreOperation.DELETE, locals())
 
+    @staticmethod
+    def mget(
+        keys: list | None = None,
+        collection: str | Collection | None = None,
+        **kwargs,
+    ) -> Operation:
+        return Operation.normalize(StoreOperation.MGET, locals())
+
+    @staticmethod
+    def mput(
+        values: dict | None = None,
+        expiry: int | None = None,
+        collection: str | Collection | None = None,
+        **kwargs,
+    ) -> Operation:
+        return Operation.normalize(StoreOperation.MPUT, locals())
+
+    @staticmethod
+    def mdelete(
+        keys: list | None = None,
+        collection: str | Collection | None = None,
+        **kwargs,
+    ) -> Operation:
+        return Operation.normalize(StoreOperation.MDELETE, locals())
+
     @staticmethod
     def query(
         select: str | Select | None = None,
@@ -137,11 +176,25 @@ class StoreOperation:
         order_by: str | OrderBy | None = None,
         limit: int | None = None,
         offset: int | None = None,
+        continuation: str | None = None,
         collection: str | Collection | None = None,
         **kwargs,
     ) -> Operation:
         return Operation.normalize(StoreOperation.QUERY, locals())
 
+    @staticmethod
+    def iter_query(
+        select: str | Select | None = None,
+        where: str | Expression | None = None,
+        order_by: str | OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        batch_size: int | None = None,
+        collection: str | Collection | None = None,
+        **kwargs,
+    ) -> Operation:
+        return Operation.normalize(StoreOperation.ITER_QUERY, locals())
+
     @staticmethod
     def count(
         search: str | Expression | None = None,
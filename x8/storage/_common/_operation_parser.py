@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from typing import IO, Any
 
-from x8.core import ArgParser, Operation, OperationParser
+from x8.core import ArgParser, DataModel, Operation, OperationParser
 from x8.core.exceptions import BadRequestError
 from x8.ql import (
     And,
@@ -66,10 +66,15 @@ class StoreOperationParser(OperationParser):
     def is_collection_op(self) -> bool:
         if self.get_op_name() in [
             StoreOperation.GET,
+            StoreOperation.ITER_GET,
             StoreOperation.PUT,
             StoreOperation.UPDATE,
             StoreOperation.DELETE,
+            StoreOperation.MGET,
+            StoreOperation.MPUT,
+            StoreOperation.MDELETE,
             StoreOperation.QUERY,
+            StoreOperation.ITER_QUERY,
             StoreOperation.COUNT,
             StoreOperation.BATCH,
             StoreOperation.TRANSACT,
@@ -147,6 +152,21 @@ class StoreOperationParser(OperationParser):
     def get_key(self) -> Any:
         return self.get_arg("key", True)
 
+    def get_keys(self) -> list:
+        keys = self.get_arg("keys")
+        if keys is None:
+            return []
+        return [
+            key.to_dict() if isinstance(key, DataModel) else key
+            for key in keys
+        ]
+
+    def get_values(self) -> dict:
+        values = self.get_arg("values")
+        if values is None:
+            return {}
+        return values
+
     def get_id_from_key(self, key: Value) -> Value:
         if key is not None:
             if isinstance(key, (str, int, float, bool)):
@@ -164,6 +184,14 @@ class StoreOperationParser(OperationParser):
             raise BadRequestError("id is not string")
         return id
 
+    def get_batch_size(self, default: int = 100) -> int:
+        batch_size = self.get_arg("batch_size")
+        if batch_size is None:
+            return default
+        if batch_size <= 0:
+            raise BadRequestError("batch_size must be positive")
+        return batch_size
+
     def get_expiry_in_seconds(self) -> int | None:
         expiry = self.get_arg("expiry")
         if expiry:
@@ -1,10 +1,36 @@
-from typing import Any
+import asyncio
+import base64
+import binascii
+import itertools
+import json
+from typing import Any, AsyncIterator, Callable, Iterator
 
+from x8.core import DataAccessor
 from x8.core.exceptions import BadRequestError
-from x8.storage._common import ItemProcessor, StoreOperationParser
+from x8.ql import (
+    And,
+    Comparison,
+    ComparisonOp,
+    Expression,
+    Field,
+    Not,
+    Or,
+    OrderBy,
+    OrderByDirection,
+    OrderByTerm,
+    QueryFunction,
+    Select,
+    Undefined,
+)
+from x8.storage._common import (
+    ItemProcessor,
+    SpecialAttribute,
+    StoreOperationParser,
+)
 
 from ._models import (
     DocumentCollectionConfig,
+    DocumentFieldType,
     DocumentItem,
     DocumentKey,
     DocumentList,
@@ -31,13 +57,25 @@ def build_item_from_value(
     id = processor.get_id_from_value(value=value)
     pk = processor.get_pk_from_value(value=value)
     etag = processor.get_etag_from_value(value=value)
+    val = None
+    if include_value:
+        val = processor.suppress_fields_if_needed(value=value)
+    if processor.raw:
+        # Copied like validation would, as the value can be the stored
+        # document itself.
+        return DocumentItem.record(
+            key=DocumentKey.record(id=id, pk=pk),
+            value=dict(val) if val is not None else None,
+            properties=(
+                DocumentProperties.record(etag=etag)
+                if etag is not None
+                else None
+            ),
+        )
     key = DocumentKey(id=id, pk=pk)
     properties = None
     if etag is not None:
         properties = DocumentProperties(etag=etag)
-    val = None
-    if include_value:
-        val = processor.suppress_fields_if_needed(value=value)
     return DocumentItem(key=key, value=val, properties=properties)
 
 
@@ -46,6 +84,15 @@ def build_item_from_parts(
 ) -> DocumentItem:
     id = processor.get_id_from_key(key)
     pk = processor.get_pk_from_key(key)
+    if processor.raw:
+        return DocumentItem.record(
+            key=DocumentKey.record(id=id, pk=pk),
+            properties=(
+                DocumentProperties.record(etag=etag)
+                if etag is not None
+                else None
+            ),
+        )
     key = DocumentKey(id=id, pk=pk)
     properties = None
     if etag is not None:
@@ -53,5 +100,263 @@ def build_item_from_parts(
     return DocumentItem(key=key, properties=properties)
 
 
-def build_query_result(items: list[DocumentItem]):
-    return DocumentList(items=items)
+def build_query_result(
+    items: list[DocumentItem],
+    continuation: str | None = None,
+    raw: bool = False,
+):
+    if raw:
+        return DocumentList.record(items=items, continuation=continuation)
+    return DocumentList(items=items, continuation=continuation)
+
+
+# Position of missing and null values among the other values of an
+# order by field in ascending order, as (missing, null). Negative
+# positions sort before the other values and positive ones after.
+# Missing and null values with the same position are equal.
+NULLS_FIRST = (-1, -1)
+NULL_FIRST_MISSING_LAST = (1, -1)
+
+_MISSING = 0
+_NULL = 1
+_VALUE = 2
+
+
+def get_query_args(
+    op_parser: StoreOperationParser,
+    null_order: tuple[int, int] = NULLS_FIRST,
+) -> dict[str, Any]:
+    """Get the query arguments with keyset pagination applied.
+
+    An ordered query with a limit, or a query with a continuation, is
+    ordered by its order by terms followed by $id, so that the order is
+    total. The continuation is turned into a condition that only
+    matches the documents after the last document of the previous
+    page, so each page costs the same as the first one.
+
+    Args:
+        op_parser: Operation parser.
+        null_order: Where the store sorts missing and null values.
+    """
+    where = op_parser.get_where()
+    order_by = op_parser.get_order_by()
+    limit = op_parser.get_limit()
+    continuation = op_parser.get_continuation()
+    if continuation is not None or (
+        limit is not None and order_by is not None
+    ):
+        order_by = _get_keyset_order_by(order_by)
+        if continuation is not None:
+            values, missing = _decode_continuation(continuation, order_by)
+            keyset = _build_keyset_expr(
+                order_by.terms, values, missing, null_order
+            )
+            where = keyset if where is None else And(lexpr=where, rexpr=keyset)
+    return {
+        "select": op_parser.get_select(),
+        "where": where,
+        "order_by": order_by,
+        "limit": limit,
+        "offset": op_parser.get_offset(),
+    }
+
+
+def build_query_continuation(
+    items: list[DocumentItem],
+    args: dict[str, Any],
+) -> str | None:
+    """Get the continuation of a page from its last document.
+
+    There is no continuation if the page is not full or if the query
+    is not ordered.
+    """
+    limit = args["limit"]
+    order_by: OrderBy | None = args["order_by"]
+    if limit is None or len(items) == 0 or len(items) < limit:
+        return None
+    if order_by is None:
+        return None
+    if SpecialAttribute.ID not in [term.field for term in order_by.terms]:
+        raise BadRequestError("Continuation requires ordering by $id")
+    item = items[-1]
+    values = []
+    missing = []
+    for i, term in enumerate(order_by.terms):
+        value: Any
+        if term.field == SpecialAttribute.ID:
+            value = item.key.id
+        elif not _is_selected(args["select"], term.field):
+            raise BadRequestError(
+                f"Order by field {term.field} must be selected to page"
+            )
+        else:
+            value = DataAccessor.get_field(item.value, term.field)
+        if isinstance(value, Undefined):
+            value = None
+            missing.append(i)
+        values.append(value)
+    data: dict = {"f": [term.field for term in order_by.terms], "v": values}
+    if missing:
+        data["u"] = missing
+    return base64.urlsafe_b64encode(
+        json.dumps(data, separators=(",", ":")).encode()
+    ).decode()
+
+
+def _is_selected(select: Select | None, field: str) -> bool:
+    if select is None or not select.terms:
+        return True
+    for term in select.terms:
+        if term.alias is not None and term.alias != term.field:
+            continue
+        if term.field in ("*", field) or field.startswith(
+            (f"{term.field}.", f"{term.field}[")
+        ):
+            return True
+    return False
+
+
+def _get_keyset_order_by(order_by: OrderBy | None) -> OrderBy:
+    terms = list(order_by.terms) if order_by is not None else []
+    if SpecialAttribute.ID not in [term.field for term in terms]:
+        terms.append(
+            OrderByTerm(
+                field=SpecialAttribute.ID, direction=OrderByDirection.ASC
+            )
+        )
+    return OrderBy(terms=terms)
+
+
+def _decode_continuation(
+    continuation: str, order_by: OrderBy
+) -> tuple[list, list]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(continuation.encode()))
+        fields, values = data["f"], data["v"]
+        missing = data.get("u", [])
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise BadRequestError("Continuation format error")
+    if (
+        not isinstance(values, list)
+        or len(values) == 0
+        or fields != [term.field for term in order_by.terms]
+    ):
+        raise BadRequestError("Continuation does not match the order by")
+    if not isinstance(missing, list) or not all(
+        isinstance(i, int) and 0 <= i < len(values) for i in missing
+    ):
+        raise BadRequestError("Continuation format error")
+    return values, missing
+
+
+def _build_keyset_expr(
+    terms: list[OrderByTerm],
+    values: list,
+    missing: list,
+    null_order: tuple[int, int],
+) -> Expression:
+    # (t0 after v0) or (t0 equal v0 and ((t1 after v1) or (...)))
+    expr: Expression | None = None
+    for i in reversed(range(len(terms))):
+        term, value = terms[i], values[i]
+        if i in missing:
+            kind = _MISSING
+        elif value is None:
+            kind = _NULL
+        else:
+            kind = _VALUE
+        after, equal = _build_keyset_term_exprs(term, kind, value, null_order)
+        if expr is None:
+            expr = after
+        else:
+            expr = _or(after, And(lexpr=equal, rexpr=expr))
+    if expr is None:
+        raise BadRequestError("Continuation format error")
+    return expr
+
+
+def _build_keyset_term_exprs(
+    term: OrderByTerm,
+    kind: int,
+    value: Any,
+    null_order: tuple[int, int],
+) -> tuple[Expression | None, Expression]:
+    # Missing, null and other values are matched separately, following
+    # the position of each kind in the order of the store.
+    field = term.field
+    positions = {_MISSING: null_order[0], _NULL: null_order[1], _VALUE: 0}
+    if term.direction == OrderByDirection.DESC:
+        positions = {k: -position for k, position in positions.items()}
+    after: Expression | None = None
+    equal: Expression | None = None
+    if kind != _VALUE:
+        equal = _build_kind_expr(field, kind)
+    else:
+        op = (
+            ComparisonOp.LT
+            if term.direction == OrderByDirection.DESC
+            else ComparisonOp.GT
+        )
+        after = Comparison(lexpr=Field(path=field), op=op, rexpr=value)
+        equal = Comparison(
+            lexpr=Field(path=field), op=ComparisonOp.EQ, rexpr=value
+        )
+    for other in (_MISSING, _NULL, _VALUE):
+        if other == kind:
+            continue
+        if positions[other] > positions[kind]:
+            after = _or(after, _build_kind_expr(field, other))
+        elif positions[other] == positions[kind] and kind != _VALUE:
+            equal = _or(equal, _build_kind_expr(field, other))
+    if equal is None:
+        raise BadRequestError("Continuation format error")
+    return after, equal
+
+
+def _build_kind_expr(field: str, kind: int) -> Expression:
+    if kind == _MISSING:
+        return QueryFunction.is_not_defined(field)
+    if kind == _NULL:
+        return QueryFunction.is_type(field, DocumentFieldType.NULL.value)
+    return And(
+        lexpr=QueryFunction.is_defined(field),
+        rexpr=Not(
+            expr=QueryFunction.is_type(field, DocumentFieldType.NULL.value)
+        ),
+    )
+
+
+def _or(lexpr: Expression | None, rexpr: Expression) -> Expression:
+    if lexpr is None:
+        return rexpr
+    return Or(lexpr=lexpr, rexpr=rexpr)
+
+
+def build_iter_query_result(
+    nresult: Any, convert: Callable[[Any], DocumentItem]
+) -> Iterator[DocumentItem] | AsyncIterator[DocumentItem]:
+    if hasattr(nresult, "__aiter__"):
+        return _aconvert_items(nresult, convert)
+    return map(convert, nresult)
+
+
+async def _aconvert_items(
+    nresult: AsyncIterator[Any], convert: Callable[[Any], DocumentItem]
+) -> AsyncIterator[DocumentItem]:
+    async for nitem in nresult:
+        yield convert(nitem)
+
+
+async def build_aiter_query_result(
+    items: Iterator[DocumentItem], batch_size: int
+) -> AsyncIterator[DocumentItem]:
+    # Pulls a batch at a time from a blocking iterator in a worker thread.
+    def next_batch() -> list[DocumentItem]:
+        return list(itertools.islice(items, batch_size))
+
+    while True:
+        batch = await asyncio.to_thread(next_batch)
+        if not batch:
+            return
+        for item in batch:
+            yield item
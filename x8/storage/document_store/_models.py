@@ -62,9 +62,11 @@ class DocumentList(DataModel):
 
     Attributes:
         items: List of documents.
+        continuation: Continuation token for the next page.
     """
 
     items: list[DocumentItem]
+    continuation: str | None = None
 
 
 class DocumentCollectionConfig(DataModel):
@@ -2,7 +2,7 @@
 Document Store
 """
 
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
 from x8.core import DataModel, Response, operation
 from x8.ql import Expression, OrderBy, Select, Update
@@ -23,6 +23,8 @@ from ._models import (
     DocumentTransaction,
 )
 
+DEFAULT_BATCH_SIZE = 100
+
 
 class DocumentStore(StoreComponent):
     collection: str | None
@@ -320,6 +322,7 @@ class DocumentStore(StoreComponent):
         order_by: str | OrderBy | None = None,
         limit: int | None = None,
         offset: int | None = None,
+        continuation: str | None = None,
         collection: str | None = None,
         **kwargs,
     ) -> Response[DocumentList]:
@@ -336,14 +339,87 @@ class DocumentStore(StoreComponent):
                 Query limit.
             offset:
                 Query offset.
+            continuation:
+                Continuation token from the previous page.
             collection:
                 Collection name.
 
         Returns:
-            Document list with items.
+            Document list with items. The continuation is set if the
+            page is full and more documents may follow.
         """
         raise NotImplementedError
 
+    @operation()
+    def iter_query(
+        self,
+        select: str | Select | None = None,
+        where: str | Expression | None = None,
+        order_by: str | OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        batch_size: int | None = None,
+        collection: str | None = None,
+        **kwargs,
+    ) -> Response[Iterator[DocumentItem]]:
+        """Query documents lazily.
+
+        Documents are fetched in batches as the result is iterated,
+        so only one batch is held in memory at a time.
+
+        Args:
+            select:
+                Select expression.
+            where:
+                Condition expression.
+            order_by:
+                Order by expression.
+            limit:
+                Query limit.
+            offset:
+                Query offset.
+            batch_size:
+                Number of documents fetched at a time. Defaults to 100.
+            collection:
+                Collection name.
+
+        Returns:
+            Iterator over the document items.
+        """
+        size = batch_size or DEFAULT_BATCH_SIZE
+
+        def iterate() -> Iterator[DocumentItem]:
+            start = offset
+            continuation = None
+            remaining = limit
+            while remaining is None or remaining > 0:
+                page = size if remaining is None else min(size, remaining)
+                response: Any = self.query(
+                    select=select,
+                    where=where,
+                    order_by=order_by,
+                    limit=page,
+                    offset=start,
+                    continuation=continuation,
+                    collection=collection,
+                    **kwargs,
+                )
+                if isinstance(response, Response):
+                    response = response.result
+                items = response.items
+                yield from items
+                if len(items) < page:
+                    return
+                if response.continuation is not None:
+                    # The next page starts after the last document.
+                    start, continuation = None, response.continuation
+                else:
+                    start = (start or 0) + page
+                if remaining is not None:
+                    remaining -= page
+
+        return Response(result=iterate())
+
     @operation()
     def count(
         self,
@@ -676,6 +752,7 @@ class DocumentStore(StoreComponent):
         order_by: str | OrderBy | None = None,
         limit: int | None = None,
         offset: int | None = None,
+        continuation: str | None = None,
         collection: str | None = None,
         **kwargs,
     ) -> Response[DocumentList]:
@@ -692,14 +769,88 @@ class DocumentStore(StoreComponent):
                 Query limit.
             offset:
                 Query offset.
+            continuation:
+                Continuation token from the previous page.
             collection:
                 Collection name.
 
         Returns:
-            Document list with items.
+            Document list with items. The continuation is set if the
+            page is full and more documents may follow.
         """
         raise NotImplementedError
 
+    @operation()
+    async def aiter_query(
+        self,
+        select: str | Select | None = None,
+        where: str | Expression | None = None,
+        order_by: str | OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        batch_size: int | None = None,
+        collection: str | None = None,
+        **kwargs,
+    ) -> Response[AsyncIterator[DocumentItem]]:
+        """Query documents lazily.
+
+        Documents are fetched in batches as the result is iterated,
+        so only one batch is held in memory at a time.
+
+        Args:
+            select:
+                Select expression.
+            where:
+                Condition expression.
+            order_by:
+                Order by expression.
+            limit:
+                Query limit.
+            offset:
+                Query offset.
+            batch_size:
+                Number of documents fetched at a time. Defaults to 100.
+            collection:
+                Collection name.
+
+        Returns:
+            Async iterator over the document items.
+        """
+        size = batch_size or DEFAULT_BATCH_SIZE
+
+        async def iterate() -> AsyncIterator[DocumentItem]:
+            start = offset
+            continuation = None
+            remaining = limit
+            while remaining is None or remaining > 0:
+                page = size if remaining is None else min(size, remaining)
+                response: Any = await self.aquery(
+                    select=select,
+                    where=where,
+                    order_by=order_by,
+                    limit=page,
+                    offset=start,
+                    continuation=continuation,
+                    collection=collection,
+                    **kwargs,
+                )
+                if isinstance(response, Response):
+                    response = response.result
+                items = response.items
+                for item in items:
+                    yield item
+                if len(items) < page:
+                    return
+                if response.continuation is not None:
+                    # The next page starts after the last document.
+                    start, continuation = None, response.continuation
+                else:
+                    start = (start or 0) + page
+                if remaining is not None:
+                    remaining -= page
+
+        return Response(result=iterate())
+
     @operation()
     async def acount(
         self,
@@ -0,0 +1,496 @@
+"""
+Secondary indexes for the in memory document store.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Any, Callable, Iterator
+
+from x8.core import DataAccessor
+from x8.ql import (
+    And,
+    Comparison,
+    ComparisonOp,
+    Expression,
+    Field,
+    Function,
+    FunctionNamespace,
+    Or,
+    QueryFunctionName,
+    Undefined,
+)
+from x8.storage._common import (
+    ArrayIndex,
+    AscIndex,
+    CompositeIndex,
+    DescIndex,
+    FieldIndex,
+    HashIndex,
+    Index,
+    RangeIndex,
+)
+
+_value = itemgetter(0)
+
+
+class IndexPlan:
+    """Candidate lookup produced by an index.
+
+    Attributes:
+        estimate: Upper bound of the number of candidates.
+        lookup: Function that materializes the candidate sequence numbers.
+    """
+
+    __slots__ = ("estimate", "lookup")
+
+    estimate: int
+    lookup: Callable[[], set[int]]
+
+    def __init__(self, estimate: int, lookup: Callable[[], set[int]]):
+        self.estimate = estimate
+        self.lookup = lookup
+
+
+class HashFieldIndex:
+    """Hash index mapping field values to documents."""
+
+    field: str
+    buckets: dict[Any, set[int]]
+    entries: dict[int, Any]
+
+    def __init__(self, field: str):
+        self.field = field
+        self.buckets = dict()
+        self.entries = dict()
+        self._get = DataAccessor.compile_get_field(field)
+
+    def add(self, seq: int, document: dict) -> None:
+        value = self._get(document)
+        if isinstance(value, Undefined) or not _is_hashable(value):
+            # Unhashable values can never equal a hashable constant.
+            return
+        self.buckets.setdefault(value, set()).add(seq)
+        self.entries[seq] = value
+
+    def remove(self, seq: int) -> None:
+        if seq not in self.entries:
+            return
+        value = self.entries.pop(seq)
+        bucket = self.buckets[value]
+        bucket.discard(seq)
+        if not bucket:
+            del self.buckets[value]
+
+    def plan_equals(self, values: list) -> IndexPlan | None:
+        if not all(_is_hashable(v) for v in values):
+            return None
+        buckets = [self.buckets.get(v, _EMPTY) for v in values]
+        return IndexPlan(
+            sum(len(b) for b in buckets), lambda: set().union(*buckets)
+        )
+
+
+class SortedFieldIndex:
+    """Sorted index for equality, range, prefix and ordered scans.
+
+    Strings and numbers are kept in separate sorted lists of
+    ``(value, seq)`` tuples because the query language only compares
+    values of the same kind. Documents with any other defined value are
+    tracked so that ordered scans can fall back when the field does not
+    hold a single sortable kind.
+    """
+
+    field: str
+    strings: list[tuple[str, int]]
+    numbers: list[tuple[int | float, int]]
+    others: set[int]
+    entries: dict[int, tuple[Any, ...]]
+
+    def __init__(self, field: str):
+        self.field = field
+        self.strings = []
+        self.numbers = []
+        self.others = set()
+        self.entries = dict()
+        self._get = DataAccessor.compile_get_field(field)
+
+    def add(self, seq: int, document: dict) -> None:
+        value = self._get(document)
+        if isinstance(value, Undefined):
+            return
+        entries = self._get_entries(value)
+        if entries is None:
+            self.others.add(seq)
+            self.entries[seq] = ()
+        else:
+            insort(entries, (value, seq))
+            self.entries[seq] = (value,)
+
+    def remove(self, seq: int) -> None:
+        if seq not in self.entries:
+            return
+        entry = self.entries.pop(seq)
+        if not entry:
+            self.others.discard(seq)
+            return
+        value = entry[0]
+        entries = self._get_entries(value)
+        if entries is not None:
+            i = bisect_left(entries, (value, seq))
+            if i < len(entries) and entries[i][1] == seq:
+                del entries[i]
+
+    def plan_equals(self, values: list) -> IndexPlan | None:
+        ranges = []
+        for value in values:
+            entries = self._get_entries(value)
+            if entries is None:
+                return None
+            ranges.append(
+                (
+                    entries,
+                    bisect_left(entries, value, key=_value),
+                    bisect_right(entries, value, key=_value),
+                )
+            )
+        return self._plan_ranges(ranges)
+
+    def plan_compare(self, op: ComparisonOp, value: Any) -> IndexPlan:
+        entries = self._get_entries(value)
+        if entries is None:
+            return IndexPlan(0, set)
+        if op == ComparisonOp.LT:
+            bounds = (0, bisect_left(entries, value, key=_value))
+        elif op == ComparisonOp.LTE:
+            bounds = (0, bisect_right(entries, value, key=_value))
+        elif op == ComparisonOp.GT:
+            bounds = (bisect_right(entries, value, key=_value), len(entries))
+        else:
+            bounds = (bisect_left(entries, value, key=_value), len(entries))
+        return self._plan_ranges([(entries, *bounds)])
+
+    def plan_between(self, low: Any, high: Any) -> IndexPlan:
+        entries = self._get_entries(low)
+        if entries is None or entries is not self._get_entries(high):
+            return IndexPlan(0, set)
+        start = bisect_left(entries, low, key=_value)
+        end = bisect_right(entries, high, key=_value)
+        return self._plan_ranges([(entries, start, max(start, end))])
+
+    def plan_starts_with(self, prefix: Any) -> IndexPlan:
+        if not isinstance(prefix, str):
+            return IndexPlan(0, set)
+        start = bisect_left(self.strings, prefix, key=_value)
+        if prefix and ord(prefix[-1]) < 0x10FFFF:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            end = bisect_left(self.strings, upper, key=_value)
+        else:
+            end = len(self.strings)
+        return self._plan_ranges([(self.strings, start, end)])
+
+    def can_order(self) -> bool:
+        return not self.others and not (self.strings and self.numbers)
+
+    def iter_ordered(self, descending: bool = False) -> Iterator[int]:
+        """Iterate sequence numbers in field order.
+
+        Equal values are always returned in insertion order,
+        matching a stable sort of the documents.
+        """
+        for seqs in self.iter_ordered_groups(descending=descending):
+            yield from seqs
+
+    def iter_ordered_groups(
+        self, descending: bool = False
+    ) -> Iterator[list[int]]:
+        """Iterate sequence numbers in field order, grouped by value.
+
+        Each group holds the sequence numbers of equal values
+        in insertion order.
+        """
+        entries: list = self.strings or self.numbers
+        if not descending:
+            start = 0
+            while start < len(entries):
+                end = bisect_right(
+                    entries, entries[start][0], start, key=_value
+                )
+                yield [entries[i][1] for i in range(start, end)]
+                start = end
+            return
+        end = len(entries)
+        while end > 0:
+            start = bisect_left(
+                entries, entries[end - 1][0], 0, end, key=_value
+            )
+            yield [entries[i][1] for i in range(start, end)]
+            end = start
+
+    def _get_entries(self, value: Any) -> list | None:
+        if isinstance(value, str):
+            return self.strings
+        if isinstance(value, (int, float)) and not (
+            isinstance(value, float) and math.isnan(value)
+        ):
+            return self.numbers
+        return None
+
+    @staticmethod
+    def _plan_ranges(ranges: list[tuple[list, int, int]]) -> IndexPlan:
+        def lookup() -> set[int]:
+            result: set[int] = set()
+            for entries, start, end in ranges:
+                result.update(seq for _, seq in entries[start:end])
+            return result
+
+        return IndexPlan(sum(end - start for _, start, end in ranges), lookup)
+
+
+class ArrayFieldIndex:
+    """Index mapping array elements to documents."""
+
+    field: str
+    buckets: dict[Any, set[int]]
+    entries: dict[int, list]
+
+    def __init__(self, field: str):
+        self.field = field
+        self.buckets = dict()
+        self.entries = dict()
+        self._get = DataAccessor.compile_get_field(field)
+
+    def add(self, seq: int, document: dict) -> None:
+        value = self._get(document)
+        if not isinstance(value, list):
+            return
+        elements = [e for e in value if _is_hashable(e)]
+        for element in elements:
+            self.buckets.setdefault(element, set()).add(seq)
+        self.entries[seq] = elements
+
+    def remove(self, seq: int) -> None:
+        for element in self.entries.pop(seq, []):
+            bucket = self.buckets.get(element)
+            if bucket is not None:
+                bucket.discard(seq)
+                if not bucket:
+                    del self.buckets[element]
+
+    def plan_contains(self, values: list) -> IndexPlan | None:
+        if not all(_is_hashable(v) for v in values):
+            return None
+        buckets = [self.buckets.get(v, _EMPTY) for v in values]
+        return IndexPlan(
+            sum(len(b) for b in buckets), lambda: set().union(*buckets)
+        )
+
+
+class MemoryIndexes:
+    """Secondary indexes of a collection and the query planner.
+
+    Documents are identified by a sequence number that follows the
+    insertion order of the collection dictionary, so results read
+    through an index come back in the same order as a full scan.
+    """
+
+    hash_indexes: dict[str, HashFieldIndex]
+    sorted_indexes: dict[str, SortedFieldIndex]
+    array_indexes: dict[str, ArrayFieldIndex]
+
+    def __init__(self, field_resolver: Callable | None = None):
+        self.field_resolver = field_resolver
+        self.hash_indexes = dict()
+        self.sorted_indexes = dict()
+        self.array_indexes = dict()
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.hash_indexes or self.sorted_indexes or self.array_indexes
+        )
+
+    def build(
+        self,
+        indexes: list[Index],
+        documents: Iterator[tuple[int, dict]],
+    ) -> None:
+        self.hash_indexes = dict()
+        self.sorted_indexes = dict()
+        self.array_indexes = dict()
+        for index in indexes:
+            self._add_definition(index)
+        for seq, document in documents:
+            self.add(seq, document)
+
+    def add(self, seq: int, document: dict) -> None:
+        for index in self._all():
+            index.add(seq, document)
+
+    def remove(self, seq: int) -> None:
+        for index in self._all():
+            index.remove(seq)
+
+    def plan_where(self, where: Expression | None) -> IndexPlan | None:
+        """Find the most selective index lookup for the condition.
+
+        Only top level conjuncts (and disjunctions of indexable
+        terms) are considered. Candidates always have to be checked
+        against the full condition.
+        """
+        if where is None:
+            return None
+        if isinstance(where, And):
+            plans = [
+                plan
+                for plan in (
+                    self.plan_where(where.lexpr),
+                    self.plan_where(where.rexpr),
+                )
+                if plan is not None
+            ]
+            if not plans:
+                return None
+            return min(plans, key=lambda plan: plan.estimate)
+        if isinstance(where, Or):
+            lplan = self.plan_where(where.lexpr)
+            rplan = self.plan_where(where.rexpr)
+            if lplan is None or rplan is None:
+                return None
+            return IndexPlan(
+                lplan.estimate + rplan.estimate,
+                lambda: lplan.lookup() | rplan.lookup(),
+            )
+        if isinstance(where, Comparison):
+            return self._plan_comparison(where)
+        if isinstance(where, Function):
+            return self._plan_function(where)
+        return None
+
+    def get_ordered_index(self, field: str) -> SortedFieldIndex | None:
+        index = self.sorted_indexes.get(self._resolve(field))
+        if index is not None and index.can_order():
+            return index
+        return None
+
+    def _plan_comparison(self, expr: Comparison) -> IndexPlan | None:
+        op = expr.op
+        if isinstance(expr.lexpr, Field) and _is_constant(expr.rexpr):
+            field, value = self._resolve(expr.lexpr.path), expr.rexpr
+        elif (
+            isinstance(expr.rexpr, Field)
+            and _is_constant(expr.lexpr)
+            and op in _REVERSIBLE_OPS
+        ):
+            field, value = self._resolve(expr.rexpr.path), expr.lexpr
+            op = Comparison.reverse_op(op)
+        else:
+            return None
+        if op == ComparisonOp.EQ:
+            return self._plan_equals(field, [value])
+        if op == ComparisonOp.IN and isinstance(value, list):
+            return self._plan_equals(field, value)
+        sorted_index = self.sorted_indexes.get(field)
+        if sorted_index is None:
+            return None
+        if op in _RANGE_OPS:
+            return sorted_index.plan_compare(op, value)
+        if (
+            op == ComparisonOp.BETWEEN
+            and isinstance(value, list)
+            and len(value) == 2
+            and isinstance(expr.lexpr, Field)
+        ):
+            return sorted_index.plan_between(value[0], value[1])
+        return None
+
+    def _plan_function(self, expr: Function) -> IndexPlan | None:
+        if (
+            expr.namespace != FunctionNamespace.BUILTIN
+            or len(expr.args) < 2
+            or not isinstance(expr.args[0], Field)
+            or not _is_constant(expr.args[1])
+        ):
+            return None
+        field = self._resolve(expr.args[0].path)
+        value = expr.args[1]
+        if expr.name == QueryFunctionName.STARTS_WITH:
+            sorted_index = self.sorted_indexes.get(field)
+            if sorted_index is not None:
+                return sorted_index.plan_starts_with(value)
+        elif expr.name == QueryFunctionName.ARRAY_CONTAINS:
+            array_index = self.array_indexes.get(field)
+            if array_index is not None:
+                return array_index.plan_contains([value])
+        elif expr.name == QueryFunctionName.ARRAY_CONTAINS_ANY:
+            array_index = self.array_indexes.get(field)
+            if array_index is not None:
+                if not isinstance(value, list):
+                    return IndexPlan(0, set)
+                return array_index.plan_contains(value)
+        return None
+
+    def _plan_equals(self, field: str, values: list) -> IndexPlan | None:
+        hash_index = self.hash_indexes.get(field)
+        if hash_index is not None:
+            plan = hash_index.plan_equals(values)
+            if plan is not None:
+                return plan
+        sorted_index = self.sorted_indexes.get(field)
+        if sorted_index is not None:
+            return sorted_index.plan_equals(values)
+        return None
+
+    def _add_definition(self, index: Index) -> None:
+        if isinstance(index, CompositeIndex):
+            for part in index.fields:
+                self._add_definition(part)
+        elif isinstance(index, (HashIndex, FieldIndex)):
+            field = self._resolve(index.field)
+            if field not in self.hash_indexes:
+                self.hash_indexes[field] = HashFieldIndex(field)
+        elif isinstance(index, (RangeIndex, AscIndex, DescIndex)):
+            field = self._resolve(index.field)
+            if field not in self.sorted_indexes:
+                self.sorted_indexes[field] = SortedFieldIndex(field)
+        elif isinstance(index, ArrayIndex):
+            field = self._resolve(index.field)
+            if field not in self.array_indexes:
+                self.array_indexes[field] = ArrayFieldIndex(field)
+
+    def _all(self) -> list:
+        return [
+            *self.hash_indexes.values(),
+            *self.sorted_indexes.values(),
+            *self.array_indexes.values(),
+        ]
+
+    def _resolve(self, field: str) -> str:
+        if self.field_resolver is not None:
+            return self.field_resolver(field)
+        return field
+
+
+_EMPTY: frozenset = frozenset()
+
+_RANGE_OPS = (
+    ComparisonOp.LT,
+    ComparisonOp.LTE,
+    ComparisonOp.GT,
+    ComparisonOp.GTE,
+)
+
+_REVERSIBLE_OPS = (ComparisonOp.EQ, *_RANGE_OPS)
+
+
+def _is_constant(value: Any) -> bool:
+    return isinstance(value, (bool, int, float, str, list, dict))
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
@@ -0,0 +1,409 @@
+"""
+Persistence for the in memory document store.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from threading import Condition, Lock
+from typing import IO, Any, Generator
+
+from x8.core.exceptions import BadRequestError, InternalError
+
+from .._models import DocumentCollectionConfig
+
+# Log records.
+PUT = "put"
+DELETE = "delete"
+CREATE_COLLECTION = "create_collection"
+DROP_COLLECTION = "drop_collection"
+SET_INDEXES = "set_indexes"
+
+LOG_PREFIX = "log."
+SNAPSHOT_PREFIX = "snapshot."
+
+# Every entry in the log and the snapshot is framed as
+# (payload length, payload crc32, payload). The payload of a log
+# entry is its records, each pickled on its own.
+_HEADER = struct.Struct("<II")
+_PROTOCOL = 5
+
+# Entries are pickled, but only builtin values and the classes below
+# can be written or read, so loading a crafted file can not run code.
+# Index definitions are written as plain data.
+_SAFE_CLASSES = {
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("decimal", "Decimal"),
+}
+
+
+class MemoryState:
+    """Documents and index definitions of all collections.
+
+    Attributes:
+        db: Documents by collection and key.
+        indexes: Index definitions by collection and index name.
+    """
+
+    db: dict[str, dict[Any, Any]]
+    indexes: dict[str, dict[str, Any]]
+
+    def __init__(
+        self,
+        db: dict[str, dict[Any, Any]] | None = None,
+        indexes: dict[str, dict[str, Any]] | None = None,
+    ):
+        self.db = db if db is not None else dict()
+        self.indexes = indexes if indexes is not None else dict()
+
+    def apply(self, records: list[tuple]) -> None:
+        for record in records:
+            op, collection = record[0], record[1]
+            if op == PUT:
+                self.db.setdefault(collection, dict())[record[2]] = record[3]
+            elif op == DELETE:
+                self.db.get(collection, dict()).pop(record[2], None)
+            elif op == CREATE_COLLECTION:
+                self.db.setdefault(collection, dict())
+            elif op == DROP_COLLECTION:
+                self.db.pop(collection, None)
+                self.indexes.pop(collection, None)
+            elif op == SET_INDEXES:
+                self.indexes[collection] = record[2]
+
+
+class _Pickler(pickle.Pickler):
+    def reducer_override(self, obj: Any) -> Any:
+        cls = type(obj)
+        if (cls.__module__, cls.__qualname__) not in _SAFE_CLASSES:
+            raise pickle.PicklingError(
+                f"Values of type {cls.__qualname__} can not be persisted"
+            )
+        return NotImplemented
+
+
+class _Unpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in _SAFE_CLASSES:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed")
+        return super().find_class(module, name)
+
+
+def encode_record(record: tuple) -> bytes:
+    """Encode a log record.
+
+    Raises:
+        BadRequestError: A value of the record can not be persisted.
+    """
+    if record[0] == SET_INDEXES:
+        record = (SET_INDEXES, record[1], _dump_indexes(record[2]))
+    try:
+        return _dumps(record)
+    except pickle.PicklingError as e:
+        raise BadRequestError(str(e))
+
+
+def _decode_records(data: memoryview) -> list[tuple]:
+    records = []
+    for record in _loads(data):
+        if record[0] == SET_INDEXES:
+            record = (SET_INDEXES, record[1], _load_indexes(record[2]))
+        records.append(record)
+    return records
+
+
+def _dumps(value: Any) -> bytes:
+    file = io.BytesIO()
+    _Pickler(file, protocol=_PROTOCOL).dump(value)
+    return file.getvalue()
+
+
+def _loads(data: memoryview) -> list:
+    # Reads the values pickled one after another in data.
+    values = []
+    try:
+        with io.BytesIO(data) as file:
+            unpickler = _Unpickler(file)
+            while file.tell() < len(data):
+                values.append(unpickler.load())
+    except Exception as e:
+        raise InternalError(f"Memory store entry can not be read: {e}")
+    return values
+
+
+def _dump_indexes(indexes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        name: json.loads(index.to_json()) for name, index in indexes.items()
+    }
+
+
+def _load_indexes(data: dict[str, Any]) -> dict[str, Any]:
+    config = DocumentCollectionConfig.from_dict(
+        {"indexes": list(data.values())}
+    )
+    return dict(zip(data.keys(), config.indexes or []))
+
+
+class MemoryLog:
+    """Append only operation log with compacted snapshots.
+
+    The store folder holds numbered generations. snapshot.<n> is the
+    state at the start of log.<n>, and log.<n> has every change made
+    after it. Loading reads the latest complete snapshot and replays
+    the logs from its generation onwards.
+
+    Writers append an entry and then wait in sync until it is on disk.
+    One waiting writer flushes and fsyncs the file for everyone that
+    appended before it (group commit).
+    """
+
+    store_path: str
+    fsync: bool
+    snapshot_log_size: int
+
+    _generation: int
+    _file: IO[bytes] | None
+    _size: int
+    _written: int
+    _durable: int
+    _syncing: bool
+    _lock: Lock
+    _cond: Condition
+
+    def __init__(
+        self,
+        store_path: str,
+        fsync: bool = True,
+        snapshot_log_size: int = 64 * 1024 * 1024,
+    ):
+        self.store_path = store_path
+        self.fsync = fsync
+        self.snapshot_log_size = snapshot_log_size
+
+        self._generation = 0
+        self._file = None
+        self._size = 0
+        self._written = 0
+        self._durable = 0
+        self._syncing = False
+        self._lock = Lock()
+        self._cond = Condition()
+
+    def load(self) -> MemoryState:
+        os.makedirs(self.store_path, exist_ok=True)
+        snapshots = self._list_generations(SNAPSHOT_PREFIX)
+        logs = self._list_generations(LOG_PREFIX)
+        state = None
+        generation = 0
+        for snapshot_generation in reversed(snapshots):
+            state = self._read_snapshot(snapshot_generation)
+            if state is not None:
+                generation = snapshot_generation
+                break
+        if state is None:
+            state = MemoryState()
+            generation = logs[0] if logs else 0
+        size = 0
+        replayed = None
+        for log_generation in logs:
+            if log_generation < generation:
+                continue
+            if replayed is not None and size < os.path.getsize(
+                self._get_path(LOG_PREFIX, replayed)
+            ):
+                # Only the last log can end with a torn write.
+                raise InternalError(
+                    f"Memory store log {replayed} is corrupted"
+                )
+            generation = replayed = log_generation
+            size = self._replay(log_generation, state)
+        path = self._get_path(LOG_PREFIX, generation)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            # Drop the torn tail of the last write before appending.
+            with open(path, "r+b") as file:
+                file.truncate(size)
+        self._generation = generation
+        self._size = size
+        return state
+
+    def append(self, records: list[bytes]) -> int:
+        """Append an entry of records encoded with encode_record."""
+        data = b"".join(records)
+        with self._lock:
+            file = self._open()
+            file.write(_HEADER.pack(len(data), zlib.crc32(data)))
+            file.write(data)
+            self._size += _HEADER.size + len(data)
+            self._written += 1
+            return self._written
+
+    def sync(self, position: int) -> None:
+        with self._cond:
+            while self._durable < position and self._syncing:
+                self._cond.wait()
+            if self._durable >= position:
+                return
+            self._syncing = True
+        durable = self._durable
+        try:
+            with self._lock:
+                written = self._written
+                file = self._open()
+                file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+            durable = written
+        finally:
+            with self._cond:
+                self._durable = max(self._durable, durable)
+                self._syncing = False
+                self._cond.notify_all()
+
+    def needs_snapshot(self) -> bool:
+        return self._size >= self.snapshot_log_size
+
+    def rotate(self) -> int:
+        """Start the next generation of the log.
+
+        Must be called while no writer can change the state, so that
+        the state at this point can be written as the snapshot of the
+        returned generation.
+        """
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            with self._lock:
+                self._close()
+                self._generation += 1
+                self._size = 0
+                self._durable = self._written
+            return self._generation
+
+    def write_snapshot(self, generation: int, state: MemoryState) -> None:
+        data = _dumps(
+            (
+                state.db,
+                {
+                    collection: _dump_indexes(indexes)
+                    for collection, indexes in state.indexes.items()
+                },
+            )
+        )
+        path = self._get_path(SNAPSHOT_PREFIX, generation)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_HEADER.pack(len(data), zlib.crc32(data)))
+            file.write(data)
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+        self._sync_folder()
+        for prefix in (SNAPSHOT_PREFIX, LOG_PREFIX):
+            for old_generation in self._list_generations(prefix):
+                if old_generation < generation:
+                    os.remove(self._get_path(prefix, old_generation))
+
+    def close(self) -> None:
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            with self._lock:
+                self._close()
+                self._durable = self._written
+
+    def _open(self) -> IO[bytes]:
+        if self._file is None:
+            self._file = open(
+                self._get_path(LOG_PREFIX, self._generation), "ab"
+            )
+        return self._file
+
+    def _close(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def _read_snapshot(self, generation: int) -> MemoryState | None:
+        path = self._get_path(SNAPSHOT_PREFIX, generation)
+        entries = self._read_entries(path)
+        try:
+            data = next(entries, None)
+            if data is None:
+                return None
+            db, indexes = _loads(data)[0]
+            return MemoryState(
+                db,
+                {
+                    collection: _load_indexes(collection_indexes)
+                    for collection, collection_indexes in indexes.items()
+                },
+            )
+        finally:
+            entries.close()
+
+    def _replay(self, generation: int, state: MemoryState) -> int:
+        # Returns the size of the valid part of the log.
+        path = self._get_path(LOG_PREFIX, generation)
+        size = 0
+        for data in self._read_entries(path):
+            state.apply(_decode_records(data))
+            size += _HEADER.size + len(data)
+        return size
+
+    def _read_entries(self, path: str) -> Generator[memoryview, None, None]:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    offset = 0
+                    end = len(view)
+                    while offset + _HEADER.size <= end:
+                        length, crc = _HEADER.unpack_from(view, offset)
+                        start = offset + _HEADER.size
+                        stop = start + length
+                        if stop > end:
+                            return
+                        data = view[start:stop]
+                        try:
+                            if zlib.crc32(data) != crc:
+                                return
+                            yield data
+                        finally:
+                            data.release()
+                        offset = stop
+
+    def _list_generations(self, prefix: str) -> list[int]:
+        generations = []
+        for name in os.listdir(self.store_path):
+            suffix = name.removeprefix(prefix)
+            if suffix != name and suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+    def _get_path(self, prefix: str, generation: int) -> str:
+        return os.path.join(self.store_path, f"{prefix}{generation}")
+
+    def _sync_folder(self) -> None:
+        if not self.fsync or os.name == "nt":
+            return
+        fd = os.open(self.store_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -7,8 +7,10 @@ from __future__ import annotations
 __all__ = ["Memory"]
 
 import copy
+import itertools
+from contextlib import AbstractContextManager, ExitStack, contextmanager
 from threading import Lock
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 from x8.core import Context, Operation, Response
 from x8.core.exceptions import (
@@ -17,7 +19,15 @@ from x8.core.exceptions import (
     NotFoundError,
     PreconditionFailedError,
 )
-from x8.ql import QueryProcessor
+from x8.ql import (
+    Expression,
+    OrderBy,
+    OrderByDirection,
+    OrderByTerm,
+    QueryCompiler,
+    QueryProcessor,
+    Select,
+)
 from x8.storage._common import CollectionResult, CollectionStatus, Index
 from x8.storage._common import IndexHelper as BaseIndexHelper
 from x8.storage._common import (
@@ -25,6 +35,7 @@ from x8.storage._common import (
     IndexStatus,
     ItemProcessor,
     ParameterParser,
+    SpecialAttribute,
     StoreOperation,
     StoreOperationParser,
     StoreProvider,
@@ -32,9 +43,23 @@ from x8.storage._common import (
 )
 
 from .._helper import (
+    build_aiter_query_result,
     build_item_from_value,
+    build_query_continuation,
     build_query_result,
     get_collection_config,
+    get_query_args,
+)
+from ._memory_index import MemoryIndexes
+from ._memory_log import (
+    CREATE_COLLECTION,
+    DELETE,
+    DROP_COLLECTION,
+    PUT,
+    SET_INDEXES,
+    MemoryLog,
+    MemoryState,
+    encode_record,
 )
 
 
@@ -44,6 +69,9 @@ class Memory(StoreProvider):
     pk_map_field: str | dict | None
     etag_embed_field: str | dict | None
     suppress_fields: list[str] | None
+    store_path: str | None
+    fsync: bool
+    snapshot_log_size: int
     nparams: dict[str, Any]
 
     # (collection, key, value)
@@ -51,6 +79,8 @@ class Memory(StoreProvider):
     _indexes: dict[str, dict[str, Index]]
     _collection_cache: dict[str, MemoryCollection]
     _lock: Lock
+    _log: MemoryLog | None
+    _compact_lock: Lock
 
     def __init__(
         self,
@@ -59,6 +89,9 @@ class Memory(StoreProvider):
         pk_map_field: str | dict | None = "pk",
         etag_embed_field: str | dict | None = "_etag",
         suppress_fields: list[str] | None = None,
+        store_path: str | None = None,
+        fsync: bool = True,
+        snapshot_log_size: int = 64 * 1024 * 1024,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -84,6 +117,19 @@ class Memory(StoreProvider):
                 is the field.
             suppress_fields:
                 List of fields to supress when results are returned.
+            store_path:
+                Folder to persist the documents in.
+                Every change is appended to an operation log and
+                the log is periodically compacted into a snapshot.
+                The documents are loaded from the folder on first use.
+                Documents are only kept in memory if not specified.
+            fsync:
+                Whether to fsync the operation log before a write
+                returns, defaults to True. Concurrent writes share
+                a single fsync.
+            snapshot_log_size:
+                Size of the operation log in bytes after which a
+                compacted snapshot is written, defaults to 64 MB.
             nparams:
                 Native parameters to the client. Not used.
         """
@@ -92,15 +138,34 @@ class Memory(StoreProvider):
         self.pk_map_field = pk_map_field
         self.etag_embed_field = etag_embed_field
         self.suppress_fields = suppress_fields
+        self.store_path = store_path
+        self.fsync = fsync
+        self.snapshot_log_size = snapshot_log_size
         self.nparams = nparams
 
         self._db = dict()
         self._indexes = dict()
         self._collection_cache = dict()
         self._lock = Lock()
+        self._log = None
+        self._compact_lock = Lock()
 
     def __setup__(self, context: Context | None = None) -> None:
-        pass
+        if self.store_path is None or self._log is not None:
+            return
+        with self._lock:
+            if self._log is not None:
+                return
+            log = MemoryLog(
+                self.store_path,
+                fsync=self.fsync,
+                snapshot_log_size=self.snapshot_log_size,
+            )
+            state = log.load()
+            self._db = state.db
+            self._indexes = state.indexes
+            self._collection_cache = dict()
+            self._log = log
 
     def _get_collection_name(self, op_parser: StoreOperationParser) -> str:
         collection_name = (
@@ -126,8 +191,18 @@ class Memory(StoreProvider):
                 collections.extend(self._get_collections(single_op_parser))
             return collections
         db_collection = self._get_collection_name(op_parser)
+        return [self._get_collection(db_collection)]
+
+    def _get_collection(self, db_collection: str) -> MemoryCollection:
+        col = self._collection_cache.get(db_collection)
+        if col is not None:
+            return col
+        with self._lock:
+            return self._create_collection(db_collection)
+
+    def _create_collection(self, db_collection: str) -> MemoryCollection:
         if db_collection in self._collection_cache:
-            return [self._collection_cache[db_collection]]
+            return self._collection_cache[db_collection]
         id_map_field = ParameterParser.get_collection_parameter(
             self.id_map_field or self.__component__.id_map_field,
             db_collection,
@@ -147,9 +222,91 @@ class Memory(StoreProvider):
             pk_map_field,
             etag_embed_field,
             self.suppress_fields,
+            list(self._indexes.get(db_collection, dict()).values()),
+            name=db_collection,
+            journal=self._log is not None,
+            raw=self.__raw__,
         )
         self._collection_cache[db_collection] = col
-        return [col]
+        return col
+
+    def _refresh_indexes(self, db_collection: str) -> None:
+        if db_collection in self._collection_cache:
+            col = self._collection_cache[db_collection]
+            with col.lock:
+                col.set_indexes(
+                    list(self._indexes.get(db_collection, dict()).values())
+                )
+
+    def _write_lock(
+        self, collections: list[MemoryCollection]
+    ) -> AbstractContextManager:
+        if self._log is None and len(collections) == 1:
+            return collections[0].lock
+        return self._logged_write_lock(collections)
+
+    @contextmanager
+    def _logged_write_lock(
+        self, collections: list[MemoryCollection]
+    ) -> Iterator[None]:
+        # Locks are always taken in the same order to avoid deadlocks
+        # between transactions touching the same collections.
+        cols = {id(col): col for col in collections}
+        unique = [cols[key] for key in sorted(cols)]
+        position = None
+        try:
+            with ExitStack() as stack:
+                for col in unique:
+                    stack.enter_context(col.lock)
+                try:
+                    yield
+                finally:
+                    # Changes are logged in the order they are applied
+                    # and the writes of one operation form one entry.
+                    records: list[bytes] = []
+                    for col in unique:
+                        if col.changes:
+                            records.extend(col.changes)
+                            col.changes.clear()
+                    if self._log is not None and records:
+                        position = self._log.append(records)
+        finally:
+            self._commit(position)
+
+    def _append(self, records: list[tuple]) -> int | None:
+        if self._log is None or not records:
+            return None
+        return self._log.append([encode_record(record) for record in records])
+
+    def _commit(self, position: int | None) -> None:
+        if self._log is None or position is None:
+            return
+        self._log.sync(position)
+        if self._log.needs_snapshot() and self._compact_lock.acquire(
+            blocking=False
+        ):
+            try:
+                self._compact(self._log)
+            finally:
+                self._compact_lock.release()
+
+    def _compact(self, log: MemoryLog) -> None:
+        with self._lock:
+            collections = list(self._collection_cache.values())
+            with ExitStack() as stack:
+                for col in collections:
+                    stack.enter_context(col.lock)
+                generation = log.rotate()
+                # Stored documents are never changed in place,
+                # so shallow copies are a consistent snapshot.
+                state = MemoryState(
+                    {name: dict(data) for name, data in self._db.items()},
+                    {
+                        name: dict(indexes)
+                        for name, indexes in self._indexes.items()
+                    },
+                )
+        log.write_snapshot(generation, state)
 
     def _validate(self, op_parser: StoreOperationParser):
         if op_parser.op_equals(StoreOperation.BATCH):
@@ -170,8 +327,9 @@ class Memory(StoreProvider):
         self._validate(op_parser)
         collections = self._get_collections(op_parser)
         if len(collections) == 1:
-            processor = collections[0].processor
-            data = collections[0].data
+            collection = collections[0]
+            processor = collection.processor
+            data = collection.data
         result: Any = None
 
         def get_db_key_from_key(key):
@@ -217,11 +375,23 @@ class Memory(StoreProvider):
                                     ],
                                 )
                             )
+                self._refresh_indexes(collection_name)
+                records: list = [(CREATE_COLLECTION, collection_name)]
+                if config and config.indexes:
+                    records.append(
+                        (
+                            SET_INDEXES,
+                            collection_name,
+                            dict(self._indexes[collection_name]),
+                        )
+                    )
+                position = self._append(records)
                 status: Any = CollectionStatus.CREATED
                 if conflict:
                     if exists is False:
                         raise ConflictError
                     status = CollectionStatus.EXISTS
+            self._commit(position)
             result = CollectionResult(status=status, indexes=index_results)
         # DROP COLLECTION
         elif op_parser.op_equals(StoreOperation.DROP_COLLECTION):
@@ -236,10 +406,13 @@ class Memory(StoreProvider):
                     not_found = True
                 if collection_name in self._indexes:
                     del self._indexes[collection_name]
+                self._collection_cache.pop(collection_name, None)
+                position = self._append([(DROP_COLLECTION, collection_name)])
                 if not_found:
                     if exists is True:
                         raise NotFoundError
                     status = CollectionStatus.NOT_EXISTS
+            self._commit(position)
             result = CollectionResult(status=status)
         # LIST COLLECTIONS
         elif op_parser.op_equals(StoreOperation.LIST_COLLECTIONS):
@@ -264,7 +437,19 @@ class Memory(StoreProvider):
                     raise ConflictError
                 status = IndexStatus.EXISTS
                 match_index = self._indexes[collection_name][index_name]
-            self._indexes[collection_name][index_name] = index
+            with self._lock:
+                self._indexes[collection_name][index_name] = index
+                self._refresh_indexes(collection_name)
+                position = self._append(
+                    [
+                        (
+                            SET_INDEXES,
+                            collection_name,
+                            dict(self._indexes[collection_name]),
+                        )
+                    ]
+                )
+            self._commit(position)
             result = IndexResult(status=status, index=match_index)
         # DROP INDEX
         elif op_parser.op_equals(StoreOperation.DROP_INDEX):
@@ -278,7 +463,19 @@ class Memory(StoreProvider):
                 collection_name in self._indexes
                 and index_name in self._indexes[collection_name]
             ):
-                del self._indexes[collection_name][index_name]
+                with self._lock:
+                    del self._indexes[collection_name][index_name]
+                    self._refresh_indexes(collection_name)
+                    position = self._append(
+                        [
+                            (
+                                SET_INDEXES,
+                                collection_name,
+                                dict(self._indexes[collection_name]),
+                            )
+                        ]
+                    )
+                self._commit(position)
             else:
                 if exists is True:
                     raise NotFoundError
@@ -295,13 +492,14 @@ class Memory(StoreProvider):
         elif op_parser.op_equals(StoreOperation.GET):
             key = op_parser.get_key()
             db_key = get_db_key_from_key(key)
-            if db_key in data:
-                value = data[db_key]
-                result = build_item_from_value(
-                    processor=processor, value=value, include_value=True
-                )
-            else:
+            # Stored documents are never modified in place,
+            # so a single lookup is a consistent read.
+            value = data.get(db_key)
+            if value is None:
                 raise NotFoundError
+            result = build_item_from_value(
+                processor=processor, value=value, include_value=True
+            )
         # PUT
         elif op_parser.op_equals(StoreOperation.PUT):
             document = op_parser.get_value()
@@ -311,17 +509,17 @@ class Memory(StoreProvider):
             exists = op_parser.get_where_exists()
             returning = op_parser.get_returning()
             db_key = get_db_key_from_value(document)
-            with self._lock:
+            with self._write_lock([collection]):
                 if where is None:
-                    data[db_key] = document
+                    collection.put(db_key, document)
                 elif exists is False:
                     if db_key in data:
                         raise PreconditionFailedError
-                    data[db_key] = document
+                    collection.put(db_key, document)
                 elif exists is True:
                     if db_key not in data:
                         raise PreconditionFailedError
-                    data[db_key] = document
+                    collection.put(db_key, document)
                 elif where is not None:
                     current_document = None
                     if db_key in data:
@@ -330,7 +528,7 @@ class Memory(StoreProvider):
                         current_document, where, processor.resolve_field
                     ):
                         raise PreconditionFailedError
-                    data[db_key] = document
+                    collection.put(db_key, document)
             result = build_item_from_value(
                 processor=processor,
                 value=document,
@@ -349,7 +547,7 @@ class Memory(StoreProvider):
                 uset = processor.add_etag_update(uset, etag)
             current_document = None
             updated_document = None
-            with self._lock:
+            with self._write_lock([collection]):
                 if db_key in data:
                     current_document = data[db_key]
                 if where is None:
@@ -363,7 +561,7 @@ class Memory(StoreProvider):
                 updated_document = QueryProcessor.update_item(
                     current_document, uset, processor.resolve_field
                 )
-                data[db_key] = updated_document
+                collection.put(db_key, updated_document)
             if returning == "new":
                 result = build_item_from_value(
                     processor=processor,
@@ -388,7 +586,7 @@ class Memory(StoreProvider):
             where = op_parser.get_where()
             db_key = get_db_key_from_key(key)
             current_document = None
-            with self._lock:
+            with self._write_lock([collection]):
                 if db_key in data:
                     current_document = data[db_key]
                 if where is None:
@@ -399,68 +597,74 @@ class Memory(StoreProvider):
                         current_document, where, processor.resolve_field
                     ):
                         raise PreconditionFailedError
-                data.pop(db_key)
+                collection.delete(db_key)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            items = list(data.values())
-            nresult = QueryProcessor.query_items(
+            args = get_query_args(op_parser)
+            nresult = collection.query(**args)
+            items = [
+                build_item_from_value(
+                    processor=processor, value=item, include_value=True
+                )
+                for item in nresult
+            ]
+            result = build_query_result(
                 items,
+                build_query_continuation(items, args),
+                raw=processor.raw,
+            )
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            matches = collection.iter_query(
                 select=op_parser.get_select(),
                 where=op_parser.get_where(),
                 order_by=op_parser.get_order_by(),
                 limit=op_parser.get_limit(),
                 offset=op_parser.get_offset(),
-                field_resolver=processor.resolve_field,
             )
-            items = [
+            result = (
                 build_item_from_value(
                     processor=processor, value=item, include_value=True
                 )
-                for item in nresult
-            ]
-            result = build_query_result(items)
+                for item in matches
+            )
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
-            items = list(data.values())
-            result = QueryProcessor.count_items(
-                items,
-                where=op_parser.get_where(),
-                field_resolver=processor.resolve_field,
-            )
+            result = collection.count(where=op_parser.get_where())
         # BATCH
         elif op_parser.op_equals(StoreOperation.BATCH):
             result = []
             op_parsers = op_parser.get_operation_parsers()
-            for op_parser in op_parsers:
-                if op_parser.op_equals(StoreOperation.PUT):
-                    document = op_parser.get_value()
-                    key = op_parser.get_key()
-                    document = processor.add_embed_fields(document, key)
-                    db_key = get_db_key_from_value(document)
-                    with self._lock:
-                        data[db_key] = document
-                    result.append(
-                        build_item_from_value(
-                            processor=processor, value=document
+            with self._write_lock([collection]):
+                for op_parser in op_parsers:
+                    if op_parser.op_equals(StoreOperation.PUT):
+                        document = op_parser.get_value()
+                        key = op_parser.get_key()
+                        document = processor.add_embed_fields(document, key)
+                        db_key = get_db_key_from_value(document)
+                        collection.put(db_key, document)
+                        result.append(
+                            build_item_from_value(
+                                processor=processor, value=document
+                            )
                         )
-                    )
-                elif op_parser.op_equals(StoreOperation.DELETE):
-                    key = op_parser.get_key()
-                    db_key = get_db_key_from_key(key)
-                    with self._lock:
+                    elif op_parser.op_equals(StoreOperation.DELETE):
+                        key = op_parser.get_key()
+                        db_key = get_db_key_from_key(key)
                         if db_key in data:
-                            data.pop(db_key)
-                    result.append(None)
+                            collection.delete(db_key)
+                        result.append(None)
         # TRANSACT
         elif op_parser.op_equals(StoreOperation.TRANSACT):
             result = []
             op_parsers = op_parser.get_operation_parsers()
             fail = False
-            with self._lock:
+            with self._write_lock(collections):
                 for i in range(0, len(op_parsers)):
                     op_parser = op_parsers[i]
-                    processor = collections[i].processor
-                    data = collections[i].data
+                    collection = collections[i]
+                    processor = collection.processor
+                    data = collection.data
                     if op_parser.op_equals(StoreOperation.PUT):
                         key = op_parser.get_key()
                         where = op_parser.get_where()
@@ -507,14 +711,15 @@ class Memory(StoreProvider):
                     raise ConflictError
                 for i in range(0, len(op_parsers)):
                     op_parser = op_parsers[i]
-                    processor = collections[i].processor
-                    data = collections[i].data
+                    collection = collections[i]
+                    processor = collection.processor
+                    data = collection.data
                     if op_parser.op_equals(StoreOperation.PUT):
                         key = op_parser.get_key()
                         document = op_parser.get_value()
                         document = processor.add_embed_fields(document, key)
                         db_key = get_db_key_from_value(document)
-                        data[db_key] = document
+                        collection.put(db_key, document)
                         result.append(
                             build_item_from_value(
                                 processor=processor, value=document
@@ -533,7 +738,7 @@ class Memory(StoreProvider):
                         updated_document = QueryProcessor.update_item(
                             current_document, uset, processor.resolve_field
                         )
-                        data[db_key] = updated_document
+                        collection.put(db_key, updated_document)
                         if returning == "new":
                             result.append(
                                 build_item_from_value(
@@ -561,11 +766,12 @@ class Memory(StoreProvider):
                     elif op_parser.op_equals(StoreOperation.DELETE):
                         key = op_parser.get_key()
                         db_key = get_db_key_from_key(key)
-                        data.pop(db_key)
+                        collection.delete(db_key)
                         result.append(None)
         # CLOSE
         elif op_parser.op_equals(StoreOperation.CLOSE):
-            pass
+            if self._log is not None:
+                self._log.close()
         else:
             return super().__run__(
                 operation,
@@ -574,10 +780,42 @@ class Memory(StoreProvider):
             )
         return Response(result=result)
 
+    async def __arun__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        response = await super().__arun__(operation, context, **kwargs)
+        op_parser = self.get_op_parser(operation)
+        if op_parser.op_equals(StoreOperation.ITER_QUERY):
+            response.result = build_aiter_query_result(
+                response.result, op_parser.get_batch_size()
+            )
+        return response
+
 
 class MemoryCollection:
+    name: str | None
     data: dict[str, Any]
     processor: ItemProcessor
+    indexes: MemoryIndexes
+    lock: Lock
+    version: int
+
+    # Encoded log records of the writes not yet appended to the
+    # operation log. None if the store is not persisted.
+    changes: list[bytes] | None
+
+    # Documents are numbered in insertion order so that index lookups
+    # can be returned in the same order as a scan of data.
+    _seqs: dict[Any, int]
+    _keys: dict[int, Any]
+    _next_seq: int
+
+    # Immutable view of the documents at the current version.
+    # Built lazily by the first reader and shared until the next write.
+    _snapshot: tuple | None
 
     def __init__(
         self,
@@ -586,7 +824,12 @@ class MemoryCollection:
         pk_map_field: str | None,
         etag_embed_field: str | None,
         suppress_fields: list[str] | None,
+        indexes: list[Index] | None = None,
+        name: str | None = None,
+        journal: bool = False,
+        raw: bool = False,
     ):
+        self.name = name
         self.data = data
         self.processor = ItemProcessor(
             etag_embed_field=etag_embed_field,
@@ -594,4 +837,233 @@ class MemoryCollection:
             pk_map_field=pk_map_field,
             local_etag=True,
             suppress_fields=suppress_fields,
+            raw=raw,
+        )
+        self.indexes = MemoryIndexes(
+            field_resolver=self.processor.resolve_field
+        )
+        self.lock = Lock()
+        self.version = 0
+        self.changes = [] if journal else None
+        self._snapshot = None
+        self.set_indexes(indexes or [])
+
+    def set_indexes(self, indexes: list[Index]) -> None:
+        self._seqs = dict()
+        self._keys = dict()
+        self._next_seq = 0
+        self.indexes.build(indexes, iter(()))
+        if not self.indexes:
+            return
+        for db_key in self.data:
+            self._assign_seq(db_key)
+        self.indexes.build(
+            indexes,
+            ((seq, self.data[db_key]) for seq, db_key in self._keys.items()),
+        )
+
+    def snapshot(self) -> tuple:
+        """Get the documents as of the current version.
+
+        Writers never modify a stored document in place and the
+        snapshot is replaced, not mutated, on write, so it can be
+        read without holding the lock.
+        """
+        with self.lock:
+            return self._get_snapshot()
+
+    def put(self, db_key: Any, document: dict) -> None:
+        # Must be called with the lock held.
+        if self.changes is not None:
+            # Encoded first, so a document that can not be persisted
+            # is not stored.
+            self.changes.append(
+                encode_record((PUT, self.name, db_key, document))
+            )
+        self._invalidate()
+        if not self.indexes:
+            self.data[db_key] = document
+            return
+        seq = self._seqs.get(db_key)
+        if seq is None:
+            seq = self._assign_seq(db_key)
+        else:
+            self.indexes.remove(seq)
+        self.data[db_key] = document
+        self.indexes.add(seq, document)
+
+    def delete(self, db_key: Any) -> None:
+        # Must be called with the lock held.
+        if self.changes is not None:
+            self.changes.append(encode_record((DELETE, self.name, db_key)))
+        self._invalidate()
+        self.data.pop(db_key)
+        if not self.indexes:
+            return
+        seq = self._seqs.pop(db_key)
+        del self._keys[seq]
+        self.indexes.remove(seq)
+
+    def query(
+        self,
+        select: Select | None = None,
+        where: Expression | None = None,
+        order_by: OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[Any]:
+        with self.lock:
+            items, order_by, ordered = self._plan(
+                where, order_by, limit, offset
+            )
+            if ordered:
+                # Walking the index stops early at the limit,
+                # but the index must not change underneath it.
+                return QueryProcessor.query_items(
+                    items,
+                    select=select,
+                    where=where,
+                    limit=limit,
+                    offset=offset,
+                    field_resolver=self.processor.resolve_field,
+                )
+        return QueryProcessor.query_items(
+            items,
+            select=select,
+            where=where,
+            order_by=order_by,
+            limit=limit,
+            offset=offset,
+            field_resolver=self.processor.resolve_field,
         )
+
+    def iter_query(
+        self,
+        select: Select | None = None,
+        where: Expression | None = None,
+        order_by: OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Iterator[Any]:
+        start = offset if offset is not None else 0
+        end = start + limit if limit is not None else None
+        if (
+            order_by is not None
+            or start < 0
+            or (end is not None and end < start)
+        ):
+            # Every match has to be seen before the first one in order.
+            return iter(self.query(select, where, order_by, limit, offset))
+        with self.lock:
+            items, _, _ = self._plan(where, None, limit, offset)
+        matches = itertools.islice(
+            QueryProcessor.iter_items(
+                items, where, self.processor.resolve_field
+            ),
+            start,
+            end,
+        )
+        if select is None:
+            return matches
+        return map(
+            QueryCompiler.compile_select(select, self.processor.resolve_field),
+            matches,
+        )
+
+    def count(self, where: Expression | None = None) -> int:
+        with self.lock:
+            items, _, _ = self._plan(where, None, None, None)
+        return QueryProcessor.count_items(
+            items,
+            where=where,
+            field_resolver=self.processor.resolve_field,
+        )
+
+    def _plan(
+        self,
+        where: Expression | None,
+        order_by: OrderBy | None,
+        limit: int | None,
+        offset: int | None,
+    ) -> tuple[Iterable[Any], OrderBy | None, bool]:
+        # Index lookups only narrow down the candidates.
+        # The full where clause is still evaluated on every candidate.
+        if not self.indexes:
+            return self._get_snapshot(), order_by, False
+        plan = self.indexes.plan_where(where)
+        ordered_index = None
+        descending = False
+        tiebreak: OrderByTerm | None = None
+        if order_by is not None and (
+            len(order_by.terms) == 1
+            or (
+                len(order_by.terms) == 2
+                and order_by.terms[1].field == SpecialAttribute.ID
+            )
+        ):
+            term = order_by.terms[0]
+            ordered_index = self.indexes.get_ordered_index(term.field)
+            descending = term.direction == OrderByDirection.DESC
+            if len(order_by.terms) == 2:
+                tiebreak = order_by.terms[1]
+        if ordered_index is not None and (
+            plan is None
+            or (
+                limit is not None
+                and plan.estimate > (limit + (offset or 0)) * _SCAN_FACTOR
+            )
+        ):
+            if tiebreak is None:
+                seqs = ordered_index.iter_ordered(descending=descending)
+                return (
+                    (self.data[self._keys[seq]] for seq in seqs),
+                    None,
+                    True,
+                )
+            groups = ordered_index.iter_ordered_groups(descending=descending)
+            return self._iter_tied(groups, tiebreak), None, True
+        if plan is not None:
+            return (
+                [self.data[self._keys[seq]] for seq in sorted(plan.lookup())],
+                order_by,
+                False,
+            )
+        return self._get_snapshot(), order_by, False
+
+    def _iter_tied(
+        self,
+        groups: Iterator[list[int]],
+        tiebreak: OrderByTerm,
+    ) -> Iterator[Any]:
+        # Documents with equal index values are sorted on the tiebreak.
+        order_by = OrderBy(terms=[tiebreak])
+        for seqs in groups:
+            items = [self.data[self._keys[seq]] for seq in seqs]
+            if len(items) > 1:
+                items = QueryProcessor.query_items(
+                    items,
+                    order_by=order_by,
+                    field_resolver=self.processor.resolve_field,
+                )
+            yield from items
+
+    def _get_snapshot(self) -> tuple:
+        if self._snapshot is None:
+            self._snapshot = tuple(self.data.values())
+        return self._snapshot
+
+    def _invalidate(self) -> None:
+        self.version += 1
+        self._snapshot = None
+
+    def _assign_seq(self, db_key: Any) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seqs[db_key] = seq
+        self._keys[seq] = db_key
+        return seq
+
+
+# Walking an ordered index is preferred over sorting the where index
+# candidates when there are many more candidates than rows returned.
+_SCAN_FACTOR = 8
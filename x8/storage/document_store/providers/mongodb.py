@@ -73,8 +73,11 @@ from x8.storage._common import (
 from .._helper import (
     build_item_from_parts,
     build_item_from_value,
+    build_iter_query_result,
+    build_query_continuation,
     build_query_result,
     get_collection_config,
+    get_query_args,
 )
 from .._models import DocumentCollectionConfig, DocumentFieldType
 
@@ -445,6 +448,13 @@ class MongoDB(StoreProvider):
             call = NCall(client.delete_one, args, nargs)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
+            query_args = get_query_args(op_parser)
+            args = op_converter.convert_query(**query_args)
+            args = {"args": args, "nargs": nargs}
+            call = NCall(helper.query, args)
+            state = {"query_args": query_args}
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
             args = op_converter.convert_query(
                 select=op_parser.get_select(),
                 where=op_parser.get_where(),
@@ -452,8 +462,9 @@ class MongoDB(StoreProvider):
                 limit=op_parser.get_limit(),
                 offset=op_parser.get_offset(),
             )
+            args["batch_size"] = op_parser.get_batch_size()
             args = {"args": args, "nargs": nargs}
-            call = NCall(helper.query, args)
+            call = NCall(helper.iterate, args)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             args = op_converter.convert_count(
@@ -587,7 +598,20 @@ class MongoDB(StoreProvider):
                         processor=processor, value=item, include_value=True
                     )
                 )
-            result = build_query_result(items)
+            continuation = None
+            if state is not None:
+                continuation = build_query_continuation(
+                    items, state["query_args"]
+                )
+            result = build_query_result(items, continuation)
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            result = build_iter_query_result(
+                nresult,
+                lambda item: build_item_from_value(
+                    processor=processor, value=item, include_value=True
+                ),
+            )
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             result = nresult
@@ -1516,6 +1540,10 @@ class ClientHelper:
         ).invoke()
         return nresult
 
+    def iterate(self, args, nargs) -> Any:
+        # The cursor fetches batch_size documents per round trip.
+        return NCall(self.client.find, args, nargs).invoke()
+
     def batch(self, ops: list) -> Any:
         nresult = self.client.bulk_write(ops)
         return nresult
@@ -1574,6 +1602,9 @@ class AsyncClientHelper:
             nresult.append(item)
         return nresult
 
+    async def iterate(self, args, nargs) -> Any:
+        return NCall(self.client.find, args, nargs).invoke()
+
     async def batch(self, ops: list) -> Any:
         nresult = await self.client.bulk_write(ops)
         return nresult
@@ -9,7 +9,8 @@ __all__ = ["PostgreSQL"]
 import copy
 import json
 import re
-from typing import Any
+import uuid
+from typing import Any, AsyncIterator, Iterator
 
 import psycopg
 
@@ -56,6 +57,7 @@ from x8.storage._common import (
     ItemProcessor,
     ParameterParser,
     RangeIndex,
+    SpecialAttribute,
     StoreOperation,
     StoreOperationParser,
     StoreProvider,
@@ -69,12 +71,20 @@ from x8.storage._common import (
 
 from .._feature import DocumentStoreFeature
 from .._helper import (
+    NULL_FIRST_MISSING_LAST,
     build_item_from_parts,
     build_item_from_value,
+    build_iter_query_result,
+    build_query_continuation,
     build_query_result,
     get_collection_config,
+    get_query_args,
+)
+from .._models import (
+    DocumentCollectionConfig,
+    DocumentFieldType,
+    DocumentItem,
 )
-from .._models import DocumentCollectionConfig, DocumentFieldType
 
 
 class PostgreSQL(StoreProvider):
@@ -227,6 +237,7 @@ class PostgreSQL(StoreProvider):
             pk_map_field,
             etag_embed_field,
             self.suppress_fields,
+            self.__raw__,
         )
         self._collection_cache[table] = col
         return [col]
@@ -275,6 +286,7 @@ class PostgreSQL(StoreProvider):
             pk_map_field,
             etag_embed_field,
             self.suppress_fields,
+            self.__raw__,
         )
         self._acollection_cache[table] = col
         return [col]
@@ -477,14 +489,22 @@ class PostgreSQL(StoreProvider):
             call = NCall(helper.execute, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            args = op_converter.convert_query(
+            # JSON null sorts first and missing values sort last.
+            query_args = get_query_args(op_parser, NULL_FIRST_MISSING_LAST)
+            args = op_converter.convert_query(**query_args)
+            call = NCall(helper.execute, args)
+            state = {"query_args": query_args}
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            args = op_converter.convert_iter_query(
                 select=op_parser.get_select(),
                 where=op_parser.get_where(),
                 order_by=op_parser.get_order_by(),
                 limit=op_parser.get_limit(),
                 offset=op_parser.get_offset(),
+                batch_size=op_parser.get_batch_size(),
             )
-            call = NCall(helper.execute, args)
+            call = NCall(helper.iterate, args)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             args = op_converter.convert_count(
@@ -555,7 +575,10 @@ class PostgreSQL(StoreProvider):
             result = result_converter.convert_delete(nresult, op_parser)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            result = result_converter.convert_query(nresult, op_parser)
+            result = result_converter.convert_query(nresult, op_parser, state)
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            result = result_converter.convert_iter_query(nresult, op_parser)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             result = result_converter.convert_count(nresult)
@@ -960,22 +983,37 @@ class ResultConverter:
                 raise PreconditionFailedError
         return None
 
-    def convert_query(self, nresult: Any, op_parser: StoreOperationParser):
-        items: list = []
+    def convert_query(
+        self,
+        nresult: Any,
+        op_parser: StoreOperationParser,
+        state: dict | None,
+    ):
         select = op_parser.get_select()
-        for item in nresult:
-            if select is None or len(select.terms) == 0:
-                nvalue = item[0]
-            else:
-                nvalue = QueryHelper.normalize_select(
-                    self.processor, select, item
-                )
-            items.append(
-                build_item_from_value(
-                    processor=self.processor, value=nvalue, include_value=True
-                )
-            )
-        return build_query_result(items)
+        items = [self._convert_query_item(item, select) for item in nresult]
+        continuation = None
+        if state is not None:
+            continuation = build_query_continuation(items, state["query_args"])
+        return build_query_result(items, continuation, raw=self.processor.raw)
+
+    def convert_iter_query(
+        self, nresult: Any, op_parser: StoreOperationParser
+    ) -> Iterator[DocumentItem] | AsyncIterator[DocumentItem]:
+        select = op_parser.get_select()
+        return build_iter_query_result(
+            nresult, lambda item: self._convert_query_item(item, select)
+        )
+
+    def _convert_query_item(
+        self, item: tuple, select: Select | None
+    ) -> DocumentItem:
+        if select is None or len(select.terms) == 0:
+            nvalue = item[0]
+        else:
+            nvalue = QueryHelper.normalize_select(self.processor, select, item)
+        return build_item_from_value(
+            processor=self.processor, value=nvalue, include_value=True
+        )
 
     def convert_count(self, nresult: Any):
         return nresult[0]
@@ -1519,6 +1557,18 @@ class OperationConverter:
                 query = f"""{query} OFFSET 0 LIMIT {limit}"""
         return {"query": query, "fetchall": True}
 
+    def convert_iter_query(
+        self,
+        select: Select | None = None,
+        where: Expression | None = None,
+        order_by: OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        batch_size: int = 100,
+    ) -> dict:
+        args = self.convert_query(select, where, order_by, limit, offset)
+        return {"query": args["query"], "batch_size": batch_size}
+
     def convert_count(self, where: Expression | None = None) -> dict:
         query = f"SELECT COUNT(*) FROM {self.table}"
         if where is not None:
@@ -1591,7 +1641,7 @@ class OperationConverter:
         if expr is None:
             return "NULL"
         if isinstance(expr, str):
-            return f"'{expr}'"
+            return f"""'{expr.replace("'", "''")}'"""
         if isinstance(expr, bool):
             return str(expr).upper()
         if isinstance(expr, (int, float)):
@@ -1638,7 +1688,10 @@ class OperationConverter:
         field_type = get_field_type(value)
 
         if isinstance(expr.lexpr, Field):
-            lhs = self.convert_field(expr.lexpr, field_type)
+            if expr.lexpr.path == SpecialAttribute.ID:
+                lhs = self.id_column
+            else:
+                lhs = self.convert_field(expr.lexpr, field_type)
         else:
             lhs = self.convert_expr(expr.lexpr)
         if isinstance(expr.rexpr, Field):
@@ -1716,7 +1769,11 @@ class OperationConverter:
     def convert_order_by(self, order_by: OrderBy) -> str:
         str_terms = []
         for term in order_by.terms:
-            _str_term = self.convert_field(term.field)
+            if term.field == SpecialAttribute.ID:
+                # The id column is the primary key.
+                _str_term = self.id_column
+            else:
+                _str_term = self.convert_field(term.field)
             if term.direction is not None:
                 _str_term = f"{_str_term} {term.direction.value}"
             str_terms.append(_str_term)
@@ -1962,6 +2019,32 @@ class ClientHelper:
             cursor.close()
         return result
 
+    def iterate(self, query: str, batch_size: int) -> Iterator[tuple]:
+        # A named cursor keeps the result on the server. WITH HOLD lets
+        # it outlive the commits of other calls on the connection.
+        cursor = self.client.cursor(
+            name=f"x8_{uuid.uuid4().hex}", withhold=True
+        )
+        try:
+            cursor.execute(query)
+            self.client.commit()
+        except Exception:
+            self.client.rollback()
+            cursor.close()
+            raise
+
+        def fetch() -> Iterator[tuple]:
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield from rows
+            finally:
+                cursor.close()
+
+        return fetch()
+
     def close(self, nargs: Any) -> Any:
         pass
 
@@ -2105,6 +2188,33 @@ class AsyncClientHelper:
             await cursor.close()
         return result
 
+    async def iterate(
+        self, query: str, batch_size: int
+    ) -> AsyncIterator[tuple]:
+        cursor = self.client.cursor(
+            name=f"x8_{uuid.uuid4().hex}", withhold=True
+        )
+        try:
+            await cursor.execute(query)
+            await self.client.commit()
+        except Exception:
+            await self.client.rollback()
+            await cursor.close()
+            raise
+
+        async def fetch() -> AsyncIterator[tuple]:
+            try:
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield row
+            finally:
+                await cursor.close()
+
+        return fetch()
+
     async def close(self, nargs: Any) -> Any:
         await self.client.close()
 
@@ -2125,6 +2235,7 @@ class PostgreSQLCollection:
         pk_map_field: str | None,
         etag_embed_field: str | None,
         suppress_fields: list[str] | None,
+        raw: bool = False,
     ) -> None:
         self.processor = ItemProcessor(
             etag_embed_field=etag_embed_field,
@@ -2132,6 +2243,7 @@ class PostgreSQLCollection:
             pk_map_field=pk_map_field,
             local_etag=True,
             suppress_fields=suppress_fields,
+            raw=raw,
         )
         self.op_converter = OperationConverter(
             self.processor,
@@ -286,6 +286,7 @@ class Redis(RedisProvider, StoreProvider):
             self.suppress_fields,
             field_types,
             indexes,
+            self.__raw__,
         )
         self._collection_cache[db_collection] = col
         return [col]
@@ -339,6 +340,7 @@ class Redis(RedisProvider, StoreProvider):
             self.suppress_fields,
             field_types,
             indexes,
+            self.__raw__,
         )
         self._acollection_cache[db_collection] = col
         return [col]
@@ -696,7 +698,7 @@ class Redis(RedisProvider, StoreProvider):
                 items = QueryProcessor.project_item(
                     result, select, processor.resolve_field
                 )
-            result = build_query_result(items)
+            result = build_query_result(items, raw=processor.raw)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             result = int(nresult[1][1])
@@ -2651,6 +2653,7 @@ class RedisCollection:
         suppress_fields: list[str] | None,
         field_types: dict | None,
         indexes: list,
+        raw: bool = False,
     ) -> None:
         self.collection = collection
         self.client = client
@@ -2662,6 +2665,7 @@ class RedisCollection:
             local_etag=True,
             suppress_fields=suppress_fields,
             field_types=field_types,
+            raw=raw,
         )
         index_manager = IndexManager(collection, indexes)
         self.op_converter = OperationConverter(
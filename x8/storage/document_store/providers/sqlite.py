@@ -7,11 +7,13 @@ from __future__ import annotations
 __all__ = ["SQLite"]
 
 import copy
+import itertools
 import json
 import re
 import sqlite3
-from typing import Any
+from typing import Any, AsyncIterator, Callable, Iterator
 
+from x8._common.sqlite_client import SQLiteClient
 from x8.core import Context, DataAccessor, NCall, Operation, Response
 from x8.core.exceptions import (
     BadRequestError,
@@ -54,6 +56,7 @@ from x8.storage._common import (
     ItemProcessor,
     ParameterParser,
     RangeIndex,
+    SpecialAttribute,
     StoreOperation,
     StoreOperationParser,
     StoreProvider,
@@ -62,12 +65,20 @@ from x8.storage._common import (
 
 from .._feature import DocumentStoreFeature
 from .._helper import (
+    build_aiter_query_result,
     build_item_from_parts,
     build_item_from_value,
+    build_iter_query_result,
+    build_query_continuation,
     build_query_result,
     get_collection_config,
+    get_query_args,
+)
+from .._models import (
+    DocumentCollectionConfig,
+    DocumentFieldType,
+    DocumentItem,
 )
-from .._models import DocumentCollectionConfig, DocumentFieldType
 
 
 class SQLite(StoreProvider):
@@ -80,6 +91,9 @@ class SQLite(StoreProvider):
     pk_map_field: str | dict | None
     etag_embed_field: str | dict | None
     suppress_fields: list[str] | None
+    busy_timeout: float
+    group_commit: bool
+    pragmas: dict[str, Any] | None
     nparams: dict[str, Any]
 
     _client: Any
@@ -98,6 +112,9 @@ class SQLite(StoreProvider):
         pk_map_field: str | dict | None = "pk",
         etag_embed_field: str | dict | None = "_etag",
         suppress_fields: list[str] | None = None,
+        busy_timeout: float = 5.0,
+        group_commit: bool = False,
+        pragmas: dict[str, Any] | None = None,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -134,6 +151,15 @@ class SQLite(StoreProvider):
                 is the field, defaults to "_etag".
             suppress_fields:
                 List of fields to supress when results are returned.
+            busy_timeout:
+                Seconds to wait for a lock held by another connection,
+                defaults to 5.
+            group_commit:
+                Commit concurrent writes in one transaction,
+                defaults to False.
+            pragmas:
+                SQLite pragmas that override the defaults
+                (WAL journal, synchronous NORMAL, larger cache and mmap).
             nparams:
                 Native parameters to sqlite client.
         """
@@ -146,6 +172,9 @@ class SQLite(StoreProvider):
         self.pk_map_field = pk_map_field
         self.etag_embed_field = etag_embed_field
         self.suppress_fields = suppress_fields
+        self.busy_timeout = busy_timeout
+        self.group_commit = group_commit
+        self.pragmas = pragmas
         self.nparams = nparams
 
         self._client = None
@@ -160,10 +189,12 @@ class SQLite(StoreProvider):
         if self._client is not None:
             return
 
-        self._client = sqlite3.connect(
+        self._client = SQLiteClient(
             self.database,
-            check_same_thread=False,
-            **self.nparams,
+            busy_timeout=self.busy_timeout,
+            group_commit=self.group_commit,
+            pragmas=self.pragmas,
+            nparams=self.nparams,
         )
 
     def _get_table_name(self, op_parser: StoreOperationParser) -> str:
@@ -219,6 +250,7 @@ class SQLite(StoreProvider):
             pk_map_field,
             etag_embed_field,
             self.suppress_fields,
+            self.__raw__,
         )
         self._collection_cache[table] = col
         return [col]
@@ -259,6 +291,20 @@ class SQLite(StoreProvider):
         )
         return Response(result=result, native=dict(result=nresult, call=ncall))
 
+    async def __arun__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        response = await super().__arun__(operation, context, **kwargs)
+        op_parser = self.get_op_parser(operation)
+        if op_parser.op_equals(StoreOperation.ITER_QUERY):
+            response.result = build_aiter_query_result(
+                response.result, op_parser.get_batch_size()
+            )
+        return response
+
     def _get_ncall(
         self,
         op_parser: StoreOperationParser,
@@ -393,14 +439,21 @@ class SQLite(StoreProvider):
             call = NCall(helper.execute, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            args = op_converter.convert_query(
+            query_args = get_query_args(op_parser)
+            args = op_converter.convert_query(**query_args)
+            call = NCall(helper.execute, args)
+            state = {"query_args": query_args}
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            args = op_converter.convert_iter_query(
                 select=op_parser.get_select(),
                 where=op_parser.get_where(),
                 order_by=op_parser.get_order_by(),
                 limit=op_parser.get_limit(),
                 offset=op_parser.get_offset(),
+                batch_size=op_parser.get_batch_size(),
             )
-            call = NCall(helper.execute, args)
+            call = NCall(helper.iterate, args)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             args = op_converter.convert_count(
@@ -471,7 +524,10 @@ class SQLite(StoreProvider):
             result = result_converter.convert_delete(nresult, op_parser)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            result = result_converter.convert_query(nresult, op_parser)
+            result = result_converter.convert_query(nresult, op_parser, state)
+        # ITER QUERY
+        elif op_parser.op_equals(StoreOperation.ITER_QUERY):
+            result = result_converter.convert_iter_query(nresult, op_parser)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
             result = result_converter.convert_count(nresult)
@@ -712,20 +768,37 @@ class ResultConverter:
                 raise PreconditionFailedError
         return None
 
-    def convert_query(self, nresult: Any, op_parser: StoreOperationParser):
-        items: list = []
+    def convert_query(
+        self,
+        nresult: Any,
+        op_parser: StoreOperationParser,
+        state: dict | None,
+    ):
         select = op_parser.get_select()
-        for item in nresult:
-            if select is None or len(select.terms) == 0:
-                nvalue = json.loads(item[0])
-            else:
-                nvalue = Helper.normalize_select(self.processor, select, item)
-            items.append(
-                build_item_from_value(
-                    processor=self.processor, value=nvalue, include_value=True
-                )
-            )
-        return build_query_result(items)
+        items = [self._convert_query_item(item, select) for item in nresult]
+        continuation = None
+        if state is not None:
+            continuation = build_query_continuation(items, state["query_args"])
+        return build_query_result(items, continuation, raw=self.processor.raw)
+
+    def convert_iter_query(
+        self, nresult: Any, op_parser: StoreOperationParser
+    ) -> Iterator[DocumentItem] | AsyncIterator[DocumentItem]:
+        select = op_parser.get_select()
+        return build_iter_query_result(
+            nresult, lambda item: self._convert_query_item(item, select)
+        )
+
+    def _convert_query_item(
+        self, item: tuple, select: Select | None
+    ) -> DocumentItem:
+        if select is None or len(select.terms) == 0:
+            nvalue = json.loads(item[0])
+        else:
+            nvalue = Helper.normalize_select(self.processor, select, item)
+        return build_item_from_value(
+            processor=self.processor, value=nvalue, include_value=True
+        )
 
     def convert_count(self, nresult: Any):
         return nresult[0]
@@ -753,6 +826,8 @@ class OperationConverter:
     value_column: str
     pk_column: str | None
 
+    _sql_cache: dict[tuple, str]
+
     FIELD_TYPE_TEXT: str = "TEXT"
     FIELD_TYPE_NUMERIC: str = "NUMERIC"
     FIELD_TYPE_BOOLEAN: str = "BOOLEAN"
@@ -771,6 +846,7 @@ class OperationConverter:
         self.id_column = id_column
         self.value_column = value_column
         self.pk_column = pk_column
+        self._sql_cache = dict()
 
     @staticmethod
     def convert_create_collection(
@@ -850,11 +926,11 @@ class OperationConverter:
 
     @staticmethod
     def convert_has_collection(table: str) -> dict:
-        str = f"""
+        str = """
             SELECT name FROM sqlite_master
-            WHERE type='table' AND name='{table}'
+            WHERE type='table' AND name=?
             """
-        return {"query": str}
+        return {"query": str, "params": (table,)}
 
     @staticmethod
     def convert_create_index(
@@ -956,12 +1032,12 @@ class OperationConverter:
 
     @staticmethod
     def convert_list_indexes(table: str) -> dict:
-        query = f"""
+        query = """
         SELECT name, sql
         FROM sqlite_master
-        WHERE type = 'index' AND tbl_name = '{table}'
+        WHERE type = 'index' AND tbl_name = ?
         """
-        return {"query": query, "fetchall": True}
+        return {"query": query, "params": (table,), "fetchall": True}
 
     @staticmethod
     def convert_transact(
@@ -1023,9 +1099,12 @@ class OperationConverter:
         return {"ops": ops}, {"values": states}
 
     def convert_get(self, key: Value) -> dict:
-        str = f"""SELECT {self.value_column} FROM {self.table}
-                    WHERE {self.convert_key_comparison(key)}"""
-        return {"query": str}
+        str = self._get_sql(
+            ("get",),
+            lambda: f"""SELECT {self.value_column} FROM {self.table}
+                    WHERE {self._key_comparison}""",
+        )
+        return {"query": str, "params": self.convert_key_params(key)}
 
     def convert_put(
         self,
@@ -1039,32 +1118,35 @@ class OperationConverter:
             key = self.processor.get_key_from_key(key)
         else:
             key = self.processor.get_key_from_value(document)
+        json_string = json.dumps(document)
+        params: list = []
         if (where is None and exists is None) or exists is False:
             id, pk = self.processor.get_id_pk_from_key(key)
+            query = self._get_sql(
+                ("put", exists), lambda: self._build_insert(exists)
+            )
+            params.append(id)
             if self.pk_column is not None:
-                columns = f"""({self.id_column},
-                    {self.pk_column}, {self.value_column})"""
-                json_string = self._safe_json_dumps(document)
-                values = f"""({self.convert_expr(id)},
-                    {self.convert_expr(pk)}, '{json_string}')"""
-            else:
-                columns = f"({self.id_column}, {self.value_column})"
-                json_string = self._safe_json_dumps(document)
-                values = f"({self.convert_expr(id)}, '{json_string}')"
-            query = f"INSERT INTO {self.table} {columns} VALUES {values}"
-            if exists is None:
-                query = f"""{query} ON CONFLICT ({self.id_column})
-                    DO UPDATE SET {self.value_column} =
-                    EXCLUDED.{self.value_column}"""
+                params.append(pk)
+            params.append(json_string)
         elif exists is True or where is not None:
-            where_expr = self.convert_key_comparison(key)
+            params.append(json_string)
+            params.extend(self.convert_key_params(key))
             if exists is not True and where is not None:
-                where_expr = f"{where_expr} AND {self.convert_expr(where)}"
-            json_string = self._safe_json_dumps(document)
-            query = f"""UPDATE {self.table}
-                SET {self.value_column} = '{json_string}'
-                WHERE {where_expr}"""
-        return {"query": query, "rowcount": True}, {"value": document}
+                query = f"""UPDATE {self.table}
+                    SET {self.value_column} = ?
+                    WHERE {self._key_comparison}
+                    AND {self.convert_expr(where, params)}"""
+            else:
+                query = self._get_sql(
+                    ("put", True),
+                    lambda: f"""UPDATE {self.table}
+                        SET {self.value_column} = ?
+                        WHERE {self._key_comparison}""",
+                )
+        return {"query": query, "params": tuple(params), "rowcount": True}, {
+            "value": document
+        }
 
     def convert_update(
         self,
@@ -1079,23 +1161,38 @@ class OperationConverter:
             etag = self.processor.generate_etag()
             uset = self.processor.add_etag_update(uset, etag)
             state = {"etag": etag}
-        str = f"UPDATE {self.table} SET {self.convert_update_ops(uset)}"
-        where_expr = self.convert_key_comparison(key)
+        params: list = []
+        str = (
+            f"UPDATE {self.table} SET {self.convert_update_ops(uset, params)}"
+        )
+        where_expr = self._key_comparison
+        params.extend(self.convert_key_params(key))
         if where is not None:
-            where_expr = f"{where_expr} AND {self.convert_expr(where)}"
+            where_expr = f"{where_expr} AND {self.convert_expr(where, params)}"
         str = f"{str} WHERE {where_expr}"
         if returning:
             str = f"{str} RETURNING {self.value_column}"
         if not returning:
-            return {"query": str, "rowcount": True}, state
-        return {"query": str}, state
+            return {
+                "query": str,
+                "params": tuple(params),
+                "rowcount": True,
+            }, state
+        return {"query": str, "params": tuple(params)}, state
 
     def convert_delete(self, key: Value, where: Expression | None) -> dict:
-        where_expr = self.convert_key_comparison(key)
+        params = list(self.convert_key_params(key))
         if where is not None:
-            where_expr = f"{where_expr} AND {self.convert_expr(where)}"
-        str = f"DELETE FROM {self.table} WHERE {where_expr}"
-        return {"query": str, "rowcount": True}
+            str = f"""DELETE FROM {self.table}
+                WHERE {self._key_comparison}
+                AND {self.convert_expr(where, params)}"""
+        else:
+            str = self._get_sql(
+                ("delete",),
+                lambda: f"""DELETE FROM {self.table}
+                    WHERE {self._key_comparison}""",
+            )
+        return {"query": str, "params": tuple(params), "rowcount": True}
 
     def convert_query(
         self,
@@ -1105,33 +1202,86 @@ class OperationConverter:
         limit: int | None = None,
         offset: int | None = None,
     ) -> dict:
+        params: list = []
         str = f"""SELECT {self.convert_select(
-            select)} FROM {self.table}"""
+            select, params)} FROM {self.table}"""
         if where is not None:
-            str = f"{str} WHERE {self.convert_expr(where)}"
+            str = f"{str} WHERE {self.convert_expr(where, params)}"
         if order_by is not None:
             str = f"""{str} ORDER BY {self.convert_order_by(
                 order_by)}"""
         if limit is not None:
+            str = f"{str} LIMIT ?"
+            params.append(limit)
             if offset is not None:
-                str = f"""{str} LIMIT {limit} OFFSET {offset}"""
-            else:
-                str = f"""{str} LIMIT {limit}"""
-        return {"query": str, "fetchall": True}
+                str = f"{str} OFFSET ?"
+                params.append(offset)
+        return {"query": str, "params": tuple(params), "fetchall": True}
+
+    def convert_iter_query(
+        self,
+        select: Select | None = None,
+        where: Expression | None = None,
+        order_by: OrderBy | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        batch_size: int = 100,
+    ) -> dict:
+        args = self.convert_query(select, where, order_by, limit, offset)
+        return {
+            "query": args["query"],
+            "params": args["params"],
+            "batch_size": batch_size,
+        }
 
     def convert_count(self, where: Expression | None = None) -> dict:
+        params: list = []
         str = f"SELECT COUNT(*) FROM {self.table}"
         if where is not None:
-            str = f"{str} WHERE {self.convert_expr(where)}"
-        return {"query": str}
+            str = f"{str} WHERE {self.convert_expr(where, params)}"
+        return {"query": str, "params": tuple(params)}
 
-    def convert_key_comparison(self, key: Value) -> str:
+    def convert_key_params(self, key: Value) -> tuple:
         id, pk = self.processor.get_id_pk_from_key(key)
-        expr = f"{self.id_column} = {self.convert_expr(id)}"
         if self.pk_column is not None:
-            expr = f"{expr} AND {self.pk_column} = {self.convert_expr(pk)}"
+            return (id, pk)
+        return (id,)
+
+    @property
+    def _key_comparison(self) -> str:
+        return self._get_sql(("key",), self._build_key_comparison)
+
+    def _build_key_comparison(self) -> str:
+        expr = f"{self.id_column} = ?"
+        if self.pk_column is not None:
+            expr = f"{expr} AND {self.pk_column} = ?"
         return expr
 
+    def _build_insert(self, exists: bool | None) -> str:
+        if self.pk_column is not None:
+            columns = f"""({self.id_column},
+                {self.pk_column}, {self.value_column})"""
+            values = "(?, ?, ?)"
+        else:
+            columns = f"({self.id_column}, {self.value_column})"
+            values = "(?, ?)"
+        query = f"INSERT INTO {self.table} {columns} VALUES {values}"
+        if exists is None:
+            query = f"""{query} ON CONFLICT ({self.id_column})
+                DO UPDATE SET {self.value_column} =
+                EXCLUDED.{self.value_column}"""
+        return query
+
+    def _get_sql(self, shape: tuple, build: Callable[[], str]) -> str:
+        # Statements that only depend on the operation shape are built
+        # once per collection. Literals are always bound as parameters,
+        # so the same text is reused and hits the statement cache.
+        sql = self._sql_cache.get(shape)
+        if sql is None:
+            sql = build()
+            self._sql_cache[shape] = sql
+        return sql
+
     @staticmethod
     def _convert_field(
         value_column: str,
@@ -1180,38 +1330,36 @@ class OperationConverter:
             field_type,
         )
 
-    def convert_expr(self, expr: Expression | None) -> str:
+    def convert_expr(self, expr: Expression | None, params: list) -> str:
+        # Literals are appended to params and replaced by placeholders.
         if expr is None:
             return "NULL"
-        if isinstance(expr, str):
-            return f"'{expr}'"
-        if isinstance(expr, bool):
-            return str(expr).upper()
-        if isinstance(expr, (int, float)):
-            return json.dumps(expr)
+        if isinstance(expr, (str, bool, int, float)):
+            params.append(expr)
+            return "?"
         if isinstance(expr, (dict, list)):
-            json_string = self._safe_json_dumps(expr, separators=(",", ":"))
-            return f"'{json_string}'"
+            params.append(json.dumps(expr, separators=(",", ":")))
+            return "?"
         if isinstance(expr, Field):
             return self.convert_field(expr)
         if isinstance(expr, Function):
-            return self.convert_func(expr)
+            return self.convert_func(expr, params)
         if isinstance(expr, Comparison):
-            return self.convert_comparison(expr)
+            return self.convert_comparison(expr, params)
         if isinstance(expr, And):
             return f"""({self.convert_expr(
-                expr.lexpr)} AND {self.convert_expr(
-                    expr.rexpr)})"""
+                expr.lexpr, params)} AND {self.convert_expr(
+                    expr.rexpr, params)})"""
         if isinstance(expr, Or):
             return f"""({self.convert_expr(
-                expr.lexpr)} OR {self.convert_expr(
-                    expr.rexpr)})"""
+                expr.lexpr, params)} OR {self.convert_expr(
+                    expr.rexpr, params)})"""
         if isinstance(expr, Not):
             return f"""NOT {self.convert_expr(
-                expr.expr)}"""
+                expr.expr, params)}"""
         return str(expr)
 
-    def convert_comparison(self, expr: Comparison) -> str:
+    def convert_comparison(self, expr: Comparison, params: list) -> str:
         def get_field_type(value: Any) -> str | None:
             ftype = None
             if isinstance(value, bool):
@@ -1231,27 +1379,32 @@ class OperationConverter:
             value = expr.lexpr
         field_type = get_field_type(value)
 
-        if isinstance(expr.lexpr, Field):
-            lhs = self.convert_field(expr.lexpr, field_type)
-        else:
-            lhs = self.convert_expr(expr.lexpr)
-        if isinstance(expr.rexpr, Field):
-            rhs = self.convert_field(expr.rexpr, field_type)
-        else:
-            rhs = self.convert_expr(expr.rexpr)
+        def convert_lhs() -> str:
+            if isinstance(expr.lexpr, Field):
+                if expr.lexpr.path == SpecialAttribute.ID:
+                    return self.id_column
+                return self.convert_field(expr.lexpr, field_type)
+            return self.convert_expr(expr.lexpr, params)
 
         if expr.op == ComparisonOp.BETWEEN and isinstance(expr.rexpr, list):
-            return f"""{lhs} >= {self.convert_expr(
-                expr.rexpr[0])} AND {lhs} <= {self.convert_expr(
-                    expr.rexpr[1])}"""
-        elif (
+            # The left operand appears twice, so are its parameters.
+            return f"""{convert_lhs()} >= {self.convert_expr(
+                expr.rexpr[0], params)} AND {convert_lhs()} <= {
+                    self.convert_expr(expr.rexpr[1], params)}"""
+
+        lhs = convert_lhs()
+        if (
             expr.op == ComparisonOp.IN or expr.op == ComparisonOp.NIN
         ) and isinstance(expr.rexpr, list):
-            lst = ", ".join(self.convert_expr(i) for i in expr.rexpr)
+            lst = ", ".join(self.convert_expr(i, params) for i in expr.rexpr)
             rhs = f"({lst})"
+        elif isinstance(expr.rexpr, Field):
+            rhs = self.convert_field(expr.rexpr, field_type)
+        else:
+            rhs = self.convert_expr(expr.rexpr, params)
         return f"""{lhs} {expr.op.value} {rhs}"""
 
-    def convert_func(self, expr: Function) -> str:
+    def convert_func(self, expr: Function, params: list) -> str:
         namespace = expr.namespace
         name = expr.name
         args = expr.args
@@ -1289,21 +1442,21 @@ class OperationConverter:
                 field = self.convert_field(
                     args[0], OperationConverter.FIELD_TYPE_TEXT
                 )
-                value = args[1]
-                return f"{field} LIKE '%{value}%'"
+                params.append(args[1])
+                return f"{field} LIKE '%' || ? || '%'"
             if name == QueryFunctionName.STARTS_WITH:
                 field = self.convert_field(
                     args[0], OperationConverter.FIELD_TYPE_TEXT
                 )
-                value = args[1]
-                return f"{field} LIKE '{value}%'"
+                params.append(args[1])
+                return f"{field} LIKE ? || '%'"
             if name == QueryFunctionName.ARRAY_LENGTH:
                 field = self.convert_field(args[0])
                 return f"JSON_ARRAY_LENGTH({field})"
             if name == QueryFunctionName.ARRAY_CONTAINS:
                 field = self.processor.resolve_field(args[0])
                 field = f"$.{field}"
-                value = self.convert_expr(args[1])
+                value = self.convert_expr(args[1], params)
                 where = f"value = {value}"
                 json_each = (
                     f"JSON_EACH({self.table}.{self.value_column}, '{field}')"
@@ -1316,7 +1469,7 @@ class OperationConverter:
                 field = f"$.{field}"
                 clauses = []
                 for item in args[1]:
-                    value = self.convert_expr(item)
+                    value = self.convert_expr(item, params)
                     clauses.append(f"value = {value}")
                 where = f"({str.join(' OR ', clauses)})"
                 json_each = (
@@ -1330,24 +1483,32 @@ class OperationConverter:
     def convert_order_by(self, order_by: OrderBy) -> str:
         str_terms = []
         for term in order_by.terms:
-            _str_term = self.convert_field(term.field)
+            if term.field == SpecialAttribute.ID:
+                # The id column is the primary key.
+                _str_term = self.id_column
+            else:
+                # Ordered by SQL values, like the comparisons, so that
+                # null and missing values are NULL and sort first.
+                _str_term = self.convert_field(
+                    term.field, OperationConverter.FIELD_TYPE_TEXT
+                )
             if term.direction is not None:
                 _str_term = f"{_str_term} {term.direction.value}"
             str_terms.append(_str_term)
         return ", ".join([t for t in str_terms])
 
-    def convert_select(self, select: Select | None) -> str:
+    def convert_select(self, select: Select | None, params: list) -> str:
         if select is None or len(select.terms) == 0:
             return self.value_column
         str_terms = []
         for term in select.terms:
-            _str_term = self.convert_expr(Field(path=term.field))
+            _str_term = self.convert_expr(Field(path=term.field), params)
             if term.alias is not None:
                 _str_term = f"{_str_term} AS {term.alias}"
             str_terms.append(_str_term)
         return ", ".join([t for t in str_terms])
 
-    def convert_update_ops(self, update: Update) -> str:
+    def convert_update_ops(self, update: Update, params: list) -> str:
         def get_field_path(field: str) -> tuple:
             field = self.processor.resolve_field(field)
             path = (
@@ -1367,12 +1528,12 @@ class OperationConverter:
             op = operation.op
             field_path, splits = get_field_path(operation.field)
             if op == UpdateOp.PUT:
-                value = self.convert_expr(operation.args[0])
+                value = self.convert_expr(operation.args[0], params)
                 if isinstance(operation.args[0], (dict, list)):
                     value = f"json({value})"
                 str = f"JSON_SET({str}, {field_path}, {value})"
             elif op == UpdateOp.INSERT:
-                value = self.convert_expr(operation.args[0])
+                value = self.convert_expr(operation.args[0], params)
                 if isinstance(operation.args[0], (dict, list)):
                     value = f"json({value})"
                 if splits[-1] == "-":
@@ -1407,7 +1568,7 @@ class OperationConverter:
             elif op == UpdateOp.DELETE:
                 str = f"JSON_REMOVE({str}, {field_path})"
             elif op == UpdateOp.INCREMENT:
-                value = operation.args[0]
+                value = self.convert_expr(operation.args[0], params)
                 extract = f"JSON_EXTRACT({self.value_column}, {field_path})"
                 extract = f"IFNULL({extract}, 0)"
                 extract = f"{extract} + {value}"
@@ -1418,7 +1579,7 @@ class OperationConverter:
                 str = f"JSON_SET({str}, {dest_field_path}, {extract})"
                 str = f"JSON_REMOVE({str}, {field_path})"
             elif op == UpdateOp.ARRAY_UNION:
-                value = self.convert_expr(operation.args[0])
+                value = self.convert_expr(operation.args[0], params)
                 if isinstance(operation.args[0][0], (dict, list)):
                     group = "JSON_GROUP_ARRAY(json(t3.value))"
                 else:
@@ -1441,7 +1602,7 @@ class OperationConverter:
                     """
                 str = f"JSON_SET({str}, {field_path}, {value_query})"
             elif op == UpdateOp.ARRAY_REMOVE:
-                value = self.convert_expr(operation.args[0])
+                value = self.convert_expr(operation.args[0], params)
                 if isinstance(operation.args[0][0], (dict, list)):
                     group = "JSON_GROUP_ARRAY(json(t2.value))"
                 else:
@@ -1464,9 +1625,6 @@ class OperationConverter:
                 )
         return f"{self.value_column} = {str}"
 
-    def _safe_json_dumps(self, value, separators=None) -> str:
-        return json.dumps(value, separators=separators).replace("'", "''")
-
 
 class ClientHelper:
     client: Any
@@ -1561,49 +1719,46 @@ class ClientHelper:
         return result
 
     def execute(
-        self, query: str, rowcount: bool = False, fetchall: bool = False
+        self,
+        query: str,
+        params: tuple = (),
+        rowcount: bool = False,
+        fetchall: bool = False,
     ) -> Any:
-        cursor = self.client.cursor()
-        try:
-            cursor.execute(query)
+        with self.client.cursor() as cursor:
+            cursor.execute(query, params)
             if rowcount:
                 return cursor.rowcount
             if fetchall:
                 return cursor.fetchall()
             return cursor.fetchone()
-        finally:
-            self.client.commit()
-            cursor.close()
+
+    def iterate(
+        self, query: str, params: tuple, batch_size: int
+    ) -> Iterator[tuple]:
+        return itertools.chain.from_iterable(
+            self.client.iterate(query, params, batch_size)
+        )
 
     def batch(self, ops: list) -> Any:
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             for op in ops:
-                cursor.execute(op["query"])
-        finally:
-            self.client.commit()
-            cursor.close()
+                cursor.execute(op["query"], op.get("params", ()))
 
     def transact(self, ops: list) -> Any:
         result = []
-        cursor = self.client.cursor()
-        try:
+        with self.client.transaction() as cursor:
             for op in ops:
-                cursor.execute(op["query"])
+                cursor.execute(op["query"], op.get("params", ()))
                 if "rowcount" in op and op["rowcount"]:
                     if cursor.rowcount == 0:
-                        self.client.rollback()
                         raise ConflictError
                     result.append(cursor.rowcount)
                 else:
                     res = cursor.fetchone()
                     if res is None or len(res) == 0:
-                        self.client.rollback()
                         raise ConflictError
                     result.append(res)
-            self.client.commit()
-        finally:
-            cursor.close()
         return result
 
     def close(self, nargs: Any) -> Any:
@@ -1702,11 +1857,15 @@ class AsyncClientHelper:
         return ResultConverter.convert_list_indexes(nresult, use_name_type)
 
     async def execute(
-        self, query: str, rowcount: bool = False, fetchall: bool = False
+        self,
+        query: str,
+        params: tuple = (),
+        rowcount: bool = False,
+        fetchall: bool = False,
     ) -> Any:
         cursor = self.client.cursor()
         try:
-            await cursor.execute(query)
+            await cursor.execute(query, params)
             if rowcount:
                 return cursor.rowcount
             if fetchall:
@@ -1720,7 +1879,7 @@ class AsyncClientHelper:
         cursor = self.client.cursor()
         try:
             for op in ops:
-                await cursor.execute(op["query"])
+                await cursor.execute(op["query"], op.get("params", ()))
         finally:
             await self.client.commit()
             await cursor.close()
@@ -1730,7 +1889,7 @@ class AsyncClientHelper:
         cursor = self.client.cursor()
         try:
             for op in ops:
-                await cursor.execute(op["query"])
+                await cursor.execute(op["query"], op.get("params", ()))
                 if "rowcount" in op and op["rowcount"]:
                     if cursor.rowcount == 0:
                         await self.client.rollback()
@@ -1766,6 +1925,7 @@ class SQLiteCollection:
         pk_map_field: str | None,
         etag_embed_field: str | None,
         suppress_fields: list[str] | None,
+        raw: bool = False,
     ) -> None:
         self.processor = ItemProcessor(
             etag_embed_field=etag_embed_field,
@@ -1773,6 +1933,7 @@ class SQLiteCollection:
             pk_map_field=pk_map_field,
             local_etag=True,
             suppress_fields=suppress_fields,
+            raw=raw,
         )
         self.op_converter = OperationConverter(
             self.processor,
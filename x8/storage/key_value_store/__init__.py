@@ -8,9 +8,11 @@ from x8.ql import QueryFunction
 
 from ._models import (
     KeyValueBatch,
+    KeyValueCacheInfo,
     KeyValueItem,
     KeyValueKey,
     KeyValueList,
+    KeyValueNearCacheInfo,
     KeyValueQueryConfig,
     KeyValueTransaction,
 )
@@ -18,9 +20,11 @@ from .component import KeyValueStore
 
 __all__ = [
     "KeyValueBatch",
+    "KeyValueCacheInfo",
     "KeyValueItem",
     "KeyValueKey",
     "KeyValueList",
+    "KeyValueNearCacheInfo",
     "KeyValueQueryConfig",
     "KeyValueStore",
     "KeyValueTransaction",
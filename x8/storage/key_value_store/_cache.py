@@ -0,0 +1,496 @@
+"""
+Bounded in memory cache of key value items.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Hashable, Iterator
+
+from ._models import KeyValueCacheInfo
+
+EVICTION_POLICIES = ("lru", "lfu", "tinylfu")
+
+# Expired items removed by each write.
+EXPIRE_LIMIT = 16
+
+_MASK64 = (1 << 64) - 1
+_SEEDS = (
+    0xC3A5C85C97CB3127,
+    0xB492B66FBE98F273,
+    0x9AE16A3B2F90404F,
+    0xCBF29CE484222325,
+)
+
+
+class CacheEntry:
+    """Value stored in the cache.
+
+    Attributes:
+        value: Item value.
+        etag: Item ETag.
+        expiry: Expiry timestamp in seconds, None if it never expires.
+        size: Approximate size of the key and the value in bytes.
+        stale_at: Timestamp in seconds after which the item should be
+            revalidated, None if it is always fresh.
+    """
+
+    __slots__ = ("value", "etag", "expiry", "size", "stale_at")
+
+    value: Any
+    etag: str | None
+    expiry: float | None
+    size: int
+    stale_at: float | None
+
+    def __init__(
+        self,
+        value: Any,
+        etag: str | None,
+        expiry: float | None,
+        size: int,
+        stale_at: float | None = None,
+    ):
+        self.value = value
+        self.etag = etag
+        self.expiry = expiry
+        self.size = size
+        self.stale_at = stale_at
+
+    def has_expired(self, now: float) -> bool:
+        return bool(self.expiry) and now > self.expiry  # type: ignore
+
+
+class MemoryCache:
+    """Key value items by collection with capacity limits and expiry.
+
+    When an insert takes the cache over max_items or max_bytes, items
+    are evicted by the eviction policy:
+
+    lru: Least recently used.
+    lfu: Least frequently used, least recently used among equals.
+    tinylfu: W-TinyLFU. New items enter a small LRU window and then
+        have to be used more often, by an approximate frequency count,
+        than the item they would replace in the main segmented LRU.
+        Scans and one-off keys do not flush frequently used items.
+
+    Items with an expiry are kept in a heap ordered by expiry time.
+    Expired items are dropped when they are looked up and by expire,
+    which removes a bounded number of them per call so that it can be
+    called on every write.
+
+    The cache is not thread safe, callers hold their own lock.
+    """
+
+    max_items: int | None
+    max_bytes: int | None
+    eviction: str
+
+    _data: dict[Any, dict[Any, CacheEntry]]
+    _policy: _Policy
+    _expiries: list[tuple[float, int, Any, Any]]
+    _counter: Iterator[int]
+    _items: int
+    _bytes: int
+    _hits: int
+    _misses: int
+    _evictions: int
+    _expirations: int
+
+    def __init__(
+        self,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        eviction: str = "lru",
+    ):
+        if eviction == "lru":
+            self._policy = _LRUPolicy()
+        elif eviction == "lfu":
+            self._policy = _LFUPolicy()
+        elif eviction == "tinylfu":
+            self._policy = _TinyLFUPolicy()
+        else:
+            raise ValueError(
+                f"Eviction policy {eviction} not supported, "
+                f"use one of {', '.join(EVICTION_POLICIES)}"
+            )
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self._data = dict()
+        self._expiries = []
+        self._counter = count()
+        self._items = 0
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, collection: Any, id: Any, now: float) -> CacheEntry | None:
+        """Look up a fresh item, counting a hit or a miss.
+
+        Stale items count as misses and are kept for revalidation.
+        """
+        entry = self.peek(collection, id, now)
+        if entry is None or (
+            entry.stale_at is not None and now >= entry.stale_at
+        ):
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._policy.access((collection, id))
+        return entry
+
+    def peek(self, collection: Any, id: Any, now: float) -> CacheEntry | None:
+        """Look up an item without counting it as a use."""
+        items = self._data.get(collection)
+        if items is None:
+            return None
+        entry = items.get(id)
+        if entry is None:
+            return None
+        if entry.has_expired(now):
+            self._remove(collection, id)
+            self._expirations += 1
+            return None
+        return entry
+
+    def set(
+        self,
+        collection: Any,
+        id: Any,
+        value: Any,
+        etag: str | None,
+        expiry: float | None,
+        stale_at: float | None = None,
+    ) -> CacheEntry:
+        entry = CacheEntry(value, etag, expiry, _get_size(id, value), stale_at)
+        items = self._data.get(collection)
+        if items is None:
+            items = self._data[collection] = dict()
+        old_entry = items.get(id)
+        items[id] = entry
+        if old_entry is None:
+            self._items += 1
+            self._bytes += entry.size
+            self._policy.add((collection, id), self._items)
+        else:
+            self._bytes += entry.size - old_entry.size
+            self._policy.access((collection, id))
+        if expiry:
+            heapq.heappush(
+                self._expiries,
+                (expiry, next(self._counter), collection, id),
+            )
+        self._evict()
+        return entry
+
+    def pop(self, collection: Any, id: Any) -> CacheEntry | None:
+        items = self._data.get(collection)
+        if items is None or id not in items:
+            return None
+        return self._remove(collection, id)
+
+    def ids(self, collection: Any, now: float) -> list:
+        """Ids of the live items of a collection."""
+        items = self._data.get(collection)
+        if items is None:
+            return []
+        ids = []
+        for id, entry in list(items.items()):
+            if entry.has_expired(now):
+                self._remove(collection, id)
+                self._expirations += 1
+            else:
+                ids.append(id)
+        return ids
+
+    def expire(self, now: float, limit: int | None = None) -> int:
+        """Remove expired items, at most limit of them."""
+        expiries = self._expiries
+        removed = 0
+        while expiries and expiries[0][0] < now:
+            if limit is not None and removed >= limit:
+                break
+            expiry, _, collection, id = heapq.heappop(expiries)
+            entry = self._data.get(collection, {}).get(id)
+            # Entries that were replaced or deleted leave stale
+            # heap items behind, which are skipped.
+            if entry is not None and entry.expiry == expiry:
+                self._remove(collection, id)
+                self._expirations += 1
+                removed += 1
+        if len(expiries) > 2 * self._items + 64:
+            self._expiries = [
+                (entry.expiry, next(self._counter), collection, id)
+                for collection, items in self._data.items()
+                for id, entry in items.items()
+                if entry.expiry
+            ]
+            heapq.heapify(self._expiries)
+        return removed
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._policy.clear()
+        self._expiries.clear()
+        self._items = 0
+        self._bytes = 0
+
+    def info(self) -> KeyValueCacheInfo:
+        lookups = self._hits + self._misses
+        return KeyValueCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            hit_ratio=self._hits / lookups if lookups else 0.0,
+            evictions=self._evictions,
+            expirations=self._expirations,
+            items=self._items,
+            bytes=self._bytes,
+            max_items=self.max_items,
+            max_bytes=self.max_bytes,
+        )
+
+    def _remove(self, collection: Any, id: Any) -> CacheEntry:
+        items = self._data[collection]
+        entry = items.pop(id)
+        if not items:
+            self._data.pop(collection)
+        self._items -= 1
+        self._bytes -= entry.size
+        self._policy.remove((collection, id))
+        return entry
+
+    def _evict(self) -> None:
+        while self._items and (
+            (self.max_items is not None and self._items > self.max_items)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            collection, id = self._policy.victim()
+            self._remove(collection, id)
+            self._evictions += 1
+
+
+def _get_size(id: Any, value: Any) -> int:
+    size = 0
+    for obj in (id, value):
+        if isinstance(obj, (bytes, str)):
+            size += len(obj)
+        elif obj is not None:
+            size += sys.getsizeof(obj)
+    return size
+
+
+class _Policy(ABC):
+    @abstractmethod
+    def add(self, key: Hashable, items: int) -> None:
+        """Track a new key. items is the number of cached items."""
+
+    @abstractmethod
+    def access(self, key: Hashable) -> None:
+        """Record a use of a tracked key."""
+
+    @abstractmethod
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking a key."""
+
+    @abstractmethod
+    def victim(self) -> Any:
+        """Return the tracked key to evict next."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+
+
+class _LRUPolicy(_Policy):
+    _order: OrderedDict
+
+    def __init__(self):
+        self._order = OrderedDict()
+
+    def add(self, key: Hashable, items: int) -> None:
+        self._order[key] = None
+
+    def access(self, key: Hashable) -> None:
+        self._order.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        del self._order[key]
+
+    def victim(self) -> Any:
+        return next(iter(self._order))
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class _LFUPolicy(_Policy):
+    # Keys are kept in one LRU ordered bucket per use count,
+    # so every operation is O(1).
+    _counts: dict[Hashable, int]
+    _buckets: dict[int, OrderedDict]
+    _min_count: int
+
+    def __init__(self):
+        self._counts = dict()
+        self._buckets = dict()
+        self._min_count = 1
+
+    def add(self, key: Hashable, items: int) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def access(self, key: Hashable) -> None:
+        count = self._counts[key]
+        self._unlink(key, count)
+        if self._min_count == count and count not in self._buckets:
+            self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        self._unlink(key, self._counts.pop(key))
+
+    def victim(self) -> Any:
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 1
+
+    def _unlink(self, key: Hashable, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+
+class _TinyLFUPolicy(_Policy):
+    # The window holds about 1% of the items and the protected
+    # segment at most 80% of the main space.
+    _window: OrderedDict
+    _probation: OrderedDict
+    _protected: OrderedDict
+    _sketch: _FrequencySketch
+    _candidate: Any
+
+    def __init__(self):
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._sketch = _FrequencySketch()
+        self._candidate = None
+
+    def add(self, key: Hashable, items: int) -> None:
+        self._sketch.ensure_capacity(items)
+        self._sketch.increment(key)
+        self._window[key] = None
+        if len(self._window) > max(1, items // 100):
+            candidate, _ = self._window.popitem(last=False)
+            self._probation[candidate] = None
+            self._candidate = candidate
+
+    def access(self, key: Hashable) -> None:
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            main = len(self._probation) + len(self._protected)
+            if len(self._protected) > max(1, main * 4 // 5):
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        else:
+            self._protected.move_to_end(key)
+
+    def remove(self, key: Hashable) -> None:
+        if key == self._candidate:
+            self._candidate = None
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def victim(self) -> Any:
+        if self._probation:
+            victim = next(iter(self._probation))
+            candidate = self._candidate
+            if (
+                candidate is not None
+                and candidate != victim
+                and candidate in self._probation
+            ):
+                # Admit the newcomer only if it is used more
+                # often than the item it would replace.
+                self._candidate = None
+                frequency = self._sketch.frequency
+                if frequency(candidate) <= frequency(victim):
+                    return candidate
+            return victim
+        if self._protected:
+            return next(iter(self._protected))
+        return next(iter(self._window))
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._candidate = None
+
+
+class _FrequencySketch:
+    # Count-min sketch of 4 rows of 4 bit counters, with about 4
+    # counters per item in each row. All counters are halved after
+    # 10 increments per item so that old popularity fades.
+    _width: int
+    _table: list[int]
+    _additions: int
+
+    def __init__(self, width: int = 64):
+        self._resize(width)
+
+    def ensure_capacity(self, items: int) -> None:
+        if 4 * items > self._width:
+            self._resize(1 << (4 * items - 1).bit_length())
+
+    def increment(self, key: Hashable) -> None:
+        table = self._table
+        added = False
+        for index in self._indexes(key):
+            if table[index] < 15:
+                table[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= 10 * self._width // 4:
+                self._table = [value >> 1 for value in table]
+                self._additions //= 2
+
+    def frequency(self, key: Hashable) -> int:
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        hash_value = hash(key)
+        mask = self._width - 1
+        indexes = []
+        for row, seed in enumerate(_SEEDS):
+            mixed = ((hash_value ^ seed) * 0x9E3779B97F4A7C15) & _MASK64
+            indexes.append(row * self._width + ((mixed >> 32) & mask))
+        return indexes
+
+    def _resize(self, width: int) -> None:
+        self._width = width
+        self._table = [0] * (4 * width)
+        self._additions = 0
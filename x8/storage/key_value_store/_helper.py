@@ -7,6 +7,7 @@ from ._models import (
     KeyValueItem,
     KeyValueKey,
     KeyValueKeyType,
+    KeyValueList,
     KeyValueProperties,
     KeyValueQueryConfig,
     KeyValueValueType,
@@ -49,7 +50,14 @@ def build_item(
     id: KeyValueKeyType,
     value: KeyValueValueType | None = None,
     etag: str | None = None,
+    raw: bool = False,
 ) -> KeyValueItem:
+    if raw:
+        return KeyValueItem.record(
+            key=KeyValueKey.record(id=id),
+            value=value,
+            properties=KeyValueProperties.record(etag=etag),
+        )
     key = KeyValueKey(id=id)
     return KeyValueItem(
         key=key,
@@ -58,6 +66,16 @@ def build_item(
     )
 
 
+def build_query_result(
+    items: list[KeyValueItem],
+    continuation: str | None = None,
+    raw: bool = False,
+) -> KeyValueList:
+    if raw:
+        return KeyValueList.record(items=items, continuation=continuation)
+    return KeyValueList(items=items, continuation=continuation)
+
+
 def get_query_config(op_parser: StoreOperationParser):
     config = op_parser.get_config()
     if config is None:
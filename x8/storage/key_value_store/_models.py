@@ -54,6 +54,53 @@ class KeyValueList(DataModel):
     """Continuation token."""
 
 
+class KeyValueCacheInfo(DataModel):
+    """Cache statistics.
+
+    Attributes:
+        hits: Lookups that found the item.
+        misses: Lookups that did not find the item.
+        hit_ratio: Share of lookups that found the item.
+        evictions: Items dropped to stay within the limits.
+        expirations: Expired items that were removed.
+        items: Current number of items.
+        bytes: Approximate size of the current items in bytes.
+        max_items: Maximum number of items.
+        max_bytes: Maximum size of the items in bytes.
+    """
+
+    hits: int
+    misses: int
+    hit_ratio: float = 0.0
+    evictions: int
+    expirations: int
+    items: int
+    bytes: int
+    max_items: int | None = None
+    max_bytes: int | None = None
+
+
+class KeyValueNearCacheInfo(DataModel):
+    """Near cache statistics.
+
+    Attributes:
+        near: Statistics of the in process tier.
+        store_hits: Lookups missed by the near tier and found in the
+            store.
+        store_misses: Lookups missed by both tiers.
+        store_hit_ratio: Share of the store lookups that found the item.
+        revalidations: Stale items found unchanged in the store.
+        invalidations: Items dropped on messages from other instances.
+    """
+
+    near: KeyValueCacheInfo
+    store_hits: int
+    store_misses: int
+    store_hit_ratio: float = 0.0
+    revalidations: int
+    invalidations: int
+
+
 class KeyValueQueryConfig(DataModel):
     """Query config."""
 
@@ -1,6 +1,7 @@
 from typing import Any, Literal
 
 from x8.core import Response, operation
+from x8.core.exceptions import BaseError, NotFoundError
 from x8.ql import Expression, Update
 from x8.storage._common import StoreComponent
 
@@ -168,6 +169,95 @@ class KeyValueStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    def mget(
+        self,
+        keys: list[KeyValueKeyType | dict | KeyValueKey],
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[KeyValueItem | None]]:
+        """Get the values of many keys in one call.
+
+        Args:
+            keys: Keys.
+            collection: Collection name.
+
+        Returns:
+            Key value items with values, in the order of the keys.
+            None for the keys that were not found.
+        """
+        result: list[KeyValueItem | None] = []
+        for key in keys:
+            try:
+                result.append(
+                    _get_result(self.get(key=key, collection=collection))
+                )
+            except NotFoundError:
+                result.append(None)
+        return self._build_response(result)
+
+    @operation()
+    def mput(
+        self,
+        values: dict[KeyValueKeyType, KeyValueValueType],
+        expiry: int | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[KeyValueItem | None]]:
+        """Put the values of many keys in one call.
+
+        Args:
+            values: Values by key.
+            expiry: Expiry in milliseconds.
+            collection: Collection name.
+
+        Returns:
+            Key value items, in the order of the values.
+            None for the keys that failed to be written.
+        """
+        result: list[KeyValueItem | None] = []
+        for key, value in values.items():
+            try:
+                result.append(
+                    _get_result(
+                        self.put(
+                            key=key,
+                            value=value,
+                            expiry=expiry,
+                            collection=collection,
+                        )
+                    )
+                )
+            except BaseError:
+                result.append(None)
+        return self._build_response(result)
+
+    @operation()
+    def mdelete(
+        self,
+        keys: list[KeyValueKeyType | dict | KeyValueKey],
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[bool]]:
+        """Delete many keys in one call.
+
+        Args:
+            keys: Keys.
+            collection: Collection name.
+
+        Returns:
+            A value for each key indicating whether it was deleted.
+            False for the keys that were not found.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                self.delete(key=key, collection=collection)
+                result.append(True)
+            except NotFoundError:
+                result.append(False)
+        return self._build_response(result)
+
     @operation()
     def query(
         self,
@@ -385,6 +475,97 @@ class KeyValueStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    async def amget(
+        self,
+        keys: list[KeyValueKeyType | dict | KeyValueKey],
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[KeyValueItem | None]]:
+        """Get the values of many keys in one call.
+
+        Args:
+            keys: Keys.
+            collection: Collection name.
+
+        Returns:
+            Key value items with values, in the order of the keys.
+            None for the keys that were not found.
+        """
+        result: list[KeyValueItem | None] = []
+        for key in keys:
+            try:
+                result.append(
+                    _get_result(
+                        await self.aget(key=key, collection=collection)
+                    )
+                )
+            except NotFoundError:
+                result.append(None)
+        return self._build_response(result)
+
+    @operation()
+    async def amput(
+        self,
+        values: dict[KeyValueKeyType, KeyValueValueType],
+        expiry: int | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[KeyValueItem | None]]:
+        """Put the values of many keys in one call.
+
+        Args:
+            values: Values by key.
+            expiry: Expiry in milliseconds.
+            collection: Collection name.
+
+        Returns:
+            Key value items, in the order of the values.
+            None for the keys that failed to be written.
+        """
+        result: list[KeyValueItem | None] = []
+        for key, value in values.items():
+            try:
+                result.append(
+                    _get_result(
+                        await self.aput(
+                            key=key,
+                            value=value,
+                            expiry=expiry,
+                            collection=collection,
+                        )
+                    )
+                )
+            except BaseError:
+                result.append(None)
+        return self._build_response(result)
+
+    @operation()
+    async def amdelete(
+        self,
+        keys: list[KeyValueKeyType | dict | KeyValueKey],
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[list[bool]]:
+        """Delete many keys in one call.
+
+        Args:
+            keys: Keys.
+            collection: Collection name.
+
+        Returns:
+            A value for each key indicating whether it was deleted.
+            False for the keys that were not found.
+        """
+        result: list[bool] = []
+        for key in keys:
+            try:
+                await self.adelete(key=key, collection=collection)
+                result.append(True)
+            except NotFoundError:
+                result.append(False)
+        return self._build_response(result)
+
     @operation()
     async def aquery(
         self,
@@ -476,3 +657,16 @@ class KeyValueStore(StoreComponent):
             None.
         """
         raise NotImplementedError
+
+    def _build_response(self, result: Any) -> Any:
+        # Results of the fallbacks are unpacked like provider results.
+        if self.__unpack__:
+            return result
+        return Response(result=result)
+
+
+def _get_result(response: Any) -> Any:
+    # Calls on a component created with __unpack__ return the result.
+    if isinstance(response, Response):
+        return response.result
+    return response
@@ -16,7 +16,7 @@ from x8.core.exceptions import (
     NotFoundError,
     PreconditionFailedError,
 )
-from x8.ql import Expression, QueryProcessor, Update, UpdateOp
+from x8.ql import Expression, QueryProcessor, Update, UpdateOp, Value
 from x8.storage._common import (
     Attribute,
     ItemProcessor,
@@ -202,6 +202,23 @@ class Memcached(StoreProvider):
                 collection,
             )
             call = NCall(client.delete, args, nargs)
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            args = op_converter.convert_mget(op_parser.get_keys(), collection)
+            call = NCall(client.gets_many, args, nargs)
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            args = op_converter.convert_mput(
+                op_parser.get_values(),
+                op_parser.get_expiry_in_seconds(),
+                collection,
+            )
+            call = NCall(client.set_many, args, nargs)
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            args = op_converter.convert_mget(op_parser.get_keys(), collection)
+            args["nargs"] = nargs
+            call = NCall(client_helper.mdelete, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             args = {"nargs": nargs}
@@ -267,6 +284,23 @@ class Memcached(StoreProvider):
         # DELETE
         elif op_parser.op_equals(StoreOperation.DELETE):
             result = result_converter.convert_delete(nresult)
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            result = result_converter.convert_mget(
+                nresult,
+                op_parser.get_keys(),
+                get_collection_name(self, op_parser),
+            )
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            result = result_converter.convert_mput(
+                nresult,
+                op_parser.get_values(),
+                get_collection_name(self, op_parser),
+            )
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            result = nresult
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             collection = get_collection_name(self, op_parser)
@@ -342,6 +376,13 @@ class ClientHelper:
         self.client.quit()
         return response
 
+    def mdelete(self, keys: list, nargs: Any) -> list[bool]:
+        # Memcached has no multi key delete that reports each key,
+        # so the keys that exist are read first.
+        found = NCall(self.client.gets_many, {"keys": keys}, nargs).invoke()
+        NCall(self.client.delete_many, {"keys": keys}, nargs).invoke()
+        return [key in found for key in keys]
+
     def batch_delete(self, keys: list) -> None:
         for key in keys:
             self.client.delete(key=key)
@@ -445,6 +486,30 @@ class OperationConverter:
         db_key = get_collection_key(collection, id)
         return {"key": db_key}
 
+    def convert_mget(
+        self,
+        keys: list[Value],
+        collection: str | None,
+    ) -> dict:
+        db_keys = [
+            get_collection_key(collection, self.processor.get_id_from_key(key))
+            for key in keys
+        ]
+        return {"keys": db_keys}
+
+    def convert_mput(
+        self,
+        values: dict[Value, KeyValueValueType],
+        expiry: int | None,
+        collection: str | None,
+    ) -> dict:
+        kvs = {}
+        for key, value in values.items():
+            id = self.processor.get_id_from_key(key)
+            kvs[get_collection_key(collection, id)] = value
+        expire = int(expiry) if expiry else 0
+        return {"values": kvs, "expire": expire}
+
     def convert_query(
         self,
         where: Expression | None,
@@ -578,6 +643,42 @@ class ResultConverter:
             raise NotFoundError
         return None
 
+    def convert_mget(
+        self,
+        nresult: Any,
+        keys: list[Value],
+        collection: str | None,
+    ) -> list[KeyValueItem | None]:
+        result: list[KeyValueItem | None] = []
+        for key in keys:
+            id = self.processor.get_id_from_key(key)
+            db_key = get_collection_key(collection, id)
+            if db_key not in nresult:
+                result.append(None)
+                continue
+            value, cas = nresult[db_key]
+            if self.type == "string":
+                value = value.decode()
+            result.append(build_item(id, value, etag=cas.decode()))
+        return result
+
+    def convert_mput(
+        self,
+        nresult: Any,
+        values: dict[Value, KeyValueValueType],
+        collection: str | None,
+    ) -> list[KeyValueItem | None]:
+        # The result of set_many is the list of keys that failed.
+        failed = set(nresult)
+        result: list[KeyValueItem | None] = []
+        for key in values:
+            id = self.processor.get_id_from_key(key)
+            if get_collection_key(collection, id) in failed:
+                result.append(None)
+            else:
+                result.append(build_item(id))
+        return result
+
     def convert_query(
         self,
         nresult: Any,
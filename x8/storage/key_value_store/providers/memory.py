@@ -6,7 +6,7 @@ from __future__ import annotations
 
 __all__ = ["Memory"]
 
-from datetime import datetime, timezone
+import time
 from threading import Lock
 from typing import Any
 
@@ -26,21 +26,32 @@ from x8.storage._common import (
     UpdateAttribute,
 )
 
-from .._helper import build_item, convert_value, get_collection_name
-from .._models import KeyValueList
+from .._cache import EXPIRE_LIMIT, CacheEntry, MemoryCache
+from .._helper import (
+    build_item,
+    build_query_result,
+    convert_value,
+    get_collection_name,
+)
+from .._models import KeyValueCacheInfo
 
 
 class Memory(StoreProvider):
     collection: str | None
+    max_items: int | None
+    max_bytes: int | None
+    eviction: str
 
-    # (collection, key, item)
-    _db: dict[str | None, dict[str, dict]]
+    _cache: MemoryCache
     _processor: ItemProcessor
     _lock: Lock
 
     def __init__(
         self,
         collection: str | None = None,
+        max_items: int | None = None,
+        max_bytes: int | None = None,
+        eviction: str = "lru",
         **kwargs,
     ):
         """Initialize.
@@ -48,15 +59,34 @@ class Memory(StoreProvider):
         Args:
             collection:
                 Collection name.
+            max_items:
+                Maximum number of items across all collections.
+                Unbounded if None.
+            max_bytes:
+                Maximum approximate size of the keys and values
+                across all collections. Unbounded if None.
+            eviction:
+                Policy used to evict items when a limit is reached,
+                one of "lru", "lfu" and "tinylfu" (W-TinyLFU).
         """
         self.collection = collection
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.eviction = eviction
 
         self._processor = ItemProcessor()
-        self._db = dict()
+        self._cache = MemoryCache(
+            max_items=max_items, max_bytes=max_bytes, eviction=eviction
+        )
         self._lock = Lock()
 
     def __setup__(self, context: Context | None = None) -> None:
-        pass
+        self._processor.raw = self.__raw__
+
+    def cache_info(self) -> KeyValueCacheInfo:
+        """Get the hit, miss, eviction and expiry counters."""
+        with self._lock:
+            return self._cache.info()
 
     def __run__(
         self,
@@ -64,54 +94,8 @@ class Memory(StoreProvider):
         context: Context | None = None,
         **kwargs,
     ) -> Any:
-        def check_etag_lazy_evict(
-            collection, db_key, etag, locked=False
-        ) -> bool:
-            if not (collection in self._db and db_key in self._db[collection]):
-                return False
-            if has_expired(self._db[collection][db_key]):
-                if not locked:
-                    with self._lock:
-                        if has_expired(self._db[collection][db_key]):
-                            self._db[collection].pop(db_key)
-                            if len(self._db[collection]) == 0:
-                                self._db.pop(collection)
-                else:
-                    self._db[collection].pop(db_key)
-                    if len(self._db[collection]) == 0:
-                        self._db.pop(collection)
-                return False
-            return self._db[collection][db_key]["etag"] == etag
-
-        def check_exists_lazy_evict(collection, db_key, locked=False) -> bool:
-            if not (collection in self._db and db_key in self._db[collection]):
-                return False
-            if has_expired(self._db[collection][db_key]):
-                if not locked:
-                    with self._lock:
-                        if has_expired(self._db[collection][db_key]):
-                            self._db[collection].pop(db_key)
-                            if len(self._db[collection]) == 0:
-                                self._db.pop(collection)
-                else:
-                    self._db[collection].pop(db_key)
-                    if len(self._db[collection]) == 0:
-                        self._db.pop(collection)
-                return False
-            return True
-
-        def has_expired(item) -> bool:
-            expiry_time: float | None = item["expiry"]
-            current_time = datetime.now(timezone.utc).timestamp()
-            if expiry_time and current_time > expiry_time:
-                return True
-            return False
-
-        def get_value(item) -> Any:
-            return item["value"]
-
-        def set_value(item, value) -> Any:
-            item["value"] = value
+        def check_etag(entry: CacheEntry | None, etag: str) -> bool:
+            return entry is not None and entry.etag == etag
 
         def get_db_key(
             op_parser: StoreOperationParser, collection: str | None
@@ -123,24 +107,26 @@ class Memory(StoreProvider):
         self.__setup__(context=context)
         op_parser = self.get_op_parser(operation)
         processor = self._processor
+        cache = self._cache
         result: Any = None
         collection: str | None = get_collection_name(self, op_parser)
 
         # EXISTS
         if op_parser.op_equals(StoreOperation.EXISTS):
             db_key = get_db_key(op_parser, collection)
-            result = check_exists_lazy_evict(collection, db_key, False)
+            with self._lock:
+                entry = cache.get(collection, db_key, time.time())
+            result = entry is not None
         # GET
         elif op_parser.op_equals(StoreOperation.GET):
             db_key = get_db_key(op_parser, collection)
             start = op_parser.get_start()
             end = op_parser.get_end()
-            if check_exists_lazy_evict(collection, db_key, False):
-                value = self._db[collection][db_key]["value"]
-                etag = self._db[collection][db_key]["etag"]
-            else:
+            with self._lock:
+                entry = cache.get(collection, db_key, time.time())
+            if entry is None:
                 raise NotFoundError
-            value = convert_value(value, self.__component__.type)
+            value = convert_value(entry.value, self.__component__.type)
             if start and end:
                 eend = end + 1
                 value = value[start:eend]
@@ -149,7 +135,9 @@ class Memory(StoreProvider):
             elif end:
                 eend = end + 1
                 value = value[:eend]
-            result = build_item(id=db_key, value=value, etag=etag)
+            result = build_item(
+                id=db_key, value=value, etag=entry.etag, raw=processor.raw
+            )
         # PUT
         elif op_parser.op_equals(StoreOperation.PUT):
             db_key = get_db_key(op_parser, collection)
@@ -159,41 +147,35 @@ class Memory(StoreProvider):
             expiry = op_parser.get_expiry()
             returning = op_parser.get_returning()
             etag = self._processor.generate_etag()
-            if expiry:
-                expiry_time = datetime.now(timezone.utc).timestamp() + (
-                    expiry / 1000
-                )
-            else:
-                expiry_time = None
             with self._lock:
+                now = time.time()
+                cache.expire(now, EXPIRE_LIMIT)
+                if expiry:
+                    expiry_time: float | None = now + (expiry / 1000)
+                else:
+                    expiry_time = None
+                entry = cache.peek(collection, db_key, now)
                 return_value: Any = None
                 if returning == "old":
-                    if check_exists_lazy_evict(collection, db_key, True):
-                        return_value = get_value(self._db[collection][db_key])
+                    if entry is not None:
+                        return_value = entry.value
                 elif returning == "new":
                     return_value = value
                 if exists is False:
-                    if check_exists_lazy_evict(collection, db_key, True):
+                    if entry is not None:
                         raise PreconditionFailedError
                 elif exists is True:
-                    if not check_exists_lazy_evict(collection, db_key, True):
+                    if entry is None:
                         raise PreconditionFailedError
                 if where_etag is not None:
-                    if not check_etag_lazy_evict(
-                        collection, db_key, where_etag, True
-                    ):
+                    if not check_etag(entry, where_etag):
                         raise PreconditionFailedError
-                if collection not in self._db:
-                    self._db[collection] = dict()
-                self._db[collection][db_key] = {
-                    "value": value,
-                    "expiry": expiry_time,
-                    "etag": etag,
-                }
+                cache.set(collection, db_key, value, etag, expiry_time)
             result = build_item(
                 id=db_key,
                 value=convert_value(return_value, self.__component__.type),
                 etag=etag,
+                raw=processor.raw,
             )
         # UPDATE
         elif op_parser.op_equals(StoreOperation.UPDATE):
@@ -205,88 +187,135 @@ class Memory(StoreProvider):
             return_value = None
             not_supported = False
             with self._lock:
+                now = time.time()
+                cache.expire(now, EXPIRE_LIMIT)
                 if len(set.operations) == 1 and (
                     set.operations[0].field == Attribute.VALUE
                     or set.operations[0].field == UpdateAttribute.VALUE
                 ):
                     op = set.operations[0].op
                     arg = set.operations[0].args[0]
+                    entry = cache.peek(collection, db_key, now)
                     if where_etag is not None:
-                        if not check_etag_lazy_evict(
-                            collection, db_key, where_etag, True
-                        ):
+                        if not check_etag(entry, where_etag):
                             raise PreconditionFailedError
-                    if check_exists_lazy_evict(collection, db_key, True):
+                    if entry is not None:
                         if returning == "old":
-                            return_value = get_value(
-                                self._db[collection][db_key]
-                            )
+                            return_value = entry.value
                         if op == UpdateOp.INCREMENT:
-                            self._db[collection][db_key]["value"] = (
-                                self._db[collection][db_key]["value"] + arg
-                            )
+                            new_value = entry.value + arg
                         elif op == UpdateOp.APPEND:
-                            self._db[collection][db_key]["value"] = (
-                                self._db[collection][db_key]["value"] + arg
-                            )
+                            new_value = entry.value + arg
                         elif op == UpdateOp.PREPEND:
-                            self._db[collection][db_key]["value"] = (
-                                arg + self._db[collection][db_key]["value"]
-                            )
+                            new_value = arg + entry.value
                         else:
                             not_supported = True
-                        if returning == "new":
-                            return_value = get_value(
-                                self._db[collection][db_key]
+                        if not not_supported:
+                            cache.set(
+                                collection,
+                                db_key,
+                                new_value,
+                                etag,
+                                entry.expiry,
                             )
+                        if returning == "new":
+                            return_value = new_value
                     else:
                         if (
                             op == UpdateOp.INCREMENT
                             or op == UpdateOp.APPEND
                             or op == UpdateOp.PREPEND
                         ):
-                            if collection not in self._db:
-                                self._db[collection] = dict()
-                            self._db[collection][db_key] = {
-                                "value": arg,
-                                "expiry": 0,
-                            }
+                            cache.set(collection, db_key, arg, etag, None)
                         else:
                             not_supported = True
+                else:
+                    not_supported = True
                 if not_supported:
                     raise BadRequestError(
                         f"Update operation not supported {set}"
                     )
-                self._db[collection][db_key]["etag"] = etag
                 result = build_item(
                     id=db_key,
                     value=convert_value(return_value, self.__component__.type),
                     etag=etag,
+                    raw=processor.raw,
                 )
         # DELETE
         elif op_parser.op_equals(StoreOperation.DELETE):
             db_key = get_db_key(op_parser, collection)
             where_etag = op_parser.get_where_etag()
             with self._lock:
+                now = time.time()
+                cache.expire(now, EXPIRE_LIMIT)
+                entry = cache.peek(collection, db_key, now)
                 if where_etag is not None:
-                    if not check_etag_lazy_evict(
-                        collection, db_key, where_etag, True
-                    ):
+                    if not check_etag(entry, where_etag):
                         raise PreconditionFailedError
-                if check_exists_lazy_evict(collection, db_key, True):
-                    self._db[collection].pop(db_key)
-                    if len(self._db[collection]) == 0:
-                        self._db.pop(collection)
-                else:
+                if entry is None:
                     raise NotFoundError
+                cache.pop(collection, db_key)
             result = None
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            db_keys = [
+                processor.get_id_from_key(key) for key in op_parser.get_keys()
+            ]
+            with self._lock:
+                now = time.time()
+                entries = [cache.get(collection, k, now) for k in db_keys]
+            result = []
+            for db_key, entry in zip(db_keys, entries):
+                if entry is None:
+                    result.append(None)
+                    continue
+                result.append(
+                    build_item(
+                        id=db_key,
+                        value=convert_value(
+                            entry.value, self.__component__.type
+                        ),
+                        etag=entry.etag,
+                        raw=processor.raw,
+                    )
+                )
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            values = op_parser.get_values()
+            expiry = op_parser.get_expiry()
+            result = []
+            with self._lock:
+                now = time.time()
+                cache.expire(now, EXPIRE_LIMIT)
+                if expiry:
+                    expiry_time = now + (expiry / 1000)
+                else:
+                    expiry_time = None
+                for key, value in values.items():
+                    db_key = processor.get_id_from_key(key)
+                    etag = processor.generate_etag()
+                    cache.set(collection, db_key, value, etag, expiry_time)
+                    result.append(
+                        build_item(id=db_key, etag=etag, raw=processor.raw)
+                    )
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            db_keys = [
+                processor.get_id_from_key(key) for key in op_parser.get_keys()
+            ]
+            with self._lock:
+                now = time.time()
+                cache.expire(now, EXPIRE_LIMIT)
+                result = []
+                for db_key in db_keys:
+                    entry = cache.peek(collection, db_key, now)
+                    cache.pop(collection, db_key)
+                    result.append(entry is not None)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
-            raw_items = []
-            if collection in self._db:
-                for key in self._db[collection].keys():
-                    if check_exists_lazy_evict(collection, key, False):
-                        raw_items.append({"key": {"id": key}})
+            with self._lock:
+                ids = cache.ids(collection, time.time())
+            raw_items = [{"key": {"id": id}} for id in ids]
             filtered_items = QueryProcessor.query_items(
                 raw_items,
                 where=op_parser.get_where(),
@@ -294,16 +323,15 @@ class Memory(StoreProvider):
                 field_resolver=processor.resolve_root_field,
             )
             items = [
-                build_item(id=fitem["key"]["id"]) for fitem in filtered_items
+                build_item(id=fitem["key"]["id"], raw=processor.raw)
+                for fitem in filtered_items
             ]
-            result = KeyValueList(items=items)
+            result = build_query_result(items, raw=processor.raw)
         # COUNT
         elif op_parser.op_equals(StoreOperation.COUNT):
-            raw_items = []
-            if collection in self._db:
-                for key in self._db[collection].keys():
-                    if check_exists_lazy_evict(collection, key, False):
-                        raw_items.append({"key": {"id": key}})
+            with self._lock:
+                ids = cache.ids(collection, time.time())
+            raw_items = [{"key": {"id": id}} for id in ids]
             result = QueryProcessor.count_items(
                 raw_items,
                 where=op_parser.get_where(),
@@ -320,38 +348,33 @@ class Memory(StoreProvider):
                     value = op_parser.get_value()
                     etag = self._processor.generate_etag()
                     with self._lock:
-                        if collection not in self._db:
-                            self._db[collection] = dict()
-                        self._db[collection][db_key] = {
-                            "value": value,
-                            "expiry": None,
-                            "etag": etag,
-                        }
-                    result.append(build_item(id=db_key, etag=etag))
+                        now = time.time()
+                        cache.expire(now, EXPIRE_LIMIT)
+                        cache.set(collection, db_key, value, etag, None)
+                    result.append(
+                        build_item(id=db_key, etag=etag, raw=processor.raw)
+                    )
                 elif op_parser.op_equals(StoreOperation.GET):
                     db_key = get_db_key(op_parser, collection)
-                    if check_exists_lazy_evict(collection, db_key, False):
-                        value = self._db[collection][db_key]["value"]
-                        etag = self._db[collection][db_key]["etag"]
-                    else:
-                        value = None
-                        etag = None
+                    with self._lock:
+                        entry = cache.get(collection, db_key, time.time())
+                    if entry is None:
+                        result.append(build_item(id=db_key, raw=processor.raw))
+                        continue
                     result.append(
                         build_item(
                             id=db_key,
                             value=convert_value(
-                                value, self.__component__.type
+                                entry.value, self.__component__.type
                             ),
-                            etag=etag,
+                            etag=entry.etag,
+                            raw=processor.raw,
                         )
                     )
                 elif op_parser.op_equals(StoreOperation.DELETE):
                     db_key = get_db_key(op_parser, collection)
                     with self._lock:
-                        if check_exists_lazy_evict(collection, db_key, True):
-                            self._db[collection].pop(db_key)
-                            if len(self._db[collection]) == 0:
-                                self._db.pop(collection)
+                        cache.pop(collection, db_key)
                     result.append(None)
         # CLOSE
         elif op_parser.op_equals(StoreOperation.CLOSE):
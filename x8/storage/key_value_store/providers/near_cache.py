@@ -0,0 +1,595 @@
+"""
+Key Value Store with an in process near cache in front of another store.
+"""
+
+from __future__ import annotations
+
+__all__ = ["NearCache"]
+
+import base64
+import time
+import uuid
+from threading import Event, Lock, Thread
+from typing import Any
+
+from x8.core import Context, Operation, Response
+from x8.core.exceptions import (
+    BadRequestError,
+    NotFoundError,
+    PreconditionFailedError,
+)
+from x8.messaging.pubsub import PubSub
+from x8.storage._common import (
+    ItemProcessor,
+    StoreOperation,
+    StoreOperationParser,
+    StoreProvider,
+)
+
+from .._cache import EXPIRE_LIMIT, MemoryCache
+from .._helper import build_item, convert_value, get_collection_name
+from .._models import KeyValueNearCacheInfo
+from ..component import KeyValueStore
+
+WRITE_THROUGH = "write_through"
+WRITE_AROUND = "write_around"
+
+# Value of the items cached as not found.
+_NOT_FOUND = object()
+
+# Maximum number of keys whose write generation is remembered.
+GENERATION_LIMIT = 10000
+
+
+class NearCache(StoreProvider):
+    store: KeyValueStore
+    collection: str | None
+    max_items: int | None
+    max_bytes: int | None
+    eviction: str
+    ttl: float | None
+    negative_ttl: float | None
+    write_policy: str
+    pubsub: PubSub | None
+
+    _cache: MemoryCache
+    _processor: ItemProcessor
+    _lock: Lock
+    _origin: str
+    _store_hits: int
+    _store_misses: int
+    _revalidations: int
+    _invalidations: int
+    _generation: int
+    _generations: dict[tuple[Any, Any], int]
+    _generation_floor: int
+    _subscriber: Thread | None
+    _stop: Event
+
+    def __init__(
+        self,
+        store: KeyValueStore,
+        collection: str | None = None,
+        max_items: int | None = 10000,
+        max_bytes: int | None = None,
+        eviction: str = "lru",
+        ttl: float | None = 60.0,
+        negative_ttl: float | None = 5.0,
+        write_policy: str = WRITE_THROUGH,
+        pubsub: PubSub | None = None,
+        **kwargs,
+    ):
+        """Initialize.
+
+        Args:
+            store:
+                Key Value Store component the cache is in front of.
+            collection:
+                Collection name.
+            max_items:
+                Maximum number of items in the near cache.
+            max_bytes:
+                Maximum approximate size of the items in the near
+                cache.
+            eviction:
+                Policy used to evict items when a limit is reached,
+                one of "lru", "lfu" and "tinylfu" (W-TinyLFU).
+            ttl:
+                Seconds an item is served from the near cache without
+                reading the store. After that, the next read goes to
+                the store and keeps the cached value if the ETag has
+                not changed. None to serve items until they are
+                evicted or invalidated.
+            negative_ttl:
+                Seconds a key that was not found is remembered as
+                not found. None to not cache missing keys.
+            write_policy:
+                "write_through" to cache the values written through
+                this cache, "write_around" to only drop them from the
+                cache.
+            pubsub:
+                PubSub component used to invalidate the items changed
+                by other instances. Every write publishes the changed
+                keys, and the messages of the component subscription
+                drop them from the cache. Each instance needs its own
+                subscription to the shared topic.
+        """
+        if write_policy not in (WRITE_THROUGH, WRITE_AROUND):
+            raise BadRequestError(f"Write policy {write_policy} not supported")
+        self.store = store
+        self.collection = collection
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.write_policy = write_policy
+        self.pubsub = pubsub
+
+        self._cache = MemoryCache(
+            max_items=max_items, max_bytes=max_bytes, eviction=eviction
+        )
+        self._processor = ItemProcessor()
+        self._lock = Lock()
+        self._origin = str(uuid.uuid4())
+        self._store_hits = 0
+        self._store_misses = 0
+        self._revalidations = 0
+        self._invalidations = 0
+        self._generation = 0
+        self._generations = {}
+        self._generation_floor = 0
+        self._subscriber = None
+        self._stop = Event()
+
+    def __setup__(self, context: Context | None = None) -> None:
+        self._processor.raw = self.__raw__
+        if self.pubsub is not None and self._subscriber is None:
+            with self._lock:
+                if self._subscriber is None:
+                    self._subscriber = Thread(
+                        target=self._subscribe, daemon=True
+                    )
+                    self._subscriber.start()
+
+    def __supports__(self, feature: str) -> bool:
+        return self.store.__supports__(feature)
+
+    def cache_info(self) -> KeyValueNearCacheInfo:
+        """Get the hit, miss and eviction counters of both tiers."""
+        with self._lock:
+            lookups = self._store_hits + self._store_misses
+            return KeyValueNearCacheInfo(
+                near=self._cache.info(),
+                store_hits=self._store_hits,
+                store_misses=self._store_misses,
+                store_hit_ratio=(
+                    self._store_hits / lookups if lookups else 0.0
+                ),
+                revalidations=self._revalidations,
+                invalidations=self._invalidations,
+            )
+
+    def __run__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        self.__setup__(context=context)
+        op_parser = self.get_op_parser(operation)
+        if op_parser.op_equals(StoreOperation.MGET):
+            result, missing, generation = self._lookup_many(op_parser)
+            if missing:
+                response = self.store.mget(
+                    keys=[key for _, key in missing],
+                    collection=op_parser.get_collection_name(),
+                    __context__=context,
+                )
+                self._update_many(
+                    op_parser, result, missing, response, generation
+                )
+            return Response(result=result)
+        found, result, generation = self._lookup(op_parser)
+        if found:
+            return Response(result=result)
+        try:
+            response = self.store.__run__(
+                operation=operation,
+                context=context,
+                **kwargs,
+            )
+        except (NotFoundError, PreconditionFailedError):
+            self._update_on_error(op_parser, generation)
+            raise
+        keys = self._update(op_parser, response, generation)
+        if keys and self.pubsub is not None:
+            self.pubsub.put(value=self._get_message(keys))
+        return response
+
+    async def __arun__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        await self.__asetup__(context=context)
+        op_parser = self.get_op_parser(operation)
+        if op_parser.op_equals(StoreOperation.MGET):
+            result, missing, generation = self._lookup_many(op_parser)
+            if missing:
+                response = await self.store.amget(
+                    keys=[key for _, key in missing],
+                    collection=op_parser.get_collection_name(),
+                    __context__=context,
+                )
+                self._update_many(
+                    op_parser, result, missing, response, generation
+                )
+            return Response(result=result)
+        found, result, generation = self._lookup(op_parser)
+        if found:
+            return Response(result=result)
+        try:
+            response = await self.store.__arun__(
+                operation=operation,
+                context=context,
+                **kwargs,
+            )
+        except (NotFoundError, PreconditionFailedError):
+            self._update_on_error(op_parser, generation)
+            raise
+        keys = self._update(op_parser, response, generation)
+        if keys and self.pubsub is not None:
+            await self.pubsub.aput(value=self._get_message(keys))
+        return response
+
+    def _lookup(
+        self, op_parser: StoreOperationParser
+    ) -> tuple[bool, Any, int]:
+        # Returns whether the item was cached, the result, and the
+        # generation the store read must still match to fill the cache.
+        if not (
+            op_parser.op_equals(StoreOperation.EXISTS)
+            or op_parser.op_equals(StoreOperation.GET)
+        ):
+            return False, None, 0
+        collection, id = self._get_cache_key(op_parser)
+        with self._lock:
+            entry = self._cache.get(collection, id, time.time())
+            generation = self._generation
+        if entry is None:
+            return False, None, generation
+        if op_parser.op_equals(StoreOperation.EXISTS):
+            return True, entry.value is not _NOT_FOUND, generation
+        if entry.value is _NOT_FOUND:
+            raise NotFoundError
+        value = convert_value(entry.value, self.__component__.type)
+        start = op_parser.get_start()
+        end = op_parser.get_end()
+        if start and end:
+            eend = end + 1
+            value = value[start:eend]
+        elif start:
+            value = value[start:]
+        elif end:
+            eend = end + 1
+            value = value[:eend]
+        return (
+            True,
+            build_item(
+                id=id, value=value, etag=entry.etag, raw=self._processor.raw
+            ),
+            generation,
+        )
+
+    def _lookup_many(
+        self, op_parser: StoreOperationParser
+    ) -> tuple[list, list[tuple[int, Any]], int]:
+        # Returns the cached items, the positions and keys of the
+        # items to read from the store, and the generation to match.
+        collection = get_collection_name(self, op_parser)
+        result: list = []
+        missing: list[tuple[int, Any]] = []
+        now = time.time()
+        with self._lock:
+            generation = self._generation
+            for index, key in enumerate(op_parser.get_keys()):
+                id = self._get_cache_id(key)
+                entry = self._cache.get(collection, id, now)
+                if entry is None:
+                    result.append(None)
+                    missing.append((index, key))
+                elif entry.value is _NOT_FOUND:
+                    result.append(None)
+                else:
+                    result.append(
+                        build_item(
+                            id=id,
+                            value=convert_value(
+                                entry.value, self.__component__.type
+                            ),
+                            etag=entry.etag,
+                            raw=self._processor.raw,
+                        )
+                    )
+        return result, missing, generation
+
+    def _update_many(
+        self,
+        op_parser: StoreOperationParser,
+        result: list,
+        missing: list[tuple[int, Any]],
+        response: Any,
+        generation: int,
+    ) -> None:
+        collection = get_collection_name(self, op_parser)
+        now = time.time()
+        with self._lock:
+            self._cache.expire(now, EXPIRE_LIMIT)
+            for (index, key), item in zip(missing, response.result):
+                result[index] = item
+                id = self._get_cache_id(key)
+                if item is None:
+                    self._store_misses += 1
+                    if self._is_current(collection, id, generation):
+                        self._set_not_found(collection, id, now)
+                else:
+                    self._store_hits += 1
+                    if not self._is_current(collection, id, generation):
+                        continue
+                    self._set_found(
+                        collection, id, item.value, item.properties.etag, now
+                    )
+
+    def _update(
+        self,
+        op_parser: StoreOperationParser,
+        response: Any,
+        generation: int,
+    ) -> list[tuple[Any, Any]]:
+        # Returns the keys changed in the store. Reads only fill the
+        # cache if no write or invalidation of the key happened since
+        # the lookup, else they could cache a value older than it.
+        result = response.result
+        now = time.time()
+        with self._lock:
+            self._cache.expire(now, EXPIRE_LIMIT)
+        # EXISTS
+        if op_parser.op_equals(StoreOperation.EXISTS):
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                if result:
+                    self._store_hits += 1
+                else:
+                    self._store_misses += 1
+                    if self._is_current(collection, id, generation):
+                        self._set_not_found(collection, id, now)
+        # GET
+        elif op_parser.op_equals(StoreOperation.GET):
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                self._store_hits += 1
+                if op_parser.get_start() or op_parser.get_end():
+                    return []
+                if not self._is_current(collection, id, generation):
+                    return []
+                self._set_found(
+                    collection, id, result.value, result.properties.etag, now
+                )
+        # PUT
+        elif op_parser.op_equals(StoreOperation.PUT):
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                self._bump(collection, id)
+                if self.write_policy == WRITE_THROUGH:
+                    expiry = op_parser.get_expiry()
+                    self._cache.set(
+                        collection,
+                        id,
+                        op_parser.get_value(),
+                        result.properties.etag,
+                        now + expiry / 1000 if expiry else None,
+                        self._get_stale_at(now),
+                    )
+                else:
+                    self._cache.pop(collection, id)
+            return [(collection, id)]
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            collection = get_collection_name(self, op_parser)
+            expiry = op_parser.get_expiry()
+            keys = []
+            with self._lock:
+                for (key, value), item in zip(
+                    op_parser.get_values().items(), result
+                ):
+                    id = self._get_cache_id(key)
+                    keys.append((collection, id))
+                    self._bump(collection, id)
+                    if self.write_policy == WRITE_THROUGH and item is not None:
+                        self._cache.set(
+                            collection,
+                            id,
+                            value,
+                            item.properties.etag,
+                            now + expiry / 1000 if expiry else None,
+                            self._get_stale_at(now),
+                        )
+                    else:
+                        self._cache.pop(collection, id)
+            return keys
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            collection = get_collection_name(self, op_parser)
+            keys = [
+                (collection, self._get_cache_id(key))
+                for key in op_parser.get_keys()
+            ]
+            with self._lock:
+                for collection, id in keys:
+                    self._pop(collection, id)
+            return keys
+        # UPDATE, DELETE
+        elif op_parser.op_equals(StoreOperation.UPDATE) or op_parser.op_equals(
+            StoreOperation.DELETE
+        ):
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                self._pop(collection, id)
+            return [(collection, id)]
+        # BATCH, TRANSACT
+        elif op_parser.op_equals(StoreOperation.BATCH) or op_parser.op_equals(
+            StoreOperation.TRANSACT
+        ):
+            keys = []
+            for child_op_parser in op_parser.get_operation_parsers():
+                if (
+                    child_op_parser.op_equals(StoreOperation.PUT)
+                    or child_op_parser.op_equals(StoreOperation.UPDATE)
+                    or child_op_parser.op_equals(StoreOperation.DELETE)
+                ):
+                    keys.append(
+                        self._get_cache_key(
+                            child_op_parser,
+                            get_collection_name(self, op_parser),
+                        )
+                    )
+            with self._lock:
+                for collection, id in keys:
+                    self._pop(collection, id)
+            return keys
+        # CLOSE
+        elif op_parser.op_equals(StoreOperation.CLOSE):
+            self._stop.set()
+        return []
+
+    def _update_on_error(
+        self, op_parser: StoreOperationParser, generation: int
+    ) -> None:
+        if op_parser.op_equals(StoreOperation.GET):
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                self._store_misses += 1
+                if self._is_current(collection, id, generation):
+                    self._set_not_found(collection, id, time.time())
+        elif (
+            op_parser.op_equals(StoreOperation.PUT)
+            or op_parser.op_equals(StoreOperation.UPDATE)
+            or op_parser.op_equals(StoreOperation.DELETE)
+        ):
+            # The cached item did not match the store.
+            collection, id = self._get_cache_key(op_parser)
+            with self._lock:
+                self._pop(collection, id)
+
+    def _bump(self, collection: Any, id: Any) -> None:
+        # Called with the lock held for every change of the key.
+        self._generation += 1
+        if len(self._generations) >= GENERATION_LIMIT:
+            # Reads looked up before are not trusted to fill anymore.
+            self._generations.clear()
+            self._generation_floor = self._generation
+        self._generations[(collection, id)] = self._generation
+
+    def _pop(self, collection: Any, id: Any) -> Any:
+        self._bump(collection, id)
+        return self._cache.pop(collection, id)
+
+    def _is_current(self, collection: Any, id: Any, generation: int) -> bool:
+        # Whether the key is unchanged since the lookup of the generation.
+        if generation < self._generation_floor:
+            return False
+        return self._generations.get((collection, id), 0) <= generation
+
+    def _set_found(
+        self,
+        collection: Any,
+        id: Any,
+        value: Any,
+        etag: str | None,
+        now: float,
+    ) -> None:
+        entry = self._cache.peek(collection, id, now)
+        if (
+            entry is not None
+            and etag is not None
+            and entry.etag == etag
+            and entry.value is not _NOT_FOUND
+        ):
+            entry.stale_at = self._get_stale_at(now)
+            self._revalidations += 1
+        else:
+            self._cache.set(
+                collection, id, value, etag, None, self._get_stale_at(now)
+            )
+
+    def _set_not_found(self, collection: Any, id: Any, now: float) -> None:
+        if self.negative_ttl is None:
+            self._cache.pop(collection, id)
+            return
+        self._cache.set(
+            collection, id, _NOT_FOUND, None, now + self.negative_ttl
+        )
+
+    def _get_stale_at(self, now: float) -> float | None:
+        if self.ttl is None:
+            return None
+        return now + self.ttl
+
+    def _get_cache_key(
+        self,
+        op_parser: StoreOperationParser,
+        collection: str | None = None,
+    ) -> tuple[Any, Any]:
+        collection = (
+            op_parser.get_collection_name()
+            or collection
+            or get_collection_name(self, op_parser)
+        )
+        return collection, self._get_cache_id(op_parser.get_key())
+
+    def _get_cache_id(self, key: Any) -> Any:
+        id = self._processor.get_id_from_key(key)
+        if isinstance(id, memoryview):
+            id = id.tobytes()
+        return id
+
+    def _get_message(self, keys: list[tuple[Any, Any]]) -> dict:
+        message_keys = []
+        for collection, id in keys:
+            if isinstance(id, bytes):
+                message_keys.append(
+                    [collection, base64.b64encode(id).decode(), True]
+                )
+            else:
+                message_keys.append([collection, id, False])
+        return {"origin": self._origin, "keys": message_keys}
+
+    def _invalidate(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            return
+        if message.get("origin") == self._origin:
+            return
+        with self._lock:
+            for collection, id, encoded in message.get("keys", []):
+                if encoded:
+                    id = base64.b64decode(id)
+                if self._pop(collection, id) is not None:
+                    self._invalidations += 1
+
+    def _subscribe(self) -> None:
+        assert self.pubsub is not None
+        while not self._stop.is_set():
+            try:
+                response = self.pubsub.pull(
+                    config={"max_count": 100, "max_wait_time": 1}
+                )
+                for message in response.result:
+                    self._invalidate(message.value)
+                    if message.key is not None:
+                        self.pubsub.ack(key=message.key)
+            except Exception:
+                # Keep the subscriber running through transient
+                # failures of the messaging backend.
+                self._stop.wait(1)
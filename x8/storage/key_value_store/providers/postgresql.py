@@ -27,6 +27,7 @@ from x8.ql import (
     QueryFunctionName,
     Update,
     UpdateOp,
+    Value,
 )
 from x8.storage._common import (
     Attribute,
@@ -37,7 +38,12 @@ from x8.storage._common import (
     UpdateAttribute,
 )
 
-from .._helper import build_item, convert_value, get_collection_name
+from .._helper import (
+    build_item,
+    build_query_result,
+    convert_value,
+    get_collection_name,
+)
 from .._models import (
     KeyValueItem,
     KeyValueKeyType,
@@ -93,6 +99,7 @@ class PostgreSQL(StoreProvider):
         self,
         context: Context | None = None,
     ) -> None:
+        self._processor.raw = self.__raw__
         if self._client is not None:
             return
 
@@ -100,6 +107,7 @@ class PostgreSQL(StoreProvider):
         self._create_table_if_needed()
 
     async def __asetup__(self, context: Context | None = None) -> None:
+        self._processor.raw = self.__raw__
         if self._aclient is not None:
             return
         self._aclient = await psycopg.AsyncConnection.connect(
@@ -219,6 +227,28 @@ class PostgreSQL(StoreProvider):
                 collection,
             )
             call = NCall(helper.execute, args)
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            args = op_converter.convert_mget(
+                op_parser.get_keys(),
+                collection,
+            )
+            call = NCall(helper.execute, args)
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            args, state = op_converter.convert_mput(
+                op_parser.get_values(),
+                op_parser.get_expiry(),
+                collection,
+            )
+            call = NCall(helper.execute_many, args)
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            args = op_converter.convert_mdelete(
+                op_parser.get_keys(),
+                collection,
+            )
+            call = NCall(helper.execute, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             args = op_converter.convert_query(
@@ -289,6 +319,25 @@ class PostgreSQL(StoreProvider):
                 nresult,
                 op_parser.get_where_etag(),
             )
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            result = result_converter.convert_mget(
+                nresult,
+                op_parser.get_keys(),
+                type,
+            )
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            result = result_converter.convert_mput(
+                op_parser.get_values(),
+                state["etags"],
+            )
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            result = result_converter.convert_mdelete(
+                nresult,
+                op_parser.get_keys(),
+            )
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             result = result_converter.convert_query(nresult)
@@ -645,6 +694,81 @@ class OperationConverter:
             "params": params,
         }
 
+    def convert_mget(
+        self,
+        keys: list[Value],
+        collection: str | None,
+    ) -> dict:
+        query = f"""
+                SELECT id, value, etag, expiry
+                FROM {self.table}
+                WHERE collection = %s AND id = ANY(%s)
+                """
+        return {
+            "query": query,
+            "params": (
+                collection,
+                self._convert_ids(keys),
+            ),
+            "fetchall": True,
+        }
+
+    def convert_mput(
+        self,
+        values: dict[Value, KeyValueValueType],
+        expiry: int | None,
+        collection: str | None,
+    ) -> tuple[dict, dict]:
+        expiry_time = (
+            datetime.now(timezone.utc).timestamp() + (expiry / 1000)
+            if expiry
+            else 0
+        )
+        query = f"""INSERT INTO {self.table} (
+                        collection, id, value, etag, expiry
+                    )
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON CONFLICT (collection, id)
+                    DO UPDATE SET
+                    value = EXCLUDED.value,
+                    etag = EXCLUDED.etag,
+                    expiry = EXCLUDED.expiry
+                """
+        params_list: list = []
+        etags: list = []
+        for key, value in values.items():
+            etag = self.processor.generate_etag()
+            params_list.append(
+                (
+                    collection,
+                    self.processor.get_id_from_key(key),
+                    self.convert_put_value(value),
+                    etag,
+                    expiry_time,
+                )
+            )
+            etags.append(etag)
+        return {"query": query, "params_list": params_list}, {"etags": etags}
+
+    def convert_mdelete(
+        self,
+        keys: list[Value],
+        collection: str | None,
+    ) -> dict:
+        query = f"""
+                DELETE FROM {self.table}
+                WHERE collection = %s AND id = ANY(%s)
+                RETURNING id, expiry
+                """
+        return {
+            "query": query,
+            "params": (
+                collection,
+                self._convert_ids(keys),
+            ),
+            "fetchall": True,
+        }
+
     def convert_query(
         self,
         where: Expression | None,
@@ -752,6 +876,9 @@ class OperationConverter:
             ),
         }
 
+    def _convert_ids(self, keys: list[Value]) -> list:
+        return [self.processor.get_id_from_key(key) for key in keys]
+
     def _convert_where(
         self, where: Expression | None, collection: str | None
     ) -> str:
@@ -786,7 +913,12 @@ class ResultConverter:
 
     def convert_get(self, nresult: Any, type: str) -> KeyValueItem:
         (id, value, etag, expiry) = nresult
-        return build_item(id=id, value=convert_value(value, type), etag=etag)
+        return build_item(
+            id=id,
+            value=convert_value(value, type),
+            etag=etag,
+            raw=self.processor.raw,
+        )
 
     def convert_put(
         self,
@@ -807,7 +939,10 @@ class ResultConverter:
         if returning == "new":
             return_value = value
         return build_item(
-            id=id, value=convert_value(return_value, type), etag=etag
+            id=id,
+            value=convert_value(return_value, type),
+            etag=etag,
+            raw=self.processor.raw,
         )
 
     def convert_update(
@@ -826,7 +961,10 @@ class ResultConverter:
         if returning == "new":
             (return_value,) = nresult
         return build_item(
-            id=id, value=convert_value(return_value, type), etag=etag
+            id=id,
+            value=convert_value(return_value, type),
+            etag=etag,
+            raw=self.processor.raw,
         )
 
     def convert_delete(self, nresult: Any, where_etag: str | None):
@@ -839,11 +977,66 @@ class ResultConverter:
             raise NotFoundError
         return None
 
+    def convert_mget(
+        self,
+        nresult: Any,
+        keys: list[Value],
+        type: str,
+    ) -> list[KeyValueItem | None]:
+        current_time = datetime.now(timezone.utc).timestamp()
+        rows = {}
+        for id, value, etag, expiry in nresult:
+            if expiry == 0 or current_time <= expiry:
+                rows[id] = (value, etag)
+        result: list[KeyValueItem | None] = []
+        for key in keys:
+            id = self.processor.get_id_from_key(key)
+            if id not in rows:
+                result.append(None)
+                continue
+            value, etag = rows[id]
+            result.append(
+                build_item(
+                    id=id,
+                    value=convert_value(value, type),
+                    etag=etag,
+                    raw=self.processor.raw,
+                )
+            )
+        return result
+
+    def convert_mput(
+        self,
+        values: dict[Value, KeyValueValueType],
+        etags: list[str],
+    ) -> list[KeyValueItem | None]:
+        return [
+            build_item(
+                id=self.processor.get_id_from_key(key),
+                etag=etag,
+                raw=self.processor.raw,
+            )
+            for key, etag in zip(values, etags)
+        ]
+
+    def convert_mdelete(
+        self,
+        nresult: Any,
+        keys: list[Value],
+    ) -> list[bool]:
+        current_time = datetime.now(timezone.utc).timestamp()
+        deleted = {
+            id
+            for id, expiry in nresult
+            if expiry == 0 or current_time <= expiry
+        }
+        return [self.processor.get_id_from_key(key) in deleted for key in keys]
+
     def convert_query(self, nresult: Any) -> KeyValueList:
         items: list = []
         for raw_item in nresult:
-            items.append(build_item(id=raw_item[0]))
-        return KeyValueList(items=items)
+            items.append(build_item(id=raw_item[0], raw=self.processor.raw))
+        return build_query_result(items, raw=self.processor.raw)
 
     def convert_count(self, nresult: Any) -> int:
         return nresult[0]
@@ -859,7 +1052,11 @@ class ResultConverter:
         for op_parser, op_result, state in zip(op_parsers, nresult, states):
             id = self.processor.get_id_from_key(op_parser.get_key())
             if op_parser.op_equals(StoreOperation.PUT):
-                result.append(build_item(id=id, etag=state["etag"]))
+                result.append(
+                    build_item(
+                        id=id, etag=state["etag"], raw=self.processor.raw
+                    )
+                )
             elif op_parser.op_equals(StoreOperation.GET):
                 expiry = op_result[3]
                 current_time = datetime.now(timezone.utc).timestamp()
@@ -872,6 +1069,7 @@ class ResultConverter:
                             id=id,
                             value=convert_value(op_result[1], type),
                             etag=op_result[2],
+                            raw=self.processor.raw,
                         )
                     )
             elif op_parser.op_equals(StoreOperation.DELETE):
@@ -965,6 +1163,15 @@ class ClientHelper:
             self.client.commit()
             cursor.close()
 
+    def execute_many(self, query: str, params_list: list) -> Any:
+        cursor = self.client.cursor()
+        try:
+            cursor.executemany(query, params_list)
+            return cursor.rowcount
+        finally:
+            self.client.commit()
+            cursor.close()
+
     def batch(self, ops: list) -> list[Any]:
         nresult: list = []
         cursor = self.client.cursor()
@@ -1074,6 +1281,15 @@ class AsyncClientHelper:
             await self.client.commit()
             await cursor.close()
 
+    async def execute_many(self, query: str, params_list: list) -> Any:
+        cursor = self.client.cursor()
+        try:
+            await cursor.executemany(query, params_list)
+            return cursor.rowcount
+        finally:
+            await self.client.commit()
+            await cursor.close()
+
     async def batch(self, ops: list) -> list[Any]:
         nresult: list = []
         cursor = self.client.cursor()
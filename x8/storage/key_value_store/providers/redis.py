@@ -24,6 +24,7 @@ from x8.ql import (
     QueryFunctionName,
     Update,
     UpdateOp,
+    Value,
 )
 from x8.storage._common import (
     Attribute,
@@ -36,6 +37,7 @@ from x8.storage._common import (
 
 from .._helper import (
     build_item,
+    build_query_result,
     convert_value,
     get_collection_key,
     get_collection_name,
@@ -120,6 +122,7 @@ class Redis(RedisProvider, StoreProvider):
         )
 
     def __setup__(self, context: Context | None = None) -> None:
+        self._processor.raw = self.__raw__
         if self._client is not None:
             return
 
@@ -129,6 +132,7 @@ class Redis(RedisProvider, StoreProvider):
         )
 
     async def __asetup__(self, context: Context | None = None) -> None:
+        self._processor.raw = self.__raw__
         if self._aclient is not None:
             return
 
@@ -270,6 +274,35 @@ class Redis(RedisProvider, StoreProvider):
                 "nargs": nargs,
             }
             call = NCall(client_helper.delete, args)
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            args = {
+                "keys": op_parser.get_keys(),
+                "collection": collection,
+                "nargs": nargs,
+            }
+            call = NCall(client_helper.mget, args)
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            values = op_parser.get_values()
+            etags = [self._processor.generate_etag() for _ in values]
+            args = {
+                "values": values,
+                "expiry": op_parser.get_expiry(),
+                "collection": collection,
+                "etags": etags,
+                "nargs": nargs,
+            }
+            state["etags"] = etags
+            call = NCall(client_helper.mput, args)
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            args = {
+                "keys": op_parser.get_keys(),
+                "collection": collection,
+                "nargs": nargs,
+            }
+            call = NCall(client_helper.mdelete, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             args = op_converter.convert_query(
@@ -349,6 +382,22 @@ class Redis(RedisProvider, StoreProvider):
                 op_parser.get_where_exists(),
                 op_parser.get_where_etag(),
             )
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            result = result_converter.convert_mget(
+                nresult,
+                op_parser.get_keys(),
+            )
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            result = result_converter.convert_mput(
+                nresult,
+                op_parser.get_values(),
+                state["etags"],
+            )
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            result = result_converter.convert_mdelete(nresult)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             result = result_converter.convert_query(nresult)
@@ -584,7 +633,9 @@ class ResultConverter:
         elif end:
             eend = end + 1
             value = value[:eend]
-        return build_item(id=id, value=value, etag=nresult[1])
+        return build_item(
+            id=id, value=value, etag=nresult[1], raw=self.processor.raw
+        )
 
     def convert_put(
         self,
@@ -599,8 +650,13 @@ class ResultConverter:
         if not nresult:
             raise PreconditionFailedError
         elif returning == "new":
-            return build_item(id, convert_value(value, type), etag=etag)
-        return build_item(id, etag=etag)
+            return build_item(
+                id,
+                convert_value(value, type),
+                etag=etag,
+                raw=self.processor.raw,
+            )
+        return build_item(id, etag=etag, raw=self.processor.raw)
 
     def convert_update(
         self,
@@ -616,7 +672,12 @@ class ResultConverter:
         if returning == "new":
             return_value = nresult
         id = self.processor.get_id_from_key(key)
-        return build_item(id, convert_value(return_value, type), etag=etag)
+        return build_item(
+            id,
+            convert_value(return_value, type),
+            etag=etag,
+            raw=self.processor.raw,
+        )
 
     def convert_delete(
         self,
@@ -630,6 +691,49 @@ class ResultConverter:
             raise NotFoundError
         return None
 
+    def convert_mget(
+        self,
+        nresult: Any,
+        keys: list[Value],
+    ) -> list[KeyValueItem | None]:
+        result: list[KeyValueItem | None] = []
+        for key, response in zip(keys, nresult):
+            if not response or not response[1]:
+                result.append(None)
+                continue
+            result.append(
+                build_item(
+                    id=self.processor.get_id_from_key(key),
+                    value=response[0],
+                    etag=response[1],
+                    raw=self.processor.raw,
+                )
+            )
+        return result
+
+    def convert_mput(
+        self,
+        nresult: Any,
+        values: dict[Value, KeyValueValueType],
+        etags: list[str],
+    ) -> list[KeyValueItem | None]:
+        result: list[KeyValueItem | None] = []
+        for key, etag, success in zip(values, etags, nresult):
+            if not success:
+                result.append(None)
+                continue
+            result.append(
+                build_item(
+                    id=self.processor.get_id_from_key(key),
+                    etag=etag,
+                    raw=self.processor.raw,
+                )
+            )
+        return result
+
+    def convert_mdelete(self, nresult: Any) -> list[bool]:
+        return [response == 1 for response in nresult]
+
     def convert_query(self, nresult: Any):
         return nresult
 
@@ -775,6 +879,61 @@ class ClientHelper:
                 except self.lib.WatchError:
                     continue
 
+    def mget(
+        self,
+        keys: list[KeyValueKeyType],
+        collection: str | None,
+        nargs: Any,
+    ) -> list:
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hmget(
+                    **self.op_converter.convert_get(
+                        key, None, None, collection
+                    )
+                )
+            return pipe.execute()
+
+    def mput(
+        self,
+        values: dict[KeyValueKeyType, KeyValueValueType],
+        expiry: int | None,
+        collection: str | None,
+        etags: list[str],
+        nargs: Any,
+    ) -> list[bool]:
+        with self.client.pipeline(transaction=False) as pipe:
+            for (key, value), etag in zip(values.items(), etags):
+                args = self.op_converter.convert_put(
+                    key, value, None, None, expiry, None, collection, etag
+                )
+                pipe.hset(**args)
+                if expiry:
+                    pipe.pexpire(args["name"], expiry)
+            responses = pipe.execute(raise_on_error=False)
+        # Each key has one response for the write and one for the
+        # expiry, any of which can be an error.
+        failed = [isinstance(response, Exception) for response in responses]
+        if expiry:
+            return [
+                not (write or expire)
+                for write, expire in zip(failed[::2], failed[1::2])
+            ]
+        return [not write for write in failed]
+
+    def mdelete(
+        self,
+        keys: list[KeyValueKeyType],
+        collection: str | None,
+        nargs: Any,
+    ) -> list:
+        with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.delete(
+                    self.op_converter.convert_to_db_key(key, collection)
+                )
+            return pipe.execute()
+
     def query(
         self,
         continuation: str | None,
@@ -801,7 +960,12 @@ class ClientHelper:
                 cursor=cursor, count=count, match=match
             )
             for key in keys:
-                items.append(build_item(id=key[prefix_length:]))
+                items.append(
+                    build_item(
+                        id=key[prefix_length:],
+                        raw=self.op_converter.processor.raw,
+                    )
+                )
             if cursor == 0:
                 rcontinuation = None
                 break
@@ -811,7 +975,9 @@ class ClientHelper:
             if rlimit and len(items) < rlimit:
                 rlimit = rlimit - len(items)
             rcontinuation = str(cursor)
-        return KeyValueList(items=items, continuation=rcontinuation)
+        return build_query_result(
+            items, rcontinuation, raw=self.op_converter.processor.raw
+        )
 
     def count(self, func: str, match: str | None, nargs: Any) -> int:
         count = 0
@@ -842,6 +1008,7 @@ class ClientHelper:
                                 op_parser.get_key()
                             ),
                             etag=arg["mapping"]["etag"],
+                            raw=self.op_converter.processor.raw,
                         )
                     )
                 pipe.execute()
@@ -859,6 +1026,7 @@ class ClientHelper:
                         ),
                         value=response[0],
                         etag=response[1],
+                        raw=self.op_converter.processor.raw,
                     )
                 )
         elif func == "delete":
@@ -1011,6 +1179,61 @@ class AsyncClientHelper:
                 except self.lib.WatchError:
                     continue
 
+    async def mget(
+        self,
+        keys: list[KeyValueKeyType],
+        collection: str | None,
+        nargs: Any,
+    ) -> list:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                await pipe.hmget(
+                    **self.op_converter.convert_get(
+                        key, None, None, collection
+                    )
+                )
+            return await pipe.execute()
+
+    async def mput(
+        self,
+        values: dict[KeyValueKeyType, KeyValueValueType],
+        expiry: int | None,
+        collection: str | None,
+        etags: list[str],
+        nargs: Any,
+    ) -> list[bool]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for (key, value), etag in zip(values.items(), etags):
+                args = self.op_converter.convert_put(
+                    key, value, None, None, expiry, None, collection, etag
+                )
+                await pipe.hset(**args)
+                if expiry:
+                    await pipe.pexpire(args["name"], expiry)
+            responses = await pipe.execute(raise_on_error=False)
+        # Each key has one response for the write and one for the
+        # expiry, any of which can be an error.
+        failed = [isinstance(response, Exception) for response in responses]
+        if expiry:
+            return [
+                not (write or expire)
+                for write, expire in zip(failed[::2], failed[1::2])
+            ]
+        return [not write for write in failed]
+
+    async def mdelete(
+        self,
+        keys: list[KeyValueKeyType],
+        collection: str | None,
+        nargs: Any,
+    ) -> list:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                await pipe.delete(
+                    self.op_converter.convert_to_db_key(key, collection)
+                )
+            return await pipe.execute()
+
     async def query(
         self,
         continuation: str | None,
@@ -1037,7 +1260,12 @@ class AsyncClientHelper:
                 cursor=cursor, count=count, match=match
             )
             for key in keys:
-                items.append(build_item(id=key[prefix_length:]))
+                items.append(
+                    build_item(
+                        id=key[prefix_length:],
+                        raw=self.op_converter.processor.raw,
+                    )
+                )
             if cursor == 0:
                 rcontinuation = None
                 break
@@ -1047,7 +1275,9 @@ class AsyncClientHelper:
             if rlimit and len(items) < rlimit:
                 rlimit = rlimit - len(items)
             rcontinuation = str(cursor)
-        return KeyValueList(items=items, continuation=rcontinuation)
+        return build_query_result(
+            items, rcontinuation, raw=self.op_converter.processor.raw
+        )
 
     async def count(
         self,
@@ -1083,6 +1313,7 @@ class AsyncClientHelper:
                                 op_parser.get_key()
                             ),
                             etag=arg["mapping"]["etag"],
+                            raw=self.op_converter.processor.raw,
                         )
                     )
                 await pipe.execute()
@@ -1099,6 +1330,7 @@ class AsyncClientHelper:
                         ),
                         value=response[0] if response else None,
                         etag=response[1] if len(response) > 1 else None,
+                        raw=self.op_converter.processor.raw,
                     )
                 )
 
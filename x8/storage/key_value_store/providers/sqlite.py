@@ -6,10 +6,13 @@ from __future__ import annotations
 
 __all__ = ["SQLite"]
 
+import json
 import sqlite3
 from datetime import datetime, timezone
+from threading import Event, Thread
 from typing import Any
 
+from x8._common.sqlite_client import SQLiteClient
 from x8.core import Context, NCall, Operation, Response
 from x8.core.exceptions import (
     BadRequestError,
@@ -25,6 +28,7 @@ from x8.ql import (
     QueryFunctionName,
     Update,
     UpdateOp,
+    Value,
 )
 from x8.storage._common import (
     Attribute,
@@ -35,7 +39,12 @@ from x8.storage._common import (
     UpdateAttribute,
 )
 
-from .._helper import build_item, convert_value, get_collection_name
+from .._helper import (
+    build_item,
+    build_query_result,
+    convert_value,
+    get_collection_name,
+)
 from .._models import (
     KeyValueItem,
     KeyValueKeyType,
@@ -48,18 +57,32 @@ class SQLite(StoreProvider):
     database: str
     table: str
     collection: str | None
+    busy_timeout: float
+    group_commit: bool
+    pragmas: dict[str, Any] | None
+    sweep_interval: float | None
+    sweep_batch_size: int
+    incremental_vacuum: bool
     nparams: dict[str, Any]
 
     _client: Any
     _processor: ItemProcessor
     _op_converter: OperationConverter
     _result_converter: ResultConverter
+    _sweeper: Thread | None
+    _stop: Event
 
     def __init__(
         self,
         database: str = ":memory:",
         table: str = "kv",
         collection: str | None = None,
+        busy_timeout: float = 5.0,
+        group_commit: bool = False,
+        pragmas: dict[str, Any] | None = None,
+        sweep_interval: float | None = 60.0,
+        sweep_batch_size: int = 1000,
+        incremental_vacuum: bool = False,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -72,32 +95,90 @@ class SQLite(StoreProvider):
                 Table name that will host the key value store.
             collection:
                 Default collection.
+            busy_timeout:
+                Seconds to wait for a lock held by another connection.
+                Defaults to 5.
+            group_commit:
+                Commit concurrent writes in one transaction.
+                Defaults to False.
+            pragmas:
+                SQLite pragmas that override the defaults
+                (WAL journal, synchronous NORMAL, larger cache and mmap).
+            sweep_interval:
+                Seconds between two background deletes of the expired
+                items. None to only delete expired items when they
+                are read. Defaults to 60.
+            sweep_batch_size:
+                Maximum number of expired items deleted at a time,
+                so that other calls run between the batches of a
+                sweep. Defaults to 1000.
+            incremental_vacuum:
+                Return the pages freed by a sweep to the file system.
+                Sets auto_vacuum to incremental, which vacuums an
+                existing database once. Defaults to False.
             nparams:
                 Native parameters to SQLite client.
         """
         self.database = database
         self.table = table
         self.collection = collection
+        self.busy_timeout = busy_timeout
+        self.group_commit = group_commit
+        self.pragmas = pragmas
+        self.sweep_interval = sweep_interval
+        self.sweep_batch_size = sweep_batch_size
+        self.incremental_vacuum = incremental_vacuum
         self.nparams = nparams
 
         self._client = None
         self._processor = ItemProcessor()
         self._op_converter = OperationConverter(self._processor, self.table)
         self._result_converter = ResultConverter(self._processor)
+        self._sweeper = None
+        self._stop = Event()
 
     def __setup__(
         self,
         context: Context | None = None,
     ) -> None:
+        self._processor.raw = self.__raw__
         if self._client is not None:
             return
 
-        self._client = sqlite3.connect(
-            database=self.database,
-            check_same_thread=False,
-            **self.nparams,
+        self._client = SQLiteClient(
+            self.database,
+            busy_timeout=self.busy_timeout,
+            group_commit=self.group_commit,
+            pragmas=self.pragmas,
+            nparams=self.nparams,
         )
+        if self.incremental_vacuum:
+            self._enable_incremental_vacuum()
         self._create_table_if_needed()
+        if self.sweep_interval is not None:
+            self._sweeper = Thread(target=self._sweep_loop, daemon=True)
+            self._sweeper.start()
+
+    def sweep(self) -> int:
+        """Delete the expired items.
+
+        Returns:
+            Number of items deleted.
+        """
+        self.__setup__()
+        deleted = 0
+        while True:
+            args = self._op_converter.convert_sweep(self.sweep_batch_size)
+            with self._client.cursor() as cursor:
+                cursor.execute(args["query"], args["params"])
+                count = cursor.rowcount
+            deleted += count
+            if count < self.sweep_batch_size:
+                break
+        if deleted and self.incremental_vacuum:
+            with self._client.cursor() as cursor:
+                cursor.execute("PRAGMA incremental_vacuum").fetchall()
+        return deleted
 
     def __run__(
         self,
@@ -185,6 +266,28 @@ class SQLite(StoreProvider):
                 collection,
             )
             call = NCall(helper.execute, args)
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            args = op_converter.convert_mget(
+                op_parser.get_keys(),
+                collection,
+            )
+            call = NCall(helper.execute, args)
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            args, state = op_converter.convert_mput(
+                op_parser.get_values(),
+                op_parser.get_expiry(),
+                collection,
+            )
+            call = NCall(helper.execute_many, args)
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            args = op_converter.convert_mdelete(
+                op_parser.get_keys(),
+                collection,
+            )
+            call = NCall(helper.execute, args)
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             args = op_converter.convert_query(
@@ -209,6 +312,7 @@ class SQLite(StoreProvider):
             call = NCall(helper.batch, args)
         # CLOSE
         elif op_parser.op_equals(StoreOperation.CLOSE):
+            self._stop.set()
             call = NCall(helper.close, None)
         return call, state
 
@@ -255,6 +359,25 @@ class SQLite(StoreProvider):
                 nresult,
                 op_parser.get_where_etag(),
             )
+        # MGET
+        elif op_parser.op_equals(StoreOperation.MGET):
+            result = result_converter.convert_mget(
+                nresult,
+                op_parser.get_keys(),
+                type,
+            )
+        # MPUT
+        elif op_parser.op_equals(StoreOperation.MPUT):
+            result = result_converter.convert_mput(
+                op_parser.get_values(),
+                state["etags"],
+            )
+        # MDELETE
+        elif op_parser.op_equals(StoreOperation.MDELETE):
+            result = result_converter.convert_mdelete(
+                nresult,
+                op_parser.get_keys(),
+            )
         # QUERY
         elif op_parser.op_equals(StoreOperation.QUERY):
             result = result_converter.convert_query(nresult)
@@ -275,27 +398,50 @@ class SQLite(StoreProvider):
         return result
 
     def _create_table_if_needed(self, **kwargs: Any) -> None:
-        cursor = self._client.cursor()
-        rows = cursor.execute(
-            """SELECT name FROM sqlite_master WHERE type='table'
-                AND name=?""",
-            (self.table,),
-        ).fetchall()
-        if len(rows) == 0:
+        with self._client.cursor() as cursor:
+            rows = cursor.execute(
+                """SELECT name FROM sqlite_master WHERE type='table'
+                    AND name=?""",
+                (self.table,),
+            ).fetchall()
+            if len(rows) == 0:
+                cursor.execute(
+                    f"""
+                    CREATE TABLE {self.table} (
+                        collection TEXT,
+                        id TEXT,
+                        value BLOB,
+                        etag TEXT,
+                        expiry REAL,
+                        PRIMARY KEY (collection, id)
+                    )
+                    """
+                )
             cursor.execute(
                 f"""
-                CREATE TABLE {self.table} (
-                    collection TEXT,
-                    id TEXT,
-                    value BLOB,
-                    etag TEXT,
-                    expiry REAL,
-                    PRIMARY KEY (collection, id)
-                )
+                CREATE INDEX IF NOT EXISTS {self.table}_expiry
+                ON {self.table} (expiry) WHERE expiry != 0
                 """
             )
-        self._client.commit()
-        cursor.close()
+
+    def _enable_incremental_vacuum(self) -> None:
+        with self._client.cursor() as cursor:
+            (auto_vacuum,) = cursor.execute("PRAGMA auto_vacuum").fetchone()
+            if auto_vacuum != 2:
+                # The mode of an existing database only changes when
+                # it is vacuumed.
+                cursor.execute("PRAGMA auto_vacuum = incremental")
+                cursor.execute("VACUUM")
+
+    def _sweep_loop(self) -> None:
+        assert self.sweep_interval is not None
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception:
+                # Keep sweeping through transient failures,
+                # such as a database locked by another connection.
+                pass
 
 
 class OperationConverter:
@@ -561,6 +707,88 @@ class OperationConverter:
             "params": params,
         }
 
+    def convert_mget(
+        self,
+        keys: list[Value],
+        collection: str | None,
+    ) -> dict:
+        # The ids are passed as one JSON array to stay under
+        # the limit on the number of query parameters.
+        query = f"""
+                SELECT id, value, etag, expiry
+                FROM {self.table}
+                WHERE collection = ?
+                AND id IN (SELECT value FROM json_each(?))
+                AND (expiry = 0 OR expiry > ?)
+                """
+        current_time = datetime.now(timezone.utc).timestamp()
+        return {
+            "query": query,
+            "params": (
+                collection,
+                self._convert_ids(keys),
+                current_time,
+            ),
+            "fetchall": True,
+        }
+
+    def convert_mput(
+        self,
+        values: dict[Value, KeyValueValueType],
+        expiry: int | None,
+        collection: str | None,
+    ) -> tuple[dict, dict]:
+        expiry_time = (
+            datetime.now(timezone.utc).timestamp() + (expiry / 1000)
+            if expiry
+            else 0
+        )
+        query = f"""INSERT INTO {self.table} (
+                        collection, id, value, etag, expiry
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (collection, id)
+                    DO UPDATE SET
+                    value = EXCLUDED.value,
+                    etag = EXCLUDED.etag,
+                    expiry = EXCLUDED.expiry
+                """
+        params_list: list = []
+        etags: list = []
+        for key, value in values.items():
+            etag = self.processor.generate_etag()
+            params_list.append(
+                (
+                    collection,
+                    self.processor.get_id_from_key(key),
+                    value,
+                    etag,
+                    expiry_time,
+                )
+            )
+            etags.append(etag)
+        return {"query": query, "params_list": params_list}, {"etags": etags}
+
+    def convert_mdelete(
+        self,
+        keys: list[Value],
+        collection: str | None,
+    ) -> dict:
+        query = f"""
+                DELETE FROM {self.table}
+                WHERE collection = ?
+                AND id IN (SELECT value FROM json_each(?))
+                RETURNING id, expiry
+                """
+        return {
+            "query": query,
+            "params": (
+                collection,
+                self._convert_ids(keys),
+            ),
+            "fetchall": True,
+        }
+
     def convert_query(
         self,
         where: Expression | None,
@@ -568,10 +796,12 @@ class OperationConverter:
         collection: str | None,
     ) -> dict:
         where_str = self._convert_where(where, collection)
-        query = f"SELECT id FROM {self.table} WHERE {where_str}"
+        query = f"""SELECT id FROM {self.table} WHERE {where_str}
+                AND (expiry = 0 OR expiry > ?)"""
         if limit:
             query = f"{query} LIMIT {limit}"
-        return {"query": query, "fetchall": True}
+        current_time = datetime.now(timezone.utc).timestamp()
+        return {"query": query, "params": (current_time,), "fetchall": True}
 
     def convert_count(
         self,
@@ -579,8 +809,10 @@ class OperationConverter:
         collection: str | None,
     ) -> dict:
         where_str = self._convert_where(where, collection)
-        query = f"SELECT COUNT(*) FROM {self.table} WHERE {where_str}"
-        return {"query": query}
+        query = f"""SELECT COUNT(*) FROM {self.table} WHERE {where_str}
+                AND (expiry = 0 OR expiry > ?)"""
+        current_time = datetime.now(timezone.utc).timestamp()
+        return {"query": query, "params": (current_time,)}
 
     def convert_batch(
         self,
@@ -642,6 +874,18 @@ class OperationConverter:
                 )
         return {"ops": ops}, {"etags": states}
 
+    def convert_sweep(self, batch_size: int) -> dict:
+        current_time = datetime.now(timezone.utc).timestamp()
+        query = f"""
+                DELETE FROM {self.table}
+                WHERE rowid IN (
+                    SELECT rowid FROM {self.table}
+                    WHERE expiry != 0 AND expiry < ?
+                    LIMIT ?
+                )
+                """
+        return {"query": query, "params": (current_time, batch_size)}
+
     def convert_evict(
         self,
         key: KeyValueKeyType,
@@ -664,6 +908,11 @@ class OperationConverter:
             ),
         }
 
+    def _convert_ids(self, keys: list[Value]) -> str:
+        return json.dumps(
+            [self.processor.get_id_from_key(key) for key in keys]
+        )
+
     def _convert_where(
         self, where: Expression | None, collection: str | None
     ) -> str:
@@ -698,7 +947,12 @@ class ResultConverter:
 
     def convert_get(self, nresult: Any, type: str) -> KeyValueItem:
         (id, value, etag, expiry) = nresult
-        return build_item(id=id, value=convert_value(value, type), etag=etag)
+        return build_item(
+            id=id,
+            value=convert_value(value, type),
+            etag=etag,
+            raw=self.processor.raw,
+        )
 
     def convert_put(
         self,
@@ -719,7 +973,10 @@ class ResultConverter:
         if returning == "new":
             return_value = value
         return build_item(
-            id=id, value=convert_value(return_value, type), etag=etag
+            id=id,
+            value=convert_value(return_value, type),
+            etag=etag,
+            raw=self.processor.raw,
         )
 
     def convert_update(
@@ -738,7 +995,10 @@ class ResultConverter:
         if returning == "new":
             (return_value,) = nresult
         return build_item(
-            id=id, value=convert_value(return_value, type), etag=etag
+            id=id,
+            value=convert_value(return_value, type),
+            etag=etag,
+            raw=self.processor.raw,
         )
 
     def convert_delete(self, nresult: Any, where_etag: str | None):
@@ -751,11 +1011,62 @@ class ResultConverter:
             raise NotFoundError
         return None
 
+    def convert_mget(
+        self,
+        nresult: Any,
+        keys: list[Value],
+        type: str,
+    ) -> list[KeyValueItem | None]:
+        rows = {id: (value, etag) for id, value, etag, _ in nresult}
+        result: list[KeyValueItem | None] = []
+        for key in keys:
+            id = self.processor.get_id_from_key(key)
+            if id not in rows:
+                result.append(None)
+                continue
+            value, etag = rows[id]
+            result.append(
+                build_item(
+                    id=id,
+                    value=convert_value(value, type),
+                    etag=etag,
+                    raw=self.processor.raw,
+                )
+            )
+        return result
+
+    def convert_mput(
+        self,
+        values: dict[Value, KeyValueValueType],
+        etags: list[str],
+    ) -> list[KeyValueItem | None]:
+        return [
+            build_item(
+                id=self.processor.get_id_from_key(key),
+                etag=etag,
+                raw=self.processor.raw,
+            )
+            for key, etag in zip(values, etags)
+        ]
+
+    def convert_mdelete(
+        self,
+        nresult: Any,
+        keys: list[Value],
+    ) -> list[bool]:
+        current_time = datetime.now(timezone.utc).timestamp()
+        deleted = {
+            id
+            for id, expiry in nresult
+            if expiry == 0 or current_time <= expiry
+        }
+        return [self.processor.get_id_from_key(key) in deleted for key in keys]
+
     def convert_query(self, nresult: Any) -> KeyValueList:
         items: list = []
         for raw_item in nresult:
-            items.append(build_item(id=raw_item[0]))
-        return KeyValueList(items=items)
+            items.append(build_item(id=raw_item[0], raw=self.processor.raw))
+        return build_query_result(items, raw=self.processor.raw)
 
     def convert_count(self, nresult: Any) -> int:
         return nresult[0]
@@ -771,7 +1082,11 @@ class ResultConverter:
         for op_parser, op_result, state in zip(op_parsers, nresult, states):
             id = self.processor.get_id_from_key(op_parser.get_key())
             if op_parser.op_equals(StoreOperation.PUT):
-                result.append(build_item(id=id, etag=state["etag"]))
+                result.append(
+                    build_item(
+                        id=id, etag=state["etag"], raw=self.processor.raw
+                    )
+                )
             elif op_parser.op_equals(StoreOperation.GET):
                 expiry = op_result[3]
                 current_time = datetime.now(timezone.utc).timestamp()
@@ -784,6 +1099,7 @@ class ResultConverter:
                             id=id,
                             value=convert_value(op_result[1], type),
                             etag=op_result[2],
+                            raw=self.processor.raw,
                         )
                     )
             elif op_parser.op_equals(StoreOperation.DELETE):
@@ -805,8 +1121,7 @@ class ClientHelper:
         collection: str | None,
     ) -> bool:
         args = self.op_converter.convert_exists(key, collection)
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             cursor.execute(args["query"], args["params"])
             nresult = cursor.fetchone()
             if nresult is None:
@@ -818,9 +1133,6 @@ class ClientHelper:
                 args = self.op_converter.convert_evict(key, collection)
                 cursor.execute(args["query"], args["params"])
                 return False
-        finally:
-            self.client.commit()
-            cursor.close()
         return True
 
     def get(
@@ -831,8 +1143,7 @@ class ClientHelper:
         end: int | None,
     ) -> Any:
         args = self.op_converter.convert_get(key, start, end, collection)
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             cursor.execute(args["query"], args["params"])
             nresult = cursor.fetchone()
             if nresult is None:
@@ -849,9 +1160,6 @@ class ClientHelper:
                 args = self.op_converter.convert_evict(key, collection)
                 cursor.execute(args["query"], args["params"])
                 raise NotFoundError
-        finally:
-            self.client.commit()
-            cursor.close()
         return nresult
 
     def execute(
@@ -861,8 +1169,7 @@ class ClientHelper:
         rowcount: bool = False,
         fetchall: bool = False,
     ) -> Any:
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             if params:
                 cursor.execute(query, params)
             else:
@@ -872,23 +1179,21 @@ class ClientHelper:
             if fetchall:
                 return cursor.fetchall()
             return cursor.fetchone()
-        finally:
-            self.client.commit()
-            cursor.close()
+
+    def execute_many(self, query: str, params_list: list) -> Any:
+        with self.client.cursor() as cursor:
+            cursor.executemany(query, params_list)
+            return cursor.rowcount
 
     def batch(self, ops: list) -> list[Any]:
         nresult = []
-        cursor = self.client.cursor()
-        try:
+        with self.client.cursor() as cursor:
             for op in ops:
                 if "params" in op:
                     cursor.execute(op["query"], op["params"])
                 else:
                     cursor.execute(op["query"])
                 nresult.append(cursor.fetchone())
-        finally:
-            self.client.commit()
-            cursor.close()
         return nresult
 
     def close(self) -> Any:
@@ -18,6 +18,8 @@ from ._models import (
     ObjectQueryConfig,
     ObjectSource,
     ObjectStoreClass,
+    ObjectSyncProgress,
+    ObjectSyncResult,
     ObjectTransferConfig,
     ObjectVersion,
 )
@@ -33,6 +35,8 @@ __all__ = [
     "ObjectQueryConfig",
     "ObjectSource",
     "ObjectStore",
+    "ObjectSyncProgress",
+    "ObjectSyncResult",
     "ObjectTransferConfig",
     "ObjectVersion",
     "ObjectStoreClass",
@@ -1,3 +1,6 @@
+import asyncio
+from typing import AsyncIterator, Iterator
+
 from x8.core.exceptions import BadRequestError
 from x8.ql import (
     Comparison,
@@ -66,6 +69,17 @@ def get_transfer_config(
     raise BadRequestError("Transfer config format error")
 
 
+async def build_aiter_get_result(
+    chunks: Iterator[bytes],
+) -> AsyncIterator[bytes]:
+    # Reads each chunk from a blocking iterator in a worker thread.
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, b"")
+        if not chunk:
+            return
+        yield chunk
+
+
 def get_query_args(
     op_parser: StoreOperationParser,
 ) -> QueryArgs:
@@ -89,7 +89,7 @@ class ObjectItem(DataModel):
     key: ObjectKey
     """Object key."""
 
-    value: bytes | None = None
+    value: bytes | memoryview | None = None
     """Object value."""
 
     metadata: dict | None = None
@@ -143,10 +143,49 @@ class ObjectTransferConfig(DataModel):
     concurrency: int | None = None
     """Number of concurrent transfer."""
 
+    zero_copy: bool | None = False
+    """A value indicating whether the value should be returned
+    as a read-only memory view over the object instead of a copy,
+    if the provider supports it. Downloads of a whole object to a file
+    may hard link the file to the object, so the file must not be
+    changed in place."""
+
     nconfig: dict[str, Any] | None = None
     """Native config for providers."""
 
 
+class ObjectSyncProgress(DataModel):
+    """Directory sync progress."""
+
+    id: str
+    """Id of the object that was transferred."""
+
+    completed: int
+    """Number of transfers completed."""
+
+    total: int
+    """Number of transfers."""
+
+    transferred_bytes: int
+    """Number of bytes transferred so far."""
+
+
+class ObjectSyncResult(DataModel):
+    """Directory sync result."""
+
+    transferred: list[str] = []
+    """Ids of the objects that were transferred."""
+
+    skipped: list[str] = []
+    """Ids of the objects that were unchanged."""
+
+    deleted: list[str] = []
+    """Ids of the objects that were deleted at the destination."""
+
+    transferred_bytes: int = 0
+    """Number of bytes transferred."""
+
+
 class ObjectSource(DataModel):
     """Object source."""
 
@@ -0,0 +1,468 @@
+"""
+Directory sync between a local folder and an object store.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Awaitable, BinaryIO, Callable
+
+from x8.core import Response
+from x8.core.exceptions import BadRequestError
+from x8.ql import Comparison, ComparisonOp, Expression, Field, QueryFunction
+from x8.storage._common import SpecialAttribute
+
+from ._models import (
+    ObjectItem,
+    ObjectQueryConfig,
+    ObjectSyncProgress,
+    ObjectSyncResult,
+    ObjectTransferConfig,
+)
+
+DEFAULT_CONCURRENCY = 8
+PAGE_SIZE = 1000
+PART_SUFFIX = ".x8part"
+# Modified times set on downloaded files can be rounded by the
+# file system, so they are compared with a tolerance.
+MTIME_TOLERANCE = 0.001
+
+_MD5_ETAG = re.compile(r'^"?[0-9a-fA-F]{32}"?$')
+
+LocalFiles = dict[str, tuple[str, os.stat_result]]
+RemoteObjects = dict[str, ObjectItem]
+
+
+class DirectorySync:
+    """Transfers the files that changed between a folder and a store.
+
+    A file and an object are the same if their sizes match and the
+    destination is not older than the source. Downloads set the modified
+    time of the file to the last modified time of the object. When the
+    times do not match, an ETag that is an MD5 digest is compared with
+    the file contents.
+
+    Large downloads with multipart enabled are fetched in ranges of
+    chunksize into a part file, so an interrupted sync resumes from
+    the last range if the object ETag did not change.
+    """
+
+    store: Any
+    path: str
+    prefix: str
+    delete: bool
+    config: ObjectTransferConfig | None
+    concurrency: int
+    progress: Callable[[ObjectSyncProgress], None] | None
+    collection: str | None
+    kwargs: dict[str, Any]
+
+    def __init__(
+        self,
+        store: Any,
+        path: str,
+        prefix: str | None,
+        delete: bool,
+        config: dict | ObjectTransferConfig | None,
+        progress: Callable[[ObjectSyncProgress], None] | None,
+        collection: str | None,
+        kwargs: dict[str, Any],
+    ):
+        if isinstance(config, dict):
+            config = ObjectTransferConfig(**config)
+        self.store = store
+        self.path = path
+        self.prefix = prefix or ""
+        self.delete = delete
+        self.config = config
+        self.concurrency = (
+            config.concurrency if config else None
+        ) or DEFAULT_CONCURRENCY
+        self.progress = progress
+        self.collection = collection
+        self.kwargs = kwargs
+
+    def upload(self) -> ObjectSyncResult:
+        if not os.path.isdir(self.path):
+            raise BadRequestError(f"Folder {self.path} not found")
+        local = self._list_local()
+        remote = self._list_remote()
+        transfers, result = self._plan(local, remote, upload=True)
+
+        def upload(id: str) -> int:
+            file, stat = local[id]
+            self.store.put(
+                key=id,
+                file=file,
+                config=self.config,
+                collection=self.collection,
+                **self.kwargs,
+            )
+            return stat.st_size
+
+        self._run(transfers, upload, result)
+        for id in result.deleted:
+            self.store.delete(
+                key=id, collection=self.collection, **self.kwargs
+            )
+        return result
+
+    def download(self) -> ObjectSyncResult:
+        os.makedirs(self.path, exist_ok=True)
+        remote = self._list_remote()
+        local = self._list_local()
+        transfers, result = self._plan(local, remote, upload=False)
+        self._run(transfers, lambda id: self._download(remote[id]), result)
+        for id in result.deleted:
+            os.remove(local[id][0])
+        return result
+
+    async def aupload(self) -> ObjectSyncResult:
+        if not os.path.isdir(self.path):
+            raise BadRequestError(f"Folder {self.path} not found")
+        local = await asyncio.to_thread(self._list_local)
+        remote = await self._alist_remote()
+        transfers, result = await asyncio.to_thread(
+            self._plan, local, remote, True
+        )
+
+        async def upload(id: str) -> int:
+            file, stat = local[id]
+            await self.store.aput(
+                key=id,
+                file=file,
+                config=self.config,
+                collection=self.collection,
+                **self.kwargs,
+            )
+            return stat.st_size
+
+        await self._arun(transfers, upload, result)
+        for id in result.deleted:
+            await self.store.adelete(
+                key=id, collection=self.collection, **self.kwargs
+            )
+        return result
+
+    async def adownload(self) -> ObjectSyncResult:
+        os.makedirs(self.path, exist_ok=True)
+        remote = await self._alist_remote()
+        local = await asyncio.to_thread(self._list_local)
+        transfers, result = await asyncio.to_thread(
+            self._plan, local, remote, False
+        )
+        await self._arun(
+            transfers, lambda id: self._adownload(remote[id]), result
+        )
+        for id in result.deleted:
+            os.remove(local[id][0])
+        return result
+
+    def _download(self, item: ObjectItem) -> int:
+        id = item.key.id
+        file, part, size, etag, chunksize = self._prepare_download(item)
+        if chunksize is not None and etag is not None and size > chunksize:
+            f, offset = self._open_part(part, size)
+            with f:
+                while offset < size:
+                    end = min(offset + chunksize, size) - 1
+                    self.store.get(
+                        key=id,
+                        stream=f,
+                        where=self._get_etag_where(etag),
+                        start=offset,
+                        end=end,
+                        collection=self.collection,
+                        **self.kwargs,
+                    )
+                    f.flush()
+                    offset = end + 1
+        else:
+            self.store.get(
+                key=id,
+                file=part,
+                config=self.config,
+                collection=self.collection,
+                **self.kwargs,
+            )
+        self._complete_download(item, file, part)
+        return size
+
+    async def _adownload(self, item: ObjectItem) -> int:
+        id = item.key.id
+        file, part, size, etag, chunksize = self._prepare_download(item)
+        if chunksize is not None and etag is not None and size > chunksize:
+            f, offset = self._open_part(part, size)
+            with f:
+                while offset < size:
+                    end = min(offset + chunksize, size) - 1
+                    await self.store.aget(
+                        key=id,
+                        stream=f,
+                        where=self._get_etag_where(etag),
+                        start=offset,
+                        end=end,
+                        collection=self.collection,
+                        **self.kwargs,
+                    )
+                    f.flush()
+                    offset = end + 1
+        else:
+            await self.store.aget(
+                key=id,
+                file=part,
+                config=self.config,
+                collection=self.collection,
+                **self.kwargs,
+            )
+        self._complete_download(item, file, part)
+        return size
+
+    def _prepare_download(
+        self, item: ObjectItem
+    ) -> tuple[str, str, int, str | None, int | None]:
+        file = self._get_file(item.key.id)
+        properties = item.properties
+        size = (properties.content_length if properties else None) or 0
+        etag = properties.etag if properties else None
+        chunksize = None
+        if self.config is not None and self.config.multipart:
+            chunksize = self.config.chunksize
+        if etag is not None:
+            digest = hashlib.sha256(etag.encode()).hexdigest()[:16]
+            part = f"{file}.{digest}{PART_SUFFIX}"
+        else:
+            part = f"{file}{PART_SUFFIX}"
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        return file, part, size, etag, chunksize
+
+    def _complete_download(self, item: ObjectItem, file: str, part: str):
+        os.replace(part, file)
+        properties = item.properties
+        if properties is not None and properties.last_modified is not None:
+            os.utime(
+                file, (properties.last_modified, properties.last_modified)
+            )
+
+    def _open_part(self, part: str, size: int) -> tuple[BinaryIO, int]:
+        # Ranges are appended because providers can seek the stream
+        # back to the start after writing to it.
+        offset = os.path.getsize(part) if os.path.isfile(part) else 0
+        f = open(part, "ab")
+        if offset > size:
+            offset = 0
+        if offset == 0:
+            f.truncate(0)
+        return f, offset
+
+    def _get_etag_where(self, etag: str) -> Expression:
+        return Comparison(
+            lexpr=Field(path=SpecialAttribute.ETAG),
+            op=ComparisonOp.EQ,
+            rexpr=etag,
+        )
+
+    def _run(
+        self,
+        transfers: list[str],
+        transfer: Callable[[str], int],
+        result: ObjectSyncResult,
+    ) -> None:
+        if not transfers:
+            return
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(transfer, id): id for id in transfers}
+            try:
+                for future in as_completed(futures):
+                    self._complete(
+                        futures[future], future.result(), result, transfers
+                    )
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+        result.transferred.sort()
+
+    async def _arun(
+        self,
+        transfers: list[str],
+        transfer: Callable[[str], Awaitable[int]],
+        result: ObjectSyncResult,
+    ) -> None:
+        ids = iter(transfers)
+
+        async def worker() -> None:
+            for id in ids:
+                self._complete(id, await transfer(id), result, transfers)
+
+        tasks = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.concurrency, len(transfers)))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        result.transferred.sort()
+
+    def _complete(
+        self,
+        id: str,
+        size: int,
+        result: ObjectSyncResult,
+        transfers: list[str],
+    ) -> None:
+        result.transferred.append(id)
+        result.transferred_bytes += size
+        if self.progress is not None:
+            self.progress(
+                ObjectSyncProgress(
+                    id=id,
+                    completed=len(result.transferred),
+                    total=len(transfers),
+                    transferred_bytes=result.transferred_bytes,
+                )
+            )
+
+    def _plan(
+        self, local: LocalFiles, remote: RemoteObjects, upload: bool
+    ) -> tuple[list[str], ObjectSyncResult]:
+        result = ObjectSyncResult()
+        transfers = []
+        source, destination = (local, remote) if upload else (remote, local)
+        for id in sorted(source):
+            if id in local and id in remote:
+                file, stat = local[id]
+                if self._is_same(file, stat, remote[id], upload):
+                    result.skipped.append(id)
+                    continue
+            transfers.append(id)
+        if self.delete:
+            result.deleted = sorted(
+                id for id in destination if id not in source
+            )
+        return transfers, result
+
+    def _is_same(
+        self,
+        file: str,
+        stat: os.stat_result,
+        item: ObjectItem,
+        upload: bool,
+    ) -> bool:
+        properties = item.properties
+        if properties is None or properties.content_length != stat.st_size:
+            return False
+        last_modified = properties.last_modified
+        if last_modified is not None:
+            if upload:
+                if last_modified >= stat.st_mtime:
+                    return True
+            elif stat.st_mtime + MTIME_TOLERANCE >= last_modified:
+                return True
+        etag = properties.etag
+        if etag is not None and _MD5_ETAG.match(etag):
+            return _md5(file) == etag.strip('"').lower()
+        return False
+
+    def _list_local(self) -> LocalFiles:
+        files: LocalFiles = dict()
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                if name.endswith(PART_SUFFIX):
+                    continue
+                file = os.path.join(root, name)
+                relative = os.path.relpath(file, self.path)
+                id = self.prefix + relative.replace(os.sep, "/")
+                files[id] = (file, os.stat(file))
+        return files
+
+    def _list_remote(self) -> RemoteObjects:
+        objects: RemoteObjects = dict()
+        continuation = None
+        while True:
+            response = self.store.query(
+                where=self._get_prefix_where(),
+                continuation=continuation,
+                config=ObjectQueryConfig(paging=True, page_size=PAGE_SIZE),
+                collection=self.collection,
+                **self.kwargs,
+            )
+            object_list = _get_result(response)
+            for item in object_list.items:
+                if not item.key.id.endswith("/"):
+                    objects[item.key.id] = item
+            continuation = object_list.continuation
+            if continuation is None:
+                break
+        for id, item in objects.items():
+            if _needs_properties(item):
+                response = self.store.get_properties(
+                    key=id, collection=self.collection, **self.kwargs
+                )
+                objects[id] = _get_result(response)
+        return objects
+
+    async def _alist_remote(self) -> RemoteObjects:
+        objects: RemoteObjects = dict()
+        continuation = None
+        while True:
+            response = await self.store.aquery(
+                where=self._get_prefix_where(),
+                continuation=continuation,
+                config=ObjectQueryConfig(paging=True, page_size=PAGE_SIZE),
+                collection=self.collection,
+                **self.kwargs,
+            )
+            object_list = _get_result(response)
+            for item in object_list.items:
+                if not item.key.id.endswith("/"):
+                    objects[item.key.id] = item
+            continuation = object_list.continuation
+            if continuation is None:
+                break
+        for id, item in objects.items():
+            if _needs_properties(item):
+                response = await self.store.aget_properties(
+                    key=id, collection=self.collection, **self.kwargs
+                )
+                objects[id] = _get_result(response)
+        return objects
+
+    def _get_prefix_where(self) -> Expression | None:
+        if not self.prefix:
+            return None
+        return QueryFunction.starts_with(
+            field=SpecialAttribute.ID, value=self.prefix
+        )
+
+    def _get_file(self, id: str) -> str:
+        path = os.path.abspath(self.path)
+        relative = id.removeprefix(self.prefix).split("/")
+        file = os.path.normpath(os.path.join(path, *relative))
+        if os.path.commonpath([path, file]) != path:
+            raise BadRequestError(f"Object {id} is outside the folder")
+        return file
+
+
+def _get_result(response: Any) -> Any:
+    if isinstance(response, Response):
+        return response.result
+    return response
+
+
+def _needs_properties(item: ObjectItem) -> bool:
+    return item.properties is None or item.properties.content_length is None
+
+
+def _md5(file: str) -> str:
+    digest = hashlib.md5()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
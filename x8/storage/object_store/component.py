@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from typing import IO, Any
+from typing import IO, Any, AsyncIterator, Callable, Iterator
 
 from x8.core import Response, operation
-from x8.ql import Expression, Value
-from x8.storage._common import CollectionResult, StoreComponent
+from x8.ql import Comparison, ComparisonOp, Expression, Field, Value
+from x8.storage._common import (
+    CollectionResult,
+    SpecialAttribute,
+    StoreComponent,
+)
 
 from ._models import (
     ObjectBatch,
@@ -15,8 +19,13 @@ from ._models import (
     ObjectProperties,
     ObjectQueryConfig,
     ObjectSource,
+    ObjectSyncProgress,
+    ObjectSyncResult,
     ObjectTransferConfig,
 )
+from ._sync import DirectorySync, _get_result
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
 class ObjectStore(StoreComponent):
@@ -194,6 +203,76 @@ class ObjectStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    def iter_get(
+        self,
+        key: str | dict | ObjectKey,
+        where: str | Expression | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        config: dict | ObjectTransferConfig | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[Iterator[bytes]]:
+        """Get object as chunks.
+
+        Each chunk is read as the result is iterated, so only one
+        chunk is held in memory at a time. Providers without native
+        support read each chunk with a range get.
+
+        Args:
+            key:
+                Object key.
+            where:
+                Condition expression.
+            start:
+                Start bytes for range request.
+            end:
+                End bytes for range request.
+            config:
+                Transfer config. The chunksize sets the size
+                of each chunk. Defaults to 1 MiB.
+            collection:
+                Collection name.
+
+        Returns:
+            Iterator over the object bytes.
+
+        Raises:
+            NotFoundError:
+                Object not found.
+            NotModified:
+                Object not modified.
+        """
+        if isinstance(config, dict):
+            config = ObjectTransferConfig(**config)
+        size = (config.chunksize if config else None) or DEFAULT_CHUNK_SIZE
+        item = _get_result(
+            self.get_properties(
+                key=key, where=where, collection=collection, **kwargs
+            )
+        )
+        page_where = _get_page_where(item, where)
+
+        def iterate() -> Iterator[bytes]:
+            for page_start, page_end in _iter_pages(item, start, end, size):
+                value = _get_result(
+                    self.get(
+                        key=item.key,
+                        where=page_where,
+                        start=page_start,
+                        end=page_end,
+                        collection=collection,
+                        **kwargs,
+                    )
+                ).value
+                if value:
+                    yield bytes(value)
+                if len(value or b"") <= page_end - page_start:
+                    return
+
+        return Response(result=iterate())
+
     @operation()
     def get_metadata(
         self,
@@ -458,6 +537,95 @@ class ObjectStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    def upload_dir(
+        self,
+        path: str,
+        prefix: str | None = None,
+        delete: bool = False,
+        config: dict | ObjectTransferConfig | None = None,
+        progress: Callable[[ObjectSyncProgress], None] | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[ObjectSyncResult]:
+        """Upload the files in a folder that changed.
+
+        Each file is stored as an object whose id is the prefix
+        followed by the file path relative to the folder, with "/"
+        as the separator. Files whose size matches the object and
+        that are not newer than it are skipped.
+
+        Args:
+            path:
+                Folder to upload.
+            prefix:
+                Object id prefix.
+            delete:
+                Delete the objects under the prefix that have no
+                file in the folder, mirroring the folder.
+            config:
+                Transfer config. Concurrency sets the number of
+                parallel transfers, defaults to 8. The config is
+                passed to put, so with multipart, providers that
+                support it upload files larger than chunksize in
+                parts of chunksize.
+            progress:
+                Callback called after each transfer.
+            collection:
+                Collection name.
+
+        Returns:
+            Sync result.
+        """
+        sync = DirectorySync(
+            self, path, prefix, delete, config, progress, collection, kwargs
+        )
+        return Response(result=sync.upload())
+
+    @operation()
+    def download_dir(
+        self,
+        path: str,
+        prefix: str | None = None,
+        delete: bool = False,
+        config: dict | ObjectTransferConfig | None = None,
+        progress: Callable[[ObjectSyncProgress], None] | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[ObjectSyncResult]:
+        """Download the objects under a prefix that changed.
+
+        Each object is written to the folder at its id without
+        the prefix, with "/" as the separator. Objects whose size
+        matches the file and that are not newer than it are skipped.
+        Downloaded files get the object's last modified time.
+
+        Args:
+            path:
+                Folder to download to.
+            prefix:
+                Object id prefix.
+            delete:
+                Delete the files in the folder that have no object
+                under the prefix, mirroring the objects.
+            config:
+                Transfer config. Concurrency sets the number of
+                parallel transfers, defaults to 8. With multipart,
+                objects larger than chunksize are downloaded
+                in resumable ranges of chunksize.
+            progress:
+                Callback called after each transfer.
+            collection:
+                Collection name.
+
+        Returns:
+            Sync result.
+        """
+        sync = DirectorySync(
+            self, path, prefix, delete, config, progress, collection, kwargs
+        )
+        return Response(result=sync.download())
+
     @operation()
     def close(
         self,
@@ -626,6 +794,76 @@ class ObjectStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    async def aiter_get(
+        self,
+        key: str | dict | ObjectKey,
+        where: str | Expression | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        config: dict | ObjectTransferConfig | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[AsyncIterator[bytes]]:
+        """Get object as chunks.
+
+        Each chunk is read as the result is iterated, so only one
+        chunk is held in memory at a time. Providers without native
+        support read each chunk with a range get.
+
+        Args:
+            key:
+                Object key.
+            where:
+                Condition expression.
+            start:
+                Start bytes for range request.
+            end:
+                End bytes for range request.
+            config:
+                Transfer config. The chunksize sets the size
+                of each chunk. Defaults to 1 MiB.
+            collection:
+                Collection name.
+
+        Returns:
+            Async iterator over the object bytes.
+
+        Raises:
+            NotFoundError:
+                Object not found.
+            NotModified:
+                Object not modified.
+        """
+        if isinstance(config, dict):
+            config = ObjectTransferConfig(**config)
+        size = (config.chunksize if config else None) or DEFAULT_CHUNK_SIZE
+        item = _get_result(
+            await self.aget_properties(
+                key=key, where=where, collection=collection, **kwargs
+            )
+        )
+        page_where = _get_page_where(item, where)
+
+        async def iterate() -> AsyncIterator[bytes]:
+            for page_start, page_end in _iter_pages(item, start, end, size):
+                value = _get_result(
+                    await self.aget(
+                        key=item.key,
+                        where=page_where,
+                        start=page_start,
+                        end=page_end,
+                        collection=collection,
+                        **kwargs,
+                    )
+                ).value
+                if value:
+                    yield bytes(value)
+                if len(value or b"") <= page_end - page_start:
+                    return
+
+        return Response(result=iterate())
+
     @operation()
     async def aget_metadata(
         self,
@@ -890,6 +1128,95 @@ class ObjectStore(StoreComponent):
         """
         raise NotImplementedError
 
+    @operation()
+    async def aupload_dir(
+        self,
+        path: str,
+        prefix: str | None = None,
+        delete: bool = False,
+        config: dict | ObjectTransferConfig | None = None,
+        progress: Callable[[ObjectSyncProgress], None] | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[ObjectSyncResult]:
+        """Upload the files in a folder that changed.
+
+        Each file is stored as an object whose id is the prefix
+        followed by the file path relative to the folder, with "/"
+        as the separator. Files whose size matches the object and
+        that are not newer than it are skipped.
+
+        Args:
+            path:
+                Folder to upload.
+            prefix:
+                Object id prefix.
+            delete:
+                Delete the objects under the prefix that have no
+                file in the folder, mirroring the folder.
+            config:
+                Transfer config. Concurrency sets the number of
+                parallel transfers, defaults to 8. The config is
+                passed to put, so with multipart, providers that
+                support it upload files larger than chunksize in
+                parts of chunksize.
+            progress:
+                Callback called after each transfer.
+            collection:
+                Collection name.
+
+        Returns:
+            Sync result.
+        """
+        sync = DirectorySync(
+            self, path, prefix, delete, config, progress, collection, kwargs
+        )
+        return Response(result=await sync.aupload())
+
+    @operation()
+    async def adownload_dir(
+        self,
+        path: str,
+        prefix: str | None = None,
+        delete: bool = False,
+        config: dict | ObjectTransferConfig | None = None,
+        progress: Callable[[ObjectSyncProgress], None] | None = None,
+        collection: str | None = None,
+        **kwargs: Any,
+    ) -> Response[ObjectSyncResult]:
+        """Download the objects under a prefix that changed.
+
+        Each object is written to the folder at its id without
+        the prefix, with "/" as the separator. Objects whose size
+        matches the file and that are not newer than it are skipped.
+        Downloaded files get the object's last modified time.
+
+        Args:
+            path:
+                Folder to download to.
+            prefix:
+                Object id prefix.
+            delete:
+                Delete the files in the folder that have no object
+                under the prefix, mirroring the objects.
+            config:
+                Transfer config. Concurrency sets the number of
+                parallel transfers, defaults to 8. With multipart,
+                objects larger than chunksize are downloaded
+                in resumable ranges of chunksize.
+            progress:
+                Callback called after each transfer.
+            collection:
+                Collection name.
+
+        Returns:
+            Sync result.
+        """
+        sync = DirectorySync(
+            self, path, prefix, delete, config, progress, collection, kwargs
+        )
+        return Response(result=await sync.adownload())
+
     @operation()
     async def aclose(
         self,
@@ -901,3 +1228,35 @@ class ObjectStore(StoreComponent):
             None.
         """
         raise NotImplementedError
+
+
+def _get_page_where(
+    item: ObjectItem, where: str | Expression | None
+) -> str | Expression | None:
+    # Pages are read from the version and etag of the first lookup,
+    # so a put while iterating does not mix two objects.
+    if item.properties is None or item.properties.etag is None:
+        return where
+    return Comparison(
+        lexpr=Field(path=SpecialAttribute.ETAG),
+        op=ComparisonOp.EQ,
+        rexpr=item.properties.etag,
+    )
+
+
+def _iter_pages(
+    item: ObjectItem, start: int | None, end: int | None, size: int
+) -> Iterator[tuple[int, int]]:
+    # Yields inclusive byte ranges of at most size bytes. Without a
+    # known length, pages are read until one comes back short.
+    offset = start or 0
+    last = end
+    length = item.properties.content_length if item.properties else None
+    if length is not None:
+        last = length - 1 if end is None else min(end, length - 1)
+    while last is None or offset <= last:
+        page_end = offset + size - 1
+        if last is not None:
+            page_end = min(page_end, last)
+        yield offset, page_end
+        offset = page_end + 1
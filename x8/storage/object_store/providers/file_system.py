@@ -6,11 +6,17 @@ from __future__ import annotations
 
 __all__ = ["FileSystem"]
 
+import copy
+import mmap
 import os
 import shutil
+import sqlite3
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import IO, Any
+from io import BufferedReader
+from threading import Lock
+from typing import IO, Any, Iterator
 from urllib.parse import urljoin
 from urllib.request import pathname2url
 
@@ -46,6 +52,7 @@ from x8.storage.document_store.providers.sqlite import SQLite
 
 from .._helper import (
     QueryArgs,
+    build_aiter_get_result,
     get_collection_config,
     get_query_args,
     get_transfer_config,
@@ -67,6 +74,7 @@ OBJECT_COLLECTION = "object"
 OBJECT_DOCUMENT_TYPE = "object"
 VERSION_DOCUMENT_TYPE = "version"
 PK = "#"
+CHUNK_SIZE = 1024 * 1024
 
 
 class ObjectDocument(DataModel):
@@ -90,16 +98,24 @@ class FileSystem(StoreProvider):
     store_path: str
     folder: str | None
     db_file_name: str
+    metadata_cache_size: int
     nparams: dict[str, Any]
 
     _init: bool
     _db_cache: dict[str, DocumentStore]
+    _versioned_cache: dict[str, bool]
+    _metadata_cache: OrderedDict[
+        tuple[str, str],
+        dict[str | None, tuple[tuple[int, int, int], ObjectDocument]],
+    ]
+    _metadata_lock: Lock
 
     def __init__(
         self,
         store_path: str = ".",
         folder: str | None = None,
         db_file_name: str = DB_FILE_NAME,
+        metadata_cache_size: int = 10000,
         nparams: dict[str, Any] = dict(),
         **kwargs,
     ):
@@ -113,6 +129,12 @@ class FileSystem(StoreProvider):
             db_file_name:
                 File name of the SQLite DB that
                 manages the metadata in each collection folder.
+            metadata_cache_size:
+                Maximum number of objects whose metadata is cached
+                in memory. Cached metadata is dropped when the object
+                file changes, so writes from other providers or
+                processes are seen. Set to 0 to disable the cache.
+                Defaults to 10000.
             nparams:
                 Native parameters to file system operations.
         """
@@ -120,8 +142,12 @@ class FileSystem(StoreProvider):
         self.folder = folder
         self.nparams = nparams
         self.db_file_name = db_file_name
+        self.metadata_cache_size = metadata_cache_size
         self._init = False
         self._db_cache = dict()
+        self._versioned_cache = dict()
+        self._metadata_cache = OrderedDict()
+        self._metadata_lock = Lock()
 
     def _get_db(self, collection: str):
         if collection in self._db_cache:
@@ -138,12 +164,16 @@ class FileSystem(StoreProvider):
         return db
 
     def _is_versioned(self, collection: str) -> bool:
+        if collection in self._versioned_cache:
+            return self._versioned_cache[collection]
         db = self._get_db(collection)
         try:
             res = db.get(key=CONFIG_ID, collection=CONFIG_COLLECTION)
-            return res.result.value["versioned"]
         except NotFoundError:
             return False
+        versioned = res.result.value["versioned"]
+        self._versioned_cache[collection] = versioned
+        return versioned
 
     def __setup__(self, context: Context | None = None) -> None:
         if not self._init:
@@ -230,6 +260,17 @@ class FileSystem(StoreProvider):
                 config=get_transfer_config(op_parser),
                 collection=self._get_folder_name(op_parser),
             )
+        # ITER GET
+        elif op_parser.op_equals(StoreOperation.ITER_GET):
+            result = self.iter_get(
+                id=op_parser.get_id_as_str(),
+                version=op_parser.get_version(),
+                match_condition=op_parser.get_match_condition(),
+                start=op_parser.get_start(),
+                end=op_parser.get_end(),
+                config=get_transfer_config(op_parser),
+                collection=self._get_folder_name(op_parser),
+            )
         # GET metadata or properties
         elif op_parser.op_equals(
             StoreOperation.GET_METADATA
@@ -308,8 +349,26 @@ class FileSystem(StoreProvider):
         # CLOSE
         elif op_parser.op_equals(StoreOperation.CLOSE):
             result = self.close()
+        else:
+            return super().__run__(
+                operation=operation,
+                context=context,
+                **kwargs,
+            )
         return Response(result=result)
 
+    async def __arun__(
+        self,
+        operation: Operation | None = None,
+        context: Context | None = None,
+        **kwargs,
+    ) -> Any:
+        response = await super().__arun__(operation, context, **kwargs)
+        op_parser = self.get_op_parser(operation)
+        if op_parser.op_equals(StoreOperation.ITER_GET):
+            response.result = build_aiter_get_result(response.result)
+        return response
+
     def create_collection(
         self,
         collection: str,
@@ -333,6 +392,7 @@ class FileSystem(StoreProvider):
             ConfigDocument(id=CONFIG_ID, pk=CONFIG_ID, versioned=versioned),
             collection=CONFIG_COLLECTION,
         )
+        self._versioned_cache[collection] = versioned
         return CollectionResult(status=CollectionStatus.CREATED)
 
     def drop_collection(
@@ -350,6 +410,8 @@ class FileSystem(StoreProvider):
         db.close()
         if collection in self._db_cache:
             self._db_cache.pop(collection)
+        self._versioned_cache.pop(collection, None)
+        self._cache_clear(collection)
         import shutil
 
         shutil.rmtree(folder_path)
@@ -385,11 +447,13 @@ class FileSystem(StoreProvider):
         versioned = self._is_versioned(collection)
         version = None
         link_path = None
-        try:
-            current_item = self._db_get(db, id, version)
-        except NotFoundError:
-            current_item = None
-        self._match(current_item, match_condition)
+        # Unconditional puts overwrite without reading the metadata.
+        conditional = self._is_conditional(match_condition)
+        current_item = None
+        if conditional:
+            current_item = self._match_current(
+                db, id, match_condition, collection
+            )
 
         if versioned:
             version = str(uuid.uuid4())
@@ -397,14 +461,8 @@ class FileSystem(StoreProvider):
             collection, id, version
         )
         os.makedirs(os.path.dirname(object_path), exist_ok=True)
-        if file:
-            shutil.copy(file, object_path)
-        elif value:
-            with open(object_path, "wb") as f:
-                f.write(value)
-        elif stream:
-            with open(object_path, "wb") as f:
-                shutil.copyfileobj(stream, f)
+        if file or value or stream:
+            self._write(object_path, value, file, stream)
 
         if link_path:
             os.makedirs(os.path.dirname(link_path), exist_ok=True)
@@ -421,48 +479,52 @@ class FileSystem(StoreProvider):
             props = properties.copy()
         props["last_modified"] = last_modified
         props["content_length"] = content_length
+        object_document = ObjectDocument(
+            id=self._get_db_object_id(id),
+            pk=PK,
+            object_id=id,
+            version=version,
+            metadata=metadata,
+            properties=props,
+            ts=ts,
+            type=OBJECT_DOCUMENT_TYPE,
+        )
+        version_document = None
         if version:
-            transaction = DocumentTransaction()
-            transaction.put(
-                value=ObjectDocument(
-                    id=self._get_db_object_id(id),
-                    pk=PK,
-                    object_id=id,
-                    version=version,
-                    metadata=metadata,
-                    properties=props,
-                    ts=ts,
-                    type=OBJECT_DOCUMENT_TYPE,
-                )
+            version_document = object_document.copy(
+                update={
+                    "id": self._get_db_version_id(id, version),
+                    "type": VERSION_DOCUMENT_TYPE,
+                }
             )
-            transaction.put(
-                value=ObjectDocument(
-                    id=self._get_db_version_id(id, version),
-                    pk=PK,
-                    object_id=id,
-                    version=version,
-                    metadata=metadata,
-                    properties=props,
-                    ts=ts,
-                    type=VERSION_DOCUMENT_TYPE,
+        while True:
+            try:
+                etag = self._db_put(
+                    db,
+                    object_document,
+                    version_document,
+                    current_item,
+                    conditional,
                 )
-            )
-            res = db.transact(transaction=transaction)
-            etag = res.result[1].properties.etag
-        else:
-            res = db.put(
-                ObjectDocument(
-                    id=self._get_db_object_id(id),
-                    pk=PK,
-                    object_id=id,
-                    version=version,
-                    metadata=metadata,
-                    properties=props,
-                    ts=ts,
-                    type=OBJECT_DOCUMENT_TYPE,
+                break
+            except (ConflictError, sqlite3.IntegrityError):
+                # The metadata changed after the conditions were
+                # checked, so check them again before retrying.
+                self._cache_pop(collection, id)
+                current_item = self._match_current(
+                    db, id, match_condition, collection
                 )
-            )
-            etag = res.result.properties.etag
+        item = (version_document or object_document).copy(
+            update={
+                "metadata": copy.deepcopy(metadata),
+                "properties": props | {"etag": etag},
+            }
+        )
+        self._cache_pop(collection, id)
+        signature = self._get_signature(collection, id, version)
+        self._cache_put(collection, id, None, item, signature)
+        if version:
+            self._cache_put(collection, id, version, item, signature)
         return_value = None
         if returning == "new":
             return_value = value
@@ -491,7 +553,7 @@ class FileSystem(StoreProvider):
         collection: str,
     ) -> ObjectItem:
         db = self._get_db(collection)
-        value = None
+        value: bytes | memoryview | None = None
         object_path, link_path = self._convert_object_link_path(
             collection, id, version
         )
@@ -499,26 +561,32 @@ class FileSystem(StoreProvider):
         if not os.path.isfile(object_path) and not os.path.islink(object_path):
             raise NotFoundError
 
-        item = self._db_get(db, id, version)
+        item = self._get_item(db, id, version, collection)
         self._match(item, match_condition)
 
+        chunksize = (config.chunksize if config else None) or CHUNK_SIZE
         with open(object_path, "rb") as f:
-            if start is not None or end is not None:
-                f.seek(start or 0)
-                data = f.read(
-                    (end - (start or 0) + 1) if end is not None else None
+            offset, length = self._get_range(f, start, end)
+            if file:
+                os.makedirs(os.path.dirname(file), exist_ok=True)
+                linked = (
+                    config is not None
+                    and config.zero_copy
+                    and offset == 0
+                    and length == os.fstat(f.fileno()).st_size
+                    and self._link(object_path, file)
                 )
+                if not linked:
+                    with open(file, "wb") as out_file:
+                        self._copy(f, out_file, offset, length, chunksize)
+            elif stream:
+                self._copy(f, stream, offset, length, chunksize)
+                stream.seek(0)
+            elif config is not None and config.zero_copy:
+                value = self._map(f, offset, length)
             else:
-                data = f.read()
-        if file:
-            os.makedirs(os.path.dirname(file), exist_ok=True)
-            with open(file, "wb") as out_file:
-                out_file.write(data)
-        elif stream:
-            stream.write(data)
-            stream.seek(0)
-        else:
-            value = data
+                f.seek(offset)
+                value = f.read(length)
 
         return ObjectItem(
             key=ObjectKey(id=id, version=item.version),
@@ -528,6 +596,30 @@ class FileSystem(StoreProvider):
             url=self._convert_url(link_path or object_path),
         )
 
+    def iter_get(
+        self,
+        id: str,
+        version: str | None,
+        match_condition: MatchCondition,
+        start: int | None,
+        end: int | None,
+        config: ObjectTransferConfig | None,
+        collection: str,
+    ) -> Iterator[bytes]:
+        db = self._get_db(collection)
+        object_path, _ = self._convert_object_link_path(
+            collection, id, version
+        )
+
+        if not os.path.isfile(object_path) and not os.path.islink(object_path):
+            raise NotFoundError
+
+        item = self._get_item(db, id, version, collection)
+        self._match(item, match_condition)
+
+        chunksize = (config.chunksize if config else None) or CHUNK_SIZE
+        return self._iter_chunks(object_path, start, end, chunksize)
+
     def get_properties(
         self,
         id: str,
@@ -540,7 +632,7 @@ class FileSystem(StoreProvider):
             collection, id, version
         )
         try:
-            item = self._db_get(db, id, version)
+            item = self._get_item(db, id, version, collection)
             self._match(item, match_condition)
         except NotFoundError:
             raise NotFoundError
@@ -609,10 +701,7 @@ class FileSystem(StoreProvider):
     ):
         db = self._get_db(collection)
         versioned = self._is_versioned(collection)
-        try:
-            current_item = self._db_get(db, id, version)
-        except NotFoundError:
-            current_item = None
+        current_item = self._get_item_or_none(db, id, version, collection)
         self._match(current_item, match_condition)
         if versioned:
             try:
@@ -672,6 +761,7 @@ class FileSystem(StoreProvider):
             )
             self._delete_file(object_path)
             db.delete(key=res.result.key)
+        self._cache_pop(collection, id)
         return None
 
     def update(
@@ -739,6 +829,10 @@ class FileSystem(StoreProvider):
             etag = res.result.properties.etag
             item = obj
         item.properties["etag"] = etag
+        # Metadata changes are seen by the caches of other providers
+        # through the modification time of the object file.
+        os.utime(object_path)
+        self._cache_pop(collection, id)
         return ObjectItem(
             key=ObjectKey(id=id, version=item.version),
             metadata=item.metadata,
@@ -771,16 +865,13 @@ class FileSystem(StoreProvider):
             source_object_path
         ):
             raise NotFoundError
-        source_item = self._db_get(
+        source_item = self._get_item(
             source_db,
             source_id,
             source_version,
+            source_collection,
         )
-        dest_item = None
-        try:
-            dest_item = self._db_get(dest_db, id, None)
-        except NotFoundError:
-            pass
+        dest_item = self._get_item_or_none(dest_db, id, None, collection)
         self._match(dest_item, match_condition)
         new_properties = source_item.properties | (properties or {})
         new_properties.pop("etag")
@@ -895,6 +986,7 @@ class FileSystem(StoreProvider):
             items.append(
                 ObjectItem(
                     key=ObjectKey(id=obj.object_id, version=obj.version),
+                    properties=ObjectProperties.from_dict(obj.properties),
                     url=self._convert_url(link_path or object_path),
                 )
             )
@@ -1000,6 +1092,144 @@ class FileSystem(StoreProvider):
         except NotFoundError:
             raise NotFoundError
 
+    def _db_put(
+        self,
+        db: DocumentStore,
+        object_document: ObjectDocument,
+        version_document: ObjectDocument | None,
+        current_item: ObjectDocument | None,
+        conditional: bool,
+    ) -> str:
+        # Writes the object and version documents in one transaction.
+        # A conditional put only writes if the object document is
+        # unchanged since the conditions were checked against it.
+        where = None
+        params = None
+        if conditional:
+            if current_item is None:
+                where = "not_exists()"
+            else:
+                where = "ts = @ts"
+                params = {"ts": current_item.ts}
+        transaction = DocumentTransaction()
+        transaction.put(value=object_document, where=where, params=params)
+        if version_document is not None:
+            transaction.put(value=version_document)
+        res: Any = db.transact(transaction=transaction)
+        return res.result[-1].properties.etag
+
+    def _match_current(
+        self,
+        db: DocumentStore,
+        id: str,
+        match_condition: MatchCondition,
+        collection: str,
+    ) -> ObjectDocument | None:
+        current_item = self._get_item_or_none(db, id, None, collection)
+        try:
+            self._match(current_item, match_condition)
+        except (PreconditionFailedError, NotModified):
+            # The cached metadata can be stale, so check the
+            # conditions against the stored metadata before failing.
+            self._cache_pop(collection, id)
+            current_item = self._get_item_or_none(db, id, None, collection)
+            self._match(current_item, match_condition)
+        return current_item
+
+    def _get_item(
+        self,
+        db: DocumentStore,
+        id: str,
+        version: str | None,
+        collection: str,
+    ) -> ObjectDocument:
+        if self.metadata_cache_size <= 0:
+            return self._db_get(db, id, version)
+        signature = self._get_signature(collection, id, version)
+        item = self._cache_get(collection, id, version, signature)
+        if item is None:
+            item = self._db_get(db, id, version)
+            self._cache_put(collection, id, version, item, signature)
+        return item
+
+    def _get_item_or_none(
+        self,
+        db: DocumentStore,
+        id: str,
+        version: str | None,
+        collection: str,
+    ) -> ObjectDocument | None:
+        try:
+            return self._get_item(db, id, version, collection)
+        except NotFoundError:
+            return None
+
+    def _get_signature(
+        self, collection: str, id: str, version: str | None
+    ) -> tuple[int, int, int] | None:
+        # Puts replace the object file and updates touch it,
+        # so the signature changes with the metadata.
+        object_path, _ = self._convert_object_link_path(
+            collection, id, version
+        )
+        try:
+            stat = os.stat(object_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _cache_get(
+        self,
+        collection: str,
+        id: str,
+        version: str | None,
+        signature: tuple[int, int, int] | None,
+    ) -> ObjectDocument | None:
+        # Cached documents are shared, so callers must not change them.
+        if signature is None:
+            return None
+        with self._metadata_lock:
+            entry = self._metadata_cache.get((collection, id))
+            if entry is None or version not in entry:
+                return None
+            if entry[version][0] != signature:
+                return None
+            self._metadata_cache.move_to_end((collection, id))
+            return entry[version][1]
+
+    def _cache_put(
+        self,
+        collection: str,
+        id: str,
+        version: str | None,
+        item: ObjectDocument,
+        signature: tuple[int, int, int] | None,
+    ) -> None:
+        if self.metadata_cache_size <= 0 or signature is None:
+            return
+        with self._metadata_lock:
+            entry = self._metadata_cache.setdefault((collection, id), {})
+            entry[version] = (signature, item)
+            self._metadata_cache.move_to_end((collection, id))
+            while len(self._metadata_cache) > self.metadata_cache_size:
+                self._metadata_cache.popitem(last=False)
+
+    def _cache_pop(self, collection: str, id: str) -> None:
+        with self._metadata_lock:
+            self._metadata_cache.pop((collection, id), None)
+
+    def _cache_clear(self, collection: str) -> None:
+        with self._metadata_lock:
+            for key in list(self._metadata_cache):
+                if key[0] == collection:
+                    self._metadata_cache.pop(key)
+
+    def _is_conditional(self, match_condition: MatchCondition) -> bool:
+        return any(
+            getattr(match_condition, name) is not None
+            for name in MatchCondition.model_fields
+        )
+
     def _match(
         self, item: ObjectDocument | None, match_condition: MatchCondition
     ):
@@ -1044,6 +1274,126 @@ class FileSystem(StoreProvider):
             if last_modified > match_condition.if_unmodified_since:
                 raise PreconditionFailedError
 
+    def _get_range(
+        self, f: IO, start: int | None, end: int | None
+    ) -> tuple[int, int]:
+        size = os.fstat(f.fileno()).st_size
+        offset = min(start or 0, size)
+        if end is None:
+            return offset, size - offset
+        return offset, max(min(end + 1, size) - offset, 0)
+
+    def _copy(
+        self,
+        src: BufferedReader,
+        dst: IO,
+        offset: int,
+        length: int,
+        chunksize: int,
+    ) -> None:
+        # Copies in the kernel when the destination is a file, which
+        # also shares extents on file systems that support reflinks.
+        # Otherwise falls back to a copy through a fixed size buffer.
+        try:
+            dst.flush()
+            dst_fd = dst.fileno()
+            while length > 0:
+                copied = _kernel_copy(src.fileno(), dst_fd, offset, length)
+                if copied == 0:
+                    return
+                offset += copied
+                length -= copied
+            return
+        except (AttributeError, OSError, ValueError):
+            pass
+        src.seek(offset)
+        buffer = memoryview(bytearray(min(chunksize, length)))
+        while length > 0:
+            read = src.readinto(buffer[: min(chunksize, length)])
+            if not read:
+                return
+            dst.write(buffer[:read])
+            length -= read
+
+    def _link(self, object_path: str, file: str) -> bool:
+        # Puts replace the object file instead of rewriting it, so a
+        # hard link keeps the content it was made with. Returns False
+        # if the file system can not link the file, e.g. across devices.
+        temp_path = os.path.join(
+            os.path.dirname(os.path.abspath(file)),
+            f".{uuid.uuid4().hex}.tmp",
+        )
+        try:
+            # Versioned objects are symbolic links to the version file.
+            os.link(os.path.realpath(object_path), temp_path)
+        except OSError:
+            return False
+        try:
+            os.replace(temp_path, file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return True
+
+    def _write(
+        self,
+        object_path: str,
+        value: bytes | None,
+        file: str | None,
+        stream: IO | None,
+    ) -> None:
+        # The object file is replaced instead of rewritten in place,
+        # so that open readers and mapped views keep the old content.
+        temp_path = os.path.join(
+            os.path.dirname(object_path), f".{uuid.uuid4().hex}.tmp"
+        )
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if file:
+                    with open(file, "rb") as src:
+                        shutil.copyfileobj(src, f)
+                elif value:
+                    f.write(value)
+                elif stream:
+                    shutil.copyfileobj(stream, f)
+            os.replace(temp_path, object_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _map(self, f: IO, offset: int, length: int) -> bytes | memoryview:
+        # The mapping stays open as long as the view is referenced.
+        if length == 0:
+            return b""
+        skip = offset % mmap.ALLOCATIONGRANULARITY
+        mapped = mmap.mmap(
+            f.fileno(),
+            length + skip,
+            access=mmap.ACCESS_READ,
+            offset=offset - skip,
+        )
+        return memoryview(mapped)[skip:]
+
+    def _iter_chunks(
+        self,
+        path: str,
+        start: int | None,
+        end: int | None,
+        chunksize: int,
+    ) -> Iterator[bytes]:
+        # The file is opened on the first read, so an iterator that is
+        # never consumed does not hold it open.
+        with open(path, "rb") as f:
+            offset, length = self._get_range(f, start, end)
+            f.seek(offset)
+            while length > 0:
+                chunk = f.read(min(chunksize, length))
+                if not chunk:
+                    return
+                length -= len(chunk)
+                yield chunk
+
     def _delete_file(self, path):
         os.remove(path)
         folder = os.path.dirname(path)
@@ -1069,3 +1419,10 @@ class FileSystem(StoreProvider):
 
     def _get_db_version_id(self, id: str, version: str) -> str:
         return f"{VERSION_DOCUMENT_TYPE}-{id}-{version}"
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    try:
+        return os.copy_file_range(src_fd, dst_fd, count, offset)
+    except (AttributeError, OSError):
+        return os.sendfile(dst_fd, src_fd, offset, count)